@@ -0,0 +1,40 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+"""
+Benchmarks the throughput and peak memory of data loading, training,
+prediction and evaluation over a matrix of datasets, forecasters, numbers of
+workers and batch sizes; run it with `python -m gluonts.bench`.
+"""
+
+# Relative imports
+from ._config import BenchmarkConfig, ForecasterConfig
+from ._results import (
+    compare_results,
+    load_results,
+    make_results,
+    save_results,
+)
+from ._runner import run_benchmark, time_stage
+
+__all__ = [
+    "BenchmarkConfig",
+    "ForecasterConfig",
+    "compare_results",
+    "load_results",
+    "make_results",
+    "run_benchmark",
+    "save_results",
+    "time_stage",
+]
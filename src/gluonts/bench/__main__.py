@@ -0,0 +1,109 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+import logging
+import sys
+
+# Third-party imports
+import click
+
+# First-party imports
+from gluonts.bench import (
+    BenchmarkConfig,
+    compare_results,
+    load_results,
+    make_results,
+    run_benchmark,
+    save_results,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+@cli.command(name="run")
+@click.argument("config", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False),
+    default="benchmark.json",
+    show_default=True,
+    help="The file the versioned JSON results are written to.",
+)
+def run_command(config: str, output: str) -> None:
+    benchmark_config = BenchmarkConfig.load(config)
+    results = run_benchmark(benchmark_config)
+    save_results(make_results(benchmark_config, results), output)
+
+    for record in results:
+        latency = (
+            f", latency p50 {record['latency_p50_seconds'] * 1000:.2f} ms "
+            f"p99 {record['latency_p99_seconds'] * 1000:.2f} ms"
+            if "latency_p50_seconds" in record
+            else ""
+        )
+        click.echo(
+            f"{record['dataset']} {record['forecaster']} "
+            f"workers={record['num_workers']} "
+            f"batch_size={record['batch_size']} {record['stage']}: "
+            f"{record['items_per_second']:.2f} items/s, "
+            f"peak RSS {record['peak_rss_mb']:.0f} MB "
+            f"(+{record['rss_increase_mb']:.0f} MB){latency}"
+        )
+
+
+@cli.command(name="compare")
+@click.argument("baseline", type=click.Path(exists=True, dir_okay=False))
+@click.argument("candidate", type=click.Path(exists=True, dir_okay=False))
+@click.option(
+    "--threshold",
+    type=float,
+    default=0.1,
+    show_default=True,
+    help=(
+        "Relative drop of the throughput, or increase of the memory used by "
+        "a stage relative to its peak RSS, above which a stage is flagged as "
+        "a regression."
+    ),
+)
+def compare_command(baseline: str, candidate: str, threshold: float) -> None:
+    comparison = compare_results(
+        load_results(baseline), load_results(candidate), threshold
+    )
+    for record in comparison:
+        click.echo(
+            f"{'REGRESSION' if record['regression'] else 'ok':<10} "
+            f"{record['dataset']} {record['forecaster']} "
+            f"workers={record['num_workers']} "
+            f"batch_size={record['batch_size']} {record['stage']}: "
+            f"throughput {record['throughput_change']:+.1%}, "
+            f"peak RSS {record['peak_rss_change']:+.1%}"
+        )
+
+    if any(record["regression"] for record in comparison):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)s] %(name)s %(message)s",
+        datefmt="[%Y-%m-%d %H:%M:%S]",
+    )
+    cli(prog_name=__package__)
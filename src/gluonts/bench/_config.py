@@ -0,0 +1,74 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+# Third-party imports
+import pydantic
+
+STAGES = ["data_loading", "training", "prediction", "evaluation"]
+
+
+class ForecasterConfig(pydantic.BaseModel):
+    """
+    An estimator or predictor of the benchmark, given by an alias or a fully
+    qualified class name as for the `train` command of the shell, and its
+    hyperparameters; `freq` and `prediction_length` are taken from the
+    dataset.
+    """
+
+    name: str
+    hyperparameters: Dict[str, Any] = {}
+
+
+class BenchmarkConfig(pydantic.BaseModel):
+    """
+    The matrix of datasets, forecasters, numbers of workers and batch sizes
+    for which the stages of the pipeline are benchmarked.
+
+    Datasets are given as "synthetic:<name>", for the "constant" and
+    "complex_seasonal" artificial datasets with `synthetic_num_series` time
+    series, or as "repository:<name>", for a dataset of the repository,
+    which is downloaded once and then read from its local cache.
+
+    Every stage is run `warmup` times without being timed and then timed
+    `repeats` times; data loading and training run `num_batches` batches.
+    """
+
+    datasets: List[str] = ["synthetic:complex_seasonal"]
+    forecasters: List[ForecasterConfig] = [
+        ForecasterConfig(
+            name="gluonts.model.seasonal_naive.SeasonalNaivePredictor"
+        )
+    ]
+    num_workers: List[int] = [0]
+    batch_sizes: List[int] = [32]
+    stages: List[str] = STAGES
+    warmup: int = 1
+    repeats: int = 3
+    num_batches: int = 50
+    num_samples: int = 100
+    synthetic_num_series: int = 100
+
+    @pydantic.validator("stages")
+    def known_stages(cls, stages: List[str]) -> List[str]:
+        unknown = set(stages) - set(STAGES)
+        assert not unknown, f"Unknown stages: {sorted(unknown)}"
+        return stages
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "BenchmarkConfig":
+        return cls.parse_file(path)
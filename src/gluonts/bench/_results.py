@@ -0,0 +1,137 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+import json
+import math
+import multiprocessing
+import platform
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+
+# First-party imports
+import gluonts
+
+# Relative imports
+from ._config import BenchmarkConfig
+
+FORMAT_VERSION = 1
+
+CASE_KEYS = ("dataset", "forecaster", "num_workers", "batch_size", "stage")
+
+
+def make_results(config: BenchmarkConfig, results: List[Dict]) -> Dict:
+    """
+    Wraps benchmark results with the versions, environment and configuration
+    they were obtained with.
+    """
+    return {
+        "format_version": FORMAT_VERSION,
+        "gluonts_version": gluonts.__version__,
+        "created": datetime.utcnow().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": multiprocessing.cpu_count(),
+        },
+        "config": config.dict(),
+        "results": results,
+    }
+
+
+def save_results(results: Dict, path: Union[str, Path]) -> None:
+    with open(path, "w") as fp:
+        json.dump(results, fp, indent=2)
+
+
+def load_results(path: Union[str, Path]) -> Dict:
+    with open(path) as fp:
+        results = json.load(fp)
+    assert results.get("format_version") == FORMAT_VERSION, (
+        f"Unsupported format version {results.get('format_version')} "
+        f"of benchmark results {path}"
+    )
+    return results
+
+
+def _by_case(results: Dict) -> Dict[Tuple, Dict]:
+    return {
+        tuple(record[key] for key in CASE_KEYS): record
+        for record in results["results"]
+    }
+
+
+def _relative_change(difference: float, reference: float) -> float:
+    """
+    The `difference` relative to `reference`, or NaN, which is never flagged
+    as a regression, if `reference` is not a positive finite number.
+    """
+    if not (math.isfinite(reference) and reference > 0):
+        return math.nan
+    return difference / reference
+
+
+def compare_results(
+    baseline: Dict, candidate: Dict, threshold: float = 0.1
+) -> List[Dict]:
+    """
+    Compares the stages benchmarked in both results.
+
+    Parameters
+    ----------
+    baseline
+        Results to compare against.
+    candidate
+        Results to check for regressions.
+    threshold
+        Relative drop of the throughput, or increase of the memory allocated
+        by the stage relative to its peak RSS, above which a stage is flagged
+        as a regression.
+
+    Returns
+    -------
+    List[Dict]
+        One record per stage present in both results, with the relative
+        changes of throughput and peak RSS and whether it regressed; the
+        changes are NaN, and not flagged, for baselines which are zero or
+        were not measured.
+    """
+    baseline_cases = _by_case(baseline)
+    comparison = []
+    for case, new in _by_case(candidate).items():
+        old = baseline_cases.get(case)
+        if old is None:
+            continue
+        throughput_change = _relative_change(
+            new["items_per_second"] - old["items_per_second"],
+            old["items_per_second"],
+        )
+        # the additional memory used by the stage, relative to its peak RSS
+        rss_change = _relative_change(
+            new["rss_increase_mb"] - old["rss_increase_mb"],
+            old["peak_rss_mb"],
+        )
+        comparison.append(
+            {
+                **dict(zip(CASE_KEYS, case)),
+                "baseline_items_per_second": old["items_per_second"],
+                "items_per_second": new["items_per_second"],
+                "throughput_change": throughput_change,
+                "peak_rss_change": rss_change,
+                "regression": throughput_change < -threshold
+                or rss_change > threshold,
+            }
+        )
+    return comparison
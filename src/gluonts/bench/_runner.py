@@ -0,0 +1,331 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Third-party imports
+import mxnet as mx
+import numpy as np
+
+# First-party imports
+from gluonts.dataset.artificial import (
+    ComplexSeasonalTimeSeries,
+    ConstantDataset,
+)
+from gluonts.dataset.common import TrainDatasets
+from gluonts.dataset.loader import TrainDataLoader
+from gluonts.dataset.repository.datasets import get_dataset
+from gluonts.evaluation import Evaluator
+from gluonts.evaluation.backtest import make_evaluation_predictions
+from gluonts.model.estimator import Estimator, GluonEstimator
+from gluonts.model.predictor import Predictor
+from gluonts.shell.util import forecaster_type_by_name
+
+# Relative imports
+from ._config import BenchmarkConfig, ForecasterConfig
+
+logger = logging.getLogger(__name__)
+
+
+def load_dataset(name: str, num_series: int) -> TrainDatasets:
+    """
+    Loads a dataset given as "synthetic:<name>" or "repository:<name>".
+    """
+    source, _, dataset_name = name.partition(":")
+    if source == "synthetic":
+        if dataset_name == "constant":
+            return ConstantDataset(num_timeseries=num_series).generate()
+        if dataset_name == "complex_seasonal":
+            return ComplexSeasonalTimeSeries(num_series=num_series).generate()
+        raise ValueError(f"Unknown synthetic dataset {dataset_name}")
+    if source == "repository":
+        return get_dataset(dataset_name, regenerate=False)
+    raise ValueError(
+        f"Dataset {name} should start with 'synthetic:' or 'repository:'"
+    )
+
+
+def rss_mb() -> float:
+    """
+    Current resident set size in MB, of this process and of its worker
+    processes if `psutil` is installed, and otherwise of this process only
+    as read from /proc, or NaN where it is not available.
+    """
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        process = psutil.Process()
+        rss = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                rss += child.memory_info().rss
+            except psutil.Error:
+                # the child terminated in the meantime
+                pass
+        return rss / 2 ** 20
+
+    statm = Path("/proc/self/statm")
+    if not statm.exists():
+        return np.nan
+    pages = int(statm.read_text().split()[1])
+    return pages * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+
+
+class RssMonitor:
+    """
+    Samples the RSS in a background thread while it is used as a context
+    manager, to measure the peak of a stage and its increase over the RSS at
+    the start of the stage, which, unlike the lifetime maximum of the
+    process, do not depend on the stages run before.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.start_mb = np.nan
+        self.peak_mb = np.nan
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_mb = max(self.peak_mb, rss_mb())
+
+    def __enter__(self) -> "RssMonitor":
+        self.start_mb = self.peak_mb = rss_mb()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._stop.set()
+        assert self._thread is not None
+        self._thread.join()
+        self.peak_mb = max(self.peak_mb, rss_mb())
+
+    @property
+    def increase_mb(self) -> float:
+        return self.peak_mb - self.start_mb
+
+
+def time_stage(
+    run: Callable[[], int],
+    warmup: int,
+    repeats: int,
+    latencies: Optional[List[float]] = None,
+) -> Dict[str, float]:
+    """
+    Runs a stage `warmup` times, e.g. to hybridize networks and fill caches,
+    and then times it `repeats` times.
+
+    Parameters
+    ----------
+    run
+        Runs the stage and returns the number of items it processed.
+    latencies
+        List to which `run` appends the latency of every item, in seconds,
+        if the stage measures them.
+
+    Returns
+    -------
+    Dict[str, float]
+        The number of items per run, the median and minimum run time, the
+        throughput derived from the median, the peak RSS during the timed
+        runs and its increase over the RSS before them, and the median and
+        99th percentile of the latencies of the timed runs, if measured.
+    """
+    for _ in range(warmup):
+        run()
+    if latencies is not None:
+        del latencies[:]
+
+    seconds = []
+    num_items = 0
+    with RssMonitor() as monitor:
+        for _ in range(max(repeats, 1)):
+            start = time.perf_counter()
+            num_items = run()
+            seconds.append(time.perf_counter() - start)
+
+    median = float(np.median(seconds))
+    measurement = {
+        "items": num_items,
+        "seconds_median": median,
+        "seconds_min": min(seconds),
+        "items_per_second": num_items / median if median > 0 else np.inf,
+        "peak_rss_mb": monitor.peak_mb,
+        "rss_increase_mb": monitor.increase_mb,
+    }
+    if latencies:
+        p50, p99 = np.percentile(latencies, [50, 99])
+        measurement["latency_p50_seconds"] = float(p50)
+        measurement["latency_p99_seconds"] = float(p99)
+    return measurement
+
+
+def _make_forecaster(
+    forecaster: ForecasterConfig,
+    dataset: TrainDatasets,
+    batch_size: int,
+    num_batches: int,
+):
+    hyperparameters = {
+        "freq": dataset.metadata.freq,
+        "prediction_length": dataset.metadata.prediction_length,
+        "batch_size": batch_size,
+        "epochs": 1,
+        "num_batches_per_epoch": num_batches,
+        **forecaster.hyperparameters,
+    }
+    return forecaster_type_by_name(forecaster.name).from_inputs(
+        dataset.train, **hyperparameters
+    )
+
+
+def run_case(
+    config: BenchmarkConfig,
+    dataset: TrainDatasets,
+    forecaster_config: ForecasterConfig,
+    num_workers: int,
+    batch_size: int,
+) -> Iterator[Tuple[str, Dict[str, float]]]:
+    """
+    Benchmarks the stages of one entry of the matrix; stages which do not
+    apply, like training a predictor, are skipped.
+    """
+    forecaster = _make_forecaster(
+        forecaster_config, dataset, batch_size, config.num_batches
+    )
+    loader_workers = num_workers if num_workers > 0 else None
+
+    if "data_loading" in config.stages and isinstance(
+        forecaster, GluonEstimator
+    ):
+        transformation = forecaster.create_transformation()
+
+        def load() -> int:
+            loader = TrainDataLoader(
+                dataset=dataset.train,
+                transform=transformation,
+                batch_size=batch_size,
+                ctx=mx.cpu(),
+                num_batches_per_epoch=config.num_batches,
+                num_workers=loader_workers,
+            )
+            return sum(len(batch["past_target"]) for batch in loader)
+
+        yield "data_loading", time_stage(load, config.warmup, config.repeats)
+
+    predictor: Optional[Predictor] = (
+        forecaster if isinstance(forecaster, Predictor) else None
+    )
+    if isinstance(forecaster, Estimator):
+
+        def train() -> int:
+            nonlocal predictor
+            if isinstance(forecaster, GluonEstimator):
+                predictor = forecaster.train(
+                    dataset.train, num_workers=loader_workers
+                )
+                return config.num_batches
+            predictor = forecaster.train(dataset.train)
+            return 1
+
+        if "training" in config.stages:
+            yield "training", time_stage(train, config.warmup, config.repeats)
+        else:
+            train()
+
+    assert predictor is not None
+    forecasts: List = []
+    latencies: List[float] = []
+
+    def predict() -> int:
+        nonlocal forecasts
+        forecast_it, _ = make_evaluation_predictions(
+            dataset.test, predictor, num_samples=config.num_samples
+        )
+        # the latency of a time series is the time waited for its forecast,
+        # which includes the whole batch for the first series of a batch
+        forecasts = []
+        start = time.perf_counter()
+        for forecast in forecast_it:
+            end = time.perf_counter()
+            latencies.append(end - start)
+            forecasts.append(forecast)
+            start = end
+        return len(forecasts)
+
+    if "prediction" in config.stages:
+        yield "prediction", time_stage(
+            predict, config.warmup, config.repeats, latencies
+        )
+    elif "evaluation" in config.stages:
+        predict()
+
+    if "evaluation" in config.stages:
+        evaluator = Evaluator(num_workers=num_workers)
+
+        def evaluate() -> int:
+            _, ts_it = make_evaluation_predictions(
+                dataset.test, predictor, num_samples=config.num_samples
+            )
+            evaluator(ts_it, iter(forecasts))
+            return len(forecasts)
+
+        # the workers are started once for all repetitions
+        with evaluator:
+            yield "evaluation", time_stage(
+                evaluate, config.warmup, config.repeats
+            )
+
+
+def run_benchmark(config: BenchmarkConfig) -> List[Dict]:
+    """
+    Runs the benchmark for every dataset, forecaster, number of workers and
+    batch size of the configuration.
+
+    Returns
+    -------
+    List[Dict]
+        One record per benchmarked stage, with the entry of the matrix and
+        the measurements of `time_stage`.
+    """
+    results = []
+    for dataset_name in config.datasets:
+        dataset = load_dataset(dataset_name, config.synthetic_num_series)
+        for forecaster in config.forecasters:
+            for num_workers in config.num_workers:
+                for batch_size in config.batch_sizes:
+                    case = {
+                        "dataset": dataset_name,
+                        "forecaster": forecaster.name,
+                        "num_workers": num_workers,
+                        "batch_size": batch_size,
+                    }
+                    logger.info(f"Benchmarking {case}")
+                    for stage, measurement in run_case(
+                        config, dataset, forecaster, num_workers, batch_size
+                    ):
+                        logger.info(f"{stage}: {measurement}")
+                        results.append(dict(case, stage=stage, **measurement))
+    return results
@@ -15,7 +15,7 @@
 import itertools
 import logging
 import multiprocessing as mp
-from typing import Any, Dict, Iterable, Iterator, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 # Third-party imports
 import mxnet as mx
@@ -229,7 +229,81 @@ class ValidationDataLoader(DataLoader):
         )
 
 
+def select_bucket(num_instances: int, batch_buckets: List[int]) -> int:
+    """
+    Returns the smallest of the (sorted) `batch_buckets` which can hold
+    `num_instances` instances, or the largest bucket if none can.
+    """
+    for bucket in batch_buckets:
+        if num_instances <= bucket:
+            return bucket
+    return batch_buckets[-1]
+
+
+def pad_batch(batch: DataBatch, size: int) -> DataBatch:
+    """
+    Pads every array in the batch along the first axis to `size` rows by
+    repeating its last row. Repeating real data, rather than padding with
+    zeros, keeps the padded rows valid inputs for any network (e.g. scalers
+    dividing by the observed values). Non-array fields such as
+    `forecast_start` or `item_id` are left untouched, so their length is
+    still the number of actual instances in the batch.
+    """
+    padded = {}
+    for key, value in batch.items():
+        if isinstance(value, mx.nd.NDArray) and value.shape[0] < size:
+            num_rows = value.shape[0]
+            if value.size == 0:
+                # MXNet cannot take from arrays with a 0-length dimension
+                value = mx.nd.array(
+                    np.zeros((size,) + value.shape[1:]),
+                    ctx=value.context,
+                    dtype=value.dtype,
+                )
+            else:
+                index = mx.nd.array(
+                    list(range(num_rows)) + [num_rows - 1] * (size - num_rows),
+                    ctx=value.context,
+                )
+                value = value.take(index, axis=0)
+        padded[key] = value
+    return padded
+
+
 class InferenceDataLoader(DataLoader):
+    """
+    An Iterable type for iterating and transforming a dataset just once, in
+    batches of a prescribed size.
+
+    The transformation are applied with in inference mode, i.e. with the flag
+    `is_train = False`.
+
+    Parameters
+    ----------
+    dataset
+        The dataset from which to load data.
+    transform
+        A transformation to apply to each entry in the dataset.
+    batch_size
+        The size of the batches to emit.
+    ctx
+        MXNet context to use to store data.
+    num_workers
+        The number of multiprocessing workers to use for data preprocessing.
+        By default 0, in which case no multiprocessing will be utilized.
+    num_prefetch
+        The number of prefetching batches only works if `num_workers` > 0.
+    dtype
+        Floating point type to use. Default is np.float32.
+    batch_buckets
+        If given, batches with fewer than `batch_size` instances (the last
+        batch of a dataset, or a small dataset as a whole) are padded with
+        :func:`pad_batch` to the smallest of these sizes that fits them, so
+        that a hybridized network only ever sees a few fixed input shapes.
+        `batch_size` is always one of the buckets. The non-array fields of a
+        padded batch keep the number of actual instances.
+    """
+
     def __init__(
         self,
         dataset: Dataset,
@@ -240,6 +314,7 @@ class InferenceDataLoader(DataLoader):
         num_workers: Optional[int] = None,
         num_prefetch: Optional[int] = None,
         dtype: DType = np.float32,
+        batch_buckets: Optional[List[int]] = None,
         **kwargs,
     ) -> None:
         super().__init__(
@@ -255,3 +330,28 @@ class InferenceDataLoader(DataLoader):
             shuffle_buffer_length=None,
             **kwargs,
         )
+
+        if batch_buckets is not None:
+            assert all(
+                0 < bucket <= batch_size for bucket in batch_buckets
+            ), "batch buckets must be positive and at most batch_size"
+            batch_buckets = sorted(set(batch_buckets) | {batch_size})
+        self.batch_buckets = batch_buckets
+
+    def __iter__(self) -> Iterator[DataBatch]:
+        if self.batch_buckets is None:
+            yield from self.parallel_data_loader
+            return
+
+        for batch in self.parallel_data_loader:
+            num_instances = max(
+                (
+                    value.shape[0]
+                    for value in batch.values()
+                    if isinstance(value, mx.nd.NDArray)
+                ),
+                default=0,
+            )
+            yield pad_batch(
+                batch, select_bucket(num_instances, self.batch_buckets)
+            )
@@ -13,8 +13,17 @@
 
 # Relative imports
 from ._base import Evaluator, MultivariateEvaluator
+from ._context import EvaluationContext
+from ._streaming import load_item_metrics
+from ._target import TargetSeries
 
-__all__ = ["Evaluator", "MultivariateEvaluator"]
+__all__ = [
+    "Evaluator",
+    "EvaluationContext",
+    "MultivariateEvaluator",
+    "TargetSeries",
+    "load_item_metrics",
+]
 
 # fix Sphinx issues, see https://bit.ly/2K2eptM
 for item in __all__:
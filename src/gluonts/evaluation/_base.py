@@ -17,7 +17,9 @@ import multiprocessing
 import re
 import sys
 from collections import Sized
-from itertools import chain, tee
+from functools import lru_cache
+from itertools import chain, islice
+from pathlib import Path
 from typing import (
     Any,
     Callable,
@@ -34,11 +36,106 @@ from typing import (
 import numpy as np
 import pandas as pd
 
+from pandas.tseries.frequencies import to_offset
+
 from gluonts.gluonts_tqdm import tqdm
 from gluonts.time_feature import get_seasonality
 
 # First-party imports
-from gluonts.model.forecast import Forecast, Quantile
+from gluonts.model.forecast import (
+    Forecast,
+    ForecastBatch,
+    Quantile,
+    SampleForecast,
+    SampleForecastBatch,
+    sample_quantiles,
+)
+
+# Relative imports
+from ._context import EvaluationContext
+from ._parallel import EvaluationPool
+from ._streaming import (
+    DiscardItemMetrics,
+    ItemMetricsSink,
+    KeepItemMetrics,
+    MetricAccumulator,
+    SampleItemMetrics,
+    SpillItemMetrics,
+    _metrics_frame,
+)
+from ._target import TargetSeries
+
+
+def _forecast_parts(
+    forecast: Union[Forecast, ForecastBatch]
+) -> Tuple[List[pd.Timestamp], List[Optional[str]]]:
+    if isinstance(forecast, ForecastBatch):
+        return forecast.start_dates, forecast.item_ids
+    return [forecast.start_date], [forecast.item_id]
+
+
+def _evaluation_blocks(
+    ts_iterator: Iterator[Union[pd.Series, pd.DataFrame]],
+    fcst_iterator: Iterator[Union[Forecast, ForecastBatch]],
+    block_size: int,
+) -> Iterator[
+    Tuple[
+        List[Union[pd.Series, pd.DataFrame]],
+        List[Union[Forecast, ForecastBatch]],
+    ]
+]:
+    """
+    Groups targets and forecasts into blocks of about `block_size` time series
+    with the same prediction length; batches of forecasts are kept whole.
+    """
+    block_ts: List[Union[pd.Series, pd.DataFrame]] = []
+    block_fcst: List[Union[Forecast, ForecastBatch]] = []
+    prediction_length = None
+
+    for forecast in fcst_iterator:
+        if block_ts and (
+            forecast.prediction_length != prediction_length
+            or len(block_ts) >= block_size
+        ):
+            yield block_ts, block_fcst
+            block_ts, block_fcst = [], []
+        prediction_length = forecast.prediction_length
+
+        num_items = len(forecast) if isinstance(forecast, ForecastBatch) else 1
+        time_series = list(islice(ts_iterator, num_items))
+        assert (
+            len(time_series) == num_items
+        ), "fcst_iterator has more elements than ts_iterator"
+        block_ts.extend(time_series)
+        block_fcst.append(forecast)
+
+    if block_ts:
+        yield block_ts, block_fcst
+
+
+@lru_cache(maxsize=1024)
+def _forecast_end(
+    start_date: pd.Timestamp, freq: str, prediction_length: int
+) -> pd.Timestamp:
+    return start_date + (prediction_length - 1) * to_offset(freq)
+
+
+def _masked_sum(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Sums the valid entries of every row, which is NaN for rows without any.
+    """
+    total = np.where(valid, values, 0.0).sum(axis=1)
+    return np.where(valid.any(axis=1), total, np.nan)
+
+
+def _masked_mean(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """
+    Averages the valid entries of every row, which is NaN for rows without
+    any.
+    """
+    count = valid.sum(axis=1)
+    total = np.where(valid, values, 0.0).sum(axis=1)
+    return np.where(count > 0, total * 1.0 / np.maximum(count, 1), np.nan)
 
 
 class Evaluator:
@@ -68,12 +165,41 @@ class Evaluator:
         By default False.
     num_workers
         The number of multiprocessing workers that will be used to process
-        the data in parallel.
+        the data in parallel. Targets and forecast samples are passed to them
+        in shared memory. The workers are started and shut down by every
+        call, unless the evaluator is used as a context manager, in which
+        case they are reused by all calls in the ``with`` block.
         Default is multiprocessing.cpu_count().
         Setting it to 0 means no multiprocessing.
     chunk_size
-        Controls the approximate chunk size each workers handles at a time.
-        Default is 32.
+        Controls the approximate number of time series whose metrics are
+        computed together in one vectorised block, by the evaluator or by
+        each worker.
+        Default is 1024.
+    item_metrics
+        What to do with the per time series metrics, whose table can exhaust
+        the memory for very large datasets: "keep" returns them (default),
+        "discard" drops them, "sample" returns a uniform random sample of
+        `item_metrics_sample_size` of them, and "spill" appends them to an
+        on-disk columnar store at `item_metrics_path`, to be read with
+        `load_item_metrics`. With "keep", the aggregate metrics are computed
+        by `get_aggregate_metrics` from the returned table; otherwise they
+        are accumulated block by block in constant memory, with compensated
+        float64 sums which agree with `get_aggregate_metrics` of the full
+        table up to rounding, and an overridden `get_aggregate_metrics` is
+        not supported.
+    item_metrics_path
+        Directory of the store for `item_metrics="spill"`.
+    item_metrics_sample_size
+        Number of time series kept for `item_metrics="sample"`.
+        Default is 1000.
+    calculate_crps
+        Determines whether the continuous ranked probability score "CRPS" of
+        sample forecasts, summed over the prediction range, should also be
+        calculated, together with its aggregate "wCRPS" weighted by the
+        absolute target like the quantile losses. It is computed from the
+        sorted samples in O(num_samples log num_samples) per time point.
+        By default False.
     """
 
     default_quantiles = 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9
@@ -86,23 +212,90 @@ class Evaluator:
         calculate_owa: bool = False,
         num_workers: Optional[int] = None,
         chunk_size: Optional[int] = None,
+        item_metrics: str = "keep",
+        item_metrics_path: Optional[Union[str, Path]] = None,
+        item_metrics_sample_size: int = 1000,
+        calculate_crps: bool = False,
     ) -> None:
+        assert item_metrics in (
+            "keep",
+            "discard",
+            "sample",
+            "spill",
+        ), f"Unknown value {item_metrics} for `item_metrics`"
+        assert (
+            item_metrics != "spill" or item_metrics_path is not None
+        ), "`item_metrics_path` is required for item_metrics='spill'"
+
         self.quantiles = tuple(map(Quantile.parse, quantiles))
         self.seasonality = seasonality
         self.alpha = alpha
         self.calculate_owa = calculate_owa
+        self.calculate_crps = calculate_crps
 
         self.num_workers = (
             num_workers
             if num_workers is not None
             else multiprocessing.cpu_count()
         )
-        self.chunk_size = chunk_size if chunk_size is not None else 32
+        self.chunk_size = chunk_size if chunk_size is not None else 1024
+        self.item_metrics = item_metrics
+        self.item_metrics_path = item_metrics_path
+        self.item_metrics_sample_size = item_metrics_sample_size
+        self._pool: Optional[EvaluationPool] = None
+        self._keep_pool = False
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_pool"] = None
+        state["_keep_pool"] = False
+        return state
+
+    def __enter__(self) -> "Evaluator":
+        self._keep_pool = True
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._keep_pool = False
+        self.close()
+
+    def _get_pool(self) -> EvaluationPool:
+        """
+        Returns the pool of workers, which is started, or restarted if the
+        configuration of the evaluator changed since it was started.
+        """
+        config = (
+            self.quantiles,
+            self.seasonality,
+            self.alpha,
+            self.calculate_owa,
+            self.calculate_crps,
+        )
+        if self._pool is not None and (
+            self._pool.config != config
+            or self._pool.num_workers != self.num_workers
+        ):
+            self.close()
+        if self._pool is None:
+            self._pool = EvaluationPool(self, config, self.num_workers)
+        return self._pool
+
+    def close(self) -> None:
+        """
+        Shuts down the worker processes, if any; the next call starts new
+        ones.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
 
     def __call__(
         self,
-        ts_iterator: Iterable[Union[pd.DataFrame, pd.Series]],
-        fcst_iterator: Iterable[Forecast],
+        ts_iterator: Union[
+            Iterable[Union[pd.DataFrame, pd.Series, TargetSeries]],
+            EvaluationContext,
+        ],
+        fcst_iterator: Iterable[Union[Forecast, ForecastBatch]],
         num_series: Optional[int] = None,
     ) -> Tuple[Dict[str, float], pd.DataFrame]:
         """
@@ -111,9 +304,17 @@ class Evaluator:
         Parameters
         ----------
         ts_iterator
-            iterator containing true target on the predicted range
+            iterator containing true target on the predicted range, as pandas
+            objects or as `TargetSeries`, which are aligned with the
+            forecasts by integer offsets without creating an index, or an
+            `EvaluationContext` of the test dataset created with
+            `create_context`, in which case only the forecast-dependent
+            terms of the metrics are computed
         fcst_iterator
-            iterator of forecasts on the predicted range
+            iterator of forecasts on the predicted range; batches of forecasts
+            (as returned by `GluonPredictor.predict_batches`) are evaluated
+            like their individual forecasts, but their quantiles are computed
+            for the whole batch at once
         num_series
             number of series of the iterator
             (optional, only used for displaying progress)
@@ -125,49 +326,666 @@ class Evaluator:
         pd.DataFrame
             DataFrame containing per-time-series metrics
         """
-        ts_iterator = iter(ts_iterator)
         fcst_iterator = iter(fcst_iterator)
 
-        rows = []
+        context = None
+        if isinstance(ts_iterator, EvaluationContext):
+            context = ts_iterator
+            context.check_evaluator(self.seasonality, self.calculate_owa)
+            # the targets are looked up in the context by position
+            ts_iterator = range(len(context))
+
+        if self._overrides_aggregate_metrics():
+            assert self.item_metrics == "keep", (
+                "An overridden `get_aggregate_metrics` needs "
+                '`item_metrics="keep"`'
+            )
+        # the kept table is aggregated by `get_aggregate_metrics`, otherwise
+        # the aggregates are accumulated block by block
+        accumulator = (
+            MetricAccumulator(self.agg_funs())
+            if self.item_metrics != "keep"
+            else None
+        )
+        sink = self._item_metrics_sink()
+        num_evaluated = 0
 
         with tqdm(
-            zip(ts_iterator, fcst_iterator),
-            total=num_series,
-            desc="Running evaluation",
-        ) as it, np.errstate(invalid="ignore"):
-            if self.num_workers > 0 and not sys.platform == "win32":
-                mp_pool = multiprocessing.Pool(
-                    initializer=_worker_init(self), processes=self.num_workers
+            ts_iterator, total=num_series, desc="Running evaluation"
+        ) as ts_iterator, np.errstate(invalid="ignore", divide="ignore"):
+            ts_iterator = iter(ts_iterator)
+            blocks = _evaluation_blocks(
+                ts_iterator, fcst_iterator, self.chunk_size
+            )
+            if self._overrides_metrics_per_ts():
+                # subclasses which customise the metrics of a single time
+                # series are evaluated series by series
+                assert context is None, (
+                    "An evaluation context cannot be used with an overridden "
+                    "`get_metrics_per_ts`"
                 )
-                rows = mp_pool.map(
-                    func=_worker_fun,
-                    iterable=iter(it),
-                    chunksize=self.chunk_size,
+                metrics_blocks = (
+                    self._get_metrics_per_ts_block(block_ts, block_fcst)
+                    for block_ts, block_fcst in blocks
                 )
-                mp_pool.close()
-                mp_pool.join()
+            elif self.num_workers > 0 and not sys.platform == "win32":
+                metrics_blocks = self._get_pool().map(self, blocks, context)
             else:
-                for ts, forecast in it:
-                    rows.append(self.get_metrics_per_ts(ts, forecast))
+                metrics_blocks = (
+                    self.get_metrics_per_block(block_ts, block_fcst, context)
+                    for block_ts, block_fcst in blocks
+                )
 
-        assert not any(
-            True for _ in ts_iterator
-        ), "ts_iterator has more elements than fcst_iterator"
+            try:
+                for metrics in metrics_blocks:
+                    if accumulator is not None:
+                        accumulator.update(metrics)
+                    sink.add(metrics)
+                    num_evaluated += len(metrics["item_id"])
+            finally:
+                if not self._keep_pool:
+                    self.close()
 
-        assert not any(
-            True for _ in fcst_iterator
-        ), "fcst_iterator has more elements than ts_iterator"
+            assert not any(
+                True for _ in ts_iterator
+            ), "ts_iterator has more elements than fcst_iterator"
 
         if num_series is not None:
             assert (
-                len(rows) == num_series
-            ), f"num_series={num_series} did not match number of elements={len(rows)}"
+                num_evaluated == num_series
+            ), f"num_series={num_series} did not match number of elements={num_evaluated}"
+
+        if accumulator is None:
+            return self.get_aggregate_metrics(sink.result())
+        return self._derived_metrics(accumulator.totals()), sink.result()
+
+    def create_context(
+        self,
+        ts_iterator: Iterable[Union[pd.DataFrame, pd.Series, TargetSeries]],
+        prediction_length: int,
+        num_series: Optional[int] = None,
+    ) -> EvaluationContext:
+        """
+        Computes the forecast-independent terms of the metrics of a test
+        dataset once, to evaluate forecasts of several predictors with them.
+
+        Parameters
+        ----------
+        ts_iterator
+            iterator of the targets, whose last `prediction_length` values
+            are the prediction ranges, as in `make_evaluation_predictions`
+        prediction_length
+            length of the prediction ranges
+        num_series
+            number of series of the iterator
+            (optional, only used for displaying progress)
+
+        Returns
+        -------
+        EvaluationContext
+            The context, to be passed in place of the targets to this or any
+            evaluator with the same seasonality.
+        """
+        target_terms: List[Dict[str, np.ndarray]] = []
+        start_dates: List[str] = []
+        freqs: List[str] = []
+
+        with tqdm(
+            ts_iterator, total=num_series, desc="Creating evaluation context"
+        ) as ts_iterator, np.errstate(invalid="ignore", divide="ignore"):
+            ts_iterator = iter(ts_iterator)
+            while True:
+                block = list(islice(ts_iterator, self.chunk_size))
+                if not block:
+                    break
+                target = np.empty((len(block), prediction_length))
+                past_data, block_freqs = [], []
+                for i, ts in enumerate(block):
+                    assert len(ts) >= prediction_length, (
+                        f"Time series of length {len(ts)} is shorter than "
+                        f"the prediction length {prediction_length}"
+                    )
+                    values = np.atleast_1d(
+                        np.squeeze(
+                            np.asarray(ts, dtype=np.float64).transpose()
+                        )
+                    )
+                    offset = len(values) - prediction_length
+                    target[i] = values[offset:]
+                    past_data.append(values[:offset])
+                    if isinstance(ts, TargetSeries):
+                        block_freqs.append(ts.freq)
+                        start_dates.append(str(ts.timestamp(offset)))
+                    else:
+                        block_freqs.append(ts.index.freqstr)
+                        start_dates.append(str(ts.index[offset]))
+                target_terms.append(
+                    dict(
+                        self.target_terms(target, past_data, block_freqs),
+                        target=target,
+                    )
+                )
+                freqs.extend(block_freqs)
+
+        assert target_terms, "ts_iterator is empty"
+        arrays = {
+            name: np.concatenate([terms[name] for terms in target_terms])
+            for name in target_terms[0]
+        }
+        arrays["start_date"] = np.array(start_dates, dtype=str)
+        arrays["freq"] = np.array(freqs, dtype=str)
+        return EvaluationContext(arrays, prediction_length, self.seasonality)
+
+    def _item_metrics_sink(self) -> ItemMetricsSink:
+        if self.item_metrics == "discard":
+            return DiscardItemMetrics()
+        if self.item_metrics == "sample":
+            return SampleItemMetrics(self.item_metrics_sample_size)
+        if self.item_metrics == "spill":
+            return SpillItemMetrics(self.item_metrics_path)
+        return KeepItemMetrics()
+
+    def _align_target(
+        self,
+        time_series: Union[pd.Series, pd.DataFrame, TargetSeries],
+        start_date: pd.Timestamp,
+        freq: str,
+        prediction_length: int,
+    ) -> Tuple[np.ndarray, int]:
+        """
+        Locates the prediction range in the target by an integer offset.
+
+        Returns
+        -------
+        Tuple
+            The target values as float array and the position of the
+            forecast start date in it, such that the prediction target is
+            ``values[offset:offset + prediction_length]`` and the past data
+            ``values[:offset]``.
+        """
+        if isinstance(time_series, TargetSeries):
+            offset = time_series.position(start_date)
+            assert (
+                offset is not None
+                and 0 <= offset
+                and offset + prediction_length <= len(time_series)
+            ), (
+                "Cannot extract prediction target since the index of forecast is outside the index of target\n"
+                f"Forecast start: {start_date}\n Target start: {time_series.start}, length: {len(time_series)}"
+            )
+            values = np.asarray(time_series, dtype=np.float64)
+            return np.atleast_1d(np.squeeze(values.transpose())), offset
+
+        index = time_series.index
+        try:
+            offset = index.get_loc(start_date)
+        except KeyError:
+            offset = None
+        end = offset + prediction_length - 1 if offset is not None else -1
+        assert (
+            isinstance(offset, int)
+            and end < len(index)
+            and index[end]
+            == _forecast_end(start_date, freq, prediction_length)
+        ), (
+            "Cannot extract prediction target since the index of forecast is outside the index of target\n"
+            f"Forecast start: {start_date}\n Index of target: {index}"
+        )
+        values = np.asarray(time_series, dtype=np.float64)
+        return np.atleast_1d(np.squeeze(values.transpose())), offset
+
+    def _seasonal_errors(
+        self, past_data: List[np.ndarray], freqs: List[str]
+    ) -> np.ndarray:
+        """
+        Same as `seasonal_error` for a list of past data arrays at once; time
+        series with the same length and seasonality are computed together.
+        """
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for i, (past, freq) in enumerate(zip(past_data, freqs)):
+            seasonality = (
+                self.seasonality if self.seasonality else get_seasonality(freq)
+            )
+            # edge case: the seasonal freq is larger than the length of ts,
+            # revert to freq=1
+            if seasonality >= len(past):
+                seasonality = 1
+            groups.setdefault((len(past), seasonality), []).append(i)
+
+        seasonal_error = np.empty(len(past_data))
+        for (_, seasonality), indices in groups.items():
+            past = np.stack([past_data[i] for i in indices])
+            y_t = past[:, :-seasonality]
+            y_tm = past[:, seasonality:]
+            seasonal_error[indices] = _masked_mean(
+                np.abs(y_t - y_tm), np.isfinite(y_t) & np.isfinite(y_tm)
+            )
+        return seasonal_error
+
+    def target_terms(
+        self,
+        target: np.ndarray,
+        past_data: List[np.ndarray],
+        freqs: List[str],
+    ) -> Dict[str, np.ndarray]:
+        """
+        Computes the terms of the metrics which do not depend on the
+        forecasts, which `create_context` stores to reuse them.
+        """
+        valid = np.isfinite(target)
+        abs_target = np.abs(target)
+        terms = {
+            "seasonal_error": self._seasonal_errors(past_data, freqs),
+            "abs_target_sum": _masked_sum(abs_target, valid),
+            "abs_target_mean": _masked_mean(abs_target, valid),
+        }
+        if self.calculate_owa:
+            terms["naive_2"] = self._naive_2_forecasts(
+                past_data, freqs, target.shape[1]
+            )
+        return terms
+
+    def get_metrics_per_block(
+        self,
+        time_series: List[Union[pd.Series, pd.DataFrame]],
+        forecasts: List[Union[Forecast, ForecastBatch]],
+        context: Optional[EvaluationContext] = None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Computes the same metrics as `get_metrics_per_ts` for several time
+        series at once, with a single vectorised computation over the
+        (num_series, prediction_length) block of their prediction targets.
 
-        # If all entries of a target array are NaNs, the resulting metric will have value "masked". Pandas does not
-        # handle masked values correctly. Thus we set dtype=np.float64 to convert masked values back to NaNs which
-        # are handled correctly by pandas Dataframes during aggregation.
+        Parameters
+        ----------
+        time_series
+            Targets of the time series.
+        forecasts
+            Forecasts or batches of forecasts for the time series, in the same
+            order, which all have the same prediction length.
+        context
+            Evaluation context of the test dataset, if `time_series` are
+            positions in it rather than the targets themselves.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            Columns of metrics, in the same order as in `get_metrics_per_ts`,
+            with one entry per time series.
+        """
+        return self.get_metrics_from_arrays(
+            *self.prepare_block(time_series, forecasts, context=context)
+        )
+
+    def _overrides_metrics_per_ts(self) -> bool:
+        return (
+            type(self).get_metrics_per_ts is not Evaluator.get_metrics_per_ts
+        )
+
+    def _overrides_aggregate_metrics(self) -> bool:
+        return (
+            type(self).get_aggregate_metrics
+            is not Evaluator.get_aggregate_metrics
+        )
+
+    def _get_metrics_per_ts_block(
+        self,
+        time_series: List[Union[pd.Series, pd.DataFrame, TargetSeries]],
+        forecasts: List[Union[Forecast, ForecastBatch]],
+    ) -> Dict[str, np.ndarray]:
+        """
+        Computes the metrics of a block with `get_metrics_per_ts`, one time
+        series at a time, in the columns returned by `get_metrics_per_block`.
+        """
+        single_forecasts = chain.from_iterable(
+            forecast if isinstance(forecast, ForecastBatch) else [forecast]
+            for forecast in forecasts
+        )
+        rows = [
+            self.get_metrics_per_ts(
+                ts.to_pandas() if isinstance(ts, TargetSeries) else ts,
+                forecast,
+            )
+            for ts, forecast in zip(time_series, single_forecasts)
+        ]
+        # masked values and None are converted to NaN
         metrics_per_ts = pd.DataFrame(rows, dtype=np.float64)
-        return self.get_aggregate_metrics(metrics_per_ts)
+        return {
+            name: metrics_per_ts[name].values
+            for name in metrics_per_ts.columns
+        }
+
+    def _levels(self) -> List[float]:
+        # all quantiles required by the metrics are computed at once
+        lower_q, upper_q = self.alpha / 2, 1.0 - self.alpha / 2
+        return [0.5, lower_q, upper_q] + [
+            quantile.value for quantile in self.quantiles
+        ]
+
+    def prepare_block(
+        self,
+        time_series: List[Union[pd.Series, pd.DataFrame]],
+        forecasts: List[Union[Forecast, ForecastBatch]],
+        keep_samples: bool = False,
+        context: Optional[EvaluationContext] = None,
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, list]]:
+        """
+        Converts a block of targets and forecasts into the plain arrays from
+        which `get_metrics_from_arrays` computes the metrics.
+
+        Parameters
+        ----------
+        time_series
+            Targets of the time series.
+        forecasts
+            Forecasts or batches of forecasts for the time series, in the same
+            order, which all have the same prediction length.
+        keep_samples
+            If all forecasts are sample forecasts with the same number of
+            samples, pass the stacked samples instead of their quantiles and
+            mean, e.g. to compute these in a worker process.
+        context
+            Evaluation context of the test dataset, if `time_series` are
+            positions in it rather than the targets themselves.
+
+        Returns
+        -------
+        Tuple
+            Arrays "target" of shape (num_series, prediction_length), the
+            concatenated "past_data" and its "past_lengths" (or, with a
+            context, the precomputed arrays of the context), and either
+            "samples" of shape (num_series, num_samples, prediction_length) or
+            "quantiles" of shape (num_series, num_levels, prediction_length)
+            and "mean" of shape (num_series, prediction_length); and the
+            "item_id" and "freq" of every time series.
+        """
+        prediction_length = forecasts[0].prediction_length
+        arrays: Dict[str, np.ndarray] = {}
+
+        start_dates, item_ids, freqs = [], [], []
+        for forecast in forecasts:
+            assert forecast.prediction_length == prediction_length
+            dates, ids = _forecast_parts(forecast)
+            start_dates.extend(dates)
+            item_ids.extend(ids)
+            freqs.extend([forecast.freq] * len(dates))
+        assert len(time_series) == len(start_dates)
+
+        samples = [
+            forecast.samples
+            if isinstance(forecast, SampleForecastBatch)
+            else forecast.samples[None]
+            for forecast in forecasts
+            if isinstance(forecast, (SampleForecast, SampleForecastBatch))
+        ]
+        if (
+            keep_samples
+            and len(samples) == len(forecasts)
+            and len({part.shape[1:] for part in samples}) == 1
+            and samples[0].ndim == 3
+        ):
+            arrays["samples"] = np.concatenate(samples)
+        else:
+            quantiles, means = [], []
+            for forecast in forecasts:
+                batch = isinstance(forecast, ForecastBatch)
+                fcst_quantiles = forecast.quantiles(self._levels())
+                quantiles.append(
+                    fcst_quantiles if batch else fcst_quantiles[None]
+                )
+                try:
+                    mean_fcst = forecast.mean
+                    means.append(mean_fcst if batch else mean_fcst[None])
+                except:
+                    means.append(
+                        np.full(
+                            (len(forecast) if batch else 1, prediction_length),
+                            np.nan,
+                        )
+                    )
+            arrays["quantiles"] = np.concatenate(quantiles)
+            arrays["mean"] = np.concatenate(means)
+
+        if context is not None:
+            arrays.update(
+                context.take(
+                    np.asarray(time_series, dtype=int),
+                    start_dates,
+                    prediction_length,
+                )
+            )
+        else:
+            target = np.empty((len(time_series), prediction_length))
+            past_data = []
+            for i, (ts, start_date, freq) in enumerate(
+                zip(time_series, start_dates, freqs)
+            ):
+                values, offset = self._align_target(
+                    ts, start_date, freq, prediction_length
+                )
+                target[i] = values[offset : offset + prediction_length]
+                past_data.append(values[:offset])
+
+            arrays["target"] = target
+            arrays["past_data"] = np.concatenate(past_data + [np.zeros(0)])
+            arrays["past_lengths"] = np.array(
+                [len(past) for past in past_data], dtype=int
+            )
+
+        if self.calculate_crps and "samples" not in arrays:
+            # the CRPS is computed here from the sorted samples, which the
+            # forecasts may have cached, rather than passing on the samples
+            crps, row = [], 0
+            for forecast in forecasts:
+                num_items = (
+                    len(forecast) if isinstance(forecast, ForecastBatch) else 1
+                )
+                target = arrays["target"][row : row + num_items]
+                row += num_items
+                if isinstance(forecast, SampleForecastBatch):
+                    crps.append(
+                        self._block_crps(forecast.sorted_samples, target)
+                    )
+                elif isinstance(forecast, SampleForecast):
+                    crps.append(
+                        self._block_crps(forecast.sorted_samples[None], target)
+                    )
+                else:
+                    crps.append(np.full(target.shape, np.nan))
+            arrays["crps"] = np.concatenate(crps)
+        return arrays, {"item_id": item_ids, "freq": freqs}
+
+    def get_metrics_from_arrays(
+        self, arrays: Dict[str, np.ndarray], meta: Dict[str, list]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Computes the metrics of a block prepared with `prepare_block`; the
+        forecast-independent terms are only computed if they are not given.
+        """
+        pred_target = arrays["target"]
+        if "samples" in arrays:
+            fcst_quantiles = sample_quantiles(
+                arrays["samples"], self._levels(), axis=1
+            )
+            mean_fcst = np.mean(arrays["samples"], axis=1)
+        else:
+            fcst_quantiles, mean_fcst = arrays["quantiles"], arrays["mean"]
+        fcst_quantiles = fcst_quantiles.swapaxes(0, 1)
+        median_fcst, lower_fcst, upper_fcst = fcst_quantiles[:3]
+
+        num_series = len(pred_target)
+        valid = np.isfinite(pred_target)
+        abs_error = np.abs(pred_target - median_fcst)
+
+        if "seasonal_error" in arrays:
+            target_terms = arrays
+        else:
+            target_terms = self.target_terms(
+                pred_target,
+                np.split(
+                    arrays["past_data"],
+                    np.cumsum(arrays["past_lengths"])[:-1],
+                ),
+                meta["freq"],
+            )
+        seasonal_error = target_terms["seasonal_error"]
+
+        metrics = {
+            "item_id": np.array(meta["item_id"], dtype=object),
+            "MSE": _masked_mean(np.square(pred_target - mean_fcst), valid),
+            "abs_error": _masked_sum(abs_error, valid),
+            "abs_target_sum": target_terms["abs_target_sum"],
+            "abs_target_mean": target_terms["abs_target_mean"],
+            "seasonal_error": seasonal_error,
+            "MASE": self._block_mase(abs_error, valid, seasonal_error),
+            "MAPE": self._block_mape(pred_target, median_fcst, valid),
+            "sMAPE": self._block_smape(pred_target, median_fcst, valid),
+            "OWA": np.full(num_series, np.nan),
+        }
+
+        try:
+            metrics["MSIS"] = self._block_msis(
+                pred_target,
+                lower_fcst,
+                upper_fcst,
+                valid,
+                seasonal_error,
+                self.alpha,
+            )
+        except Exception:
+            logging.warning("Could not calculate MSIS metric.")
+            metrics["MSIS"] = np.full(num_series, np.nan)
+
+        if self.calculate_owa:
+            metrics["OWA"] = self._block_owa(
+                pred_target,
+                median_fcst,
+                valid,
+                target_terms["naive_2"],
+                seasonal_error,
+            )
+
+        for quantile, forecast_quantile in zip(
+            self.quantiles, fcst_quantiles[3:]
+        ):
+            metrics[quantile.loss_name] = 2.0 * _masked_sum(
+                np.abs(
+                    (forecast_quantile - pred_target)
+                    * ((pred_target <= forecast_quantile) - quantile.value)
+                ),
+                valid,
+            )
+            metrics[quantile.coverage_name] = _masked_mean(
+                pred_target < forecast_quantile, valid
+            )
+
+        if self.calculate_crps:
+            crps = (
+                arrays["crps"]
+                if "crps" in arrays
+                else self._block_crps(
+                    np.sort(arrays["samples"], axis=1), pred_target
+                )
+            )
+            metrics["CRPS"] = _masked_sum(crps, valid)
+
+        return metrics
+
+    @staticmethod
+    def _block_crps(sorted_samples, target):
+        # CRPS = E|X - y| - E|X - X'| / 2, where E|X - X'| is the mean over
+        # all m^2 pairs of samples, including the diagonal, as in
+        # `MultivariateEvaluator.energy_score`; for sorted samples
+        # x_1 <= ... <= x_m the second term is sum_i (2i - m - 1) x_i / m^2
+        num_samples = sorted_samples.shape[1]
+        weights = 2.0 * np.arange(1, num_samples + 1) - num_samples - 1
+        spread = np.einsum("i,bit->bt", weights, sorted_samples)
+        return (
+            np.mean(np.abs(sorted_samples - target[:, None]), axis=1)
+            - spread / num_samples ** 2
+        )
+
+    @staticmethod
+    def _block_mase(abs_error, valid, seasonal_error):
+        flag = seasonal_error == 0
+        return (_masked_mean(abs_error, valid) * (1 - flag)) / (
+            seasonal_error + flag
+        )
+
+    @staticmethod
+    def _block_mape(target, forecast, valid):
+        denominator = np.abs(target)
+        flag = denominator == 0
+        return _masked_mean(
+            (np.abs(target - forecast) * (1 - flag)) / (denominator + flag),
+            valid,
+        )
+
+    @staticmethod
+    def _block_smape(target, forecast, valid):
+        denominator = np.abs(target) + np.abs(forecast)
+        flag = denominator == 0
+        return 2 * _masked_mean(
+            (np.abs(target - forecast) * (1 - flag)) / (denominator + flag),
+            valid,
+        )
+
+    @staticmethod
+    def _block_msis(
+        target, lower_quantile, upper_quantile, valid, seasonal_error, alpha
+    ):
+        numerator = _masked_mean(
+            upper_quantile
+            - lower_quantile
+            + 2.0
+            / alpha
+            * (lower_quantile - target)
+            * (target < lower_quantile)
+            + 2.0
+            / alpha
+            * (target - upper_quantile)
+            * (target > upper_quantile),
+            valid,
+        )
+        flag = seasonal_error == 0
+        return (numerator * (1 - flag)) / (seasonal_error + flag)
+
+    @staticmethod
+    def _naive_2_forecasts(
+        past_data: List[np.ndarray], freqs: List[str], prediction_length: int
+    ) -> np.ndarray:
+        # avoid import error due to circular dependency
+        from gluonts.model.naive_2 import naive_2
+
+        # calculate the forecast of the seasonal naive predictor, for time
+        # series with past data of the same length at once
+        naive_median_fcst = np.empty((len(past_data), prediction_length))
+        groups: Dict[Tuple[int, str], List[int]] = {}
+        for i, (past, freq) in enumerate(zip(past_data, freqs)):
+            groups.setdefault((len(past), freq), []).append(i)
+        for (_, freq), indices in groups.items():
+            naive_median_fcst[indices] = naive_2(
+                np.stack([past_data[i] for i in indices]),
+                prediction_length,
+                freq=freq,
+            )
+        return naive_median_fcst
+
+    def _block_owa(
+        self, target, forecast, valid, naive_median_fcst, seasonal_error
+    ):
+        abs_error = np.abs(target - forecast)
+        naive_abs_error = np.abs(target - naive_median_fcst)
+        return 0.5 * (
+            (
+                self._block_smape(target, forecast, valid)
+                / self._block_smape(target, naive_median_fcst, valid)
+            )
+            + (
+                self._block_mase(abs_error, valid, seasonal_error)
+                / self._block_mase(naive_abs_error, valid, seasonal_error)
+            )
+        )
 
     @staticmethod
     def extract_pred_target(
@@ -265,6 +1083,12 @@ class Evaluator:
     def get_metrics_per_ts(
         self, time_series: Union[pd.Series, pd.DataFrame], forecast: Forecast
     ) -> Dict[str, Union[float, str, None]]:
+        """
+        Computes the metrics of a single time series. The evaluator computes
+        the same metrics for blocks of time series at once with
+        `get_metrics_per_block`, unless a subclass overrides this method, in
+        which case it is called for every time series instead.
+        """
         pred_target = np.array(self.extract_pred_target(time_series, forecast))
         pred_target = np.ma.masked_invalid(pred_target)
 
@@ -276,7 +1100,14 @@ class Evaluator:
             mean_fcst = forecast.mean
         except:
             mean_fcst = None
-        median_fcst = forecast.quantile(0.5)
+
+        # all quantiles required by the metrics are computed at once
+        lower_q, upper_q = self.alpha / 2, 1.0 - self.alpha / 2
+        fcst_quantiles = forecast.quantiles(
+            [0.5, lower_q, upper_q]
+            + [quantile.value for quantile in self.quantiles]
+        )
+        median_fcst = fcst_quantiles[0]
         seasonal_error = self.seasonal_error(past_data, forecast)
         metrics = {
             "item_id": forecast.item_id,
@@ -296,8 +1127,8 @@ class Evaluator:
         try:
             metrics["MSIS"] = self.msis(
                 pred_target,
-                forecast.quantile(self.alpha / 2),
-                forecast.quantile(1.0 - self.alpha / 2),
+                fcst_quantiles[1],
+                fcst_quantiles[2],
                 seasonal_error,
                 self.alpha,
             )
@@ -314,9 +1145,9 @@ class Evaluator:
                 forecast.start_date,
             )
 
-        for quantile in self.quantiles:
-            forecast_quantile = forecast.quantile(quantile.value)
-
+        for quantile, forecast_quantile in zip(
+            self.quantiles, fcst_quantiles[3:]
+        ):
             metrics[quantile.loss_name] = self.quantile_loss(
                 pred_target, forecast_quantile, quantile.value
             )
@@ -324,11 +1155,19 @@ class Evaluator:
                 pred_target, forecast_quantile
             )
 
+        if self.calculate_crps:
+            metrics["CRPS"] = (
+                self.crps(pred_target, forecast.sorted_samples)
+                if isinstance(forecast, SampleForecast)
+                else np.nan
+            )
+
         return metrics
 
-    def get_aggregate_metrics(
-        self, metric_per_ts: pd.DataFrame
-    ) -> Tuple[Dict[str, float], pd.DataFrame]:
+    def agg_funs(self) -> Dict[str, str]:
+        """
+        Aggregation function of every aggregated per time series metric.
+        """
         agg_funs = {
             "MSE": "mean",
             "abs_error": "sum",
@@ -344,6 +1183,14 @@ class Evaluator:
         for quantile in self.quantiles:
             agg_funs[quantile.loss_name] = "sum"
             agg_funs[quantile.coverage_name] = "mean"
+        if self.calculate_crps:
+            agg_funs["CRPS"] = "sum"
+        return agg_funs
+
+    def get_aggregate_metrics(
+        self, metric_per_ts: pd.DataFrame
+    ) -> Tuple[Dict[str, float], pd.DataFrame]:
+        agg_funs = self.agg_funs()
 
         assert (
             set(metric_per_ts.columns) >= agg_funs.keys()
@@ -352,28 +1199,39 @@ class Evaluator:
         totals = {
             key: metric_per_ts[key].agg(agg) for key, agg in agg_funs.items()
         }
+        return self._derived_metrics(totals), metric_per_ts
 
-        # derived metrics based on previous aggregate metrics
-        totals["RMSE"] = np.sqrt(totals["MSE"])
-
-        flag = totals["abs_target_mean"] == 0
-        totals["NRMSE"] = np.divide(
-            totals["RMSE"] * (1 - flag), totals["abs_target_mean"] + flag
-        )
+    def _derived_metrics(self, totals: Dict[str, float]) -> Dict[str, float]:
+        """
+        Adds the metrics derived from the aggregated per time series metrics.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            totals["RMSE"] = np.sqrt(totals["MSE"])
 
-        flag = totals["abs_target_sum"] == 0
-        totals["ND"] = np.divide(
-            totals["abs_error"] * (1 - flag), totals["abs_target_sum"] + flag
-        )
+            flag = totals["abs_target_mean"] == 0
+            totals["NRMSE"] = np.divide(
+                totals["RMSE"] * (1 - flag), totals["abs_target_mean"] + flag
+            )
 
-        all_qLoss_names = [
-            quantile.weighted_loss_name for quantile in self.quantiles
-        ]
-        for quantile in self.quantiles:
-            totals[quantile.weighted_loss_name] = np.divide(
-                totals[quantile.loss_name], totals["abs_target_sum"]
+            flag = totals["abs_target_sum"] == 0
+            totals["ND"] = np.divide(
+                totals["abs_error"] * (1 - flag),
+                totals["abs_target_sum"] + flag,
             )
 
+            all_qLoss_names = [
+                quantile.weighted_loss_name for quantile in self.quantiles
+            ]
+            for quantile in self.quantiles:
+                totals[quantile.weighted_loss_name] = np.divide(
+                    totals[quantile.loss_name], totals["abs_target_sum"]
+                )
+
+            if "CRPS" in totals:
+                totals["wCRPS"] = np.divide(
+                    totals["CRPS"], totals["abs_target_sum"]
+                )
+
         totals["mean_wQuantileLoss"] = np.array(
             [totals[ql] for ql in all_qLoss_names]
         ).mean()
@@ -384,7 +1242,7 @@ class Evaluator:
                 for q in self.quantiles
             ]
         )
-        return totals, metric_per_ts
+        return totals
 
     @staticmethod
     def mse(target, forecast):
@@ -407,6 +1265,23 @@ class Evaluator:
     def coverage(target, quantile_forecast):
         return np.mean((target < quantile_forecast))
 
+    @staticmethod
+    def crps(target, sorted_samples):
+        r"""
+        .. math::
+
+            crps = sum(mean(|X - Y|) - mean(|X - X'|) / 2)
+
+        where X, X' are samples of the forecast, computed from the sorted
+        samples.
+        """
+        num_samples = len(sorted_samples)
+        weights = 2.0 * np.arange(1, num_samples + 1) - num_samples - 1
+        return np.sum(
+            np.mean(np.abs(sorted_samples - target), axis=0)
+            - np.dot(weights, sorted_samples) / num_samples ** 2
+        )
+
     @staticmethod
     def mase(target, forecast, seasonal_error):
         r"""
@@ -561,6 +1436,9 @@ class MultivariateEvaluator(Evaluator):
         alpha: float = 0.05,
         eval_dims: List[int] = None,
         target_agg_funcs: Dict[str, Callable] = {},
+        calculate_crps: bool = False,
+        calculate_energy_score: bool = False,
+        energy_score_num_pairs: int = 1000,
     ) -> None:
         """
 
@@ -582,40 +1460,30 @@ class MultivariateEvaluator(Evaluator):
             pass key-value pairs that define aggregation functions over the
             dimension axis. Useful to compute metrics over aggregated target
             and forecast (typically sum or mean).
+        calculate_crps
+            whether to calculate the CRPS of every dimension and aggregate,
+            see `Evaluator`.
+        calculate_energy_score
+            whether to calculate the "energy_score" of the evaluated
+            dimensions, the multivariate generalisation of the CRPS, averaged
+            over the prediction range.
+        energy_score_num_pairs
+            the expected distance between two samples in the energy score is
+            computed from all pairs of distinct samples if there are at most
+            this many,
+            and otherwise estimated from this many random pairs, which bounds
+            its cost.
         """
         super().__init__(
-            quantiles=quantiles, seasonality=seasonality, alpha=alpha
+            quantiles=quantiles,
+            seasonality=seasonality,
+            alpha=alpha,
+            calculate_crps=calculate_crps,
         )
         self._eval_dims = eval_dims
         self.target_agg_funcs = target_agg_funcs
-
-    @staticmethod
-    def extract_target_by_dim(
-        it_iterator: Iterator[pd.DataFrame], dim: int
-    ) -> Iterator[pd.DataFrame]:
-        for i in it_iterator:
-            yield (i[dim])
-
-    @staticmethod
-    def extract_forecast_by_dim(
-        forecast_iterator: Iterator[Forecast], dim: int
-    ) -> Iterator[Forecast]:
-        for forecast in forecast_iterator:
-            yield forecast.copy_dim(dim)
-
-    @staticmethod
-    def extract_aggregate_target(
-        it_iterator: Iterator[pd.DataFrame], agg_fun: Callable
-    ) -> Iterator[pd.DataFrame]:
-        for i in it_iterator:
-            yield i.agg(agg_fun, axis=1)
-
-    @staticmethod
-    def extract_aggregate_forecast(
-        forecast_iterator: Iterator[Forecast], agg_fun: Callable
-    ) -> Iterator[Forecast]:
-        for forecast in forecast_iterator:
-            yield forecast.copy_aggregate(agg_fun)
+        self.calculate_energy_score = calculate_energy_score
+        self.energy_score_num_pairs = energy_score_num_pairs
 
     @staticmethod
     def peek(iterator: Iterator[Any]) -> Tuple[Any, Iterator[Any]]:
@@ -645,60 +1513,171 @@ class MultivariateEvaluator(Evaluator):
         )
         return eval_dims
 
-    def calculate_aggregate_multivariate_metrics(
-        self,
-        ts_iterator: Iterator[pd.DataFrame],
-        forecast_iterator: Iterator[Forecast],
-        agg_fun: Callable,
-    ) -> Dict[str, float]:
+    def _sample_pairs(self, num_samples: int) -> Tuple[np.ndarray, np.ndarray]:
         """
-
-        Parameters
-        ----------
-        ts_iterator
-            Iterator over time series
-        forecast_iterator
-            Iterator over forecasts
-        agg_fun
-            aggregation function
-        Returns
-        -------
-        Dict[str, float]
-            dictionary with aggregate datasets metrics
+        Indices of the pairs of distinct samples over which the energy score
+        averages the distance between two samples.
         """
-        agg_metrics, _ = super(MultivariateEvaluator, self).__call__(
-            self.extract_aggregate_target(ts_iterator, agg_fun),
-            self.extract_aggregate_forecast(forecast_iterator, agg_fun),
+        if num_samples * (num_samples - 1) // 2 <= self.energy_score_num_pairs:
+            return np.triu_indices(num_samples, 1)
+        random_state = np.random.RandomState(num_samples)
+        first = random_state.randint(
+            num_samples, size=self.energy_score_num_pairs
         )
-        return agg_metrics
+        second = (
+            first
+            + random_state.randint(
+                1, num_samples, size=self.energy_score_num_pairs
+            )
+        ) % num_samples
+        return first, second
 
-    def calculate_aggregate_vector_metrics(
-        self,
-        all_agg_metrics: Dict[str, float],
-        all_metrics_per_ts: pd.DataFrame,
-    ) -> Dict[str, float]:
-        """
+    def energy_score(self, target: np.ndarray, samples: np.ndarray) -> float:
+        r"""
+        .. math::
+
+            energy\_score = mean(mean(||X - Y||) - mean(||X - X'||) / 2)
+
+        over the time points of the prediction range without missing values,
+        where X, X' are samples of shape (target_dim,) of the forecast.
+
+        Like for the CRPS, mean(||X - X'||) is taken over all num_samples ** 2
+        pairs of samples, including the zero distance of every sample to
+        itself, so that the energy score of a one-dimensional target is its
+        CRPS averaged over the prediction range. If there are more than
+        `energy_score_num_pairs` pairs, the mean over distinct pairs is
+        estimated from random pairs and scaled by (num_samples - 1) /
+        num_samples accordingly.
 
         Parameters
         ----------
-        all_agg_metrics
-            dictionary with aggregate metrics of individual dimensions
-        all_metrics_per_ts
-            DataFrame containing metrics for all time series of all evaluated
-            dimensions
-
-        Returns
-        -------
-        Dict[str, float]
-            dictionary with aggregate metrics (of individual (evaluated)
-            dimensions and the entire vector)
+        target
+            array of shape (prediction_length, target_dim)
+        samples
+            array of shape (num_samples, prediction_length, target_dim)
         """
-        vector_aggregate_metrics, _ = self.get_aggregate_metrics(
-            all_metrics_per_ts
+        observed = np.isfinite(target).all(axis=1)
+        if not observed.any():
+            return np.nan
+        target, samples = target[observed], samples[:, observed]
+
+        distance = np.mean(np.linalg.norm(samples - target, axis=2), axis=0)
+
+        # the pairs are processed in chunks of about a million values
+        first, second = self._sample_pairs(len(samples))
+        chunk_size = max(1, 2 ** 20 // samples[0].size)
+        spread = np.zeros(len(target))
+        for start in range(0, len(first), chunk_size):
+            pairs = slice(start, start + chunk_size)
+            spread += np.linalg.norm(
+                samples[first[pairs]] - samples[second[pairs]], axis=2
+            ).sum(axis=0)
+        # the mean over distinct pairs, including the diagonal
+        spread *= (len(samples) - 1) / (len(samples) * len(first))
+
+        return np.mean(distance - 0.5 * spread)
+
+    def prepare_multivariate_block(
+        self,
+        time_series: List[pd.DataFrame],
+        forecasts: List[Forecast],
+        eval_dims: List[int],
+    ) -> Tuple[Dict[str, np.ndarray], Dict[str, list]]:
+        """
+        Converts a block of multivariate targets and sample forecasts into
+        the arrays of `prepare_block`, with one row for every evaluated
+        dimension and every aggregation function in `target_agg_funcs` of
+        every time series: the rows of the i-th time series are at positions
+        ``i + k * len(time_series)`` for the k-th of these.
+
+        The quantiles and means of all dimensions and aggregates of a
+        forecast are computed at once from its samples of shape
+        (num_samples, prediction_length, target_dim), as are the "crps" of
+        every row and the "energy_score" of every time series, if enabled.
+        """
+        prediction_length = forecasts[0].prediction_length
+        agg_funs = list(self.target_agg_funcs.values())
+        num_groups = len(eval_dims) + len(agg_funs)
+        num_series = len(time_series)
+        assert len(forecasts) == num_series
+
+        target = np.empty((num_groups, num_series, prediction_length))
+        quantiles = np.empty(
+            (num_groups, num_series, len(self._levels()), prediction_length)
         )
-        for key, value in vector_aggregate_metrics.items():
-            all_agg_metrics[key] = value
-        return all_agg_metrics
+        mean = np.empty((num_groups, num_series, prediction_length))
+        crps = np.empty((num_groups, num_series, prediction_length))
+        energy_score = np.empty(num_series)
+        past_data: List[List[np.ndarray]] = [[] for _ in range(num_groups)]
+
+        for i, (ts, forecast) in enumerate(zip(time_series, forecasts)):
+            assert isinstance(forecast, SampleForecast) and (
+                forecast.samples.ndim == 3
+            ), "Only multivariate sample forecasts can be evaluated"
+            assert forecast.prediction_length == prediction_length
+
+            values, offset = self._align_target(
+                ts, forecast.start_date, forecast.freq, prediction_length
+            )
+            frame = ts.to_pandas() if isinstance(ts, TargetSeries) else ts
+            rows = [values[dim] for dim in eval_dims] + [
+                np.asarray(frame.agg(agg_fun, axis=1), dtype=np.float64)
+                for agg_fun in agg_funs
+            ]
+            for k, row in enumerate(rows):
+                target[k, i] = row[offset : offset + prediction_length]
+                past_data[k].append(row[:offset])
+
+            # samples of all dimensions and aggregates, with shape
+            # (num_groups, num_samples, prediction_length)
+            samples = np.concatenate(
+                [np.moveaxis(forecast.samples[:, :, eval_dims], 2, 0)]
+                + [
+                    agg_fun(forecast.samples, axis=2)[None]
+                    for agg_fun in agg_funs
+                ]
+            )
+            quantiles[:, i] = sample_quantiles(samples, self._levels(), axis=1)
+            mean[:, i] = np.mean(samples, axis=1)
+
+            if self.calculate_crps:
+                sorted_samples = np.concatenate(
+                    [
+                        np.moveaxis(
+                            forecast.sorted_samples[:, :, eval_dims], 2, 0
+                        )
+                    ]
+                    + [np.sort(samples[len(eval_dims) :], axis=1)]
+                )
+                crps[:, i] = self._block_crps(sorted_samples, target[:, i])
+            if self.calculate_energy_score:
+                energy_score[i] = self.energy_score(
+                    target[: len(eval_dims), i].T,
+                    forecast.samples[:, :, eval_dims],
+                )
+
+        past_data_rows = list(chain.from_iterable(past_data))
+        arrays = {
+            "target": target.reshape(-1, prediction_length),
+            "quantiles": quantiles.reshape(
+                -1, len(self._levels()), prediction_length
+            ),
+            "mean": mean.reshape(-1, prediction_length),
+            "past_data": np.concatenate(past_data_rows + [np.zeros(0)]),
+            "past_lengths": np.array(
+                [len(past) for past in past_data_rows], dtype=int
+            ),
+        }
+        if self.calculate_crps:
+            arrays["crps"] = crps.reshape(-1, prediction_length)
+        if self.calculate_energy_score:
+            arrays["energy_score"] = energy_score
+        meta = {
+            "item_id": [forecast.item_id for forecast in forecasts]
+            * num_groups,
+            "freq": [forecast.freq for forecast in forecasts] * num_groups,
+        }
+        return arrays, meta
 
     def __call__(
         self,
@@ -706,74 +1685,76 @@ class MultivariateEvaluator(Evaluator):
         fcst_iterator: Iterable[Forecast],
         num_series=None,
     ) -> Tuple[Dict[str, float], pd.DataFrame]:
-        ts_iterator = iter(ts_iterator)
         fcst_iterator = iter(fcst_iterator)
 
-        all_agg_metrics = dict()
-        all_metrics_per_ts = list()
-
         peeked_forecast, fcst_iterator = self.peek(fcst_iterator)
         target_dimensionality = self.get_target_dimensionality(peeked_forecast)
         eval_dims = self.get_eval_dims(target_dimensionality)
+        num_groups = len(eval_dims) + len(self.target_agg_funcs)
 
-        ts_iterator_set = tee(
-            ts_iterator, target_dimensionality + len(self.target_agg_funcs)
-        )
-        fcst_iterator_set = tee(
-            fcst_iterator, target_dimensionality + len(self.target_agg_funcs)
-        )
+        # every dimension and aggregate is a group of rows of the blocks,
+        # whose metrics are kept to be aggregated by `get_aggregate_metrics`
+        group_metrics: List[List[Dict[str, np.ndarray]]] = [
+            [] for _ in range(num_groups)
+        ]
 
-        for dim in eval_dims:
-            agg_metrics, metrics_per_ts = super(
-                MultivariateEvaluator, self
-            ).__call__(
-                self.extract_target_by_dim(ts_iterator_set[dim], dim),
-                self.extract_forecast_by_dim(fcst_iterator_set[dim], dim),
+        # all dimensions and aggregates of the time series of a block are
+        # evaluated at once, in blocks of about `chunk_size` rows
+        with tqdm(
+            ts_iterator, total=num_series, desc="Running evaluation"
+        ) as ts_iterator, np.errstate(invalid="ignore", divide="ignore"):
+            ts_iterator = iter(ts_iterator)
+            blocks = _evaluation_blocks(
+                ts_iterator,
+                fcst_iterator,
+                max(1, self.chunk_size // num_groups),
             )
-
-            all_metrics_per_ts.append(metrics_per_ts)
-
+            for block_ts, block_fcst in blocks:
+                arrays, meta = self.prepare_multivariate_block(
+                    block_ts, block_fcst, eval_dims
+                )
+                metrics = self.get_metrics_from_arrays(arrays, meta)
+                n = len(block_ts)
+                if self.calculate_energy_score:
+                    # the energy score of a time series is reported with
+                    # every one of its dimensions
+                    metrics["energy_score"] = np.tile(
+                        arrays["energy_score"], num_groups
+                    )
+                for k in range(num_groups):
+                    group_metrics[k].append(
+                        {
+                            key: value[k * n : (k + 1) * n]
+                            for key, value in metrics.items()
+                        }
+                    )
+
+            assert not any(
+                True for _ in ts_iterator
+            ), "ts_iterator has more elements than fcst_iterator"
+
+        group_frames = [_metrics_frame(group) for group in group_metrics]
+        all_agg_metrics = dict()
+        for dim, metrics_per_ts in zip(eval_dims, group_frames):
+            agg_metrics, _ = self.get_aggregate_metrics(metrics_per_ts)
             for metric, value in agg_metrics.items():
                 all_agg_metrics[f"{dim}_{metric}"] = value
 
-        all_metrics_per_ts = pd.concat(all_metrics_per_ts)
-        all_agg_metrics = self.calculate_aggregate_vector_metrics(
-            all_agg_metrics, all_metrics_per_ts
-        )
-
-        if self.target_agg_funcs:
-            multivariate_metrics = {
-                agg_fun_name: self.calculate_aggregate_multivariate_metrics(
-                    ts_iterator_set[-(index + 1)],
-                    fcst_iterator_set[-(index + 1)],
-                    agg_fun,
-                )
-                for index, (agg_fun_name, agg_fun) in enumerate(
-                    self.target_agg_funcs.items()
-                )
-            }
-
-            for key, metric_dict in multivariate_metrics.items():
-                prefix = f"m_{key}_"
-                for metric, value in metric_dict.items():
-                    all_agg_metrics[prefix + metric] = value
+        # per time series metrics of all dimensions, one after the other
+        all_metrics_per_ts = pd.concat(group_frames[: len(eval_dims)])
+        agg_metrics, _ = self.get_aggregate_metrics(all_metrics_per_ts)
+        all_agg_metrics.update(agg_metrics)
+        if self.calculate_energy_score:
+            all_agg_metrics["energy_score"] = group_frames[0][
+                "energy_score"
+            ].mean()
+
+        for agg_fun_name, metrics_per_ts in zip(
+            self.target_agg_funcs, group_frames[len(eval_dims) :]
+        ):
+            prefix = f"m_{agg_fun_name}_"
+            agg_metrics, _ = self.get_aggregate_metrics(metrics_per_ts)
+            for metric, value in agg_metrics.items():
+                all_agg_metrics[prefix + metric] = value
 
         return all_agg_metrics, all_metrics_per_ts
-
-
-# This is required for the multiprocessing to work.
-_worker_evaluator: Optional[Evaluator] = None
-
-
-def _worker_init(evaluator: Evaluator):
-    global _worker_evaluator
-    _worker_evaluator = evaluator
-
-
-def _worker_fun(inp: tuple):
-    ts, forecast = inp
-    global _worker_evaluator
-    assert isinstance(
-        _worker_evaluator, Evaluator
-    ), "Something went wrong with the worker initialization."
-    return _worker_evaluator.get_metrics_per_ts(ts, forecast)
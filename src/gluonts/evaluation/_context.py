@@ -0,0 +1,136 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+# Arrays which depend on the test dataset only, in the order in which they
+# are indexed by `EvaluationContext.take`
+_TARGET_ARRAYS = (
+    "target",
+    "seasonal_error",
+    "abs_target_sum",
+    "abs_target_mean",
+    "naive_2",
+)
+
+
+class EvaluationContext:
+    """
+    The forecast-independent part of the evaluation on a test dataset: the
+    prediction targets, their seasonal errors, sums and means of absolute
+    values and optionally the forecasts of the Naive2 baseline, for every
+    time series.
+
+    A context is created once with `Evaluator.create_context` and can be
+    saved to disk; passing it to an `Evaluator` in place of the targets
+    evaluates forecasts of other predictors on the same test dataset without
+    recomputing these.
+
+    Parameters
+    ----------
+    arrays
+        The per time series arrays "target", "seasonal_error",
+        "abs_target_sum", "abs_target_mean" and optionally "naive_2", as well
+        as the "start_date" and "freq" of the prediction ranges as strings.
+    prediction_length
+        Length of the prediction ranges.
+    seasonality
+        The seasonality with which the seasonal errors were computed, as
+        passed to the `Evaluator`.
+    """
+
+    def __init__(
+        self,
+        arrays: Dict[str, np.ndarray],
+        prediction_length: int,
+        seasonality: Optional[int] = None,
+    ) -> None:
+        assert arrays["target"].shape[1:] == (prediction_length,)
+        self.arrays = arrays
+        self.prediction_length = prediction_length
+        self.seasonality = seasonality
+
+    def __len__(self) -> int:
+        return len(self.arrays["target"])
+
+    @property
+    def has_naive_2(self) -> bool:
+        return "naive_2" in self.arrays
+
+    def check_evaluator(
+        self, seasonality: Optional[int], calculate_owa: bool
+    ) -> None:
+        assert seasonality == self.seasonality, (
+            f"The context was created with seasonality={self.seasonality}, "
+            f"but the evaluator uses seasonality={seasonality}"
+        )
+        assert (
+            not calculate_owa or self.has_naive_2
+        ), "The context was created without the Naive2 forecasts for OWA"
+
+    def take(
+        self,
+        rows: np.ndarray,
+        start_dates: List[pd.Timestamp],
+        prediction_length: int,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Returns the arrays of the given time series, after checking that the
+        forecasts evaluated against them cover their prediction ranges.
+        """
+        assert prediction_length == self.prediction_length, (
+            f"Forecasts of length {prediction_length} cannot be evaluated "
+            f"with a context of prediction length {self.prediction_length}"
+        )
+        assert len(rows) == 0 or rows[-1] < len(
+            self
+        ), "fcst_iterator has more elements than the evaluation context"
+        expected = self.arrays["start_date"][rows]
+        actual = np.array([str(date) for date in start_dates])
+        assert np.array_equal(expected, actual), (
+            "Forecasts do not start at the prediction ranges of the context\n"
+            f"Forecast starts: {actual}\nExpected: {expected}"
+        )
+        return {
+            name: self.arrays[name][rows]
+            for name in _TARGET_ARRAYS
+            if name in self.arrays
+        }
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Writes the context to a single .npz file.
+        """
+        settings = {
+            "prediction_length": self.prediction_length,
+            "seasonality": self.seasonality,
+        }
+        with open(path, "wb") as file:
+            np.savez(
+                file, settings=np.array(json.dumps(settings)), **self.arrays,
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "EvaluationContext":
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in data.files}
+        settings = json.loads(str(arrays.pop("settings")))
+        return cls(arrays, **settings)
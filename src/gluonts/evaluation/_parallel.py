@@ -0,0 +1,189 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+import multiprocessing
+import os
+import tempfile
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+# Third-party imports
+import numpy as np
+
+
+def _shared_memory_dir() -> str:
+    # /dev/shm is memory backed on Linux, so that files there are shared
+    # memory segments which can be opened by name from any process
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+class SharedArrays:
+    """
+    A set of arrays in a memory-mapped file, which other processes can open
+    without copying them through pipes; only the file name and the layout of
+    the arrays are pickled.
+
+    Parameters
+    ----------
+    path
+        the file holding the arrays
+    layout
+        name, dtype, shape and byte offset of every array in the file
+    """
+
+    def __init__(
+        self, path: str, layout: List[Tuple[str, str, tuple, int]]
+    ) -> None:
+        self.path = path
+        self.layout = layout
+
+    @classmethod
+    def create(cls, arrays: Dict[str, np.ndarray]) -> "SharedArrays":
+        fd, path = tempfile.mkstemp(
+            prefix="gluonts-evaluation-", dir=_shared_memory_dir()
+        )
+        layout = []
+        offset = 0
+        with os.fdopen(fd, "wb") as out:
+            for name, array in arrays.items():
+                array = np.ascontiguousarray(array)
+                layout.append((name, array.dtype.str, array.shape, offset))
+                out.write(array.tobytes())
+                offset += array.nbytes
+        return cls(path, layout)
+
+    def open(self) -> Dict[str, np.ndarray]:
+        """
+        Read-only views on the arrays.
+        """
+        if all(np.prod(shape) == 0 for _, _, shape, _ in self.layout):
+            return {
+                name: np.zeros(shape, dtype=dtype)
+                for name, dtype, shape, _ in self.layout
+            }
+        buffer = np.memmap(self.path, dtype=np.uint8, mode="r")
+        return {
+            name: np.ndarray(
+                shape, dtype=np.dtype(dtype), buffer=buffer, offset=offset
+            )
+            for name, dtype, shape, offset in self.layout
+        }
+
+    def unlink(self) -> None:
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+
+# This is required for the multiprocessing to work.
+_worker_evaluator: Optional[Any] = None
+
+
+def _worker_init(evaluator) -> None:
+    global _worker_evaluator
+    _worker_evaluator = evaluator
+
+
+def _worker_fun(task: Tuple[SharedArrays, Dict[str, list]]):
+    shared, meta = task
+    global _worker_evaluator
+    assert (
+        _worker_evaluator is not None
+    ), "Something went wrong with the worker initialization."
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _worker_evaluator.get_metrics_from_arrays(shared.open(), meta)
+
+
+class EvaluationPool:
+    """
+    Pool of worker processes computing metrics of blocks of time series, which
+    are prepared in the parent process and passed as shared arrays.
+
+    Results are returned in the order of the blocks, and at most
+    `max_pending` blocks are in flight at any time, so that the input is
+    streamed in bounded memory (unlike `Pool.imap`, which consumes its input
+    as fast as it can).
+
+    Parameters
+    ----------
+    evaluator
+        evaluator whose configuration the workers are initialized with
+    config
+        the settings of the evaluator which the workers depend on, to detect
+        when the pool has to be restarted
+    num_workers
+        number of worker processes
+    max_pending
+        maximum number of blocks submitted to the workers but not yet
+        returned, by default twice the number of workers
+    """
+
+    def __init__(
+        self,
+        evaluator,
+        config: Any,
+        num_workers: int,
+        max_pending: Optional[int] = None,
+    ) -> None:
+        self.config = config
+        self.num_workers = num_workers
+        self.max_pending = (
+            max_pending if max_pending is not None else 2 * num_workers
+        )
+        self.pool = multiprocessing.Pool(
+            processes=num_workers,
+            initializer=_worker_init,
+            initargs=(evaluator,),
+        )
+
+    def map(
+        self, evaluator, blocks: Iterator[Tuple[list, list]], context=None,
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        pending: Deque[Tuple[SharedArrays, Any]] = deque()
+        try:
+            for time_series, forecasts in blocks:
+                arrays, meta = evaluator.prepare_block(
+                    time_series, forecasts, keep_samples=True, context=context
+                )
+                shared = SharedArrays.create(arrays)
+                pending.append(
+                    (
+                        shared,
+                        self.pool.apply_async(_worker_fun, ((shared, meta),)),
+                    )
+                )
+                while len(pending) >= self.max_pending:
+                    yield self._collect(pending)
+            while pending:
+                yield self._collect(pending)
+        finally:
+            for shared, _ in pending:
+                shared.unlink()
+
+    @staticmethod
+    def _collect(pending: Deque[Tuple[SharedArrays, Any]]):
+        shared, result = pending[0]
+        try:
+            return result.get()
+        finally:
+            pending.popleft()
+            shared.unlink()
+
+    def close(self) -> None:
+        self.pool.terminate()
+        self.pool.join()
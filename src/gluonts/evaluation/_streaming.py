@@ -0,0 +1,342 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+
+
+class RunningSum:
+    """
+    Running sum of floats in constant memory. Every block of values is
+    summed with `np.sum`, and the block sums are added with Neumaier's
+    compensated summation, so that the rounding errors of the additions do
+    not accumulate over the blocks. NaNs are skipped and counted separately,
+    like pandas does for `sum` and `mean`.
+    """
+
+    def __init__(self) -> None:
+        self.total = 0.0
+        self.compensation = 0.0
+        # sum of the infinite values, which is +-inf or NaN if there are any
+        self.infinite = 0.0
+        self.count = 0
+
+    def add(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        finite = np.isfinite(values)
+        if not finite.all():
+            self.infinite += float(values[~finite].sum())
+            values = values[finite]
+
+        value = float(values.sum())
+        total = self.total + value
+        if abs(self.total) >= abs(value):
+            self.compensation += (self.total - total) + value
+        else:
+            self.compensation += (value - total) + self.total
+        self.total = total
+
+    def sum(self) -> float:
+        """
+        The sum of all non-NaN values; 0 if there were none.
+        """
+        return self.total + self.compensation + self.infinite
+
+    def mean(self) -> float:
+        """
+        The mean of all non-NaN values; NaN if there were none.
+        """
+        return self.sum() / self.count if self.count > 0 else np.nan
+
+
+class MetricAccumulator:
+    """
+    Aggregates columns of metrics, given block by block, with the `sum` and
+    `mean` aggregation functions in constant memory.
+
+    Parameters
+    ----------
+    agg_funs
+        aggregation function (`"sum"` or `"mean"`) for each metric
+    """
+
+    def __init__(self, agg_funs: Dict[str, str]) -> None:
+        assert set(agg_funs.values()) <= {
+            "sum",
+            "mean",
+        }, "Only `sum` and `mean` aggregation functions are supported."
+        self.agg_funs = agg_funs
+        self.sums = {key: RunningSum() for key in agg_funs}
+
+    def update(self, metrics: Dict[str, np.ndarray]) -> None:
+        assert (
+            metrics.keys() >= self.agg_funs.keys()
+        ), "The some of the requested item metrics are missing."
+        for key, running_sum in self.sums.items():
+            running_sum.add(metrics[key])
+
+    def totals(self) -> Dict[str, float]:
+        return {
+            key: getattr(self.sums[key], agg)()
+            for key, agg in self.agg_funs.items()
+        }
+
+
+class ItemMetricsSink:
+    """
+    Receives the per time series metrics of an evaluation block by block and
+    decides which of them are kept.
+    """
+
+    def add(self, metrics: Dict[str, np.ndarray]) -> None:
+        raise NotImplementedError()
+
+    def result(self) -> pd.DataFrame:
+        raise NotImplementedError()
+
+
+def _metrics_frame(
+    metrics_blocks: List[Dict[str, np.ndarray]]
+) -> pd.DataFrame:
+    """
+    Builds the table of per time series metrics column by column.
+
+    Like for a table built from rows with dtype np.float64, masked or missing
+    values are NaN and columns which cannot be converted to floats, like
+    string item ids, are kept as objects.
+    """
+    if not metrics_blocks:
+        return pd.DataFrame([], dtype=np.float64)
+
+    columns = {}
+    for name in metrics_blocks[0]:
+        column = np.concatenate([block[name] for block in metrics_blocks])
+        try:
+            columns[name] = column.astype(np.float64)
+        except (TypeError, ValueError):
+            columns[name] = column
+    return pd.DataFrame(columns)
+
+
+class KeepItemMetrics(ItemMetricsSink):
+    """
+    Keeps all per time series metrics in memory.
+    """
+
+    def __init__(self) -> None:
+        self.blocks: List[Dict[str, np.ndarray]] = []
+
+    def add(self, metrics: Dict[str, np.ndarray]) -> None:
+        self.blocks.append(metrics)
+
+    def result(self) -> pd.DataFrame:
+        return _metrics_frame(self.blocks)
+
+
+class DiscardItemMetrics(ItemMetricsSink):
+    """
+    Discards the per time series metrics; the result is an empty table with
+    the metric columns.
+    """
+
+    def __init__(self) -> None:
+        self.columns: Optional[List[str]] = None
+
+    def add(self, metrics: Dict[str, np.ndarray]) -> None:
+        self.columns = list(metrics)
+
+    def result(self) -> pd.DataFrame:
+        return pd.DataFrame(columns=self.columns, dtype=np.float64)
+
+
+class SampleItemMetrics(ItemMetricsSink):
+    """
+    Keeps a uniform random sample of the per time series metrics, using
+    reservoir sampling; the sampled rows are returned in their original order.
+
+    Parameters
+    ----------
+    sample_size
+        number of time series to keep
+    seed
+        seed of the random number generator
+    """
+
+    def __init__(self, sample_size: int, seed: int = 0) -> None:
+        assert sample_size > 0, "The value of `sample_size` should be > 0"
+        self.sample_size = sample_size
+        self.random_state = np.random.RandomState(seed)
+        self.reservoir: Optional[Dict[str, np.ndarray]] = None
+        self.positions = np.zeros(0, dtype=int)
+        self.num_seen = 0
+
+    def add(self, metrics: Dict[str, np.ndarray]) -> None:
+        num_items = len(next(iter(metrics.values())))
+        positions = self.num_seen + np.arange(num_items)
+        self.num_seen += num_items
+
+        # fill the reservoir first
+        num_fill = max(
+            0, min(num_items, self.sample_size - len(self.positions))
+        )
+        if num_fill > 0:
+            fill = {key: value[:num_fill] for key, value in metrics.items()}
+            self.reservoir = (
+                fill
+                if self.reservoir is None
+                else {
+                    key: np.concatenate([self.reservoir[key], value])
+                    for key, value in fill.items()
+                }
+            )
+            self.positions = np.concatenate(
+                [self.positions, positions[:num_fill]]
+            )
+
+        # then the item at position t replaces a random slot with probability
+        # sample_size / (t + 1)
+        candidates = np.arange(num_fill, num_items)
+        slots = np.floor(
+            self.random_state.rand(len(candidates))
+            * (positions[candidates] + 1)
+        ).astype(int)
+        replace = slots < self.sample_size
+        candidates, slots = candidates[replace], slots[replace]
+        # of several items drawing the same slot, the last one stays
+        slots_reversed, last = np.unique(slots[::-1], return_index=True)
+        candidates = candidates[::-1][last]
+        for key, value in metrics.items():
+            self.reservoir[key][slots_reversed] = value[candidates]
+        self.positions[slots_reversed] = positions[candidates]
+
+    def result(self) -> pd.DataFrame:
+        if self.reservoir is None:
+            return pd.DataFrame([], dtype=np.float64)
+        order = np.argsort(self.positions)
+        return _metrics_frame(
+            [{key: value[order] for key, value in self.reservoir.items()}]
+        )
+
+
+class SpillItemMetrics(ItemMetricsSink):
+    """
+    Appends the per time series metrics to an on-disk columnar store, which
+    can be read with :func:`load_item_metrics`; the in-memory result is an
+    empty table with the metric columns.
+
+    The store is a directory containing one file of raw float64 values per
+    metric, the item ids as JSON lines, and a `columns.json` manifest.
+
+    Parameters
+    ----------
+    path
+        directory of the store, which is created if needed; existing stores
+        are overwritten
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.columns: Optional[List[str]] = None
+        self.num_rows = 0
+
+    def _column_file(self, i: int) -> Path:
+        return self.path / f"column_{i}.f8"
+
+    def add(self, metrics: Dict[str, np.ndarray]) -> None:
+        if self.columns is None:
+            self.columns = list(metrics)
+            for i in range(len(self.columns)):
+                self._column_file(i).write_bytes(b"")
+            (self.path / "item_id.jsonl").write_text("")
+
+        for i, name in enumerate(self.columns):
+            if name == "item_id":
+                with (self.path / "item_id.jsonl").open("a") as out:
+                    out.writelines(
+                        json.dumps(item_id) + "\n"
+                        for item_id in metrics[name].tolist()
+                    )
+            else:
+                with self._column_file(i).open("ab") as out:
+                    np.asarray(metrics[name], dtype=np.float64).tofile(out)
+        self.num_rows += len(metrics[self.columns[0]])
+
+        self._write_manifest()
+
+    def _write_manifest(self) -> None:
+        manifest = {
+            "num_rows": self.num_rows,
+            "columns": [
+                {
+                    "name": name,
+                    "file": "item_id.jsonl"
+                    if name == "item_id"
+                    else self._column_file(i).name,
+                }
+                for i, name in enumerate(self.columns or [])
+            ],
+        }
+        (self.path / "columns.json").write_text(json.dumps(manifest))
+
+    def result(self) -> pd.DataFrame:
+        if self.columns is None:
+            self._write_manifest()
+        return pd.DataFrame(columns=self.columns, dtype=np.float64)
+
+
+def load_item_metrics(
+    path: Union[str, Path], columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    Loads per time series metrics which an :class:`Evaluator` spilled to disk
+    with `item_metrics="spill"`.
+
+    Parameters
+    ----------
+    path
+        directory of the store
+    columns
+        metrics to load, by default all of them
+
+    Returns
+    -------
+    pd.DataFrame
+        the per time series metrics, as returned with `item_metrics="keep"`
+    """
+    path = Path(path)
+    manifest = json.loads((path / "columns.json").read_text())
+    data = {}
+    for column in manifest["columns"]:
+        name = column["name"]
+        if columns is not None and name not in columns:
+            continue
+        if name == "item_id":
+            with (path / column["file"]).open() as lines:
+                values = np.array(
+                    [json.loads(line) for line in lines], dtype=object
+                )
+        else:
+            values = np.fromfile(str(path / column["file"]), dtype=np.float64)
+        assert len(values) == manifest["num_rows"]
+        data[name] = values
+    return _metrics_frame([data]) if data else pd.DataFrame([])
@@ -0,0 +1,119 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+from functools import lru_cache
+from typing import Optional, Union
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+from pandas.tseries.frequencies import to_offset
+from pandas.tseries.offsets import Tick
+
+
+@lru_cache(maxsize=4096)
+def _periods_between(
+    start: pd.Timestamp, freq: str, date: pd.Timestamp
+) -> Optional[int]:
+    """
+    Number of periods of frequency `freq` from `start` to `date`, or None if
+    `date` is not on the grid of time points starting at `start`.
+    """
+    offset = to_offset(freq)
+    if isinstance(offset, Tick):
+        periods, remainder = divmod((date - start).value, offset.nanos)
+        return periods if remainder == 0 else None
+    try:
+        # calendar frequencies like weeks, months or business days are
+        # counted by the difference of the ordinals of their periods
+        base_periods = (
+            pd.Period(date, freq=offset.base).ordinal
+            - pd.Period(start, freq=offset.base).ordinal
+        )
+    except ValueError:
+        # offsets without periods, like month starts
+        first, last = min(start, date), max(start, date)
+        index = pd.date_range(first, last, freq=offset)
+        if not len(index) or index[0] != first or index[-1] != last:
+            return None
+        return len(index) - 1 if date >= start else 1 - len(index)
+    periods, remainder = divmod(base_periods, offset.n)
+    if remainder != 0 or start + periods * offset != date:
+        return None
+    return periods
+
+
+class TargetSeries:
+    """
+    The target of a time series for evaluation, given by its values, the
+    start of its index and its frequency, which the `Evaluator` aligns with
+    forecasts by integer offsets.
+
+    This is not a `pandas.DataFrame`: the corresponding data frame, with the
+    values as columns and a date range index, is only created by
+    `to_pandas`, e.g. to plot the time series.
+
+    Parameters
+    ----------
+    values
+        Array of shape (length,) or (length, target_dim).
+    start
+        Time stamp of the first value, which is rolled forward to the next
+        time point of the frequency like in `pandas.date_range`.
+    freq
+        Frequency of the time series.
+    """
+
+    def __init__(
+        self, values: np.ndarray, start: Union[str, pd.Timestamp], freq: str
+    ) -> None:
+        self._values = values
+        self.start = pd.Timestamp(
+            to_offset(freq).rollforward(pd.Timestamp(start)), freq=freq
+        )
+        self.freq = freq
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __array__(self, dtype=None) -> np.ndarray:
+        # the values as given, of shape (length,) or (length, target_dim)
+        return np.asarray(self._values, dtype=dtype)
+
+    def position(self, date: pd.Timestamp) -> Optional[int]:
+        """
+        Position of the time point `date` in the values, which may be outside
+        of them, or None if it is not a time point of the series' frequency.
+        """
+        return _periods_between(self.start, self.freq, date)
+
+    def timestamp(self, position: int) -> pd.Timestamp:
+        """
+        Time stamp of the value at the given position.
+        """
+        return self.start + position * self.start.freq
+
+    def to_pandas(self) -> pd.DataFrame:
+        """
+        The time series as `pandas.DataFrame`, with one column per
+        dimension, which is created once and cached.
+        """
+        if self._frame is None:
+            index = pd.date_range(
+                start=self.start, freq=self.freq, periods=len(self._values)
+            )
+            self._frame = pd.DataFrame(index=index, data=self._values)
+        return self._frame
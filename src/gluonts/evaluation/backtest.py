@@ -14,9 +14,18 @@
 # Standard library imports
 import logging
 import re
-from typing import Dict, Iterator, NamedTuple, Optional, Tuple, Union
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 # Third-party imports
+import numpy as np
 import pandas as pd
 
 # First-party imports
@@ -24,12 +33,13 @@ import gluonts  # noqa
 from gluonts import transform
 from gluonts.core.serde import load_code
 from gluonts.dataset.common import DataEntry, Dataset
+from gluonts.dataset.field_names import FieldName
 from gluonts.dataset.loader import InferenceDataLoader
 from gluonts.dataset.stat import (
     DatasetStatistics,
     calculate_dataset_statistics,
 )
-from gluonts.evaluation import Evaluator
+from gluonts.evaluation import Evaluator, TargetSeries
 from gluonts.model.estimator import Estimator
 from gluonts.model.forecast import Forecast
 from gluonts.model.predictor import Predictor
@@ -39,7 +49,7 @@ from gluonts.transform import TransformedDataset
 
 def make_evaluation_predictions(
     dataset: Dataset, predictor: Predictor, num_samples: int
-) -> Tuple[Iterator[Forecast], Iterator[pd.Series]]:
+) -> Tuple[Iterator[Forecast], Iterator[TargetSeries]]:
     """
     Return predictions on the last portion of predict_length time units of the
     target. Such portion is cut before making predictions, such a function can
@@ -58,30 +68,21 @@ def make_evaluation_predictions(
 
     Returns
     -------
+    Tuple
+        The forecasts and the targets of the time series; the targets are
+        `TargetSeries`, which are converted to `pandas.DataFrame` with their
+        `to_pandas` method.
     """
 
     prediction_length = predictor.prediction_length
     freq = predictor.freq
     lead_time = predictor.lead_time
 
-    def add_ts_dataframe(
-        data_iterator: Iterator[DataEntry],
-    ) -> Iterator[DataEntry]:
-        for data_entry in data_iterator:
-            data = data_entry.copy()
-            index = pd.date_range(
-                start=data["start"],
-                freq=freq,
-                periods=data["target"].shape[-1],
-            )
-            data["ts"] = pd.DataFrame(
-                index=index, data=data["target"].transpose()
+    def ts_iter(dataset: Dataset) -> Iterator[TargetSeries]:
+        for data_entry in dataset:
+            yield TargetSeries(
+                data_entry["target"].transpose(), data_entry["start"], freq
             )
-            yield data
-
-    def ts_iter(dataset: Dataset) -> pd.DataFrame:
-        for data_entry in add_ts_dataframe(iter(dataset)):
-            yield data_entry["ts"]
 
     def truncate_target(data):
         data = data.copy()
@@ -106,6 +107,149 @@ def make_evaluation_predictions(
     )
 
 
+class RollingBacktestResult(NamedTuple):
+    """
+    Result of `rolling_backtest`.
+
+    Attributes
+    ----------
+    agg_metrics
+        aggregate metrics over all windows
+    window_metrics
+        aggregate metrics of every window, from the earliest to the latest
+        forecast start
+    item_metrics
+        metrics of every time series and window, with the number of the
+        window in the column "window"
+    """
+
+    agg_metrics: Dict[str, float]
+    window_metrics: List[Dict[str, float]]
+    item_metrics: pd.DataFrame
+
+
+def _rolling_windows(
+    dataset: Dataset,
+    prediction_length: int,
+    lead_time: int,
+    num_windows: int,
+    distance: int,
+) -> Iterator[Tuple[int, DataEntry, int]]:
+    """
+    Yields the window number, the data entry and the length of the history
+    for every window of every time series, in this order; windows without
+    any history left are skipped.
+    """
+    for data_entry in dataset:
+        length = data_entry["target"].shape[-1]
+        for window in range(num_windows):
+            end = length - (num_windows - 1 - window) * distance
+            history_length = end - prediction_length - lead_time
+            if history_length > 0:
+                yield window, data_entry, history_length
+
+
+def rolling_backtest(
+    dataset: Dataset,
+    predictor: Predictor,
+    evaluator: Evaluator,
+    num_windows: int,
+    distance: Optional[int] = None,
+    num_samples: int = 100,
+) -> RollingBacktestResult:
+    """
+    Evaluates the predictor on several prediction ranges (windows) of every
+    time series: the last window is the prediction range evaluated by
+    `make_evaluation_predictions`, and every earlier one ends `distance`
+    time points before the next.
+
+    The truncated time series of all windows are created lazily and fed to
+    the predictor in a single pass, so that batches mix windows, and the
+    evaluator locates the prediction range of every window in the target of
+    the time series by its integer offset.
+
+    Parameters
+    ----------
+    dataset
+        Dataset where the evaluation will happen.
+    predictor
+        Model used to draw predictions.
+    evaluator
+        Evaluator to use, which must keep the per time series metrics.
+    num_windows
+        Number of windows per time series; windows of time series which are
+        too short to have any history are skipped.
+    distance
+        Number of time points between the ends of consecutive windows, by
+        default the prediction length.
+    num_samples
+        Number of samples to draw on the model when evaluating.
+
+    Returns
+    -------
+    RollingBacktestResult
+        Aggregate metrics over all windows and of every window, and the
+        metrics of every time series and window.
+    """
+    assert num_windows > 0, "num_windows must be positive"
+    assert (
+        getattr(evaluator, "item_metrics", "keep") == "keep"
+    ), "The metrics of every window require the per time series metrics"
+
+    prediction_length = predictor.prediction_length
+    lead_time = predictor.lead_time
+    freq = predictor.freq
+    distance = distance if distance is not None else prediction_length
+    windows: List[int] = []
+
+    def truncated_entries() -> Iterator[DataEntry]:
+        for window, data_entry, history_length in _rolling_windows(
+            dataset, prediction_length, lead_time, num_windows, distance
+        ):
+            windows.append(window)
+            data = data_entry.copy()
+            data["target"] = data_entry["target"][..., :history_length]
+            # dynamic features must end with the prediction range
+            end = history_length + lead_time + prediction_length
+            for field in (
+                FieldName.FEAT_DYNAMIC_REAL,
+                FieldName.FEAT_DYNAMIC_CAT,
+            ):
+                if field in data:
+                    data[field] = data[field][..., :end]
+            yield data
+
+    def ts_iter() -> Iterator[TargetSeries]:
+        ts, previous_entry = None, None
+        for _, data_entry, _ in _rolling_windows(
+            dataset, prediction_length, lead_time, num_windows, distance
+        ):
+            if data_entry is not previous_entry:
+                ts = TargetSeries(
+                    data_entry["target"].transpose(), data_entry["start"], freq
+                )
+                previous_entry = data_entry
+            yield ts
+
+    agg_metrics, item_metrics = evaluator(
+        ts_iter(),
+        predictor.predict(truncated_entries(), num_samples=num_samples),
+    )
+
+    # per dimension metrics of multivariate time series follow each other
+    item_metrics = item_metrics.copy()
+    item_metrics["window"] = np.resize(
+        np.array(windows, dtype=int), len(item_metrics)
+    )
+    window_metrics = [
+        evaluator.get_aggregate_metrics(
+            item_metrics[item_metrics["window"] == window]
+        )[0]
+        for window in range(num_windows)
+    ]
+    return RollingBacktestResult(agg_metrics, window_metrics, item_metrics)
+
+
 train_dataset_stats_key = "train_dataset_stats"
 test_dataset_stats_key = "test_dataset_stats"
 estimator_key = "estimator"
@@ -13,8 +13,14 @@
 
 # Relative imports
 from ._estimator import DeepAREstimator
+from ._predictor import EncoderState, LRUCache, StatefulDeepARPredictor
 
-__all__ = ["DeepAREstimator"]
+__all__ = [
+    "DeepAREstimator",
+    "EncoderState",
+    "LRUCache",
+    "StatefulDeepARPredictor",
+]
 
 # fix Sphinx issues, see https://bit.ly/2K2eptM
 for item in __all__:
@@ -246,6 +246,50 @@ class DeepARNetwork(mx.gluon.HybridBlock):
             dim=1,
         )
 
+        inputs = self.encoder_inputs(
+            F=F,
+            lags=lags,
+            time_feat=time_feat,
+            static_feat=static_feat,
+            scale=scale,
+            subsequences_length=subsequences_length,
+        )
+
+        # unroll encoder
+        outputs, state = self.rnn.unroll(
+            inputs=inputs,
+            length=subsequences_length,
+            layout="NTC",
+            merge_outputs=True,
+            begin_state=self.rnn.begin_state(
+                func=F.zeros,
+                dtype=self.dtype,
+                batch_size=inputs.shape[0]
+                if isinstance(inputs, mx.nd.NDArray)
+                else 0,
+            ),
+        )
+
+        # outputs: (batch_size, seq_len, num_cells)
+        # state: list of (batch_size, num_cells) tensors
+        # scale: (batch_size, 1, *target_shape)
+        # static_feat: (batch_size, num_features + prod(target_shape))
+        return outputs, state, scale, static_feat
+
+    def encoder_inputs(
+        self,
+        F,
+        lags: Tensor,  # (batch_size, sub_seq_len, *target_shape, num_lags)
+        time_feat: Tensor,  # (batch_size, sub_seq_len, num_features)
+        static_feat: Tensor,  # (batch_size, num_features)
+        scale: Tensor,  # (batch_size, 1, *target_shape)
+        subsequences_length: int,
+    ) -> Tensor:
+        """
+        Assembles the inputs of the encoder from the lagged target values,
+        which are scaled by `scale`, the time features and the static
+        features, which are repeated for each time step.
+        """
         # (batch_size, subsequences_length, num_features + 1)
         repeated_static_feat = static_feat.expand_dims(axis=1).repeat(
             axis=1, repeats=subsequences_length
@@ -266,28 +310,54 @@ class DeepARNetwork(mx.gluon.HybridBlock):
         )
 
         # (batch_size, sub_seq_len, input_dim)
-        inputs = F.concat(input_lags, time_feat, repeated_static_feat, dim=-1)
+        return F.concat(input_lags, time_feat, repeated_static_feat, dim=-1)
 
-        # unroll encoder
-        outputs, state = self.rnn.unroll(
+    def advance_encoder(
+        self,
+        F,
+        past_time_feat: Tensor,  # (batch_size, history_length, num_features)
+        past_target: Tensor,  # (batch_size, history_length, *target_shape)
+        begin_state: List,
+        scale: Tensor,  # (batch_size, 1, *target_shape)
+        static_feat: Tensor,  # (batch_size, num_features + prod(target_shape))
+        num_steps: int,
+    ) -> List:
+        """
+        Unrolls the encoder over the last `num_steps` time steps of the past
+        data only, starting from the state the encoder had before them, e.g.
+        as returned by an earlier call of `unroll_encoder`. The scale and the
+        static features are the ones used to compute that state.
+
+        Returns the state of the encoder after the last time step.
+        """
+        assert 0 < num_steps <= self.context_length
+
+        lags = self.get_lagged_subsequences(
+            F=F,
+            sequence=past_target,
+            sequence_length=self.history_length,
+            indices=self.lags_seq,
+            subsequences_length=num_steps,
+        )
+        inputs = self.encoder_inputs(
+            F=F,
+            lags=lags,
+            time_feat=past_time_feat.slice_axis(
+                axis=1, begin=-num_steps, end=None
+            ),
+            static_feat=static_feat,
+            scale=scale,
+            subsequences_length=num_steps,
+        )
+
+        _, state = self.rnn.unroll(
             inputs=inputs,
-            length=subsequences_length,
+            length=num_steps,
             layout="NTC",
             merge_outputs=True,
-            begin_state=self.rnn.begin_state(
-                func=F.zeros,
-                dtype=self.dtype,
-                batch_size=inputs.shape[0]
-                if isinstance(inputs, mx.nd.NDArray)
-                else 0,
-            ),
+            begin_state=begin_state,
         )
-
-        # outputs: (batch_size, seq_len, num_cells)
-        # state: list of (batch_size, num_cells) tensors
-        # scale: (batch_size, 1, *target_shape)
-        # static_feat: (batch_size, num_features + prod(target_shape))
-        return outputs, state, scale, static_feat
+        return state
 
 
 class DeepARTrainingNetwork(DeepARNetwork):
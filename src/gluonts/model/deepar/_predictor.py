@@ -0,0 +1,421 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Standard library imports
+from collections import OrderedDict
+from pathlib import Path
+from typing import (
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+# Third-party imports
+import mxnet as mx
+import numpy as np
+import pandas as pd
+
+# First-party imports
+from gluonts.dataset.common import Dataset
+from gluonts.dataset.field_names import FieldName
+from gluonts.dataset.loader import DataBatch
+from gluonts.model.forecast import Forecast, SampleForecastBatch
+from gluonts.model.forecast_generator import _batch_metadata, _unpad
+from gluonts.model.predictor import RepresentableBlockPredictor
+
+# Relative imports
+from ._network import DeepARPredictionNetwork
+
+
+class EncoderState(NamedTuple):
+    """
+    State of the DeepAR encoder for a single time series, at the time step
+    before `forecast_start`.
+    """
+
+    forecast_start: pd.Timestamp
+    # one (num_cells,) array per state of the recurrent cells
+    rnn_state: List[np.ndarray]
+    # (1, *target_shape)
+    scale: np.ndarray
+    # (num_features + prod(target_shape),)
+    static_feat: np.ndarray
+    # the last `max(lags_seq)` values of the past target, (max_lag,)
+    lag_target: np.ndarray
+    # number of time steps encoded since the state was computed from scratch
+    num_incremental_steps: int
+
+
+class LRUCache(MutableMapping):
+    """
+    A mapping holding at most `max_size` entries, which evicts the least
+    recently used entry when a new one is added to a full cache.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        assert max_size > 0, "max_size must be positive"
+        self.max_size = max_size
+        self._data: OrderedDict = OrderedDict()
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value) -> None:
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def __delitem__(self, key) -> None:
+        del self._data[key]
+
+    def __iter__(self):
+        # looking up entries while iterating reorders them
+        return iter(list(self._data))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def _unpad_batch(batch: DataBatch, num_instances: int) -> DataBatch:
+    """
+    Drops the rows added to the arrays of a batch by
+    :func:`gluonts.dataset.loader.pad_batch`.
+    """
+    return {
+        key: _unpad(value, num_instances)
+        if isinstance(value, (np.ndarray, mx.nd.NDArray))
+        else value
+        for key, value in batch.items()
+    }
+
+
+class StatefulDeepARPredictor(RepresentableBlockPredictor):
+    """
+    DeepAR predictor for re-forecasting the same time series as new
+    observations arrive.
+
+    For each `item_id` it keeps the state of the encoder at the end of the
+    history of the last request in `cache`, together with the scale and
+    static features used to compute it. If the next request for the item
+    extends that history by a few time steps, the encoder is only advanced
+    over these steps, instead of being unrolled over the whole context
+    window, before the sampling decoder is run as usual.
+
+    Advancing the encoder is not equivalent to encoding the new context
+    window from scratch: the state also depends on observations from before
+    the window, and the scale is the one of the window the state was first
+    computed for. The state is therefore computed from scratch again after
+    `max_incremental_steps` time steps, and whenever the history of an item
+    does not extend the one it was computed for (e.g. because past values
+    were revised).
+
+    Use :meth:`from_predictor` to create it from the predictor returned by
+    :class:`DeepAREstimator`.
+
+    Parameters
+    ----------
+    cache
+        Mapping from item ids to :class:`EncoderState` tuples, by default an
+        :class:`LRUCache` holding the states of `cache_size` time series.
+    cache_size
+        Number of time series held by the default cache.
+    max_incremental_steps
+        Number of time steps the encoder is advanced by, at most, before its
+        state is computed from scratch. By default the context length of the
+        network.
+    kwargs
+        Arguments of :class:`RepresentableBlockPredictor`.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[MutableMapping[Hashable, EncoderState]] = None,
+        cache_size: int = 100_000,
+        max_incremental_steps: Optional[int] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        assert isinstance(
+            self.prediction_net, DeepARPredictionNetwork
+        ), "the prediction network must be a DeepARPredictionNetwork"
+
+        network = self.prediction_net
+        self.cache = cache if cache is not None else LRUCache(cache_size)
+        self.max_incremental_steps = (
+            max_incremental_steps
+            if max_incremental_steps is not None
+            else network.context_length
+        )
+        assert (
+            0 <= self.max_incremental_steps <= network.context_length
+        ), "max_incremental_steps must be at most the context length"
+        self.max_lag = max(network.lags_seq)
+
+    @classmethod
+    def from_predictor(
+        cls, predictor: RepresentableBlockPredictor, **kwargs
+    ) -> "StatefulDeepARPredictor":
+        """
+        Creates a stateful variant of a DeepAR predictor, sharing its network.
+        The keyword arguments are passed to the constructor.
+        """
+        return cls(
+            prediction_net=predictor.prediction_net,
+            batch_size=predictor.batch_size,
+            prediction_length=predictor.prediction_length,
+            freq=predictor.freq,
+            ctx=predictor.ctx,
+            input_transform=predictor.input_transform,
+            lead_time=predictor.lead_time,
+            forecast_generator=predictor.forecast_generator,
+            output_transform=predictor.output_transform,
+            dtype=predictor.dtype,
+            **kwargs,
+        )
+
+    @classmethod
+    def deserialize(
+        cls, path: Path, ctx: Optional[mx.Context] = None
+    ) -> "StatefulDeepARPredictor":
+        # the cached states are not serialized, they are rebuilt on demand
+        return cls.from_predictor(
+            RepresentableBlockPredictor.deserialize(path, ctx)
+        )
+
+    def predict(
+        self,
+        dataset: Dataset,
+        num_samples: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        num_prefetch: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[Forecast]:
+        for forecast_batch in self.predict_batches(
+            dataset,
+            num_samples=num_samples,
+            num_workers=num_workers,
+            num_prefetch=num_prefetch,
+            **kwargs,
+        ):
+            yield from forecast_batch
+
+    def predict_batches(
+        self,
+        dataset: Dataset,
+        num_samples: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        num_prefetch: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[SampleForecastBatch]:
+        inference_data_loader = self._inference_data_loader(
+            dataset, num_workers, num_prefetch, **kwargs
+        )
+        for batch in inference_data_loader:
+            # the encoder states are kept per time series, so the rows which
+            # pad the batch to a bucket size are dropped
+            batch = _unpad_batch(batch, len(batch["forecast_start"]))
+            states = self._encoder_states(batch)
+
+            item_ids = batch.get(FieldName.ITEM_ID)
+            if item_ids is not None:
+                for item_id, state in zip(item_ids, states):
+                    if item_id is not None:
+                        self.cache[item_id] = state
+
+            samples = self._sample_paths(batch, states, num_samples)
+            yield SampleForecastBatch(
+                samples, freq=self.freq, **_batch_metadata(batch)
+            )
+
+    def _num_new_steps(
+        self, state: EncoderState, forecast_start: pd.Timestamp
+    ) -> Optional[int]:
+        """
+        Number of time steps from the cached state to `forecast_start`, or
+        None if the state is not before `forecast_start`.
+        """
+        if forecast_start == state.forecast_start:
+            return 0
+        if forecast_start < state.forecast_start:
+            return None
+        index = pd.date_range(
+            start=state.forecast_start, end=forecast_start, freq=self.freq
+        )
+        if index[-1] != forecast_start:
+            return None
+        return len(index) - 1
+
+    def _cached_state(
+        self,
+        item_id: Hashable,
+        forecast_start: pd.Timestamp,
+        past_target: np.ndarray,
+    ) -> Tuple[Optional[EncoderState], int]:
+        """
+        Returns the cached state of the item, if the encoder can be advanced
+        from it to `forecast_start`, and the number of steps to advance.
+        """
+        if item_id is None or item_id not in self.cache:
+            return None, 0
+
+        state = self.cache[item_id]
+        num_steps = self._num_new_steps(state, forecast_start)
+        if (
+            num_steps is None
+            or state.num_incremental_steps + num_steps
+            > self.max_incremental_steps
+        ):
+            return None, 0
+
+        # the history must extend the one the state was computed for
+        end = len(past_target) - num_steps
+        if not np.array_equal(
+            past_target[end - self.max_lag : end], state.lag_target
+        ):
+            return None, 0
+
+        return state, num_steps
+
+    def _encoder_states(self, batch: DataBatch) -> List[EncoderState]:
+        network = self.prediction_net
+        num_series = len(batch["forecast_start"])
+        item_ids = batch.get(FieldName.ITEM_ID) or [None] * num_series
+        past_target = batch["past_target"].asnumpy()
+
+        states: List[Optional[EncoderState]] = [None] * num_series
+        from_scratch = []
+        to_advance: Dict[int, List[int]] = {}
+        for i, (item_id, forecast_start) in enumerate(
+            zip(item_ids, batch["forecast_start"])
+        ):
+            state, num_steps = self._cached_state(
+                item_id, forecast_start, past_target[i]
+            )
+            if state is None:
+                from_scratch.append(i)
+            elif num_steps == 0:
+                states[i] = state
+            else:
+                to_advance.setdefault(num_steps, []).append(i)
+
+        if from_scratch:
+            take = self._take(batch, from_scratch)
+            _, rnn_state, scale, static_feat = network.unroll_encoder(
+                F=mx.nd,
+                feat_static_cat=take("feat_static_cat"),
+                feat_static_real=take("feat_static_real"),
+                past_time_feat=take("past_time_feat"),
+                past_target=take("past_target"),
+                past_observed_values=take("past_observed_values"),
+                future_time_feat=None,
+                future_target=None,
+            )
+            rnn_state = [s.asnumpy() for s in rnn_state]
+            scale = scale.asnumpy()
+            static_feat = static_feat.asnumpy()
+            for j, i in enumerate(from_scratch):
+                states[i] = EncoderState(
+                    forecast_start=batch["forecast_start"][i],
+                    rnn_state=[s[j] for s in rnn_state],
+                    scale=scale[j],
+                    static_feat=static_feat[j],
+                    lag_target=past_target[i, -self.max_lag :],
+                    num_incremental_steps=0,
+                )
+
+        # series advanced by the same number of steps are advanced together
+        for num_steps, indices in to_advance.items():
+            cached = [self.cache[item_ids[i]] for i in indices]
+            take = self._take(batch, indices)
+            rnn_state = network.advance_encoder(
+                F=mx.nd,
+                past_time_feat=take("past_time_feat"),
+                past_target=take("past_target"),
+                begin_state=self._stack(s.rnn_state for s in cached),
+                scale=self._stack([s.scale for s in cached]),
+                static_feat=self._stack([s.static_feat for s in cached]),
+                num_steps=num_steps,
+            )
+            rnn_state = [s.asnumpy() for s in rnn_state]
+            for j, (i, state) in enumerate(zip(indices, cached)):
+                states[i] = state._replace(
+                    forecast_start=batch["forecast_start"][i],
+                    rnn_state=[s[j] for s in rnn_state],
+                    lag_target=past_target[i, -self.max_lag :],
+                    num_incremental_steps=state.num_incremental_steps
+                    + num_steps,
+                )
+
+        return states
+
+    def _sample_paths(
+        self,
+        batch: DataBatch,
+        states: List[EncoderState],
+        num_samples: Optional[int],
+    ) -> np.ndarray:
+        network = self.prediction_net
+        begin_state = self._stack(s.rnn_state for s in states)
+        scale = self._stack([s.scale for s in states])
+        static_feat = self._stack([s.static_feat for s in states])
+
+        def sample_paths() -> np.ndarray:
+            samples = network.sampling_decoder(
+                F=mx.nd,
+                static_feat=static_feat,
+                past_target=batch["past_target"],
+                time_feat=batch["future_time_feat"],
+                scale=scale,
+                begin_states=begin_state,
+            ).asnumpy()
+            if self.output_transform is not None:
+                samples = self.output_transform(batch, samples)
+            return samples
+
+        samples = sample_paths()
+        if num_samples:
+            collected_samples = [samples]
+            num_collected_samples = samples.shape[1]
+            while num_collected_samples < num_samples:
+                samples = sample_paths()
+                collected_samples.append(samples)
+                num_collected_samples += samples.shape[1]
+            samples = np.concatenate(collected_samples, axis=1)[
+                :, :num_samples
+            ]
+        return samples
+
+    def _take(self, batch: DataBatch, indices: List[int]):
+        index = mx.nd.array(indices, ctx=self.ctx)
+        return lambda name: batch[name].take(index, axis=0)
+
+    def _stack(self, arrays):
+        """
+        Stacks the per-series arrays of the cached states into batch tensors;
+        lists of arrays, like the states of the recurrent cells, are stacked
+        element-wise.
+        """
+        arrays = list(arrays)
+        if isinstance(arrays[0], list):
+            return [self._stack(a) for a in zip(*arrays)]
+        return mx.nd.array(
+            np.stack(arrays), ctx=self.ctx, dtype=arrays[0].dtype
+        )
@@ -147,6 +147,14 @@ class DeepStateEstimator(GluonEstimator):
     innovation_bounds
         Lower and upper bounds for the standard deviation of the observation 
         noise
+    filtering
+        Kalman filtering algorithm used to compute the likelihood and the
+        final state: 'sequential' or 'parallel' (default: 'sequential').
+        The parallel filter is computed with an associative scan, whose
+        computational graph has logarithmic rather than linear depth in
+        `past_length` and is much smaller for long contexts; it performs
+        about twice the arithmetic, so it pays off mostly on parallel
+        hardware
     """
 
     @validated()
@@ -175,6 +183,7 @@ class DeepStateEstimator(GluonEstimator):
         noise_std_bounds: ParameterBounds = ParameterBounds(1e-6, 1.0),
         prior_cov_bounds: ParameterBounds = ParameterBounds(1e-6, 1.0),
         innovation_bounds: ParameterBounds = ParameterBounds(1e-6, 0.01),
+        filtering: str = "sequential",
     ) -> None:
         super().__init__(trainer=trainer)
 
@@ -203,6 +212,11 @@ class DeepStateEstimator(GluonEstimator):
             for p in [noise_std_bounds, prior_cov_bounds, innovation_bounds]
         ), "All parameter bounds should be finite, and lower bounds should be positive"
 
+        assert filtering in [
+            "sequential",
+            "parallel",
+        ], "The value of `filtering` should be 'sequential' or 'parallel'"
+
         self.freq = freq
         self.past_length = (
             past_length
@@ -243,6 +257,7 @@ class DeepStateEstimator(GluonEstimator):
         self.noise_std_bounds = noise_std_bounds
         self.prior_cov_bounds = prior_cov_bounds
         self.innovation_bounds = innovation_bounds
+        self.filtering = filtering
 
     def create_transformation(self) -> Transformation:
         remove_field_names = [
@@ -332,6 +347,7 @@ class DeepStateEstimator(GluonEstimator):
             noise_std_bounds=self.noise_std_bounds,
             prior_cov_bounds=self.prior_cov_bounds,
             innovation_bounds=self.innovation_bounds,
+            filtering=self.filtering,
         )
 
     def create_predictor(
@@ -352,6 +368,7 @@ class DeepStateEstimator(GluonEstimator):
             noise_std_bounds=self.noise_std_bounds,
             prior_cov_bounds=self.prior_cov_bounds,
             innovation_bounds=self.innovation_bounds,
+            filtering=self.filtering,
             params=trained_network.collect_params(),
         )
 
@@ -43,6 +43,7 @@ class DeepStateNetwork(mx.gluon.HybridBlock):
         noise_std_bounds: ParameterBounds = ParameterBounds(1e-6, 1.0),
         prior_cov_bounds: ParameterBounds = ParameterBounds(1e-6, 1.0),
         innovation_bounds: ParameterBounds = ParameterBounds(1e-6, 0.01),
+        filtering: str = "sequential",
         **kwargs,
     ) -> None:
         super().__init__(**kwargs)
@@ -66,6 +67,7 @@ class DeepStateNetwork(mx.gluon.HybridBlock):
         self.noise_std_bounds = noise_std_bounds
         self.prior_cov_bounds = prior_cov_bounds
         self.innovation_bounds = innovation_bounds
+        self.filtering = filtering
 
         with self.name_scope():
             self.prior_mean_model = mx.gluon.nn.Dense(
@@ -158,6 +160,7 @@ class DeepStateNetwork(mx.gluon.HybridBlock):
             latent_dim=self.issm.latent_dim(),
             output_dim=self.issm.output_dim(),
             seq_length=length,
+            filtering=self.filtering,
         )
 
         return lds, lstm_final_state
@@ -53,7 +53,11 @@ from gluonts.transform import (
 )
 
 # Relative imports
-from ._network import DeepVARPredictionNetwork, DeepVARTrainingNetwork
+from ._network import (
+    DeepVARPredictionNetwork,
+    DeepVARTrainingNetwork,
+    chunk_size_for_budget,
+)
 
 
 class FourierDateFeatures(TimeFeature):
@@ -199,6 +203,12 @@ class DeepVAREstimator(GluonEstimator):
         Set maximum length for conditioning the marginal transformation
     use_marginal_transformation
         Whether marginal (empirical cdf, gaussian ppf) transformation is used.
+    sampling_memory_budget
+        Approximate number of bytes that the tensors of the sampling decoder
+        may take for a batch of time series at prediction time. The sample
+        paths are then drawn in chunks that fit the budget, all starting
+        from the same encoder state (default: None, in which case all sample
+        paths are drawn at once)
     """
 
     @validated()
@@ -224,6 +234,7 @@ class DeepVAREstimator(GluonEstimator):
         time_features: Optional[List[TimeFeature]] = None,
         conditioning_length: int = 200,
         use_marginal_transformation=False,
+        sampling_memory_budget: Optional[int] = None,
         **kwargs,
     ) -> None:
         super().__init__(trainer=trainer, **kwargs)
@@ -270,6 +281,7 @@ class DeepVAREstimator(GluonEstimator):
         self.embedding_dimension = embedding_dimension
         self.conditioning_length = conditioning_length
         self.use_marginal_transformation = use_marginal_transformation
+        self.sampling_memory_budget = sampling_memory_budget
 
         self.lags_seq = (
             lags_seq
@@ -384,12 +396,43 @@ class DeepVAREstimator(GluonEstimator):
             conditioning_length=self.conditioning_length,
         )
 
+    def sample_chunk_size(self) -> Optional[int]:
+        """
+        Number of sample paths to draw at once so that the sampling decoder
+        roughly fits into sampling_memory_budget: each sample path holds the
+        target history, the lags, embeddings and distribution arguments of
+        every target dimension, and the RNN states, in float32.
+        """
+        rank = getattr(self.distr_output, "rank", self.target_dim)
+        bytes_per_sample_path = (
+            4
+            * self.trainer.batch_size
+            * (
+                self.target_dim
+                * (
+                    self.history_length
+                    + self.prediction_length
+                    + len(self.lags_seq)
+                    + self.embedding_dimension
+                    + rank
+                    + 2
+                )
+                + 2 * self.num_layers * self.num_cells
+            )
+        )
+        return chunk_size_for_budget(
+            self.sampling_memory_budget,
+            bytes_per_sample_path,
+            self.num_parallel_samples,
+        )
+
     def create_predictor(
         self, transformation: Transformation, trained_network: HybridBlock
     ) -> Predictor:
         prediction_network = DeepVARPredictionNetwork(
             target_dim=self.target_dim,
             num_parallel_samples=self.num_parallel_samples,
+            sample_chunk_size=self.sample_chunk_size(),
             num_layers=self.num_layers,
             num_cells=self.num_cells,
             cell_type=self.cell_type,
@@ -26,6 +26,31 @@ from gluonts.mx.distribution import Distribution, DistributionOutput
 from gluonts.support.util import assert_shape, weighted_average
 
 
+def chunk_sizes(total: int, chunk_size: Optional[int]) -> List[int]:
+    """
+    Splits `total` into a list of chunk sizes of at most `chunk_size`
+    (a single chunk if `chunk_size` is None).
+    """
+    if chunk_size is None or chunk_size >= total:
+        return [total]
+    assert chunk_size > 0, "The value of `chunk_size` should be > 0"
+    num_full_chunks, remainder = divmod(total, chunk_size)
+    return [chunk_size] * num_full_chunks + ([remainder] if remainder else [])
+
+
+def chunk_size_for_budget(
+    memory_budget: Optional[int], bytes_per_unit: int, num_units: int
+) -> Optional[int]:
+    """
+    Returns the largest number of units of `bytes_per_unit` bytes each that
+    fit into `memory_budget` bytes, but at least one, or None if all of the
+    `num_units` units fit (or there is no budget).
+    """
+    if memory_budget is None or bytes_per_unit * num_units <= memory_budget:
+        return None
+    return max(1, memory_budget // bytes_per_unit)
+
+
 def make_rnn_cell(
     num_cells: int,
     num_layers: int,
@@ -574,8 +599,48 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
             prediction_length, target_dim).
         """
 
+        # the sample paths are drawn in chunks that all start from the same
+        # encoder state, which bounds the size of the repeated tensors
+        samples = [
+            self.sample_chunk(
+                F,
+                past_target_cdf=past_target_cdf,
+                target_dimension_indicator=target_dimension_indicator,
+                time_feat=time_feat,
+                scale=scale,
+                begin_states=begin_states,
+                num_samples=num_samples,
+            )
+            for num_samples in chunk_sizes(
+                self.num_parallel_samples, self.sample_chunk_size
+            )
+        ]
+        return samples[0] if len(samples) == 1 else F.concat(*samples, dim=1)
+
+    def sample_chunk(
+        self,
+        F,
+        past_target_cdf: Tensor,
+        target_dimension_indicator: Tensor,
+        time_feat: Tensor,
+        scale: Tensor,
+        begin_states: List[Tensor],
+        num_samples: int,
+    ) -> Tensor:
+        """
+        Computes num_samples sample paths by unrolling the RNN starting with
+        a initial input and state; the arguments are as in
+        `sampling_decoder`.
+
+        Returns
+        --------
+        sample_paths : Tensor
+            A tensor containing sampled paths. Shape: (batch_size,
+            num_samples, prediction_length, target_dim).
+        """
+
         def repeat(tensor):
-            return tensor.repeat(repeats=self.num_parallel_samples, axis=0)
+            return tensor.repeat(repeats=num_samples, axis=0)
 
         # blows-up the dimension of each tensor to
         # batch_size * self.num_sample_paths for increasing parallelism
@@ -587,7 +652,7 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
         )
 
         # slight difference for GPVAR and DeepVAR, in GPVAR, its a list
-        repeated_states = self.make_states(begin_states)
+        repeated_states = self.make_states(begin_states, num_samples)
 
         future_samples = []
 
@@ -637,15 +702,12 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
 
         # (batch_size, num_samples, prediction_length, target_dim)
         return samples.reshape(
-            shape=(
-                -1,
-                self.num_parallel_samples,
-                self.prediction_length,
-                self.target_dim,
-            )
+            shape=(-1, num_samples, self.prediction_length, self.target_dim)
         )
 
-    def make_states(self, begin_states: List[Tensor]) -> List[Tensor]:
+    def make_states(
+        self, begin_states: List[Tensor], num_samples: Optional[int] = None
+    ) -> List[Tensor]:
         """
         Repeat states to match the the shape induced by the number of sample
         paths.
@@ -654,14 +716,17 @@ class DeepVARNetwork(mx.gluon.HybridBlock):
         ----------
         begin_states
             List of initial states for the RNN layers (batch_size, num_cells)
+        num_samples
+            Number of sample paths (default: num_parallel_samples)
 
         Returns
         -------
             List of initial states
         """
+        num_samples = num_samples or self.num_parallel_samples
 
         def repeat(tensor):
-            return tensor.repeat(repeats=self.num_parallel_samples, axis=0)
+            return tensor.repeat(repeats=num_samples, axis=0)
 
         return [repeat(s) for s in begin_states]
 
@@ -805,9 +870,15 @@ class DeepVARTrainingNetwork(DeepVARNetwork):
 
 class DeepVARPredictionNetwork(DeepVARNetwork):
     @validated()
-    def __init__(self, num_parallel_samples: int, **kwargs) -> None:
+    def __init__(
+        self,
+        num_parallel_samples: int,
+        sample_chunk_size: Optional[int] = None,
+        **kwargs,
+    ) -> None:
         super().__init__(**kwargs)
         self.num_parallel_samples = num_parallel_samples
+        self.sample_chunk_size = sample_chunk_size
 
         # for decoding the lags are shifted by one,
         # at the first time-step of the decoder a lag of one corresponds to
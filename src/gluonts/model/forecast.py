@@ -13,8 +13,20 @@
 
 # Standard library imports
 import re
+from collections import OrderedDict
 from enum import Enum
-from typing import Callable, Dict, List, NamedTuple, Optional, Set, Union
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Type,
+    Union,
+)
 
 # Third-party imports
 import mxnet as mx
@@ -27,6 +39,10 @@ from gluonts.core.component import validated
 # First-party imports
 from gluonts.core.exception import GluonTSUserError
 from gluonts.mx.distribution import Distribution
+from gluonts.mx.distribution.numpy_distribution import (
+    NumPyDistribution,
+    to_numpy_distribution,
+)
 
 
 class Quantile(NamedTuple):
@@ -113,6 +129,37 @@ class Quantile(NamedTuple):
             return cls.from_str(quantile)
 
 
+def sample_quantiles(
+    samples: np.ndarray, qs: Sequence[float], axis: int = 0
+) -> np.ndarray:
+    """
+    Computes several quantiles of `samples` along `axis`, as the order
+    statistics at index ``round((num_samples - 1) * q)``.
+
+    Only the required order statistics are computed using `np.partition`,
+    instead of sorting all samples.
+
+    Parameters
+    ----------
+    samples
+        Array of samples.
+    qs
+        Quantile levels to compute.
+    axis
+        Axis of `samples` along which the samples are stored.
+
+    Returns
+    -------
+    numpy.ndarray
+        Array of the same shape as `samples`, where the samples along `axis`
+        are replaced by the values of the quantiles, in the order of `qs`.
+    """
+    num_samples = samples.shape[axis]
+    sample_idx = np.round((num_samples - 1) * np.asarray(qs)).astype(int)
+    partitioned = np.partition(samples, np.unique(sample_idx), axis=axis)
+    return np.take(partitioned, sample_idx, axis=axis)
+
+
 class Forecast:
     """
     A abstract class representing predictions.
@@ -142,6 +189,23 @@ class Forecast:
         """
         raise NotImplementedError()
 
+    def quantiles(self, qs: Sequence[Union[float, str]]) -> np.ndarray:
+        """
+        Computes several quantiles from the predicted distribution at once.
+
+        Parameters
+        ----------
+        qs
+            Quantiles to compute.
+
+        Returns
+        -------
+        numpy.ndarray
+            Values of the quantiles across the prediction range, with the
+            quantiles, in the order of `qs`, as first axis.
+        """
+        return np.stack([self.quantile(q) for q in qs])
+
     def quantile_ts(self, q: Union[float, str]) -> pd.Series:
         return pd.Series(index=self.index, data=self.quantile(q))
 
@@ -202,7 +266,7 @@ class Forecast:
         def alpha_for_percentile(p):
             return (p / 100.0) ** 0.3
 
-        ps_data = [self.quantile(p / 100.0) for p in percentiles_sorted]
+        ps_data = list(self.quantiles([p / 100.0 for p in percentiles_sorted]))
         i_p50 = len(percentiles_sorted) // 2
 
         p50_data = ps_data[i_p50]
@@ -210,7 +274,7 @@ class Forecast:
         p50_series.plot(color=color, ls="-", label=f"{label_prefix}median")
 
         if show_mean:
-            mean_data = np.mean(self._sorted_samples, axis=0)
+            mean_data = self.mean
             pd.Series(data=mean_data, index=self.index).plot(
                 color=color,
                 ls=":",
@@ -290,11 +354,12 @@ class Forecast:
             result["mean"] = self.mean.tolist()
 
         if OutputType.quantiles in config.output_types:
-            quantiles = map(Quantile.parse, config.quantiles)
+            quantiles = list(map(Quantile.parse, config.quantiles))
+            values = self.quantiles([quantile.value for quantile in quantiles])
 
             result["quantiles"] = {
-                quantile.name: self.quantile(quantile.value).tolist()
-                for quantile in quantiles
+                quantile.name: value.tolist()
+                for quantile, value in zip(quantiles, values)
             }
 
         if OutputType.samples in config.output_types:
@@ -342,8 +407,8 @@ class SampleForecast(Forecast):
         self.samples = (
             samples if (isinstance(samples, np.ndarray)) else samples.asnumpy()
         )
-        self._sorted_samples_value = None
         self._mean = None
+        self._sorted_samples = None
         self._dim = None
         self.item_id = item_id
         self.info = info
@@ -356,12 +421,6 @@ class SampleForecast(Forecast):
         assert isinstance(freq, str), "freq should be a string"
         self.freq = freq
 
-    @property
-    def _sorted_samples(self):
-        if self._sorted_samples_value is None:
-            self._sorted_samples_value = np.sort(self.samples, axis=0)
-        return self._sorted_samples_value
-
     @property
     def num_samples(self):
         """
@@ -376,6 +435,16 @@ class SampleForecast(Forecast):
         """
         return self.samples.shape[1]
 
+    @property
+    def sorted_samples(self) -> np.ndarray:
+        """
+        The samples sorted along the sample axis, which are computed once and
+        cached.
+        """
+        if self._sorted_samples is None:
+            self._sorted_samples = np.sort(self.samples, axis=0)
+        return self._sorted_samples
+
     @property
     def mean(self) -> np.ndarray:
         """
@@ -394,9 +463,11 @@ class SampleForecast(Forecast):
         return pd.Series(self.mean, index=self.index)
 
     def quantile(self, q: Union[float, str]) -> np.ndarray:
-        q = Quantile.parse(q).value
-        sample_idx = int(np.round((self.num_samples - 1) * q))
-        return self._sorted_samples[sample_idx, :]
+        return self.quantiles([q])[0]
+
+    def quantiles(self, qs: Sequence[Union[float, str]]) -> np.ndarray:
+        qs = [Quantile.parse(q).value for q in qs]
+        return sample_quantiles(self.samples, qs, axis=0)
 
     def copy_dim(self, dim: int) -> "SampleForecast":
         if len(self.samples.shape) == 2:
@@ -611,17 +682,16 @@ class DistributionForecast(Forecast):
         assert isinstance(freq, str), "freq should be a string"
         self.freq = freq
         self._mean = None
+        self._numpy_distribution = _NumPyDistributionCache(distribution)
 
     @property
     def mean(self) -> np.ndarray:
         """
         Forecast mean.
         """
-        if self._mean is not None:
-            return self._mean
-        else:
-            self._mean = self.distribution.mean.asnumpy()
-            return self._mean
+        if self._mean is None:
+            self._mean = self._numpy_distribution.mean()
+        return self._mean
 
     @property
     def mean_ts(self) -> pd.Series:
@@ -631,9 +701,19 @@ class DistributionForecast(Forecast):
         return pd.Series(self.mean, index=self.index)
 
     def quantile(self, level: Union[float, str]) -> np.ndarray:
-        level = Quantile.parse(level).value
-        q = self.distribution.quantile(mx.nd.array([level])).asnumpy()[0]
-        return q
+        return self.quantiles([level])[0]
+
+    def quantiles(self, levels: Sequence[Union[float, str]]) -> np.ndarray:
+        return self._numpy_distribution.quantile(
+            [Quantile.parse(level).value for level in levels]
+        )
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the cumulative distribution function of the forecast at
+        `x`, which has the shape of the forecast.
+        """
+        return self._numpy_distribution.cdf(x)
 
     def to_sample_forecast(self, num_samples: int = 200) -> SampleForecast:
         return SampleForecast(
@@ -645,6 +725,452 @@ class DistributionForecast(Forecast):
         )
 
 
+class _NumPyDistributionCache:
+    """
+    Evaluates the mean, cdf and quantiles of a distribution using its NumPy
+    implementation, if there is one, and MXNet otherwise. The distribution
+    parameters are only copied to NumPy on first use.
+    """
+
+    def __init__(self, distribution: Distribution) -> None:
+        self.distribution = distribution
+        self._converted = False
+        self._numpy_distribution: Optional[NumPyDistribution] = None
+
+    @property
+    def numpy_distribution(self) -> Optional[NumPyDistribution]:
+        if not self._converted:
+            self._numpy_distribution = to_numpy_distribution(self.distribution)
+            self._converted = True
+        return self._numpy_distribution
+
+    def mean(self) -> np.ndarray:
+        if self.numpy_distribution is not None:
+            return self.numpy_distribution.mean
+        return self.distribution.mean.asnumpy()
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        if self.numpy_distribution is not None:
+            return self.numpy_distribution.cdf(x)
+        return self.distribution.cdf(mx.nd.array(x)).asnumpy()
+
+    def quantile(self, levels: List[float]) -> np.ndarray:
+        if self.numpy_distribution is not None:
+            return self.numpy_distribution.quantile(np.array(levels))
+        return self.distribution.quantile(mx.nd.array(levels)).asnumpy()
+
+
+def _unvalidated(cls: Type, **kwargs):
+    """
+    Creates an instance of `cls`, whose initializer is :func:`validated`,
+    without running the validation. This must only be used for arguments
+    which are known to be valid.
+    """
+    obj = cls.__new__(cls)
+    obj.__init_args__ = OrderedDict(sorted(kwargs.items()))
+    cls.__init__.__wrapped__(obj, **kwargs)
+    return obj
+
+
+class ForecastBatch:
+    """
+    A batch of forecasts for several time series, which are of the same type
+    and shape and whose values are stored together in a single array.
+
+    Statistics like the mean or quantiles are computed for the whole batch at
+    once. Iterating over the batch yields the individual :class:`Forecast`
+    objects, which are views on the batch array and are only created when
+    needed.
+
+    Parameters
+    ----------
+    start_dates
+        start of the forecast of each time series
+    freq
+        forecast frequency
+    item_ids
+        item id of each time series, if any
+    info
+        additional information for each time series, if any
+    """
+
+    prediction_length: int
+
+    def __init__(
+        self,
+        start_dates: List[pd.Timestamp],
+        freq: str,
+        item_ids: Optional[List[Optional[str]]] = None,
+        info: Optional[List[Optional[Dict]]] = None,
+    ) -> None:
+        self.start_dates = list(start_dates)
+        self.freq = freq
+        self.item_ids = (
+            list(item_ids)
+            if item_ids is not None
+            else [None] * len(self.start_dates)
+        )
+        self.info = (
+            list(info) if info is not None else [None] * len(self.start_dates)
+        )
+        self._index = None
+
+        assert len(self.item_ids) == len(self.start_dates)
+        assert len(self.info) == len(self.start_dates)
+
+    def __len__(self) -> int:
+        return len(self.start_dates)
+
+    def __getitem__(self, i: int) -> Forecast:
+        raise NotImplementedError()
+
+    def __iter__(self) -> Iterator[Forecast]:
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def mean(self) -> np.ndarray:
+        """
+        Forecast mean of every time series, with the batch as first axis.
+        """
+        raise NotImplementedError()
+
+    def quantile(self, q: Union[float, str]) -> np.ndarray:
+        """
+        Computes a quantile of the forecast of every time series.
+
+        Parameters
+        ----------
+        q
+            Quantile to compute.
+
+        Returns
+        -------
+        numpy.ndarray
+            Value of the quantile across the prediction range, with the batch
+            as first axis.
+        """
+        raise NotImplementedError()
+
+    def quantiles(self, qs: Sequence[Union[float, str]]) -> np.ndarray:
+        """
+        Computes several quantiles of the forecast of every time series.
+
+        Parameters
+        ----------
+        qs
+            Quantiles to compute.
+
+        Returns
+        -------
+        numpy.ndarray
+            Values of the quantiles across the prediction range, with the
+            batch as first and the quantiles, in the order of `qs`, as second
+            axis.
+        """
+        return np.stack([self.quantile(q) for q in qs], axis=1)
+
+    @property
+    def index(self) -> List[pd.DatetimeIndex]:
+        """
+        Prediction range of every time series; time series with the same
+        start date share the same index object.
+        """
+        if self._index is None:
+            ranges: Dict[pd.Timestamp, pd.DatetimeIndex] = {}
+            for start_date in self.start_dates:
+                if start_date not in ranges:
+                    ranges[start_date] = pd.date_range(
+                        start_date,
+                        periods=self.prediction_length,
+                        freq=self.freq,
+                    )
+            self._index = [ranges[start] for start in self.start_dates]
+        return self._index
+
+    def as_json_dicts(self, config: "Config") -> List[dict]:
+        """
+        Same as calling :meth:`Forecast.as_json_dict` for every forecast of
+        the batch.
+        """
+        results: List[dict] = [{} for _ in range(len(self))]
+
+        if OutputType.mean in config.output_types:
+            for result, mean in zip(results, self.mean.tolist()):
+                result["mean"] = mean
+
+        if OutputType.quantiles in config.output_types:
+            quantiles = list(map(Quantile.parse, config.quantiles))
+            values = self.quantiles([quantile.value for quantile in quantiles])
+
+            for result, item_values in zip(results, values.tolist()):
+                result["quantiles"] = {
+                    quantile.name: value
+                    for quantile, value in zip(quantiles, item_values)
+                }
+
+        if OutputType.samples in config.output_types:
+            for result in results:
+                result["samples"] = []
+
+        return results
+
+
+class SampleForecastBatch(ForecastBatch):
+    """
+    A :class:`ForecastBatch` of :class:`SampleForecast` objects.
+
+    Parameters
+    ----------
+    samples
+        Array of size (batch_size, num_samples, prediction_length) (1D case)
+        or (batch_size, num_samples, prediction_length, target_dim)
+        (multivariate case)
+    start_dates
+        start of the forecast of each time series
+    freq
+        forecast frequency
+    item_ids
+        item id of each time series, if any
+    info
+        additional information for each time series, if any
+    """
+
+    def __init__(
+        self,
+        samples: np.ndarray,
+        start_dates: List[pd.Timestamp],
+        freq: str,
+        item_ids: Optional[List[Optional[str]]] = None,
+        info: Optional[List[Optional[Dict]]] = None,
+    ) -> None:
+        super().__init__(
+            start_dates=start_dates, freq=freq, item_ids=item_ids, info=info
+        )
+        assert samples.ndim in (3, 4), (
+            "samples should be a 3-dimensional or 4-dimensional array. "
+            f"Dimensions found: {samples.ndim}"
+        )
+        assert samples.shape[0] == len(self.start_dates)
+
+        self.samples = samples
+        self._sorted_samples = None
+
+    @property
+    def num_samples(self) -> int:
+        return self.samples.shape[1]
+
+    @property
+    def prediction_length(self) -> int:
+        return self.samples.shape[2]
+
+    @property
+    def sorted_samples(self) -> np.ndarray:
+        """
+        The samples sorted along the sample axis, which are computed once and
+        cached.
+        """
+        if self._sorted_samples is None:
+            self._sorted_samples = np.sort(self.samples, axis=1)
+        return self._sorted_samples
+
+    def __getitem__(self, i: int) -> SampleForecast:
+        return _unvalidated(
+            SampleForecast,
+            samples=self.samples[i],
+            start_date=self.start_dates[i],
+            freq=self.freq,
+            item_id=self.item_ids[i],
+            info=self.info[i],
+        )
+
+    @property
+    def mean(self) -> np.ndarray:
+        return np.mean(self.samples, axis=1)
+
+    def quantile(self, q: Union[float, str]) -> np.ndarray:
+        return self.quantiles([q])[:, 0]
+
+    def quantiles(self, qs: Sequence[Union[float, str]]) -> np.ndarray:
+        qs = [Quantile.parse(q).value for q in qs]
+        return sample_quantiles(self.samples, qs, axis=1)
+
+    def as_json_dicts(self, config: "Config") -> List[dict]:
+        results = super().as_json_dicts(config)
+
+        if OutputType.samples in config.output_types:
+            for result, samples in zip(results, self.samples.tolist()):
+                result["samples"] = samples
+
+        return results
+
+
+class QuantileForecastBatch(ForecastBatch):
+    """
+    A :class:`ForecastBatch` of :class:`QuantileForecast` objects.
+
+    Parameters
+    ----------
+    forecast_arrays
+        Array of size (batch_size, num_keys, prediction_length)
+    start_dates
+        start of the forecast of each time series
+    freq
+        forecast frequency
+    forecast_keys
+        A list of quantiles of the form '0.1', '0.9', etc.,
+        and potentially 'mean'. Each entry corresponds to one array along the
+        second axis of forecast_arrays.
+    item_ids
+        item id of each time series, if any
+    info
+        additional information for each time series, if any
+    """
+
+    def __init__(
+        self,
+        forecast_arrays: np.ndarray,
+        start_dates: List[pd.Timestamp],
+        freq: str,
+        forecast_keys: List[str],
+        item_ids: Optional[List[Optional[str]]] = None,
+        info: Optional[List[Optional[Dict]]] = None,
+    ) -> None:
+        super().__init__(
+            start_dates=start_dates, freq=freq, item_ids=item_ids, info=info
+        )
+        self.forecast_arrays = forecast_arrays
+        self.forecast_keys = forecast_keys
+        self._key_index = {
+            Quantile.from_str(key).name if key != "mean" else key: i
+            for i, key in enumerate(forecast_keys)
+        }
+
+        assert forecast_arrays.shape[:2] == (
+            len(self.start_dates),
+            len(forecast_keys),
+        ), (
+            f"The forecast_arrays (shape={forecast_arrays.shape}) should "
+            f"have shape (batch_size, len(forecast_keys), ...)"
+        )
+
+    @property
+    def prediction_length(self) -> int:
+        return self.forecast_arrays.shape[-1]
+
+    def __getitem__(self, i: int) -> QuantileForecast:
+        return QuantileForecast(
+            self.forecast_arrays[i],
+            start_date=self.start_dates[i],
+            freq=self.freq,
+            forecast_keys=self.forecast_keys,
+            item_id=self.item_ids[i],
+            info=self.info[i],
+        )
+
+    def quantile(self, q: Union[float, str]) -> np.ndarray:
+        q_str = Quantile.parse(q).name
+        if q_str not in self._key_index:
+            # We return nan here such that evaluation runs through
+            return np.full(
+                (len(self),) + self.forecast_arrays.shape[2:], np.nan
+            )
+        return self.forecast_arrays[:, self._key_index[q_str]]
+
+    @property
+    def mean(self) -> np.ndarray:
+        if "mean" in self._key_index:
+            return self.forecast_arrays[:, self._key_index["mean"]]
+
+        return self.quantile("p50")
+
+
+class DistributionForecastBatch(ForecastBatch):
+    """
+    A :class:`ForecastBatch` of :class:`DistributionForecast` objects, which
+    keeps a single distribution for the whole batch.
+
+    Parameters
+    ----------
+    distribution
+        Distribution object, whose first axis is the batch axis, i.e. drawing
+        `num_samples` samples from it results in an array of shape
+        (num_samples, batch_size, prediction_length, ...).
+    start_dates
+        start of the forecast of each time series
+    freq
+        forecast frequency
+    item_ids
+        item id of each time series, if any
+    info
+        additional information for each time series, if any
+    """
+
+    def __init__(
+        self,
+        distribution: Distribution,
+        start_dates: List[pd.Timestamp],
+        freq: str,
+        item_ids: Optional[List[Optional[str]]] = None,
+        info: Optional[List[Optional[Dict]]] = None,
+    ) -> None:
+        super().__init__(
+            start_dates=start_dates, freq=freq, item_ids=item_ids, info=info
+        )
+        self.distribution = distribution
+        self.shape = distribution.batch_shape + distribution.event_shape
+        self._numpy_distribution = _NumPyDistributionCache(distribution)
+
+        assert self.shape[0] == len(self.start_dates)
+
+    @property
+    def prediction_length(self) -> int:
+        return self.shape[1]
+
+    def __getitem__(self, i: int) -> DistributionForecast:
+        return _unvalidated(
+            DistributionForecast,
+            distribution=self.distribution[i],
+            start_date=self.start_dates[i],
+            freq=self.freq,
+            item_id=self.item_ids[i],
+            info=self.info[i],
+        )
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self._numpy_distribution.mean()
+
+    def quantile(self, q: Union[float, str]) -> np.ndarray:
+        return self.quantiles([q])[:, 0]
+
+    def quantiles(self, qs: Sequence[Union[float, str]]) -> np.ndarray:
+        levels = [Quantile.parse(q).value for q in qs]
+        return np.moveaxis(self._numpy_distribution.quantile(levels), 0, 1)
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the cumulative distribution function of every forecast at
+        `x`, which has shape (batch_size, prediction_length, ...).
+        """
+        return self._numpy_distribution.cdf(x)
+
+    def to_sample_forecast_batch(
+        self, num_samples: int = 200
+    ) -> SampleForecastBatch:
+        """
+        Draws `num_samples` samples for every forecast of the batch at once.
+        """
+        samples = self.distribution.sample(num_samples).asnumpy()
+        return SampleForecastBatch(
+            samples=np.swapaxes(samples, 0, 1),
+            start_dates=self.start_dates,
+            freq=self.freq,
+            item_ids=self.item_ids,
+            info=self.info,
+        )
+
+
 class OutputType(str, Enum):
     mean = "mean"
     samples = "samples"
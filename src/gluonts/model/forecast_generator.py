@@ -24,9 +24,11 @@ from gluonts.dataset.field_names import FieldName
 from gluonts.dataset.loader import InferenceDataLoader
 from gluonts.model.forecast import (
     DistributionForecast,
+    DistributionForecastBatch,
     Forecast,
-    QuantileForecast,
-    SampleForecast,
+    ForecastBatch,
+    QuantileForecastBatch,
+    SampleForecastBatch,
 )
 
 # First-party imports
@@ -74,9 +76,43 @@ def _extract_instances(x: Any) -> Any:
         assert False
 
 
+def _unpad(x: Any, num_instances: int) -> Any:
+    """
+    Helper function to drop the outputs of the rows added to a batch by
+    :func:`gluonts.dataset.loader.pad_batch`, i.e. all but the first
+    `num_instances` rows of every (nested) tensor.
+    """
+    if isinstance(x, (np.ndarray, mx.nd.NDArray)):
+        return x if x.shape[0] == num_instances else x[:num_instances]
+    elif isinstance(x, tuple):
+        return tuple(_unpad(y, num_instances) for y in x)
+    elif isinstance(x, list):
+        return [_unpad(y, num_instances) for y in x]
+    elif x is None:
+        return None
+    else:
+        assert False
+
+
+def _batch_metadata(batch: DataEntry) -> dict:
+    """
+    Helper function to extract the per-instance metadata of the forecasts
+    from a batch, as keyword arguments to :class:`ForecastBatch`.
+    """
+    return dict(
+        start_dates=batch["forecast_start"],
+        item_ids=batch.get(FieldName.ITEM_ID),
+        info=batch.get("info"),
+    )
+
+
 class ForecastGenerator:
     """
     Classes used to bring the output of a network into a class.
+
+    Generators which keep the output of a whole batch together additionally
+    implement `generate_batches`, which yields :class:`ForecastBatch` objects
+    instead of individual forecasts.
     """
 
     def __call__(
@@ -107,33 +143,43 @@ class DistributionForecastGenerator(ForecastGenerator):
         num_samples: Optional[int],
         **kwargs
     ) -> Iterator[DistributionForecast]:
+        for forecast_batch in self.generate_batches(
+            inference_data_loader=inference_data_loader,
+            prediction_net=prediction_net,
+            input_names=input_names,
+            freq=freq,
+            output_transform=output_transform,
+            num_samples=num_samples,
+            **kwargs,
+        ):
+            yield from forecast_batch
+
+    def generate_batches(
+        self,
+        inference_data_loader: InferenceDataLoader,
+        prediction_net: BlockType,
+        input_names: List[str],
+        freq: str,
+        output_transform: Optional[OutputTransform],
+        num_samples: Optional[int],
+        **kwargs
+    ) -> Iterator[ForecastBatch]:
         for batch in inference_data_loader:
             inputs = [batch[k] for k in input_names]
             outputs = prediction_net(*inputs)
             if output_transform is not None:
                 outputs = output_transform(batch, outputs)
+            outputs = _unpad(outputs, len(batch["forecast_start"]))
             if num_samples:
                 log_once(
                     "Forecast is not sample based. Ignoring parameter `num_samples` from predict method."
                 )
 
-            distributions = [
-                self.distr_output.distribution(*u)
-                for u in _extract_instances(outputs)
-            ]
-
-            i = -1
-            for i, distr in enumerate(distributions):
-                yield DistributionForecast(
-                    distr,
-                    start_date=batch["forecast_start"][i],
-                    freq=freq,
-                    item_id=batch[FieldName.ITEM_ID][i]
-                    if FieldName.ITEM_ID in batch
-                    else None,
-                    info=batch["info"][i] if "info" in batch else None,
-                )
-            assert i + 1 == len(batch["forecast_start"])
+            yield DistributionForecastBatch(
+                self.distr_output.distribution(*outputs),
+                freq=freq,
+                **_batch_metadata(batch),
+            )
 
 
 class QuantileForecastGenerator(ForecastGenerator):
@@ -151,30 +197,45 @@ class QuantileForecastGenerator(ForecastGenerator):
         num_samples: Optional[int],
         **kwargs
     ) -> Iterator[Forecast]:
+        for forecast_batch in self.generate_batches(
+            inference_data_loader=inference_data_loader,
+            prediction_net=prediction_net,
+            input_names=input_names,
+            freq=freq,
+            output_transform=output_transform,
+            num_samples=num_samples,
+            **kwargs,
+        ):
+            yield from forecast_batch
+
+    def generate_batches(
+        self,
+        inference_data_loader: InferenceDataLoader,
+        prediction_net: BlockType,
+        input_names: List[str],
+        freq: str,
+        output_transform: Optional[OutputTransform],
+        num_samples: Optional[int],
+        **kwargs
+    ) -> Iterator[ForecastBatch]:
         for batch in inference_data_loader:
             inputs = [batch[k] for k in input_names]
             outputs = prediction_net(*inputs).asnumpy()
             if output_transform is not None:
                 outputs = output_transform(batch, outputs)
+            outputs = _unpad(outputs, len(batch["forecast_start"]))
 
             if num_samples:
                 log_once(
                     "Forecast is not sample based. Ignoring parameter `num_samples` from predict method."
                 )
 
-            i = -1
-            for i, output in enumerate(outputs):
-                yield QuantileForecast(
-                    output,
-                    start_date=batch["forecast_start"][i],
-                    freq=freq,
-                    item_id=batch[FieldName.ITEM_ID][i]
-                    if FieldName.ITEM_ID in batch
-                    else None,
-                    info=batch["info"][i] if "info" in batch else None,
-                    forecast_keys=self.quantiles,
-                )
-            assert i + 1 == len(batch["forecast_start"])
+            yield QuantileForecastBatch(
+                np.asarray(outputs),
+                freq=freq,
+                forecast_keys=self.quantiles,
+                **_batch_metadata(batch),
+            )
 
 
 class SampleForecastGenerator(ForecastGenerator):
@@ -192,11 +253,34 @@ class SampleForecastGenerator(ForecastGenerator):
         num_samples: Optional[int],
         **kwargs
     ) -> Iterator[Forecast]:
+        for forecast_batch in self.generate_batches(
+            inference_data_loader=inference_data_loader,
+            prediction_net=prediction_net,
+            input_names=input_names,
+            freq=freq,
+            output_transform=output_transform,
+            num_samples=num_samples,
+            **kwargs,
+        ):
+            yield from forecast_batch
+
+    def generate_batches(
+        self,
+        inference_data_loader: InferenceDataLoader,
+        prediction_net: BlockType,
+        input_names: List[str],
+        freq: str,
+        output_transform: Optional[OutputTransform],
+        num_samples: Optional[int],
+        **kwargs
+    ) -> Iterator[ForecastBatch]:
         for batch in inference_data_loader:
             inputs = [batch[k] for k in input_names]
+            num_instances = len(batch["forecast_start"])
             outputs = prediction_net(*inputs).asnumpy()
             if output_transform is not None:
                 outputs = output_transform(batch, outputs)
+            outputs = _unpad(outputs, num_instances)
             if num_samples:
                 num_collected_samples = outputs[0].shape[0]
                 collected_samples = [outputs]
@@ -204,22 +288,14 @@ class SampleForecastGenerator(ForecastGenerator):
                     outputs = prediction_net(*inputs).asnumpy()
                     if output_transform is not None:
                         outputs = output_transform(batch, outputs)
+                    outputs = _unpad(outputs, num_instances)
                     collected_samples.append(outputs)
                     num_collected_samples += outputs[0].shape[0]
-                outputs = [
-                    np.concatenate(s)[:num_samples]
-                    for s in zip(*collected_samples)
+                outputs = np.concatenate(collected_samples, axis=1)[
+                    :, :num_samples
                 ]
-                assert len(outputs[0]) == num_samples
-            i = -1
-            for i, output in enumerate(outputs):
-                yield SampleForecast(
-                    output,
-                    start_date=batch["forecast_start"][i],
-                    freq=freq,
-                    item_id=batch[FieldName.ITEM_ID][i]
-                    if FieldName.ITEM_ID in batch
-                    else None,
-                    info=batch["info"][i] if "info" in batch else None,
-                )
-            assert i + 1 == len(batch["forecast_start"])
+                assert outputs.shape[1] == num_samples
+
+            yield SampleForecastBatch(
+                np.asarray(outputs), freq=freq, **_batch_metadata(batch)
+            )
@@ -92,6 +92,15 @@ class GaussianProcessEstimator(GluonEstimator):
     num_parallel_samples
         Number of evaluation samples per time series to increase parallelism during inference.
         This is a model optimization that does not affect the accuracy (default: 100).
+    cholesky_cache_size
+        Number of Cholesky factors of training kernel matrices the predictor
+        caches, so that series sharing hyper-parameters and time grid are
+        only factorised once; 0 disables the cache (default: 32).
+    use_toeplitz
+        Whether the predictor factorises the training kernel matrix of
+        stationary kernels (RBF, periodic) on evenly spaced time features in
+        :math:`O(n^2)` using its Toeplitz structure, which makes context lengths
+        in the thousands practical (default: True).
     """
 
     @validated()
@@ -110,6 +119,8 @@ class GaussianProcessEstimator(GluonEstimator):
         sample_noise: bool = True,
         time_features: Optional[List[TimeFeature]] = None,
         num_parallel_samples: int = 100,
+        cholesky_cache_size: int = 32,
+        use_toeplitz: bool = True,
     ) -> None:
         self.float_type = dtype
         super().__init__(trainer=trainer, dtype=self.float_type)
@@ -124,6 +135,9 @@ class GaussianProcessEstimator(GluonEstimator):
         assert (
             num_parallel_samples > 0
         ), "The value of `num_parallel_samples` should be > 0"
+        assert (
+            cholesky_cache_size >= 0
+        ), "The value of `cholesky_cache_size` should be >= 0"
 
         self.freq = freq
         self.prediction_length = prediction_length
@@ -142,6 +156,8 @@ class GaussianProcessEstimator(GluonEstimator):
             else time_features_from_frequency_str(self.freq)
         )
         self.num_parallel_samples = num_parallel_samples
+        self.cholesky_cache_size = cholesky_cache_size
+        self.use_toeplitz = use_toeplitz
 
     def create_transformation(self) -> Transformation:
         return Chain(
@@ -201,6 +217,8 @@ class GaussianProcessEstimator(GluonEstimator):
             max_iter_jitter=self.max_iter_jitter,
             jitter_method=self.jitter_method,
             sample_noise=self.sample_noise,
+            cholesky_cache_size=self.cholesky_cache_size,
+            use_toeplitz=self.use_toeplitz,
         )
 
         copy_parameters(
@@ -23,7 +23,7 @@ from gluonts.model.common import Tensor
 from gluonts.mx.distribution.distribution import softplus
 from gluonts.mx.kernels import KernelOutputDict
 
-from .gaussian_process import GaussianProcess
+from .gaussian_process import CholeskyCache, GaussianProcess
 
 
 class GaussianProcessNetworkBase(mx.gluon.HybridBlock):
@@ -219,7 +219,13 @@ class GaussianProcessTrainingNetwork(GaussianProcessNetworkBase):
 class GaussianProcessPredictionNetwork(GaussianProcessNetworkBase):
     @validated()
     def __init__(
-        self, num_parallel_samples: int, sample_noise: bool, *args, **kwargs
+        self,
+        num_parallel_samples: int,
+        sample_noise: bool,
+        *args,
+        cholesky_cache_size: int = 0,
+        use_toeplitz: bool = False,
+        **kwargs,
     ) -> None:
         r"""
         Parameters
@@ -228,6 +234,12 @@ class GaussianProcessPredictionNetwork(GaussianProcessNetworkBase):
             Number of samples to be drawn.
         sample_noise
             Boolean to determine whether to add :math:`\sigma^2I` to the predictive covariance matrix.
+        cholesky_cache_size
+            Number of Cholesky factors of training kernel matrices to cache
+            across batches, or 0 to disable the cache.
+        use_toeplitz
+            Whether to exploit the Toeplitz structure of stationary kernels on
+            evenly spaced inputs to factorise the training kernel matrix.
         *args
             Variable length argument list.
         **kwargs
@@ -236,6 +248,12 @@ class GaussianProcessPredictionNetwork(GaussianProcessNetworkBase):
         super().__init__(*args, **kwargs)
         self.num_parallel_samples = num_parallel_samples
         self.sample_noise = sample_noise
+        self.use_toeplitz = use_toeplitz
+        self.cholesky_cache = (
+            CholeskyCache(cholesky_cache_size)
+            if cholesky_cache_size > 0
+            else None
+        )
 
     # noinspection PyMethodOverriding,PyPep8Naming
     def hybrid_forward(
@@ -279,6 +297,8 @@ class GaussianProcessPredictionNetwork(GaussianProcessNetworkBase):
             max_iter_jitter=self.max_iter_jitter,
             jitter_method=self.jitter_method,
             sample_noise=self.sample_noise,
+            cholesky_cache=self.cholesky_cache,
+            use_toeplitz=self.use_toeplitz,
         )
         samples, _, _ = gp.exact_inference(
             past_time_feat, past_target, future_time_feat
@@ -12,6 +12,8 @@
 # permissions and limitations under the License.
 
 # Standard library imports
+import hashlib
+from collections import OrderedDict
 from typing import List, Optional, Tuple
 
 # Third-party imports
@@ -28,9 +30,69 @@ from gluonts.support.linalg_util import (
     batch_diagonal,
     jitter_cholesky,
     jitter_cholesky_eig,
+    toeplitz_cholesky,
 )
 
 
+class CholeskyCache:
+    """
+    Least recently used cache of Cholesky factors of noisy training kernel
+    matrices, used at inference time, when series sharing hyper-parameters and
+    time grid would otherwise be factorised again for every batch.
+
+    Parameters
+    ----------
+    max_size
+        Maximum number of factors kept; each takes
+        num_data_points * num_data_points floats.
+    """
+
+    def __init__(self, max_size: int = 32) -> None:
+        assert max_size > 0, "The value of `max_size` should be > 0"
+        self.max_size = max_size
+        self.factors: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        factor = self.factors.get(key)
+        if factor is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.factors.move_to_end(key)
+        return factor
+
+    def put(self, key: bytes, factor: np.ndarray) -> None:
+        self.factors[key] = factor
+        self.factors.move_to_end(key)
+        while len(self.factors) > self.max_size:
+            self.factors.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.factors)
+
+
+def is_regular_grid(x: np.ndarray, rtol: float = 1e-6) -> bool:
+    """
+    Checks whether the inputs of every series in the batch are evenly spaced,
+    i.e. :math:`x_i = x_0 + i d` for some step :math:`d`.
+
+    Parameters
+    ----------
+    x
+        Features of shape (batch_size, num_data_points, num_features).
+    """
+    num_data_points = x.shape[1]
+    if num_data_points < 2:
+        return True
+    step = x[:, 1:2, :] - x[:, 0:1, :]
+    grid = x[:, 0:1, :] + np.arange(num_data_points)[None, :, None] * step
+    return bool(
+        np.allclose(x, grid, rtol=rtol, atol=rtol * (np.abs(step).max() + 1))
+    )
+
+
 class GaussianProcess:
     # noinspection PyMethodOverriding, PyPep8Naming
     def __init__(
@@ -48,6 +110,8 @@ class GaussianProcess:
         diag_weight: float = 1e-6,
         increase_jitter: int = 10,
         sample_noise: bool = True,
+        cholesky_cache: Optional[CholeskyCache] = None,
+        use_toeplitz: bool = False,
         F=None,
     ) -> None:
         r"""
@@ -81,6 +145,15 @@ class GaussianProcess:
             Each iteration multiply by jitter by this amount
         sample_noise
             Boolean to determine whether to add :math:`\sigma^2I` to the predictive covariance matrix.
+        cholesky_cache
+            Cache for the Cholesky factors of the training kernel matrices in
+            `exact_inference`, keyed by the noisy kernel matrix, or only its
+            first column on regular grids, i.e. by the hyper-parameters and the
+            grid.  Only used with the NDArray API.
+        use_toeplitz
+            Whether to factorise the training kernel matrix of stationary
+            kernels on evenly spaced inputs in :math:`O(n^2)` by exploiting its
+            Toeplitz structure.  Only used with the NDArray API.
         F
             A module that can either refer to the Symbol API or the NDArray
             API in MXNet.
@@ -110,6 +183,8 @@ class GaussianProcess:
         self.diag_weight = diag_weight
         self.increase_jitter = increase_jitter
         self.sample_noise = sample_noise
+        self.cholesky_cache = cholesky_cache
+        self.use_toeplitz = use_toeplitz
 
     # noinspection PyMethodOverriding,PyPep8Naming
     def _compute_cholesky_gp(
@@ -171,6 +246,90 @@ class GaussianProcess:
         else:
             return self.F.linalg.potrf(kernel_matrix)
 
+    def _train_cholesky(self, x_train: Tensor) -> Tensor:
+        r"""
+        Computes the Cholesky factor of the noisy training kernel matrix like
+        `_compute_cholesky_gp`, but factorises every distinct matrix in the
+        batch only once, reuses factors from `cholesky_cache` and uses the
+        Schur algorithm for Toeplitz matrices when possible.
+
+        Parameters
+        ----------
+        x_train
+            Training set of features of shape (batch_size, context_length, num_features).
+
+        Returns
+        -------
+        Tensor
+            Cholesky factor :math:`L` with :math:`LL^T = K + \sigma^2 I`
+            of shape (batch_size, context_length, context_length).
+        """
+        F = self.F
+        noise = (self.sigma ** 2).asnumpy().reshape(-1)
+        toeplitz = (
+            self.use_toeplitz
+            and self.kernel.stationary
+            and is_regular_grid(x_train.asnumpy())
+        )
+        if toeplitz:
+            # First row of the kernel matrix, which determines it entirely
+            kernel = self.kernel.kernel_matrix(
+                x_train.slice_axis(axis=1, begin=0, end=1), x_train
+            ).asnumpy()[:, 0, :]
+            kernel[:, 0] += noise
+        else:
+            kernel = self.kernel.kernel_matrix(x_train, x_train).asnumpy()
+            kernel += noise[:, None, None] * np.eye(self.context_length)
+
+        keys = [
+            hashlib.sha1(
+                bytes([toeplitz]) + np.ascontiguousarray(matrix).tobytes()
+            ).digest()
+            for matrix in kernel
+        ]
+        factors = np.empty(
+            (len(keys), self.context_length, self.context_length),
+            dtype=self.float_type,
+        )
+        missing: OrderedDict = OrderedDict()
+        for i, key in enumerate(keys):
+            factor = (
+                self.cholesky_cache.get(key)
+                if self.cholesky_cache is not None and key not in missing
+                else None
+            )
+            if factor is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                factors[i] = factor
+
+        if missing:
+            first = [indices[0] for indices in missing.values()]
+            if toeplitz:
+                new_factors = toeplitz_cholesky(
+                    kernel[first],
+                    self.max_iter_jitter,
+                    self.neg_tol,
+                    self.diag_weight,
+                    self.increase_jitter,
+                )
+            else:
+                new_factors = self._compute_cholesky_gp(
+                    F.array(
+                        kernel[first], ctx=self.ctx, dtype=self.float_type
+                    ),
+                    self.context_length,
+                    noise=False,
+                ).asnumpy()
+            for (key, indices), factor in zip(missing.items(), new_factors):
+                factors[indices] = factor
+                if self.cholesky_cache is not None:
+                    # a copy, so that the cache does not keep the arrays of
+                    # the whole batch alive
+                    self.cholesky_cache.put(key, factor.copy())
+
+        return F.array(factors, ctx=self.ctx, dtype=self.float_type)
+
     def log_prob(self, x_train: Tensor, y_train: Tensor) -> Tensor:
         r"""
         This method computes the negative marginal log likelihood
@@ -285,9 +444,15 @@ class GaussianProcess:
             self.prediction_length is not None
         ), "The value of `prediction_length` must be set."
         # Compute Cholesky factorization of training kernel matrix
-        l_train = self._compute_cholesky_gp(
-            self.kernel.kernel_matrix(x_train, x_train), self.context_length
-        )
+        if self.F is mx.nd and (
+            self.cholesky_cache is not None or self.use_toeplitz
+        ):
+            l_train = self._train_cholesky(x_train)
+        else:
+            l_train = self._compute_cholesky_gp(
+                self.kernel.kernel_matrix(x_train, x_train),
+                self.context_length,
+            )
 
         lower_tri_solve = self.F.linalg.trsm(
             l_train, self.kernel.kernel_matrix(x_train, x_test)
@@ -12,7 +12,7 @@
 # permissions and limitations under the License.
 
 # Standard library imports
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 # Third-party imports
 from mxnet.gluon import HybridBlock
@@ -25,6 +25,7 @@ from gluonts.model.deepvar._estimator import (
     get_lags_for_frequency,
     time_features_from_frequency_str,
 )
+from gluonts.model.deepvar._network import chunk_size_for_budget
 from gluonts.model.estimator import GluonEstimator
 from gluonts.model.predictor import Predictor, RepresentableBlockPredictor
 
@@ -125,6 +126,12 @@ class GPVAREstimator(GluonEstimator):
     use_marginal_transformation
         Whether marginal (CDFtoGaussianTransform) transformation is used by the
         model
+    sampling_memory_budget
+        Approximate number of bytes that the tensors of the sampling decoder
+        may take for a batch of time series at prediction time. The target
+        dimensions, and if needed the sample paths, are then decoded in
+        chunks that fit the budget, all starting from the same encoder state
+        (default: None, in which case everything is decoded at once)
     """
 
     @validated()
@@ -151,6 +158,7 @@ class GPVAREstimator(GluonEstimator):
         time_features: Optional[List[TimeFeature]] = None,
         conditioning_length: int = 100,
         use_marginal_transformation: bool = False,
+        sampling_memory_budget: Optional[int] = None,
     ) -> None:
         super().__init__(trainer=trainer)
 
@@ -188,6 +196,7 @@ class GPVAREstimator(GluonEstimator):
         self.cell_type = cell_type
         self.num_parallel_samples = num_parallel_samples
         self.dropout_rate = dropout_rate
+        self.sampling_memory_budget = sampling_memory_budget
 
         self.lags_seq = (
             lags_seq
@@ -306,13 +315,51 @@ class GPVAREstimator(GluonEstimator):
             conditioning_length=self.conditioning_length,
         )
 
+    def sampling_chunk_sizes(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Numbers of sample paths and of target dimensions to decode at once
+        so that the sampling decoder roughly fits into
+        sampling_memory_budget. Each target dimension of a sample path holds
+        its target history, lags, embedding, distribution arguments and RNN
+        states, in float32. Chunking the target dimensions does not add any
+        operations, since the RNN is unrolled for each one separately, so
+        the sample paths are only chunked if a single target dimension of
+        all of them does not fit.
+        """
+        bytes_per_target_dim = (
+            4
+            * self.trainer.batch_size
+            * (
+                self.history_length
+                + self.prediction_length
+                + len(self.lags_seq)
+                + 5 * self.distr_output.rank
+                + 2
+                + (2 * self.num_layers + 1) * self.num_cells
+            )
+        )
+        target_dim_chunk_size = chunk_size_for_budget(
+            self.sampling_memory_budget,
+            self.num_parallel_samples * bytes_per_target_dim,
+            self.target_dim,
+        )
+        sample_chunk_size = chunk_size_for_budget(
+            self.sampling_memory_budget,
+            (target_dim_chunk_size or self.target_dim) * bytes_per_target_dim,
+            self.num_parallel_samples,
+        )
+        return sample_chunk_size, target_dim_chunk_size
+
     def create_predictor(
         self, transformation: Transformation, trained_network: HybridBlock
     ) -> Predictor:
+        sample_chunk_size, target_dim_chunk_size = self.sampling_chunk_sizes()
         prediction_network = GPVARPredictionNetwork(
             target_dim=self.target_dim,
             target_dim_sample=self.target_dim,
             num_parallel_samples=self.num_parallel_samples,
+            sample_chunk_size=sample_chunk_size,
+            target_dim_chunk_size=target_dim_chunk_size,
             num_layers=self.num_layers,
             num_cells=self.num_cells,
             cell_type=self.cell_type,
@@ -16,10 +16,11 @@ from typing import List, Optional, Tuple
 
 # Third-party imports
 import mxnet as mx
+import numpy as np
 
 from gluonts.core.component import validated
 from gluonts.model.common import Tensor
-from gluonts.model.deepvar._network import DeepVARNetwork
+from gluonts.model.deepvar._network import DeepVARNetwork, chunk_sizes
 
 # First-party imports
 from gluonts.mx.distribution.distribution import getF
@@ -65,7 +66,9 @@ class GPVARNetwork(DeepVARNetwork):
         unroll_length
             length to unroll
         begin_state
-            State to start the unrolling of the RNN
+            State to start the unrolling of the RNN, one per target
+            dimension; if given, only as many target dimensions as there are
+            states are unrolled
 
         Returns
         -------
@@ -95,7 +98,12 @@ class GPVARNetwork(DeepVARNetwork):
 
         inputs_seq = []
 
-        for i in range(self.target_dim_sample):
+        num_dims = (
+            len(begin_state)
+            if begin_state is not None
+            else self.target_dim_sample
+        )
+        for i in range(num_dims):
             # (batch_size, sub_seq_len, input_dim)
             inputs = F.concat(
                 lags_scaled.slice_axis(axis=2, begin=i, end=i + 1).squeeze(
@@ -126,7 +134,7 @@ class GPVARNetwork(DeepVARNetwork):
             inputs_seq.append(inputs)
 
         # (batch_size, seq_len, target_dim, num_cells)
-        outputs = F.stack(*outputs, num_args=self.target_dim_sample, axis=2)
+        outputs = F.stack(*outputs, num_args=num_dims, axis=2)
 
         return outputs, states, lags_scaled, time_feat
 
@@ -138,6 +146,7 @@ class GPVARNetwork(DeepVARNetwork):
         lags_scaled: Tensor,
         target_dimension_indicator: Tensor,
         seq_len: int,
+        target_dim: Optional[int] = None,
     ):
         """
         Returns the distribution of GPVAR with respect to the RNN outputs.
@@ -157,6 +166,8 @@ class GPVARNetwork(DeepVARNetwork):
             Indices of the target dimension (batch_size, target_dim)
         seq_len
             Length of the sequences
+        target_dim
+            Number of target dimensions (default: target_dim_sample)
 
         Returns
         -------
@@ -166,6 +177,7 @@ class GPVARNetwork(DeepVARNetwork):
             Distribution arguments
         """
         F = getF(rnn_outputs)
+        target_dim = target_dim or self.target_dim_sample
 
         # (batch_size, target_dim, embed_dim)
         index_embeddings = self.embed(target_dimension_indicator)
@@ -177,7 +189,7 @@ class GPVARNetwork(DeepVARNetwork):
 
         # broadcast to (batch_size, seq_len, target_dim, num_features)
         time_features = time_features.expand_dims(axis=2).repeat(
-            axis=2, repeats=self.target_dim_sample
+            axis=2, repeats=target_dim
         )
 
         # (batch_size, seq_len, target_dim, embed_dim + num_cells + num_inputs)
@@ -190,7 +202,7 @@ class GPVARNetwork(DeepVARNetwork):
 
         # compute likelihood of target given the predicted parameters
         distr = self.distr_output.distribution(
-            distr_args, scale=scale, dim=self.target_dim_sample
+            distr_args, scale=scale, dim=target_dim
         )
 
         return distr, distr_args
@@ -268,16 +280,26 @@ class GPVARTrainingNetwork(GPVARNetwork):
 
 class GPVARPredictionNetwork(GPVARNetwork):
     @validated()
-    def __init__(self, num_parallel_samples: int, **kwargs) -> None:
+    def __init__(
+        self,
+        num_parallel_samples: int,
+        sample_chunk_size: Optional[int] = None,
+        target_dim_chunk_size: Optional[int] = None,
+        **kwargs,
+    ) -> None:
         super().__init__(**kwargs)
         self.num_parallel_samples = num_parallel_samples
+        self.sample_chunk_size = sample_chunk_size
+        self.target_dim_chunk_size = target_dim_chunk_size
 
         # for decoding the lags are shifted by one,
         # at the first time-step of the decoder a lag of one corresponds to the
         # last target value
         self.shifted_lags = [l - 1 for l in self.lags_seq]
 
-    def make_states(self, begin_states: List[Tensor]) -> List[List[Tensor]]:
+    def make_states(
+        self, begin_states: List[Tensor], num_samples: Optional[int] = None
+    ) -> List[List[Tensor]]:
         """
         Repeat states to match the the shape induced by the number of sample
         paths.
@@ -286,17 +308,179 @@ class GPVARPredictionNetwork(GPVARNetwork):
         ----------
         begin_states
             List of initial states for the RNN layers (batch_size, num_cells)
+        num_samples
+            Number of sample paths (default: num_parallel_samples)
 
         Returns
         -------
             List of list of initial states
         """
+        num_samples = num_samples or self.num_parallel_samples
 
         def repeat(tensor):
-            return tensor.repeat(repeats=self.num_parallel_samples, axis=0)
+            return tensor.repeat(repeats=num_samples, axis=0)
 
         return [[repeat(s) for s in states] for states in begin_states]
 
+    def sample_chunk(
+        self,
+        F,
+        past_target_cdf: Tensor,
+        target_dimension_indicator: Tensor,
+        time_feat: Tensor,
+        scale: Tensor,
+        begin_states: List[List[Tensor]],
+        num_samples: int,
+    ) -> Tensor:
+        """
+        Computes num_samples sample paths, see `DeepVARNetwork.sample_chunk`.
+
+        If target_dim_chunk_size is set, the target dimensions are decoded
+        in chunks of that size one after the other. Since the RNN of each
+        target dimension only depends on the lags of that dimension, this is
+        exact as long as the standard normal factors of the low-rank
+        covariance are shared by all chunks, which is why they are drawn
+        upfront for the whole prediction range.
+        """
+        if (
+            self.target_dim_chunk_size is None
+            or self.target_dim_chunk_size >= self.target_dim
+        ):
+            return super().sample_chunk(
+                F,
+                past_target_cdf=past_target_cdf,
+                target_dimension_indicator=target_dimension_indicator,
+                time_feat=time_feat,
+                scale=scale,
+                begin_states=begin_states,
+                num_samples=num_samples,
+            )
+
+        def repeat(tensor):
+            return tensor.repeat(repeats=num_samples, axis=0)
+
+        repeated_time_feat = repeat(time_feat)
+        repeated_states = self.make_states(begin_states, num_samples)
+
+        # (batch_size * num_samples, prediction_length, rank)
+        zeros = F.zeros_like(
+            repeated_time_feat.slice_axis(axis=2, begin=0, end=1)
+        ).broadcast_axes(axis=2, size=self.distr_output.rank)
+        factor_noise = F.sample_normal(mu=zeros, sigma=F.ones_like(zeros))
+
+        samples = []
+        begin = 0
+        for target_dim in chunk_sizes(
+            self.target_dim, self.target_dim_chunk_size
+        ):
+            end = begin + target_dim
+
+            def dims(tensor):
+                return repeat(tensor.slice_axis(axis=-1, begin=begin, end=end))
+
+            samples.append(
+                self.decode_target_dims(
+                    F,
+                    past_target_cdf=dims(past_target_cdf),
+                    target_dimension_indicator=dims(
+                        target_dimension_indicator
+                    ),
+                    time_feat=repeated_time_feat,
+                    scale=dims(scale),
+                    states=repeated_states[begin:end],
+                    factor_noise=factor_noise,
+                    target_dim=target_dim,
+                )
+            )
+            begin = end
+
+        # (batch_size, num_samples, prediction_length, target_dim)
+        return F.concat(*samples, dim=-1).reshape(
+            shape=(-1, num_samples, self.prediction_length, self.target_dim)
+        )
+
+    def decode_target_dims(
+        self,
+        F,
+        past_target_cdf: Tensor,
+        target_dimension_indicator: Tensor,
+        time_feat: Tensor,
+        scale: Tensor,
+        states: List[List[Tensor]],
+        factor_noise: Tensor,
+        target_dim: int,
+    ) -> Tensor:
+        """
+        Unrolls the RNN over the prediction range for a subset of the target
+        dimensions, all tensors having batch_size * num_samples rows.
+
+        Parameters
+        ----------
+        past_target_cdf
+            (batch_size * num_samples, history_length, target_dim)
+        target_dimension_indicator
+            (batch_size * num_samples, target_dim)
+        time_feat
+            (batch_size * num_samples, prediction_length, num_features)
+        scale
+            (batch_size * num_samples, 1, target_dim)
+        states
+            Initial states of the RNN of each target dimension
+        factor_noise
+            Standard normal factors of the low-rank covariance
+            (batch_size * num_samples, prediction_length, rank)
+        target_dim
+            Number of target dimensions
+
+        Returns
+        -------
+        Tensor
+            Samples (batch_size * num_samples, prediction_length, target_dim)
+        """
+        future_samples = []
+        for k in range(self.prediction_length):
+            lags = self.get_lagged_subsequences(
+                F=F,
+                sequence=past_target_cdf,
+                sequence_length=self.history_length + k,
+                indices=self.shifted_lags,
+                subsequences_length=1,
+            )
+
+            rnn_outputs, states, lags_scaled, inputs = self.unroll(
+                F=F,
+                begin_state=states,
+                lags=lags,
+                scale=scale,
+                time_feat=time_feat.slice_axis(axis=1, begin=k, end=k + 1),
+                target_dimension_indicator=target_dimension_indicator,
+                unroll_length=1,
+            )
+
+            distr, _ = self.distr(
+                time_features=inputs,
+                rnn_outputs=rnn_outputs,
+                scale=scale,
+                target_dimension_indicator=target_dimension_indicator,
+                lags_scaled=lags_scaled,
+                seq_len=1,
+                target_dim=target_dim,
+            )
+
+            # the factors of the low-rank covariance are shared by all
+            # target dimensions; (batch_size, 1, target_dim)
+            new_samples = distr.sample_rep(
+                dtype=np.float32,
+                factor_noise=factor_noise.slice_axis(
+                    axis=1, begin=k, end=k + 1
+                ),
+            )
+
+            future_samples.append(new_samples)
+            past_target_cdf = F.concat(past_target_cdf, new_samples, dim=1)
+
+        return F.concat(*future_samples, dim=1)
+
     # noinspection PyMethodOverriding,PyPep8Naming
     def hybrid_forward(
         self,
@@ -18,7 +18,7 @@ import os
 # Standard library imports
 from itertools import product
 from pathlib import Path
-from typing import Callable, Iterator, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 # Third-party imports
 import mxnet as mx
@@ -32,22 +32,38 @@ from gluonts.core.component import from_hyperparameters, validated
 from gluonts.core.exception import GluonTSHyperparametersError
 from gluonts.core.serde import dump_json, load_json
 from gluonts.dataset.common import Dataset
-from gluonts.dataset.field_names import FieldName
-from gluonts.dataset.loader import DataBatch
+from gluonts.dataset.loader import DataBatch, InferenceDataLoader
 from gluonts.model.estimator import Estimator
-from gluonts.model.forecast import Forecast, SampleForecast
+from gluonts.model.forecast import Forecast, SampleForecastBatch
+from gluonts.model.forecast_generator import _batch_metadata
 from gluonts.model.predictor import Predictor, RepresentableBlockPredictor
 from gluonts.mx.trainer import Trainer
 
 from ._estimator import NBEATSEstimator
 
 # Relative imports
-from ._network import VALID_LOSS_FUNCTIONS
+from ._network import VALID_LOSS_FUNCTIONS, NBEATSNetwork
 
 # None is also a valid parameter
 AGGREGATION_METHODS = "median", "mean", "none"
 
 
+def _architecture(network: NBEATSNetwork) -> tuple:
+    """
+    Key identifying networks which can be stacked together.
+    """
+    return (
+        network.context_length,
+        network.prediction_length,
+        tuple(network.widths),
+        tuple(network.num_blocks),
+        tuple(network.num_block_layers),
+        tuple(network.expansion_coefficient_lengths),
+        tuple(network.sharing),
+        tuple(network.stack_types),
+    )
+
+
 class NBEATSEnsemblePredictor(Predictor):
     """"
     An ensemble predictor for N-BEATS.
@@ -71,6 +87,13 @@ class NBEATSEnsemblePredictor(Predictor):
         The method by which to aggregate the individual predictions of the models.
         Either 'median', 'mean' or 'none', in which case no aggregation happens.
         Default is 'median'.
+
+    For prediction, the input transformation of the model with the longest
+    context length is applied once, and models of the same architecture
+    (i.e. which differ only in their loss function or initialization) are
+    evaluated together by a network created with :meth:`NBEATSNetwork.stack`
+    the first time :meth:`predict` is called, which holds a copy of their
+    weights.
     """
 
     def __init__(
@@ -86,6 +109,9 @@ class NBEATSEnsemblePredictor(Predictor):
 
         self.predictors = predictors
         self.aggregation_method = aggregation_method
+        self._stacked_networks: Optional[
+            List[Tuple[List[int], NBEATSNetwork]]
+        ] = None
 
     def set_aggregation_method(self, aggregation_method: str):
         assert aggregation_method in AGGREGATION_METHODS
@@ -157,55 +183,98 @@ class NBEATSEnsemblePredictor(Predictor):
                 "NBEATSEnsemblePredictor does not support sampling. "
                 "Therefore 'num_samples' will be ignored and set to 1."
             )
-        iterators = []
-
-        # create the iterators from the predictors
-        for predictor in self.predictors:
-            iterators.append(predictor.predict(dataset, num_samples=1))
+        for forecast_batch in self.predict_batches(dataset, **kwargs):
+            yield from forecast_batch
 
-        # we always have to predict for one series in the dataset with
-        # all models and return it as a 'SampleForecast' so that it is
-        # clear that all these prediction concern the same series
-        for item in dataset:
-            output = []
-            start_date = None
-
-            for iterator in iterators:
-                prediction = next(iterator)
-
-                # on order to avoid mypys complaints
-                assert isinstance(prediction, SampleForecast)
-
-                output.append(prediction.samples)
+    def predict_batches(
+        self, dataset: Dataset, **kwargs
+    ) -> Iterator[SampleForecastBatch]:
+        """
+        Same as :meth:`predict`, but yields the forecasts of each inference
+        batch together as a :class:`SampleForecastBatch`.
+        """
+        # the past targets of the longest context contain all the others
+        predictor = max(
+            self.predictors, key=lambda p: p.prediction_net.context_length
+        )
+        inference_data_loader = InferenceDataLoader(
+            dataset,
+            transform=predictor.input_transform,
+            batch_size=predictor.batch_size,
+            ctx=predictor.ctx,
+            dtype=predictor.dtype,
+            **kwargs,
+        )
 
-                # get the forecast start date
-                if start_date is None:
-                    start_date = prediction.start_date
-            output = np.stack(output, axis=0)
+        stacked_networks = self._get_stacked_networks(predictor.ctx)
+        indices = np.concatenate([indices for indices, _ in stacked_networks])
+        order = np.argsort(indices)
+
+        for batch in inference_data_loader:
+            past_target = batch["past_target"]
+            # (num_predictors, batch_size, prediction_length)
+            outputs = []
+            for indices, network in stacked_networks:
+                stacked_past_target = self._stacked_past_target(
+                    past_target, network, len(indices)
+                )
+                # the future target is not used for prediction
+                outputs.append(
+                    network(stacked_past_target, stacked_past_target)
+                )
+            output = mx.nd.concat(*outputs, dim=0).asnumpy()[order]
 
             # aggregating output of different models
             # default according to paper is median,
             # but we can also make use of not aggregating
             if self.aggregation_method == "median":
-                output = np.median(output, axis=0)
+                samples = np.median(output, axis=0)[:, None, :]
             elif self.aggregation_method == "mean":
-                output = np.mean(output, axis=0)
+                samples = np.mean(output, axis=0)[:, None, :]
             else:  # "none": do not aggregate
-                pass
-
-            # on order to avoid mypys complaints
-            assert start_date is not None
-
-            yield SampleForecast(
-                output,
-                start_date=start_date,
-                freq=start_date.freqstr,
-                item_id=item[FieldName.ITEM_ID]
-                if FieldName.ITEM_ID in item
-                else None,
-                info=item["info"] if "info" in item else None,
+                samples = np.swapaxes(output, 0, 1)[:, :, None, :]
+
+            yield SampleForecastBatch(
+                samples, freq=self.freq, **_batch_metadata(batch)
             )
 
+    @staticmethod
+    def _stacked_past_target(
+        past_target: mx.nd.NDArray, network: NBEATSNetwork, num_models: int
+    ) -> mx.nd.NDArray:
+        """
+        The last `context_length` values of the past targets, repeated for
+        each of the stacked models.
+        """
+        past_target = past_target.slice_axis(
+            axis=1, begin=-network.context_length, end=None
+        )
+        return mx.nd.broadcast_to(
+            past_target.expand_dims(axis=0),
+            shape=(num_models,) + past_target.shape,
+        )
+
+    def _get_stacked_networks(
+        self, ctx: mx.Context
+    ) -> List[Tuple[List[int], NBEATSNetwork]]:
+        if self._stacked_networks is None:
+            groups: Dict[tuple, List[int]] = {}
+            for index, predictor in enumerate(self.predictors):
+                key = _architecture(predictor.prediction_net)
+                groups.setdefault(key, []).append(index)
+
+            self._stacked_networks = [
+                (
+                    indices,
+                    NBEATSNetwork.stack(
+                        [self.predictors[i].prediction_net for i in indices],
+                        ctx,
+                    ),
+                )
+                for indices in groups.values()
+            ]
+        return self._stacked_networks
+
     def __eq__(self, that):
         """
         Unfortunately it cannot be guaranteed that two predictors are not equal if this returns false
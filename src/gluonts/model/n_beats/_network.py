@@ -12,7 +12,7 @@
 # permissions and limitations under the License.
 
 # Standard library imports
-from typing import List
+from typing import List, Optional
 
 # Third-party imports
 import mxnet as mx
@@ -79,6 +79,58 @@ def trend_model(
     return T
 
 
+class StackedDense(mx.gluon.HybridBlock):
+    """
+    The dense layers at the same position of several networks of the same
+    architecture, applied together with a batched matrix product.
+
+    Inputs of shape (num_models, batch_size, in_units) are mapped to outputs
+    of shape (num_models, batch_size, units), each model with its own
+    weights of shape (units, in_units) and biases of shape (units,).
+
+    Parameters
+    ----------
+    num_models
+        Number of stacked layers.
+    units
+        Dimensionality of the output of each layer.
+    activation
+        Activation function applied to the output, if any.
+    kwargs
+        Arguments passed to 'HybridBlock'.
+    """
+
+    def __init__(
+        self,
+        num_models: int,
+        units: int,
+        activation: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.activation = activation
+
+        with self.name_scope():
+            self.weight = self.params.get(
+                "weight",
+                shape=(num_models, units, 0),
+                allow_deferred_init=True,
+            )
+            self.bias = self.params.get(
+                "bias", shape=(num_models, units), allow_deferred_init=True
+            )
+
+    # noinspection PyMethodOverriding,PyPep8Naming
+    def hybrid_forward(self, F, x: Tensor, weight: Tensor, bias: Tensor):
+        y = F.broadcast_add(
+            F.batch_dot(x, weight, transpose_b=True),
+            F.expand_dims(bias, axis=1),
+        )
+        if self.activation is not None:
+            y = F.Activation(y, act_type=self.activation)
+        return y
+
+
 class NBEATSBlock(mx.gluon.HybridBlock):
     """
     The NBEATS Block as described in the paper: https://arxiv.org/abs/1905.10437.
@@ -100,6 +152,10 @@ class NBEATSBlock(mx.gluon.HybridBlock):
         Also known as 'lookback period'.
     has_backcast
         Only the last block of the network doesn't.
+    num_models
+        If given, the block holds the weights of this many blocks of the same
+        architecture, as :class:`StackedDense` layers, and maps inputs of
+        shape (num_models, batch_size, context_length).
     kwargs
         Arguments passed to 'HybridBlock'.
     """
@@ -115,10 +171,12 @@ class NBEATSBlock(mx.gluon.HybridBlock):
         prediction_length: int,
         context_length: int,
         has_backcast: bool,
+        num_models: Optional[int] = None,
         **kwargs,
     ) -> None:
         super().__init__(**kwargs)
 
+        self.num_models = num_models
         self.width = width
         self.num_block_layers = num_block_layers
         self.expansion_coefficient_length = expansion_coefficient_length
@@ -135,7 +193,7 @@ class NBEATSBlock(mx.gluon.HybridBlock):
             self.fc_stack = mx.gluon.nn.HybridSequential()
             for i in range(self.num_block_layers):
                 self.fc_stack.add(
-                    mx.gluon.nn.Dense(
+                    self.dense(
                         units=self.width,
                         activation="relu",
                         prefix=f"fc_stack_dense_{i}_",
@@ -153,6 +211,23 @@ class NBEATSBlock(mx.gluon.HybridBlock):
             self.backcast_basis = None
             self.forecast_basis = None
 
+    def dense(
+        self, units: int, activation: Optional[str] = None, prefix=None
+    ) -> mx.gluon.HybridBlock:
+        """
+        Creates a dense layer of the block, stacked if `num_models` is set.
+        """
+        if self.num_models is None:
+            return mx.gluon.nn.Dense(
+                units=units, activation=activation, prefix=prefix
+            )
+        return StackedDense(
+            num_models=self.num_models,
+            units=units,
+            activation=activation,
+            prefix=prefix,
+        )
+
     # This function is called upon first call of the hybrid_forward method
     def initialize_basis(self, F):
         pass
@@ -195,6 +270,10 @@ class NBEATSGenericBlock(NBEATSBlock):
         Also known as 'lookback period'.
     has_backcast
         Only the last block of the network doesn't.
+    num_models
+        If given, the block holds the weights of this many blocks of the same
+        architecture, as :class:`StackedDense` layers, and maps inputs of
+        shape (num_models, batch_size, context_length).
     kwargs
         Arguments passed to 'HybridBlock'.
     """
@@ -207,19 +286,19 @@ class NBEATSGenericBlock(NBEATSBlock):
 
         with self.name_scope():
             if self.has_backcast:
-                self.theta_backcast = mx.gluon.nn.Dense(
+                self.theta_backcast = self.dense(
                     units=self.expansion_coefficient_length,
                     prefix=f"theta_backcast_dense_",  # linear activation:
                 )
-                self.backcast = mx.gluon.nn.Dense(
+                self.backcast = self.dense(
                     units=self.context_length,
                     prefix=f"backcast_dense_",  # linear activation:
                 )
-            self.theta_forecast = mx.gluon.nn.Dense(
+            self.theta_forecast = self.dense(
                 units=self.expansion_coefficient_length,
                 prefix=f"theta_forecast_dense_",  # linear activation:
             )
-            self.forecast = mx.gluon.nn.Dense(
+            self.forecast = self.dense(
                 units=self.prediction_length,
                 prefix=f"theta_dense_",  # linear activation:
             )
@@ -245,6 +324,10 @@ class NBEATSSeasonalBlock(NBEATSBlock):
         Also known as 'lookback period'.
     has_backcast
         Only the last block of the network doesn't.
+    num_models
+        If given, the block holds the weights of this many blocks of the same
+        architecture, as :class:`StackedDense` layers, and maps inputs of
+        shape (num_models, batch_size, context_length).
     kwargs
         Arguments passed to 'HybridBlock'.
     """
@@ -262,7 +345,7 @@ class NBEATSSeasonalBlock(NBEATSBlock):
 
         with self.name_scope():
             if self.has_backcast:
-                self.theta_backcast = mx.gluon.nn.Dense(
+                self.theta_backcast = self.dense(
                     units=2 * self.num_coefficients,
                     prefix=f"theta_backcast_dense_",  # linear activation:
                 )
@@ -270,7 +353,7 @@ class NBEATSSeasonalBlock(NBEATSBlock):
                     lambda F, thetas: F.dot(thetas, self.backcast_basis),
                     prefix=f"backcast_lambda_",
                 )
-            self.theta_forecast = mx.gluon.nn.Dense(
+            self.theta_forecast = self.dense(
                 units=2 * self.num_coefficients,
                 prefix=f"theta_forecast_dense_",  # linear activation:
             )
@@ -321,6 +404,10 @@ class NBEATSTrendBlock(NBEATSBlock):
         Also known as 'lookback period'.
     has_backcast
         Only the last block of the network doesn't.
+    num_models
+        If given, the block holds the weights of this many blocks of the same
+        architecture, as :class:`StackedDense` layers, and maps inputs of
+        shape (num_models, batch_size, context_length).
     kwargs
         Arguments passed to 'HybridBlock'.
     """
@@ -333,7 +420,7 @@ class NBEATSTrendBlock(NBEATSBlock):
 
         with self.name_scope():
             if self.has_backcast:
-                self.theta_backcast = mx.gluon.nn.Dense(
+                self.theta_backcast = self.dense(
                     units=self.expansion_coefficient_length,
                     prefix=f"theta_backcast_dense_",  # linear activation:
                 )
@@ -341,7 +428,7 @@ class NBEATSTrendBlock(NBEATSBlock):
                     lambda F, thetas: F.dot(thetas, self.backcast_basis),
                     prefix=f"backcast_lambda_",
                 )
-            self.theta_forecast = mx.gluon.nn.Dense(
+            self.theta_forecast = self.dense(
                 units=self.expansion_coefficient_length,
                 prefix=f"theta_forecast_dense_",  # linear activation:
             )
@@ -419,6 +506,11 @@ class NBEATSNetwork(mx.gluon.HybridBlock):
         A list of strings of length 1 or 'num_stacks'.
         Default and recommended value for generic mode: ["G"]
         Recommended value for interpretable mode: ["T","S"]
+    num_models
+        If given, the network holds the weights of this many networks of the
+        same architecture and maps past targets of shape (num_models,
+        batch_size, context_length) to forecasts of shape (num_models,
+        batch_size, prediction_length); see :meth:`stack`.
     kwargs
         Arguments passed to 'HybridBlock'.
     """
@@ -437,11 +529,13 @@ class NBEATSNetwork(mx.gluon.HybridBlock):
         expansion_coefficient_lengths: List[int],
         sharing: List[bool],
         stack_types: List[str],
+        num_models: Optional[int] = None,
         **kwargs,
     ) -> None:
         super().__init__(**kwargs)
 
         self.num_stacks = num_stacks
+        self.num_models = num_models
         self.widths = widths
         self.num_blocks = num_blocks
         self.num_block_layers = num_block_layers
@@ -478,6 +572,7 @@ class NBEATSNetwork(mx.gluon.HybridBlock):
                             prediction_length=prediction_length,
                             context_length=context_length,
                             has_backcast=has_backcast,
+                            num_models=num_models,
                             params=params,
                         )
                     elif self.stack_types[stack_id] == "S":
@@ -490,6 +585,7 @@ class NBEATSNetwork(mx.gluon.HybridBlock):
                             prediction_length=prediction_length,
                             context_length=context_length,
                             has_backcast=has_backcast,
+                            num_models=num_models,
                             params=params,
                         )
                     else:  # self.stack_types[stack_id] == "T"
@@ -502,6 +598,7 @@ class NBEATSNetwork(mx.gluon.HybridBlock):
                             prediction_length=prediction_length,
                             context_length=context_length,
                             has_backcast=has_backcast,
+                            num_models=num_models,
                             params=params,
                         )
 
@@ -525,6 +622,42 @@ class NBEATSNetwork(mx.gluon.HybridBlock):
             # connect last block
             return forecast + self.net_blocks[-1](backcast)
 
+    @classmethod
+    def stack(
+        cls, networks: List["NBEATSNetwork"], ctx: mx.Context
+    ) -> "NBEATSNetwork":
+        """
+        Creates a network with `num_models` set, which computes the forecasts
+        of all the given networks, of the same architecture, in one pass. The
+        weights of the networks are copied into its stacked parameters.
+        """
+        first = networks[0]
+        stacked = NBEATSNetwork(
+            prediction_length=first.prediction_length,
+            context_length=first.context_length,
+            num_stacks=first.num_stacks,
+            widths=first.widths,
+            num_blocks=first.num_blocks,
+            num_block_layers=first.num_block_layers,
+            expansion_coefficient_lengths=first.expansion_coefficient_lengths,
+            sharing=first.sharing,
+            stack_types=first.stack_types,
+            num_models=len(networks),
+        )
+
+        # the parameters of networks of the same architecture are collected
+        # in the same order
+        for param, member_params in zip(
+            stacked.collect_params().values(),
+            zip(*[network.collect_params().values() for network in networks]),
+        ):
+            data = mx.nd.stack(*[p.data(ctx) for p in member_params])
+            param.shape = data.shape
+            param.initialize(init=mx.init.Zero(), ctx=ctx)
+            param.set_data(data)
+
+        return stacked
+
     def smape_loss(self, F, forecast: Tensor, future_target: Tensor) -> Tensor:
         r"""
         .. math::
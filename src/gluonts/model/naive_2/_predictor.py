@@ -12,14 +12,11 @@
 # permissions and limitations under the License.
 
 # Standard library imports
-from typing import Iterator, Optional
+from typing import Optional, Union
 
 # Third-party imports
 import numpy as np
 
-# Third-party imports
-import statsmodels.api as sm
-
 # First-party imports
 from gluonts.core.component import validated
 from gluonts.dataset.common import DataEntry
@@ -28,33 +25,176 @@ from gluonts.model.predictor import RepresentablePredictor
 from gluonts.support.pandas import forecast_start
 from gluonts.time_feature import get_seasonality
 
+# Histories at least this long use the FFT to compute auto-correlations.
+FFT_MIN_LENGTH = 4096
+
+
+def autocorrelation(
+    x: np.ndarray, nlags: int, fft: bool = False
+) -> np.ndarray:
+    """
+    Computes the (biased) auto-correlation function of `x` for lags
+    0, ..., `nlags` along the last axis, like
+    `statsmodels.tsa.stattools.acf` does.
+
+    Parameters
+    ----------
+    x
+        time series, shape: (..., length)
+    nlags
+        the largest lag to compute the auto-correlation for
+    fft
+        compute the auto-covariance via the FFT, which is faster for long
+        time series
+
+    Returns
+    -------
+    np.ndarray
+        auto-correlations, shape: (..., nlags + 1)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    length = x.shape[-1]
+    x_demeaned = x - np.mean(x, axis=-1, keepdims=True)
+
+    if fft:
+        # zero-padding to at least twice the length avoids circular overlap
+        num_fft = 2 ** int(np.ceil(np.log2(2 * length - 1)))
+        x_fft = np.fft.rfft(x_demeaned, n=num_fft, axis=-1)
+        auto_covariances = np.fft.irfft(
+            x_fft * np.conj(x_fft), n=num_fft, axis=-1
+        )[..., : nlags + 1]
+    else:
+        # row `lag` of `lagged` holds the series shifted by `lag` steps
+        padded = np.concatenate(
+            [x_demeaned, np.zeros(x.shape[:-1] + (nlags,))], axis=-1
+        )
+        lagged = np.lib.stride_tricks.as_strided(
+            padded,
+            shape=x.shape[:-1] + (nlags + 1, length),
+            strides=padded.strides + padded.strides[-1:],
+            writeable=False,
+        )
+        auto_covariances = (lagged @ x_demeaned[..., np.newaxis])[..., 0]
+
+    auto_covariances /= length
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return auto_covariances / auto_covariances[..., :1]
+
 
-def seasonality_test(past_ts_data: np.array, season_length: int) -> bool:
+def seasonality_test(
+    past_ts_data: np.ndarray, season_length: int, fft: Optional[bool] = None
+) -> Union[bool, np.ndarray]:
     """
     Test the time-series for seasonal patterns by performing a 90% auto-correlation test:
 
     As described here: https://www.m4.unic.ac.cy/wp-content/uploads/2018/03/M4-Competitors-Guide.pdf
     Code based on: https://github.com/Mcompetitions/M4-methods/blob/master/Benchmarks%20and%20Evaluation.R
+
+    A batch of time series of equal length, of shape (..., length), can be
+    tested at once, in which case an array of test results is returned. If
+    `fft` is not specified, the FFT is used for histories of at least
+    `FFT_MIN_LENGTH` points.
     """
     critical_z_score = 1.645  # corresponds to 90% confidence interval
-    if len(past_ts_data) < 3 * season_length:
-        return False
+    past_ts_data = np.asarray(past_ts_data, dtype=np.float64)
+    length = past_ts_data.shape[-1]
+
+    if length < 3 * season_length:
+        is_seasonal = np.zeros(past_ts_data.shape[:-1], dtype=bool)
     else:
         # calculate auto-correlation for lags up to season_length
-        auto_correlations = sm.tsa.stattools.acf(
-            past_ts_data, fft=False, nlags=season_length
+        auto_correlations = autocorrelation(
+            past_ts_data,
+            nlags=season_length,
+            fft=fft if fft is not None else length >= FFT_MIN_LENGTH,
         )
-        auto_correlations[1:] = 2 * auto_correlations[1:] ** 2
+        auto_correlations[..., 1:] = 2 * auto_correlations[..., 1:] ** 2
         limit = (
             critical_z_score
-            / np.sqrt(len(past_ts_data))
-            * np.sqrt(np.cumsum(auto_correlations))
+            / np.sqrt(length)
+            * np.sqrt(np.cumsum(auto_correlations, axis=-1))
+        )
+        with np.errstate(invalid="ignore"):
+            is_seasonal = (
+                abs(auto_correlations[..., season_length])
+                > limit[..., season_length]
+            )
+
+    return is_seasonal if is_seasonal.ndim > 0 else bool(is_seasonal)
+
+
+def multiplicative_seasonality(
+    x: np.ndarray, season_length: int
+) -> np.ndarray:
+    """
+    Computes the seasonal component of the classical multiplicative
+    decomposition of `x` based on moving averages, like
+    `statsmodels.tsa.seasonal.seasonal_decompose(x, period=season_length,
+    model="multiplicative").seasonal` does.
+
+    Parameters
+    ----------
+    x
+        positive time series, shape: (..., length)
+    season_length
+        length of the seasonal period
+
+    Returns
+    -------
+    np.ndarray
+        seasonal component, shape: (..., length)
+    """
+    x = np.asarray(x, dtype=np.float64)
+    length = x.shape[-1]
+
+    if not np.all(np.isfinite(x)):
+        raise ValueError("This function does not handle missing values")
+    if np.any(x <= 0):
+        raise ValueError(
+            "Multiplicative seasonality is not appropriate "
+            "for zero and negative values"
         )
-        is_seasonal = (
-            abs(auto_correlations[season_length]) > limit[season_length]
+    if length < 2 * season_length:
+        raise ValueError(
+            f"x must have 2 complete cycles requires {2 * season_length} "
+            f"observations. x only has {length} observation(s)"
         )
 
-    return is_seasonal
+    # centered moving average; for an even season length the weights are
+    # split at the ends
+    if season_length % 2 == 0:
+        weights = (
+            np.array([0.5] + [1.0] * (season_length - 1) + [0.5])
+            / season_length
+        )
+    else:
+        weights = np.repeat(1.0 / season_length, season_length)
+
+    num_weights = len(weights)
+    windows = np.lib.stride_tricks.as_strided(
+        x,
+        shape=x.shape[:-1] + (length - num_weights + 1, num_weights),
+        strides=x.strides + x.strides[-1:],
+        writeable=False,
+    )
+    trend = np.full_like(x, np.nan)
+    trim = (num_weights - 1) // 2
+    trend[..., trim : length - trim] = windows @ weights
+
+    detrended = x / trend
+
+    # average of the detrended series for each position in the season,
+    # ignoring the NaNs at the ends of the trend
+    num_periods = -(-length // season_length)
+    padded = np.full(x.shape[:-1] + (num_periods * season_length,), np.nan)
+    padded[..., :length] = detrended
+    period_averages = np.nanmean(
+        padded.reshape(x.shape[:-1] + (num_periods, season_length)), axis=-2
+    )
+    period_averages /= np.mean(period_averages, axis=-1, keepdims=True)
+
+    return np.tile(period_averages, num_periods)[..., :length]
 
 
 def naive_2(
@@ -70,6 +210,10 @@ def naive_2(
 
     As described here: https://www.m4.unic.ac.cy/wp-content/uploads/2018/03/M4-Competitors-Guide.pdf
     Code based on: https://github.com/Mcompetitions/M4-methods/blob/master/Benchmarks%20and%20Evaluation.R
+
+    A batch of time series of equal length, of shape (..., length), can be
+    forecast at once, which results in forecasts of shape
+    (..., prediction_length).
     """
     assert freq is not None or season_length is not None, (
         "Either the frequency or season length of the time series "
@@ -78,37 +222,41 @@ def naive_2(
     season_length = (
         season_length if season_length is not None else get_seasonality(freq)
     )
-    has_seasonality = False
+    past_ts_data = np.asarray(past_ts_data)
+    batch_shape = past_ts_data.shape[:-1]
+    has_seasonality = np.zeros(batch_shape, dtype=bool)
 
     if season_length > 1:
-        has_seasonality = seasonality_test(past_ts_data, season_length)
+        has_seasonality = np.asarray(
+            seasonality_test(past_ts_data, season_length)
+        )
 
     # it has seasonality, then calculate the multiplicative seasonal component
-    if has_seasonality:
+    seasonality_normed_context = past_ts_data.astype(np.float64)
+    multiplicative_seasonal_component = np.ones(
+        batch_shape + (prediction_length,)
+    )  # i.e. no seasonality component
+
+    if np.any(has_seasonality):
         # TODO: think about maybe only using past_ts_data[- max(5*season_length, 2*prediction_length):] for speedup
-        seasonal_decomposition = sm.tsa.seasonal_decompose(
-            x=past_ts_data, period=season_length, model="multiplicative"
-        ).seasonal
-        seasonality_normed_context = past_ts_data / seasonal_decomposition
+        seasonal_decomposition = multiplicative_seasonality(
+            past_ts_data[has_seasonality], season_length
+        )
+        seasonality_normed_context[has_seasonality] = (
+            past_ts_data[has_seasonality] / seasonal_decomposition
+        )
 
-        last_period = seasonal_decomposition[-season_length:]
-        num_required_periods = (prediction_length // len(last_period)) + 1
+        last_period = seasonal_decomposition[..., -season_length:]
+        num_required_periods = (prediction_length // season_length) + 1
 
-        multiplicative_seasonal_component = np.tile(
+        multiplicative_seasonal_component[has_seasonality] = np.tile(
             last_period, num_required_periods
-        )[:prediction_length]
-    else:
-        seasonality_normed_context = past_ts_data
-        multiplicative_seasonal_component = np.ones(
-            prediction_length
-        )  # i.e. no seasonality component
+        )[..., :prediction_length]
 
     # calculate naive forecast: (last value prediction_length times)
-    naive_forecast = (
-        np.ones(prediction_length) * seasonality_normed_context[-1]
-    )
+    naive_forecast = seasonality_normed_context[..., -1:]
 
-    forecast = np.mean(naive_forecast) * multiplicative_seasonal_component
+    forecast = naive_forecast * multiplicative_seasonal_component
 
     return forecast
 
@@ -12,7 +12,7 @@
 # permissions and limitations under the License.
 
 # Standard library imports
-from typing import Callable, Iterator, List, cast
+from typing import Callable, Iterator, List
 
 # Third-party imports
 import numpy as np
@@ -24,18 +24,131 @@ from gluonts.model.forecast import SampleForecast
 # Relative imports
 from ._weighted_sampler import WeightedSampler
 
+# A (log) kernel maps feature arrays of shape (..., num_features) to arrays
+# of shape (...); leading axes are broadcast, so the same kernel can be
+# applied to a single pair of time points or to all pairs at once.
+Kernel = Callable[[np.ndarray, np.ndarray], np.ndarray]
+
 
 class NPTS:
     """
     Here we collect all the methods needed for generating NPTS Forecasts.
     """
 
+    @staticmethod
+    def compute_weight_matrix(
+        train_features: np.ndarray,
+        pred_features: np.ndarray,
+        target_isnan: np.ndarray,
+        kernel: Kernel,
+        do_exp: bool = True,
+    ) -> np.ndarray:
+        """
+        Given the (logarithm of) kernel as well as training and prediction
+        range features, this method computes the sampling weights for all
+        time steps in the prediction range at once.
+
+        Row `pred_t` of the result holds the weights used for prediction time
+        step `pred_t`, over all the training targets followed by all the
+        predictions; the weights of predictions from `pred_t` onwards are
+        always zero, since they are not available at time step `pred_t`.
+
+        Any number of leading (batch) axes is supported, which allows
+        computing the weights of several time series of equal length in one
+        go.
+
+        Parameters
+        ----------
+        train_features
+            shape: (..., num_features, train_length)
+        pred_features
+            shape: (..., num_features, prediction_length)
+        target_isnan
+            boolean mask of the NaN positions of the target,
+            shape: (..., train_length)
+        kernel
+            kernel function that maps pairs of arrays to real numbers,
+            reducing over the last axis
+        do_exp:
+            exponentiate the weights in case of exponential kernel
+            (for numerical stability we do this here)
+
+        Returns
+        -------
+        np.ndarray
+            sampling weights,
+            shape: (..., prediction_length, train_length + prediction_length)
+        """
+
+        assert np.ndim(train_features) >= 2, (
+            "Train features should be 2D-array where the rows represent "
+            "features and columns the time points."
+        )
+
+        assert np.ndim(pred_features) >= 2, (
+            "Prediction features should be 2D-array where the rows represent "
+            "features and columns the time points."
+        )
+
+        train_length = train_features.shape[-1]
+        prediction_length = pred_features.shape[-1]
+        total_length = train_length + prediction_length
+
+        # shape: (..., total_length, num_features)
+        features = np.swapaxes(
+            np.concatenate([train_features, pred_features], axis=-1), -1, -2
+        )
+
+        # shape: (..., prediction_length, total_length)
+        log_weights = kernel(
+            features[..., np.newaxis, :, :],
+            np.swapaxes(pred_features, -1, -2)[..., :, np.newaxis, :],
+        )
+
+        # Prediction for `pred_t` samples from all the training targets
+        # as well as predictions until `pred_t` - 1
+        available = np.arange(total_length)[np.newaxis, :] < (
+            train_length + np.arange(prediction_length)[:, np.newaxis]
+        )
+
+        if do_exp:
+            # To avoid numerical issues with exponentiation.
+            log_weights = np.where(available, log_weights, -np.inf)
+            log_weights = log_weights - np.max(
+                log_weights, axis=-1, keepdims=True
+            )
+            sampling_weights = np.exp(log_weights)
+        else:
+            sampling_weights = np.where(available, log_weights, 0.0)
+
+        # reset kernel at positions where the target is NaN
+        isnan = np.concatenate(
+            [
+                target_isnan,
+                np.zeros(target_isnan.shape[:-1] + (prediction_length,), bool),
+            ],
+            axis=-1,
+        )[..., np.newaxis, :]
+        sampling_weights = np.where(isnan, 0.0, sampling_weights)
+
+        # Sometimes (e.g. for a for seasonal climatological kernel ) all
+        # positions with non-zero probability are NaNs, so after resetting
+        # the weights at these positions sampling_weights has only zeroes.
+        # In this case, we want to sample uniformly from the observed
+        # positions.
+        all_zero = np.sum(sampling_weights, axis=-1, keepdims=True) == 0
+        sampling_weights = np.where(
+            all_zero, (available & ~isnan).astype(float), sampling_weights
+        )
+
+        return sampling_weights
+
     @staticmethod
     def compute_weights(
         train_features: np.ndarray,
         pred_features: np.ndarray,
         target_isnan_positions: np.ndarray,
-        kernel: Callable[[np.ndarray, np.ndarray], float],
+        kernel: Kernel,
         do_exp: bool = True,
     ) -> Iterator[np.ndarray]:
         """
@@ -47,7 +160,7 @@ class NPTS:
         the prediction for time step `pred_t` samples from all the training
         targets as well as predictions until `pred_t` - 1.
 
-        :return: iterator over sampling weights
+        The weights are computed with :meth:`compute_weight_matrix`.
 
         Parameters
         ----------
@@ -79,46 +192,82 @@ class NPTS:
         )
 
         train_length = train_features.shape[1]
-        prediction_length = pred_features.shape[1]
-
-        for pred_t in range(prediction_length):
-            # Prediction for `pred_t` samples from all the training targets
-            # as well as predictions until `pred_t` - 1
-            sampling_weights = np.zeros(train_length + pred_t)
-            for train_t in range(train_length):
-                sampling_weights[train_t] = kernel(
-                    train_features[:, train_t], pred_features[:, pred_t]
-                )
-
-            for t in range(pred_t):
-                sampling_weights[train_length + t] = kernel(
-                    pred_features[:, t], pred_features[:, pred_t]
-                )
-
-            if do_exp:
-                # To avoid numerical issues with exponentiation.
-                sampling_weights -= max(sampling_weights)
-                sampling_weights = np.exp(sampling_weights)
-
-            # reset kernel at positions where the target is NaN
-            sampling_weights[target_isnan_positions] = 0.0
-
-            # Sometimes (e.g. for a for seasonal climatological kernel ) all
-            # positions with non-zero probability are NaNs, so after resetting
-            # the weights at these positions sampling_weights has only zeroes.
-            # In this case, we want to sample uniformly from the observed
-            # positions.
-            if np.sum(sampling_weights) == 0:
-                sampling_weights[target_isnan_positions] = -1.0
-                sampling_weights += 1.0
-
-            yield sampling_weights
+
+        target_isnan = np.zeros(train_length, dtype=bool)
+        target_isnan[target_isnan_positions] = True
+
+        sampling_weights = NPTS.compute_weight_matrix(
+            train_features=train_features,
+            pred_features=pred_features,
+            target_isnan=target_isnan,
+            kernel=kernel,
+            do_exp=do_exp,
+        )
+
+        for pred_t, weights in enumerate(sampling_weights):
+            yield weights[: train_length + pred_t]
+
+    @staticmethod
+    def sample_paths(
+        targets: np.ndarray, sampling_weights: np.ndarray, num_samples: int
+    ) -> np.ndarray:
+        """
+        Generates `num_samples` sample paths for the prediction range of the
+        given `targets` via weighted sampling.
+
+        Parameters
+        ----------
+        targets
+            training targets, shape: (..., train_length)
+        sampling_weights
+            weights used for sampling, as computed by
+            :meth:`compute_weight_matrix`,
+            shape: (..., prediction_length, train_length + prediction_length)
+        num_samples
+            number of sample paths to draw
+
+        Returns
+        -------
+        np.ndarray
+            samples, shape: (..., num_samples, prediction_length)
+        """
+
+        train_length = targets.shape[-1]
+
+        # shape: (..., num_samples, prediction_length)
+        samples_ix = WeightedSampler.sample_rows(sampling_weights, num_samples)
+
+        # Indices beyond the training range refer to the prediction made in
+        # an earlier time step of the same sample path. Since every step only
+        # refers to steps before it, following these references back
+        # terminates, and eventually all indices point to training targets.
+        is_pred_ix = samples_ix >= train_length
+        while np.any(is_pred_ix):
+            samples_ix = np.where(
+                is_pred_ix,
+                np.take_along_axis(
+                    samples_ix,
+                    np.where(is_pred_ix, samples_ix - train_length, 0),
+                    axis=-1,
+                ),
+                samples_ix,
+            )
+            is_pred_ix = samples_ix >= train_length
+
+        return np.take_along_axis(
+            np.broadcast_to(
+                targets[..., np.newaxis, :],
+                samples_ix.shape[:-1] + (train_length,),
+            ),
+            samples_ix,
+            axis=-1,
+        )
 
     @staticmethod
     def predict(
         targets: pd.Series,
         prediction_length: int,
-        sampling_weights_iterator: Iterator[np.ndarray],
+        sampling_weights: np.ndarray,
         num_samples: int,
     ) -> SampleForecast:
         """
@@ -126,7 +275,7 @@ class NPTS:
         samples for `predcition_length` time points.
 
         Predictions are generated via weighted sampling where the weights are
-        specified in `sampling_weights_iterator`.
+        specified in `sampling_weights`.
 
         Parameters
         ----------
@@ -134,8 +283,10 @@ class NPTS:
             targets to predict
         prediction_length
             prediction length
-        sampling_weights_iterator
-            iterator over weights used for sampling
+        sampling_weights
+            weights used for sampling, as computed by
+            :meth:`compute_weight_matrix`,
+            shape: (prediction_length, train_length + prediction_length)
         num_samples
             number of samples to set in the :class:`SampleForecast` object
 
@@ -145,29 +296,17 @@ class NPTS:
            a :class:`SampleForecast` object for the given targets
         """
 
-        # Note that to generate prediction from the second time step onwards,
-        # we need the sample predicted for all the previous time steps in the
-        # prediction range.
-        # To make this simpler, we replicate the training targets for
-        # `num_samples` times.
-
-        # samples shape: (num_samples, train_length + prediction_length)
-        samples = np.tile(
-            A=np.concatenate((targets.values, np.zeros(prediction_length))),
-            reps=(num_samples, 1),
+        assert sampling_weights.shape == (
+            prediction_length,
+            len(targets) + prediction_length,
         )
 
-        train_length = len(targets)
-        for t, sampling_weights in enumerate(sampling_weights_iterator):
-            samples_ix = WeightedSampler.sample(sampling_weights, num_samples)
-            samples[:, train_length + t] = samples[
-                np.arange(num_samples), samples_ix
-            ]
+        samples_pred_range = NPTS.sample_paths(
+            targets.values, sampling_weights, num_samples
+        )
 
         # Forecast takes as input the prediction range samples, the start date
         # of the prediction range, and the frequency of the time series.
-        samples_pred_range = samples[:, train_length:]  # prediction range only
-
         freq = targets.index.freq.freqstr
         forecast_start = targets.index[-1] + 1 * targets.index.freq
 
@@ -176,20 +315,16 @@ class NPTS:
         )
 
     @staticmethod
-    def log_distance_kernel(
-        alpha: float,
-    ) -> Callable[[np.ndarray, np.ndarray], float]:
-        return lambda x, y: cast(float, -alpha * np.sum(np.abs(x - y)))
+    def log_distance_kernel(alpha: float) -> Kernel:
+        return lambda x, y: -alpha * np.sum(np.abs(x - y), axis=-1)
 
     @staticmethod
-    def log_weighted_distance_kernel(
-        kernel_weights: List[float],
-    ) -> Callable[[np.ndarray, np.ndarray], float]:
-        kernel_weights_nd = np.ndarray(kernel_weights, dtype=np.float32)
-        return lambda x, y: cast(
-            float, -np.sum(kernel_weights_nd * np.abs(x - y))
-        )
+    def log_weighted_distance_kernel(kernel_weights: List[float]) -> Kernel:
+        kernel_weights_nd = np.array(kernel_weights, dtype=np.float32)
+        return lambda x, y: -np.abs(x - y) @ kernel_weights_nd
 
     @staticmethod
-    def uniform_kernel() -> Callable[[np.ndarray, np.ndarray], float]:
-        return lambda x, y: 1.0 if np.sum(np.abs(x - y)) == 0.0 else 0.0
+    def uniform_kernel() -> Kernel:
+        return lambda x, y: (np.sum(np.abs(x - y), axis=-1) == 0.0).astype(
+            float
+        )
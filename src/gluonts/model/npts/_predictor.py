@@ -13,7 +13,7 @@
 
 # Standard library imports
 from enum import Enum
-from typing import Iterator, List, Optional, Tuple, Union
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 
 # Third-party imports
 import numpy as np
@@ -152,6 +152,10 @@ class NPTSPredictor(RepresentablePredictor):
     feature_scale
         scale for time (seasonal) features in order to sample past seasons
         with higher probability
+    batch_size
+        maximum number of consecutive time series of equal length that are
+        forecast together; the sampling weights and samples of a batch are
+        computed with a single set of array operations
     """
 
     @validated()
@@ -166,6 +170,7 @@ class NPTSPredictor(RepresentablePredictor):
         use_default_time_features: bool = True,
         num_default_time_features: int = 1,
         feature_scale: float = 1000.0,
+        batch_size: int = 1,
     ) -> None:
         super().__init__(freq=freq, prediction_length=prediction_length)
         # We limit the context length to some maximum value instead of
@@ -178,6 +183,7 @@ class NPTSPredictor(RepresentablePredictor):
         self.use_seasonal_model = use_seasonal_model
         self.use_default_time_features = use_default_time_features
         self.feature_scale = feature_scale
+        self.batch_size = batch_size
 
         if not self._is_exp_kernel():
             self.kernel = NPTS.uniform_kernel()
@@ -197,6 +203,7 @@ class NPTSPredictor(RepresentablePredictor):
     def predict(
         self, dataset: Dataset, num_samples: int = 100, **kwargs
     ) -> Iterator[SampleForecast]:
+        batch: List[Tuple[pd.Series, Optional[np.ndarray]]] = []
         for data in dataset:
             start = pd.Timestamp(data["start"])
             target = np.asarray(data["target"], np.float32)
@@ -220,7 +227,39 @@ class NPTSPredictor(RepresentablePredictor):
             else:
                 custom_features = None
 
-            yield self.predict_time_series(ts, num_samples, custom_features)
+            if self.batch_size == 1:
+                yield self.predict_time_series(
+                    ts, num_samples, custom_features
+                )
+                continue
+
+            # Only consecutive time series of equal shape are batched
+            # together, so that forecasts are produced in input order.
+            if batch and (
+                len(batch) == self.batch_size
+                or not self._same_shape(batch[0], (ts, custom_features))
+            ):
+                yield from self.predict_time_series_batch(
+                    *zip(*batch), num_samples=num_samples
+                )
+                batch = []
+
+            batch.append((ts, custom_features))
+
+        if batch:
+            yield from self.predict_time_series_batch(
+                *zip(*batch), num_samples=num_samples
+            )
+
+    @staticmethod
+    def _same_shape(
+        a: Tuple[pd.Series, Optional[np.ndarray]],
+        b: Tuple[pd.Series, Optional[np.ndarray]],
+    ) -> bool:
+        (ts_a, features_a), (ts_b, features_b) = a, b
+        return len(ts_a) == len(ts_b) and np.shape(features_a) == np.shape(
+            features_b
+        )
 
     def predict_time_series(
         self,
@@ -249,14 +288,7 @@ class NPTSPredictor(RepresentablePredictor):
           A prediction for the supplied `ts` and `custom_features`.
         """
 
-        if np.all(np.isnan(ts.values[-self.context_length :])):
-            raise GluonTSDataError(
-                f"The last {self.context_length} positions of the target time "
-                f"series are all NaN. Please increase the `context_length` "
-                f"parameter of your NPTS model so the last "
-                f"{self.context_length} positions of each target contain at "
-                f"least one non-NaN value."
-            )
+        self._check_target(ts)
 
         # Get the features for both training and prediction ranges
         train_features, predict_features = self._get_features(
@@ -265,21 +297,94 @@ class NPTSPredictor(RepresentablePredictor):
 
         # Compute weights for sampling for each time step `t` in the
         # prediction range
-        sampling_weights_iterator = NPTS.compute_weights(
+        sampling_weights = NPTS.compute_weight_matrix(
             train_features=train_features,
             pred_features=predict_features,
-            target_isnan_positions=np.argwhere(np.isnan(ts.values)),
+            target_isnan=np.isnan(ts.values),
             kernel=self.kernel,
             do_exp=self._is_exp_kernel(),
         )
 
         # Generate forecasts
         forecast = NPTS.predict(
-            ts, self.prediction_length, sampling_weights_iterator, num_samples
+            ts, self.prediction_length, sampling_weights, num_samples
         )
 
         return forecast
 
+    def predict_time_series_batch(
+        self,
+        ts_batch: Sequence[pd.Series],
+        custom_features_batch: Optional[Sequence[Optional[np.ndarray]]] = None,
+        num_samples: int = 100,
+    ) -> List[SampleForecast]:
+        """
+        Same as :meth:`predict_time_series`, but for a batch of training time
+        series of equal length, which are processed together.
+
+        Parameters
+        ----------
+        ts_batch
+            training time series objects, all of the same length
+        custom_features_batch
+            custom features (covariates) to use for each time series, all of
+            the same shape
+        num_samples
+            number of samples to draw
+        Returns
+        -------
+        List[Forecast]
+          A prediction for each of the supplied time series.
+        """
+
+        if custom_features_batch is None:
+            custom_features_batch = [None] * len(ts_batch)
+
+        assert len(custom_features_batch) == len(ts_batch)
+        assert (
+            len({len(ts) for ts in ts_batch}) == 1
+        ), "All the time series in a batch must have the same length."
+
+        for ts in ts_batch:
+            self._check_target(ts)
+
+        features = [
+            self._get_features(ts.index, self.prediction_length, features)
+            for ts, features in zip(ts_batch, custom_features_batch)
+        ]
+        targets = np.stack([ts.values for ts in ts_batch])
+
+        # shape: (batch_size, prediction_length, train_length + pred_length)
+        sampling_weights = NPTS.compute_weight_matrix(
+            train_features=np.stack([train for train, _ in features]),
+            pred_features=np.stack([pred for _, pred in features]),
+            target_isnan=np.isnan(targets),
+            kernel=self.kernel,
+            do_exp=self._is_exp_kernel(),
+        )
+
+        # shape: (batch_size, num_samples, prediction_length)
+        samples = NPTS.sample_paths(targets, sampling_weights, num_samples)
+
+        return [
+            SampleForecast(
+                samples=ts_samples,
+                start_date=ts.index[-1] + 1 * ts.index.freq,
+                freq=ts.index.freq.freqstr,
+            )
+            for ts, ts_samples in zip(ts_batch, samples)
+        ]
+
+    def _check_target(self, ts: pd.Series) -> None:
+        if np.all(np.isnan(ts.values[-self.context_length :])):
+            raise GluonTSDataError(
+                f"The last {self.context_length} positions of the target time "
+                f"series are all NaN. Please increase the `context_length` "
+                f"parameter of your NPTS model so the last "
+                f"{self.context_length} positions of each target contain at "
+                f"least one non-NaN value."
+            )
+
     def _get_features(
         self,
         train_index: pd.DatetimeIndex,
@@ -33,25 +33,69 @@ class WeightedSampler:
         :param num_samples:
         :return:
         """
-        assert all(weights >= 0.0), "Sampling weights must be non-negative"
-        # In the special case where all the weights are zeros, we want to
-        # sample all indices uniformly
-        weights = np.ones_like(weights) if sum(weights) == 0.0 else weights
+        return WeightedSampler.sample_rows(
+            np.asarray(weights)[np.newaxis, :], num_samples
+        )[:, 0]
 
-        cumsum_weights = np.cumsum(weights)
+    @staticmethod
+    def sample_rows(weights, num_samples):
+        """
+        Sample indices independently for each row of `weights`, i.e. for
+        weights of shape (..., num_rows, num_weights) the index
+        `ix`[..., `s`, `r`] is chosen with probability `weights`[..., `r`, `ix`]
+
+        Rows need not sum to 1. All the rows are sampled with a single
+        cumulative sum and a single search.
+
+        :param weights: array of shape (..., num_rows, num_weights)
+        :param num_samples:
+        :return: array of shape (..., num_samples, num_rows)
+        """
+        assert np.all(weights >= 0.0), "Sampling weights must be non-negative"
+
+        weights = np.asarray(weights, dtype=float)
+        batch_shape = weights.shape[:-1]
+        num_weights = weights.shape[-1]
+        weights = weights.reshape(-1, num_weights)
+        num_rows = weights.shape[0]
 
-        # Just for better readability.
-        total_weight = cumsum_weights[-1]
+        # In the special case where all the weights of a row are zeros, we
+        # want to sample all indices of that row uniformly
+        weights = np.where(
+            np.sum(weights, axis=1, keepdims=True) == 0.0, 1.0, weights
+        )
+
+        cumsum_weights = np.cumsum(weights, axis=1)
 
-        # Samples from the Uniform distribution: U(0, `total_weight`)
-        uniform_samples = total_weight * np.random.random(num_samples)
+        # Normalize each row to the range [0, 1] and shift row `r` by `r`, so
+        # that the rows of the flattened array are sorted one after another.
+        row_offsets = np.arange(num_rows)
+        cumsum_weights = (
+            cumsum_weights / cumsum_weights[:, -1:] + row_offsets[:, None]
+        )
 
-        # Search for the last `ix` for each sample u ~ U(0, total weight)
-        # such that u <= `cumsum`[`ix`]
+        # Samples from the Uniform distribution: U(`r`, `r` + 1)
+        uniform_samples = (
+            np.random.random((num_samples, num_rows)) + row_offsets
+        )
+
+        # Search for the last `ix` for each sample u ~ U(r, r + 1)
+        # such that u <= `cumsum`[`r`, `ix`]
         # This means `ix` is chosen with probability
-        # `cumsum`[`ix`] - `cumsum`[`ix` - 1] = weights[ix]
-        samples_ix = np.searchsorted(
-            cumsum_weights, uniform_samples, side="left"
+        # `cumsum`[`ix`] - `cumsum`[`ix` - 1] = weights[ix] / sum(weights)
+        samples_ix = (
+            np.searchsorted(
+                cumsum_weights.ravel(), uniform_samples, side="left"
+            )
+            - row_offsets * num_weights
         )
 
-        return samples_ix
+        # Guard against rounding errors at the boundaries of a row: never go
+        # beyond the first or last index with non-zero weight.
+        first_ix = np.argmax(weights > 0.0, axis=1)
+        last_ix = num_weights - 1 - np.argmax(weights[:, ::-1] > 0.0, axis=1)
+        samples_ix = np.clip(samples_ix, first_ix, last_ix)
+
+        return np.moveaxis(
+            samples_ix.reshape((num_samples,) + batch_shape), 0, -2
+        )
@@ -12,12 +12,17 @@
 # permissions and limitations under the License.
 
 # Standard library imports
+import ctypes
 import functools
 import itertools
 import json
 import logging
 import multiprocessing as mp
+import multiprocessing.connection
+import os
+import signal
 import sys
+import time
 import traceback
 from pathlib import Path
 from pydoc import locate
@@ -50,14 +55,19 @@ from gluonts.core.component import (
 from gluonts.core.exception import GluonTSException
 from gluonts.core.serde import dump_json, fqname_for, load_json
 from gluonts.dataset.common import DataEntry, Dataset, ListDataset
-from gluonts.dataset.loader import DataBatch, InferenceDataLoader
-from gluonts.model.forecast import Forecast
+from gluonts.dataset.loader import (
+    DataBatch,
+    InferenceDataLoader,
+    pad_batch,
+)
+from gluonts.model.forecast import Forecast, ForecastBatch
 from gluonts.mx.context import get_mxnet_context
 from gluonts.mx.distribution import Distribution, DistributionOutput
 from gluonts.support.util import (
     export_repr_block,
     export_symb_block,
     get_hybrid_forward_input_names,
+    hybrid_block_to_shared_symbol_block,
     hybrid_block_to_symbol_block,
     import_repr_block,
     import_symb_block,
@@ -248,6 +258,13 @@ class GluonPredictor(Predictor):
         MXNet context to use for computation
     forecast_generator
         Class to generate forecasts from network outputs
+    batch_buckets
+        Batch sizes to which inference batches with fewer than `batch_size`
+        time series are padded (see :class:`InferenceDataLoader`). If given,
+        a separate statically allocated graph is kept for each of these
+        sizes, so that neither the last batch of a dataset nor small requests
+        trigger a new shape inference and memory allocation. The graphs can
+        be traced ahead of time with :meth:`warm_up`.
     """
 
     BlockType = mx.gluon.Block
@@ -265,6 +282,7 @@ class GluonPredictor(Predictor):
         forecast_generator: ForecastGenerator = SampleForecastGenerator(),
         output_transform: Optional[OutputTransform] = None,
         dtype: DType = np.float32,
+        batch_buckets: Optional[List[int]] = None,
     ) -> None:
         super().__init__(
             freq=freq,
@@ -280,6 +298,8 @@ class GluonPredictor(Predictor):
         self.output_transform = output_transform
         self.ctx = ctx
         self.dtype = dtype
+        self.batch_buckets = batch_buckets
+        self._bucket_nets: Dict[int, mx.gluon.Block] = {}
 
     def hybridize(self, batch: DataBatch) -> None:
         """
@@ -315,15 +335,50 @@ class GluonPredictor(Predictor):
         """
         raise NotImplementedError
 
-    def predict(
+    def warm_up(self, dataset: Dataset) -> None:
+        """
+        Traces the network for every batch bucket, using the first entry of
+        the given dataset, so that the first requests of each size are not
+        slowed down by it. Without `batch_buckets` only batches of
+        `batch_size` are traced.
+        """
+        loader = self._inference_data_loader(
+            dataset, num_workers=None, num_prefetch=None
+        )
+        batch = next(iter(loader))
+        for bucket in loader.batch_buckets or [self.batch_size]:
+            padded_batch = pad_batch(batch, bucket)
+            inputs = [padded_batch[k][:bucket] for k in self.input_names]
+            self._bucket_net(bucket)(*inputs)
+
+    def _bucket_net(self, batch_size: int) -> mx.gluon.Block:
+        if self.batch_buckets is None:
+            return self.prediction_net
+
+        net = self._bucket_nets.get(batch_size)
+        if net is None:
+            if isinstance(self.prediction_net, mx.gluon.HybridBlock):
+                with self.ctx:
+                    net = hybrid_block_to_shared_symbol_block(
+                        self.prediction_net, len(self.input_names)
+                    )
+                net.hybridize(static_alloc=True, static_shape=True)
+            else:
+                net = self.prediction_net
+            self._bucket_nets[batch_size] = net
+        return net
+
+    def _bucketed_prediction_net(self, *inputs):
+        return self._bucket_net(inputs[0].shape[0])(*inputs)
+
+    def _inference_data_loader(
         self,
         dataset: Dataset,
-        num_samples: Optional[int] = None,
-        num_workers: Optional[int] = None,
-        num_prefetch: Optional[int] = None,
+        num_workers: Optional[int],
+        num_prefetch: Optional[int],
         **kwargs,
-    ) -> Iterator[Forecast]:
-        inference_data_loader = InferenceDataLoader(
+    ) -> InferenceDataLoader:
+        return InferenceDataLoader(
             dataset,
             transform=self.input_transform,
             batch_size=self.batch_size,
@@ -331,17 +386,58 @@ class GluonPredictor(Predictor):
             dtype=self.dtype,
             num_workers=num_workers,
             num_prefetch=num_prefetch,
+            batch_buckets=self.batch_buckets,
             **kwargs,
         )
+
+    def predict(
+        self,
+        dataset: Dataset,
+        num_samples: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        num_prefetch: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[Forecast]:
         yield from self.forecast_generator(
-            inference_data_loader=inference_data_loader,
-            prediction_net=self.prediction_net,
+            inference_data_loader=self._inference_data_loader(
+                dataset, num_workers, num_prefetch, **kwargs
+            ),
+            prediction_net=self._prediction_net_for_inference(),
+            input_names=self.input_names,
+            freq=self.freq,
+            output_transform=self.output_transform,
+            num_samples=num_samples,
+        )
+
+    def predict_batches(
+        self,
+        dataset: Dataset,
+        num_samples: Optional[int] = None,
+        num_workers: Optional[int] = None,
+        num_prefetch: Optional[int] = None,
+        **kwargs,
+    ) -> Iterator[ForecastBatch]:
+        """
+        Same as :meth:`predict`, but yields the forecasts of each inference
+        batch together as a :class:`ForecastBatch`. This requires the forecast
+        generator of the predictor to implement `generate_batches`.
+        """
+        yield from self.forecast_generator.generate_batches(
+            inference_data_loader=self._inference_data_loader(
+                dataset, num_workers, num_prefetch, **kwargs
+            ),
+            prediction_net=self._prediction_net_for_inference(),
             input_names=self.input_names,
             freq=self.freq,
             output_transform=self.output_transform,
             num_samples=num_samples,
         )
 
+    def _prediction_net_for_inference(self):
+        if self.batch_buckets is None:
+            return self.prediction_net
+        return self._bucketed_prediction_net
+
     def __eq__(self, that):
         if type(self) != type(that):
             return False
@@ -379,6 +475,7 @@ class GluonPredictor(Predictor):
                 dtype=self.dtype,
                 forecast_generator=self.forecast_generator,
                 input_names=self.input_names,
+                batch_buckets=self.batch_buckets,
             )
             print(dump_json(parameters), file=fp)
 
@@ -469,6 +566,7 @@ class RepresentableBlockPredictor(GluonPredictor):
             Callable[[DataEntry, np.ndarray], np.ndarray]
         ] = None,
         dtype: DType = np.float32,
+        batch_buckets: Optional[List[int]] = None,
     ) -> None:
         super().__init__(
             input_names=get_hybrid_forward_input_names(prediction_net),
@@ -482,6 +580,7 @@ class RepresentableBlockPredictor(GluonPredictor):
             forecast_generator=forecast_generator,
             output_transform=output_transform,
             dtype=dtype,
+            batch_buckets=batch_buckets,
         )
 
     def as_symbol_block_predictor(
@@ -505,6 +604,7 @@ class RepresentableBlockPredictor(GluonPredictor):
             forecast_generator=self.forecast_generator,
             output_transform=self.output_transform,
             dtype=self.dtype,
+            batch_buckets=self.batch_buckets,
         )
 
     def serialize(self, path: Path) -> None:
@@ -728,26 +828,337 @@ class ParallelizedPredictor(Predictor):
             assert self._send_idx == self._next_idx
 
 
+def _set_num_mxnet_threads(num_threads: int) -> None:
+    """
+    Sets the number of OpenMP threads MXNet operators use in this process.
+    """
+    mx.base.check_call(
+        mx.base._LIB.MXSetNumOMPThreads(ctypes.c_int(num_threads))
+    )
+
+
+def _per_series_worker_loop(
+    predictor: Predictor,
+    connection: "mp.connection.Connection",
+    num_threads: Optional[int] = None,
+    **kwargs,
+) -> None:
+    """
+    Worker loop for :class:`ProcessPoolPredictor`.
+
+    Receives `(idx, entry)` pairs through `connection`, forecasts each entry
+    separately with `predictor` and sends back `(idx, forecast, fit_time)`,
+    where `forecast` is a :class:`WorkerError` if prediction failed.
+    """
+    if num_threads is not None:
+        _set_num_mxnet_threads(num_threads)
+
+    while True:
+        idx, entry = connection.recv()
+        if idx is None:
+            break
+        start = time.time()
+        try:
+            result = next(iter(predictor.predict([entry], **kwargs)))
+        except GluonTSException as error:
+            result = error
+        except Exception:
+            result = WorkerError(
+                "".join(traceback.format_exception(*sys.exc_info()))
+            )
+        connection.send((idx, result, time.time() - start))
+
+
+def _kill_process(process: mp.Process) -> None:
+    # Process.kill is only available from Python 3.7
+    if hasattr(signal, "SIGKILL"):
+        try:
+            os.kill(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        process.terminate()
+
+
+class ProcessPoolPredictor(Predictor):
+    """
+    Runs a predictor that fits a separate model per time series, like the
+    :class:`ProphetPredictor` or the :class:`RForecastPredictor`, in a pool
+    of worker processes.
+
+    Each worker stays alive for the whole `predict` call, so that libraries
+    are loaded only once per worker. Every time series is sent to a worker
+    separately, and forecasts are returned in the same order as the input.
+
+    If forecasting a single time series takes longer than `timeout` seconds,
+    the worker is killed and replaced, and the forecast for that time series
+    is made with the `fallback_predictor` instead. The same happens if the
+    base predictor fails with an exception other than a
+    :class:`GluonTSException`, which is propagated.
+
+    The time taken for each time series is reported in the `fit_time` field
+    of the `info` dictionary of the forecasts; forecasts made by the fallback
+    predictor have the `fallback` field set to `True`.
+
+    Parameters
+    ----------
+    base_predictor
+        The predictor to run in the workers.
+    num_workers
+        Number of workers (processes) to use. If set to None, one worker per
+        CPU will be used.
+    timeout
+        Maximum number of seconds to spend on a single time series, or None
+        for no time limit.
+    fallback_predictor
+        Predictor to use for time series that time out or fail. If None, a
+        :class:`MeanPredictor` is used.
+    num_threads
+        Number of threads MXNet operators may use in each worker. Setting it,
+        typically to the number of CPUs divided by `num_workers`, prevents
+        the workers from oversubscribing the CPUs. If None, the MXNet default
+        is kept.
+    """
+
+    def __init__(
+        self,
+        base_predictor: Predictor,
+        num_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        fallback_predictor: Optional[Predictor] = None,
+        num_threads: Optional[int] = None,
+    ) -> None:
+        super().__init__(
+            freq=base_predictor.freq,
+            lead_time=base_predictor.lead_time,
+            prediction_length=base_predictor.prediction_length,
+        )
+
+        if fallback_predictor is None:
+            from gluonts.model.trivial.mean import MeanPredictor
+
+            fallback_predictor = MeanPredictor(
+                freq=base_predictor.freq,
+                prediction_length=base_predictor.prediction_length,
+            )
+
+        assert timeout is None or timeout > 0, "`timeout` should be > 0"
+        assert (
+            num_threads is None or num_threads > 0
+        ), "`num_threads` should be > 0"
+
+        self.base_predictor = base_predictor
+        self.num_workers = (
+            num_workers if num_workers is not None else mp.cpu_count()
+        )
+        self.timeout = timeout
+        self.fallback_predictor = fallback_predictor
+        self.num_threads = num_threads
+
+    def _start_worker(self, **kwargs) -> Tuple[mp.Process, Any]:
+        # Every worker gets its own pipe, so that killing a worker which
+        # timed out cannot corrupt the communication with the other workers.
+        connection, worker_connection = mp.Pipe()
+        worker = mp.Process(
+            target=_per_series_worker_loop,
+            args=(self.base_predictor, worker_connection, self.num_threads),
+            kwargs=kwargs,
+        )
+        worker.daemon = True
+        worker.start()
+        worker_connection.close()
+        return worker, connection
+
+    def _fallback(self, entry: DataEntry, **kwargs) -> Forecast:
+        forecast = next(
+            iter(self.fallback_predictor.predict([entry], **kwargs))
+        )
+        forecast.info = {**(forecast.info or {}), "fallback": True}
+        return forecast
+
+    def predict(self, dataset: Dataset, **kwargs) -> Iterator[Forecast]:
+        logger = logging.getLogger(__name__)
+
+        data_iter = enumerate(dataset)
+        workers = [
+            self._start_worker(**kwargs) for _ in range(self.num_workers)
+        ]
+        # worker id -> (idx, entry, start time) of the entry in progress
+        in_progress: Dict[int, Tuple[int, DataEntry, float]] = {}
+        results: Dict[int, Forecast] = {}
+        next_idx = 0
+
+        def send(worker_id: int) -> bool:
+            try:
+                idx, entry = next(data_iter)
+            except StopIteration:
+                return False
+            workers[worker_id][1].send((idx, entry))
+            in_progress[worker_id] = idx, entry, time.time()
+            return True
+
+        def restart(worker_id: int) -> None:
+            worker, connection = workers[worker_id]
+            _kill_process(worker)
+            worker.join()
+            connection.close()
+            workers[worker_id] = self._start_worker(**kwargs)
+
+        try:
+            for worker_id in range(self.num_workers):
+                if not send(worker_id):
+                    break
+
+            while in_progress:
+                timeout = (
+                    None
+                    if self.timeout is None
+                    else max(
+                        0.0,
+                        min(start for _, _, start in in_progress.values())
+                        + self.timeout
+                        - time.time(),
+                    )
+                )
+                ready = mp.connection.wait(
+                    [workers[worker_id][1] for worker_id in in_progress],
+                    timeout=timeout,
+                )
+
+                for worker_id in list(in_progress):
+                    worker, connection = workers[worker_id]
+                    idx, entry, start = in_progress[worker_id]
+
+                    if connection in ready:
+                        try:
+                            _, result, fit_time = connection.recv()
+                        except EOFError:
+                            # the worker died, e.g. by crashing in native code
+                            restart(worker_id)
+                            result = WorkerError(
+                                f"Worker process exited with code "
+                                f"{worker.exitcode}."
+                            )
+                            fit_time = time.time() - start
+                        if isinstance(result, GluonTSException):
+                            raise result
+                        if isinstance(result, WorkerError):
+                            logger.warning(
+                                f"Base predictor failed with: {result.msg}"
+                            )
+                            result = self._fallback(entry, **kwargs)
+                    elif (
+                        self.timeout is not None
+                        and time.time() - start >= self.timeout
+                    ):
+                        logger.warning(
+                            f"Base predictor timed out after {self.timeout}s "
+                            f"for time series {idx}, using fallback."
+                        )
+                        restart(worker_id)
+                        result = self._fallback(entry, **kwargs)
+                        fit_time = time.time() - start
+                    else:
+                        continue
+
+                    result.info = {**(result.info or {}), "fit_time": fit_time}
+                    results[idx] = result
+                    del in_progress[worker_id]
+                    send(worker_id)
+
+                while next_idx in results:
+                    yield results.pop(next_idx)
+                    next_idx += 1
+        finally:
+            for worker, connection in workers:
+                try:
+                    connection.send((None, None))
+                except OSError:
+                    pass
+                connection.close()
+                worker.join(timeout=1.0)
+                if worker.is_alive():
+                    _kill_process(worker)
+                    worker.join()
+
+        assert not results
+
+
 class Localizer(Predictor):
     """
     A Predictor that uses an estimator to train a local model per time series and
     immediatly calls this to predict.
 
+    The local models are trained one after the other, unless `num_workers` is
+    set, in which case they are trained in parallel by a
+    :class:`ProcessPoolPredictor`. Forecasts are returned in the order of the
+    dataset in either case.
+
     Parameters
     ----------
     estimator
         The estimator object to train on each dataset entry at prediction time.
+    num_workers
+        Number of worker processes training local models in parallel. If 0,
+        the models are trained sequentially in the current process; if None,
+        one worker per CPU is used.
+    num_threads
+        Number of threads MXNet operators may use in each worker. By default,
+        the CPUs are divided evenly between the workers.
+    timeout
+        Maximum number of seconds to spend on training and predicting a single
+        time series, after which the forecast is made by `fallback_predictor`.
+        Only used if the models are trained in parallel.
+    fallback_predictor
+        Predictor to use for time series that time out or for which training
+        fails, see :class:`ProcessPoolPredictor`.
     """
 
-    def __init__(self, estimator: "Estimator"):
+    def __init__(
+        self,
+        estimator: "Estimator",
+        num_workers: Optional[int] = 0,
+        num_threads: Optional[int] = None,
+        timeout: Optional[float] = None,
+        fallback_predictor: Optional[Predictor] = None,
+    ):
         super().__init__(
             freq=estimator.freq,
             lead_time=estimator.lead_time,
             prediction_length=estimator.prediction_length,
         )
         self.estimator = estimator
+        self.num_workers = num_workers
+        self.num_threads = num_threads
+        self.timeout = timeout
+        self.fallback_predictor = fallback_predictor
 
     def predict(self, dataset: Dataset, **kwargs) -> Iterator[Forecast]:
+        if self.num_workers == 0:
+            yield from self._predict_sequentially(dataset, **kwargs)
+            return
+
+        num_workers = (
+            self.num_workers
+            if self.num_workers is not None
+            else mp.cpu_count()
+        )
+        num_threads = (
+            self.num_threads
+            if self.num_threads is not None
+            else max(1, mp.cpu_count() // num_workers)
+        )
+        yield from ProcessPoolPredictor(
+            base_predictor=Localizer(self.estimator),
+            num_workers=num_workers,
+            timeout=self.timeout,
+            fallback_predictor=self.fallback_predictor,
+            num_threads=num_threads,
+        ).predict(dataset, **kwargs)
+
+    def _predict_sequentially(
+        self, dataset: Dataset, **kwargs
+    ) -> Iterator[Forecast]:
         logger = logging.getLogger(__name__)
         for i, ts in enumerate(dataset, start=1):
             logger.info(f"training for time series {i} / {len(dataset)}")
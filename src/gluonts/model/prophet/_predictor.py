@@ -100,6 +100,10 @@ class ProphetPredictor(RepresentablePredictor):
         # or install gluonts with the Prophet extras
         pip install gluonts[Prophet]
 
+    Since a separate model is fitted for every time series, a
+    :class:`~gluonts.model.predictor.ProcessPoolPredictor` can be used to fit
+    them in parallel and with a time limit per time series.
+
     Parameters
     ----------
     freq
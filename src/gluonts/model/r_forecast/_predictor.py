@@ -49,6 +49,10 @@ class RForecastPredictor(RepresentablePredictor):
         pip install 'rpy2>=2.9.*,<3.*'
         R -e 'install.packages(c("forecast", "nnfor"), repos="https://cloud.r-project.org")'
 
+    Since a separate model is fitted for every time series, a
+    :class:`~gluonts.model.predictor.ProcessPoolPredictor` can be used to fit
+    them in parallel and with a time limit per time series.
+
     Parameters
     ----------
     freq
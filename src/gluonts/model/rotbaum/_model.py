@@ -111,6 +111,10 @@ class QRX:
         self.cell_values = None
         self.cell_values_dict = None
         self.quantile_dicts = {}
+        # arrays derived from cell_values_dict, see _cell_arrays
+        self._sorted_cell_values = None
+        self._cell_clumps = None
+        self._clumps = None
 
     @staticmethod
     def _create_xgboost_model(model_params: Optional[dict] = None):
@@ -139,6 +143,7 @@ class QRX:
         y_train: list
         """
         self.quantile_dicts = {}
+        self._sorted_cell_values = None
         x_train, y_train = np.array(x_train), np.array(y_train)  # xgboost
         # doens't like lists
         self.model.fit(np.array(x_train), np.array(y_train))
@@ -231,58 +236,61 @@ class QRX:
         dic = cls.clump(dic, clump_size)
         return dic
 
-    @classmethod
-    def get_closest_pt(cls, sorted_list: List, num: int) -> int:
+    def _cell_arrays(self):
         """
-        Given a sorted list of floats, returns the number closest to num.
-        Implements a binary search.
+        Returns the sorted cell values as an array, the index of the clump of
+        true values associated with each cell, and the list of distinct
+        clumps as arrays.
         """
-        assert sorted_list
-        if len(sorted_list) == 1:
-            return sorted_list[0]
-        else:
-            halfway_indx = (len(sorted_list) - 1) // 2
-            if sorted_list[halfway_indx] > num:
-                return cls.get_closest_pt(sorted_list[: halfway_indx + 1], num)
-            elif sorted_list[halfway_indx + 1] < num:
-                return cls.get_closest_pt(sorted_list[halfway_indx + 1 :], num)
-            elif abs(sorted_list[halfway_indx] - num) < abs(
-                sorted_list[halfway_indx + 1] - num
-            ):
-                return sorted_list[halfway_indx]
-            else:
-                return sorted_list[halfway_indx + 1]
-
-    @staticmethod
-    def _get_quantiles_from_dic_with_list_values(
-        dic: Dict, quantile: float
-    ) -> Dict:
+        if self._sorted_cell_values is None:
+            clump_ids: Dict[int, int] = {}
+            clumps = []
+            cell_clumps = []
+            for cell_value in self.cell_values:
+                clump = self.cell_values_dict[cell_value]
+                if id(clump) not in clump_ids:
+                    clump_ids[id(clump)] = len(clumps)
+                    clumps.append(np.array(clump))
+                cell_clumps.append(clump_ids[id(clump)])
+            self._sorted_cell_values = np.array(self.cell_values)
+            self._cell_clumps = np.array(cell_clumps)
+            self._clumps = clumps
+        return self._sorted_cell_values, self._cell_clumps, self._clumps
+
+    def cells(self, x_test) -> np.ndarray:
         """
-        Given a dictionary of float to lists, returns a
-        dictionary that takes num to np.percentile(dic[num], 100 * quantile).
-
-        The function is meant to be efficient under the assumption that
-        dic's values have list objects that repeat many times over.
-
-        Parameters
-        ----------
-        dic: dict
-            float to list objects, with potentially many repetitions
-        quantile: float
-
-        Returns
-        -------
-        dict
-            float to float
+        Returns the index, in self.cell_values, of the cell closest to the
+        point estimate of each row of x_test, which is computed with a single
+        call of the model.
         """
-        df = pd.DataFrame(dic.items(), columns=["keys", "values"])
-        df["id"] = df["values"].apply(id)
-        df_by_id = df.groupby("id")["values"].first().reset_index()
-        df_by_id["quantiles"] = df_by_id["values"].apply(
-            lambda l: np.percentile(l, quantile * 100)
+        cell_values, _, _ = self._cell_arrays()
+        preds = self.model.predict(np.array(x_test))  # xgboost doesn't
+        # like lists
+        right = np.clip(
+            np.searchsorted(cell_values, preds), 1, len(cell_values) - 1
         )
-        df_by_id = df_by_id[["id", "quantiles"]].merge(df, on="id")
-        return dict(zip(df_by_id["keys"], df_by_id["quantiles"]))
+        left = right - 1
+        # ties go to the larger value
+        closer_to_left = np.abs(cell_values[left] - preds) < np.abs(
+            cell_values[right] - preds
+        )
+        cells = np.where(closer_to_left, left, right)
+        if len(cell_values) == 1:
+            cells = np.zeros_like(cells)
+        return cells
+
+    def cell_quantiles(self, quantile: float) -> np.ndarray:
+        """
+        Returns the array of the given quantile of the true values associated
+        with each cell, which is computed once per quantile.
+        """
+        if quantile not in self.quantile_dicts:
+            _, cell_clumps, clumps = self._cell_arrays()
+            clump_quantiles = np.array(
+                [np.percentile(clump, quantile * 100) for clump in clumps]
+            )
+            self.quantile_dicts[quantile] = clump_quantiles[cell_clumps]
+        return self.quantile_dicts[quantile]
 
     def predict(self, x_test, quantile: float) -> List:
         """
@@ -298,23 +306,7 @@ class QRX:
         list
             list of floats
         """
-        predicted_values = []
-        if quantile in self.quantile_dicts:
-            quantile_dic = self.quantile_dicts[quantile]
-        else:
-            quantile_dic = self._get_quantiles_from_dic_with_list_values(
-                self.cell_values_dict, quantile
-            )
-            self.quantile_dicts[quantile] = quantile_dic
-        # Remember dic per quantile and use if already done
-        for pt in x_test:
-            pred = self.model.predict(np.array([pt]))[
-                0
-            ]  # xgboost doesn't like
-            # lists
-            closest_pred = self.get_closest_pt(self.cell_values, pred)
-            predicted_values.append(quantile_dic[closest_pred])
-        return predicted_values
+        return list(self.cell_quantiles(quantile)[self.cells(x_test)])
 
     def estimate_dist(self, x_test: List[List[float]]) -> List:
         """
@@ -329,9 +321,7 @@ class QRX:
         list
             list of lists
         """
-        predicted_samples = []
-        for pt in x_test:
-            pred = self.model.predict(np.array([pt]))[0]
-            closest_pred = self.get_closest_pt(self.cell_values, pred)
-            predicted_samples.append(self.cell_values_dict[closest_pred])
-        return predicted_samples
+        return [
+            self.cell_values_dict[self.cell_values[cell]]
+            for cell in self.cells(x_test)
+        ]
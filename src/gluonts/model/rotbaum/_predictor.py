@@ -21,7 +21,7 @@ import json
 # Third-party imports
 import numpy as np
 import pandas as pd
-from itertools import chain
+from itertools import chain, islice
 import concurrent.futures
 import logging
 import mxnet as mx
@@ -41,6 +41,9 @@ from gluonts.dataset.loader import DataBatch
 from ._preprocess import PreprocessOnlyLagFeatures
 from ._model import QRX, QuantileReg, QRF
 
+# number of time series whose forecasts are computed together
+PREDICTION_CHUNK_SIZE = 1024
+
 
 class RotbaumForecast(Forecast):
     """
@@ -48,6 +51,10 @@ class RotbaumForecast(Forecast):
     as well as a new estimate_dists function for estimating a sampling of the
     conditional distribution of the value of each of the steps in the
     forecast horizon (independently).
+
+    If `cells` is given, it holds the index of the cell of each QRX model,
+    i.e. of each step in the forecast horizon, which the featurized data
+    falls into; quantiles are then looked up without running the models.
     """
 
     @validated()
@@ -58,9 +65,11 @@ class RotbaumForecast(Forecast):
         start_date: pd.Timestamp,
         freq,
         prediction_length: int,
+        cells: Optional[np.ndarray] = None,
     ):
         self.models = models
         self.featurized_data = featurized_data
+        self.cells = cells
         self.start_date = start_date
         self.freq = freq
         self.prediction_length = prediction_length
@@ -74,6 +83,13 @@ class RotbaumForecast(Forecast):
         step in the forecast horizon.
         """
         assert 0 <= q <= 1
+        if self.cells is not None:
+            return np.array(
+                [
+                    model.cell_quantiles(q)[cell]
+                    for model, cell in zip(self.models, self.cells)
+                ]
+            )
         return np.array(
             list(
                 chain.from_iterable(
@@ -99,6 +115,24 @@ class RotbaumForecast(Forecast):
         )
 
 
+_training_data = None
+
+
+def _set_training_data(feature_data, target_data) -> None:
+    global _training_data
+    _training_data = feature_data, target_data
+
+
+def _fit_model(model, n_step: int, training_data: Optional[tuple] = None):
+    """
+    Fits the model for the given step of the forecast horizon, on the
+    training data given or else the one set in this (worker) process.
+    """
+    feature_data, target_data = training_data or _training_data
+    model.fit(feature_data, target_data[:, n_step])
+    return model
+
+
 class TreePredictor(GluonPredictor):
     """
     A predictor that uses a QRX model for each of the steps in the forecast
@@ -106,6 +140,10 @@ class TreePredictor(GluonPredictor):
     models being trained. In particular, this predictor does not learn a
     multivariate distribution.) The list of these models is saved under
     self.model_list.
+
+    The models are trained concurrently in up to max_workers threads, or,
+    if use_processes is True, worker processes; the latter avoids
+    contention on the GIL in the pure Python parts of training.
     """
 
     @validated()
@@ -126,6 +164,7 @@ class TreePredictor(GluonPredictor):
         max_workers: Optional[int] = None,
         method: str = "QRX",
         quantiles=None,  # Used only for "QuantileRegression" method.
+        use_processes: bool = False,
     ) -> None:
         assert method in [
             "QRX",
@@ -164,6 +203,7 @@ class TreePredictor(GluonPredictor):
         self.prediction_length = prediction_length
         self.freq = freq
         self.max_workers = max_workers
+        self.use_processes = use_processes
         self.clump_size = clump_size
         self.quantiles = quantiles
         self.model_list = None
@@ -199,17 +239,31 @@ class TreePredictor(GluonPredictor):
                 )
                 for _ in range(n_models)
             ]
-        with concurrent.futures.ThreadPoolExecutor(
-            max_workers=self.max_workers
-        ) as executor:
+        if self.use_processes:
+            # the training data is handed to each worker once, rather than
+            # with every model
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_set_training_data,
+                initargs=(feature_data, target_data),
+            )
+            training_data = None
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.max_workers
+            )
+            training_data = feature_data, target_data
+        with executor:
+            futures = []
             for n_step, model in enumerate(self.model_list):
                 logging.info(
                     f"Training model for step no. {n_step + 1} in the forecast"
                     f" horizon"
                 )
-                executor.submit(
-                    model.fit, feature_data, np.array(target_data)[:, n_step]
+                futures.append(
+                    executor.submit(_fit_model, model, n_step, training_data)
                 )
+            self.model_list = [future.result() for future in futures]
 
         return self
 
@@ -235,17 +289,41 @@ class TreePredictor(GluonPredictor):
                 "Forecast is not sample based. Ignoring parameter `num_samples` from predict method."
             )
 
-        for ts in dataset:
-            featurized_data = self.preprocess_object.make_features(
-                ts, starting_index=len(ts["target"]) - context_length
-            )
-            yield RotbaumForecast(
-                self.model_list,
-                [featurized_data],
-                start_date=forecast_start(ts),
-                prediction_length=self.prediction_length,
-                freq=self.freq,
-            )
+        # the models of each step in the forecast horizon are run once for
+        # every chunk of the dataset, rather than for every time series
+        dataset_iter = iter(dataset)
+        while True:
+            chunk = list(islice(dataset_iter, PREDICTION_CHUNK_SIZE))
+            if not chunk:
+                return
+
+            featurized_data = [
+                self.preprocess_object.make_features(
+                    ts, starting_index=len(ts["target"]) - context_length
+                )
+                for ts in chunk
+            ]
+            if self.method == "QRX":
+                # (len(chunk), prediction_length)
+                cells = np.stack(
+                    [
+                        model.cells(featurized_data)
+                        for model in self.model_list
+                    ],
+                    axis=1,
+                )
+            else:
+                cells = [None] * len(chunk)
+
+            for ts, features, ts_cells in zip(chunk, featurized_data, cells):
+                yield RotbaumForecast(
+                    self.model_list,
+                    [features],
+                    start_date=forecast_start(ts),
+                    prediction_length=self.prediction_length,
+                    freq=self.freq,
+                    cells=ts_cells,
+                )
 
     def serialize(self, path: Path) -> None:
 
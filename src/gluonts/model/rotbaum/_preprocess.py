@@ -23,6 +23,21 @@ import logging
 from gluonts.core.component import validated
 
 
+def sliding_windows(x: np.ndarray, window_size: int) -> np.ndarray:
+    """
+    Returns a read-only strided view of the 1D array x, whose i-th row is
+    x[i : i + window_size]. No data is copied.
+    """
+    x = np.ascontiguousarray(x)
+    num_windows = max(len(x) - window_size + 1, 0)
+    return np.lib.stride_tricks.as_strided(
+        x,
+        shape=(num_windows, window_size),
+        strides=(x.strides[0], x.strides[0]),
+        writeable=False,
+    )
+
+
 class PreprocessGeneric:
     """
     Class for the purpose of preprocessing time series. The method
@@ -90,6 +105,34 @@ class PreprocessGeneric:
         """
         raise NotImplementedError()
 
+    def make_features_batch(
+        self, time_series: Dict, starting_indices: np.ndarray
+    ) -> np.ndarray:
+        """
+        Makes features for the context windows starting at each of the
+        starting_indices, as the rows of a float32 array. Inherited classes
+        can override this with a vectorised implementation.
+
+        Parameters
+        ----------
+        time_series: dict
+            has 'target' and 'start' keys
+        starting_indices: np.ndarray
+            The indices where the context windows begin
+
+        Returns
+        -------
+        np.ndarray
+            array of shape (len(starting_indices), number of features)
+        """
+        return np.array(
+            [
+                self.make_features(time_series, starting_index)
+                for starting_index in starting_indices
+            ],
+            dtype=np.float32,
+        ).reshape(len(starting_indices), -1)
+
     def preprocess_from_single_ts(self, time_series: Dict) -> Tuple:
         """
         Takes a single time series, ts_list, and returns preprocessed data.
@@ -116,15 +159,13 @@ class PreprocessGeneric:
         Returns
         -------
         tuple
-            list of feature datapoints, list of target datapoints
+            array of feature datapoints, array of target datapoints
         """
         altered_time_series = time_series.copy()
         if self.n_ignore_last > 0:
             altered_time_series["target"] = altered_time_series["target"][
                 : -self.n_ignore_last
             ]
-        feature_data = []
-        target_data = []
         max_num_context_windows = (
             len(altered_time_series["target"])
             - self.context_window_size
@@ -143,43 +184,35 @@ class PreprocessGeneric:
                 )
 
         if self.num_samples > 0:
-            locations = [
-                np.random.randint(max_num_context_windows)
-                for _ in range(self.num_samples)
-            ]
+            locations = np.random.randint(
+                max_num_context_windows, size=self.num_samples
+            )
         else:
-            locations = range(max_num_context_windows)
-        for starting_index in locations:
-            if self.stratify_targets:
-                featurized_data = self.make_features(
-                    altered_time_series, starting_index
-                )
-                for forecast_horizon_index in range(self.forecast_horizon):
-                    feature_data.append(
-                        list(featurized_data) + [forecast_horizon_index]
-                    )
-                    target_data.append(
-                        [
-                            time_series["target"][
-                                starting_index
-                                + self.context_window_size
-                                + forecast_horizon_index
-                            ]
-                        ]
-                    )
-            else:
-                featurized_data = self.make_features(
-                    altered_time_series, starting_index
-                )
-                feature_data.append(featurized_data)
-                target_data.append(
-                    time_series["target"][
-                        starting_index
-                        + self.context_window_size : starting_index
-                        + self.context_window_size
-                        + self.forecast_horizon
-                    ]
-                )
+            locations = np.arange(max_num_context_windows)
+
+        feature_data = self.make_features_batch(altered_time_series, locations)
+        # row i is the forecast horizon following the context window which
+        # starts at location i
+        target_data = sliding_windows(
+            np.asarray(altered_time_series["target"], dtype=np.float32)[
+                self.context_window_size :
+            ],
+            self.forecast_horizon,
+        )[locations]
+
+        if self.stratify_targets:
+            num_windows = len(locations)
+            feature_data = np.concatenate(
+                [
+                    np.repeat(feature_data, self.forecast_horizon, axis=0),
+                    np.tile(
+                        np.arange(self.forecast_horizon, dtype=np.float32),
+                        num_windows,
+                    )[:, None],
+                ],
+                axis=1,
+            )
+            target_data = target_data.reshape(-1, 1)
         return feature_data, target_data
 
     def preprocess_from_list(
@@ -201,7 +234,7 @@ class PreprocessGeneric:
         -------
         tuple
             If change_internal_variables is False, then returns:
-            list of feature datapoints, list of target datapoints
+            array of feature datapoints, array of target datapoints
         """
         feature_data, target_data = [], []
         self.num_samples = self.get_num_samples(ts_list)
@@ -209,11 +242,24 @@ class PreprocessGeneric:
             ts_feature_data, ts_target_data = self.preprocess_from_single_ts(
                 time_series=time_series
             )
-            feature_data += list(ts_feature_data)
-            target_data += list(ts_target_data)
+            if len(ts_feature_data) > 0:
+                feature_data.append(ts_feature_data)
+                target_data.append(ts_target_data)
+        feature_data = (
+            np.concatenate(feature_data)
+            if feature_data
+            else np.zeros((0, 0), dtype=np.float32)
+        )
+        target_data = (
+            np.concatenate(target_data)
+            if target_data
+            else np.zeros((0, 0), dtype=np.float32)
+        )
         logging.info(
-            "Done preprocessing. Resulting number of datapoints is: {}".format(
-                len(feature_data)
+            "Done preprocessing. Resulting number of datapoints is: {}, "
+            "using {:.1f} MB of memory".format(
+                len(feature_data),
+                (feature_data.nbytes + target_data.nbytes) / 2 ** 20,
             )
         )
         if change_internal_variables:
@@ -306,6 +352,52 @@ class PreprocessOnlyLagFeatures(PreprocessGeneric):
             },
         )
 
+    def make_features_batch(
+        self, time_series: Dict, starting_indices: np.ndarray
+    ) -> np.ndarray:
+        """
+        Makes features for the context windows starting at each of the
+        (non-negative) starting_indices, as the rows of a float32 array.
+        The result matches make_features applied to every window.
+
+        Parameters
+        ----------
+        time_series: dict
+            has 'target' and 'start' keys
+        starting_indices: np.ndarray
+            The indices where the context windows begin
+
+        Returns
+        -------
+        np.ndarray
+            array of shape (len(starting_indices), number of features)
+        """
+        windows = sliding_windows(
+            np.asarray(time_series["target"], dtype=np.float64),
+            self.context_window_size,
+        )[starting_indices]
+        mean = windows.mean(axis=1, keepdims=True)
+        std = windows.std(axis=1, keepdims=True)
+        n_lag_features = np.full_like(mean, self.context_window_size)
+
+        # static and dynamic features are the same for every window
+        shared_features = np.array(
+            self.make_features(time_series, 0)[self.context_window_size + 3 :],
+            dtype=np.float32,
+        )
+        return np.concatenate(
+            [
+                (windows - mean).astype(np.float32),
+                mean.astype(np.float32),
+                std.astype(np.float32),
+                n_lag_features.astype(np.float32),
+                np.broadcast_to(
+                    shared_features, (len(windows), len(shared_features))
+                ),
+            ],
+            axis=1,
+        )
+
     def make_features(self, time_series: Dict, starting_index: int) -> List:
         """
         Makes features for the context window starting at starting_index.
@@ -102,7 +102,7 @@ class Laplace(Distribution):
             level = level.expand_dims(axis=-1)
 
         condition = F.broadcast_greater(level, level.zeros_like() + 0.5)
-        u = F.where(condition, F.log(2.0 * level), -F.log(2.0 - 2.0 * level))
+        u = F.where(condition, -F.log(2.0 - 2.0 * level), F.log(2.0 * level))
 
         return F.broadcast_add(self.mu, F.broadcast_mul(self.b, u))
 
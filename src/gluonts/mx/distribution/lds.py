@@ -12,6 +12,7 @@
 # permissions and limitations under the License.
 
 # Standard library imports
+import math
 from typing import NamedTuple, Optional, Tuple
 
 # Third-party imports
@@ -69,7 +70,7 @@ def _safe_split(x, num_outputs, axis, squeeze_axis, *args, **kwargs):
             num_outputs=num_outputs,
             squeeze_axis=squeeze_axis,
             *args,
-            **kwargs
+            **kwargs,
         )
     return [x.squeeze(axis=axis)] if squeeze_axis else [x]
 
@@ -123,6 +124,11 @@ class LDS(Distribution):
         Dimension of the output
     seq_length
         Sequence length
+    filtering
+        Algorithm used for Kalman filtering: "sequential" steps through time
+        one observation after the other, while "parallel" uses an
+        associative scan over the sequence (see `kalman_filter_parallel`),
+        whose computational graph has depth logarithmic in `seq_length`
     F
     """
 
@@ -139,10 +145,25 @@ class LDS(Distribution):
         latent_dim: int,
         output_dim: int,
         seq_length: int,
+        filtering: str = "sequential",
     ) -> None:
+        assert filtering in [
+            "sequential",
+            "parallel",
+        ], "filtering has to be either 'sequential' or 'parallel'"
         self.latent_dim = latent_dim
         self.output_dim = output_dim
         self.seq_length = seq_length
+        self.filtering = filtering
+
+        # Coefficients for all time steps, used by the parallel filter
+        self.coeff_seq = (
+            emission_coeff,
+            transition_coeff,
+            innovation_coeff,
+            noise_std,
+            residuals,
+        )
 
         # Split coefficients along time axis for easy access
         # emission_coef[t]: (batch_size, obs_dim, latent_dim)
@@ -232,7 +253,20 @@ class LDS(Distribution):
             x = self.F.broadcast_div(x, scale.expand_dims(axis=1))
         # TODO: Based on form of the prior decide to do either filtering
         #   or residual-sum-of-squares
-        log_p, final_mean, final_cov = self.kalman_filter(x, observed)
+        if self.filtering == "parallel":
+            log_p, final_mean, final_cov = kalman_filter_parallel(
+                self.F,
+                x,
+                observed,
+                *self.coeff_seq,
+                prior_mean=self.prior_mean,
+                prior_cov=self.prior_cov,
+                latent_dim=self.latent_dim,
+                output_dim=self.output_dim,
+                seq_length=self.seq_length,
+            )
+        else:
+            log_p, final_mean, final_cov = self.kalman_filter(x, observed)
         return log_p, final_mean, final_cov
 
     def kalman_filter(
@@ -678,3 +712,335 @@ def kalman_filter_step(
     )
 
     return filtered_mean, filtered_cov, log_p
+
+
+def _combine_filtering_elements(F, first, second, latent_dim: int):
+    """
+    Associative operator of the parallel Kalman filter.
+
+    Each element is a tuple (A, b, C, eta, J) describing the conditional
+    p(l_t | l_s, z_{s+1}, ..., z_t) = N(A l_s + b, C) together with the
+    likelihood of z_{s+1}, ..., z_t as a function of l_s, which is
+    proportional to exp(-l_s^T J l_s / 2 + eta^T l_s). The result describes
+    the span of `first` followed by that of `second`.
+
+    All tensors have shape (..., latent_dim, latent_dim), except b and eta
+    which have shape (..., latent_dim, 1).
+    """
+    A_1, b_1, C_1, eta_1, J_1 = first
+    A_2, b_2, C_2, eta_2, J_2 = second
+
+    # W = (I + C_1 J_2)^{-1}, and (I + J_2 C_1)^{-1} = W^T
+    W = F.linalg_inverse(
+        F.broadcast_add(F.eye(latent_dim), F.linalg_gemm2(C_1, J_2))
+    )
+    A_2_W = F.linalg_gemm2(A_2, W)
+    A_1_tr_W_tr = F.linalg_gemm2(A_1, W, transpose_a=True, transpose_b=True)
+
+    A = F.linalg_gemm2(A_2_W, A_1)
+    b = F.linalg_gemm2(A_2_W, b_1 + F.linalg_gemm2(C_1, eta_2)) + b_2
+    C = F.linalg_gemm2(A_2_W, F.linalg_gemm2(C_1, A_2, transpose_b=True)) + C_2
+    eta = F.linalg_gemm2(A_1_tr_W_tr, eta_2 - F.linalg_gemm2(J_2, b_1)) + eta_1
+    J = F.linalg_gemm2(A_1_tr_W_tr, F.linalg_gemm2(J_2, A_1)) + J_1
+
+    # keep the covariance and precision-like terms symmetric
+    C = 0.5 * (C + C.swapaxes(dim1=-1, dim2=-2))
+    J = 0.5 * (J + J.swapaxes(dim1=-1, dim2=-2))
+    return A, b, C, eta, J
+
+
+def _scan_filtering_elements(F, elements, length: int, latent_dim: int):
+    """
+    Inclusive scan of the filtering elements along the time axis (axis 1)
+    with `_combine_filtering_elements`.
+
+    Adjacent pairs of elements are combined, the resulting sequence of half
+    the length is scanned recursively, which yields the prefixes ending at
+    odd positions, and those ending at even positions are obtained with one
+    more combination each. This takes about 2 * length combinations in
+    2 * log2(length) sequential steps.
+    """
+    if length == 1:
+        return elements
+
+    def every_other(x, begin, end):
+        return F.slice(x, begin=(None, begin), end=(None, end), step=(None, 2))
+
+    num_pairs = length // 2
+    num_even = length - num_pairs
+
+    # prefixes ending at positions 1, 3, 5, ...
+    odd_prefixes = _scan_filtering_elements(
+        F,
+        _combine_filtering_elements(
+            F,
+            [every_other(x, 0, 2 * num_pairs) for x in elements],
+            [every_other(x, 1, 2 * num_pairs) for x in elements],
+            latent_dim,
+        ),
+        num_pairs,
+        latent_dim,
+    )
+
+    # prefixes ending at positions 0, 2, 4, ...
+    even_prefixes = [every_other(x, 0, length) for x in elements]
+    if num_even > 1:
+        combined = _combine_filtering_elements(
+            F,
+            [
+                F.slice_axis(x, axis=1, begin=0, end=num_even - 1)
+                for x in odd_prefixes
+            ],
+            [
+                F.slice_axis(x, axis=1, begin=1, end=None)
+                for x in even_prefixes
+            ],
+            latent_dim,
+        )
+        even_prefixes = [
+            F.concat(F.slice_axis(x, axis=1, begin=0, end=1), y, dim=1)
+            for x, y in zip(even_prefixes, combined)
+        ]
+
+    # interleave the two sequences of prefixes again
+    result = []
+    for even, odd in zip(even_prefixes, odd_prefixes):
+        interleaved = F.stack(
+            F.slice_axis(even, axis=1, begin=0, end=num_pairs), odd, axis=2
+        ).reshape((0, -3, -2))
+        if num_even > num_pairs:
+            interleaved = F.concat(
+                interleaved,
+                F.slice_axis(even, axis=1, begin=num_pairs, end=None),
+                dim=1,
+            )
+        result.append(interleaved)
+    return result
+
+
+def kalman_filter_parallel(
+    F,
+    targets: Tensor,
+    observed: Optional[Tensor],
+    emission_coeff: Tensor,
+    transition_coeff: Tensor,
+    innovation_coeff: Tensor,
+    noise_std: Tensor,
+    residuals: Tensor,
+    prior_mean: Tensor,
+    prior_cov: Tensor,
+    latent_dim: int,
+    output_dim: int,
+    seq_length: int,
+) -> Tuple[Tensor, ...]:
+    """
+    Kalman filtering as an associative scan over time.
+
+    This computes the same quantities as `LDS.kalman_filter`, following
+    Särkkä and García-Fernández, "Temporal Parallelization of Bayesian
+    Smoothers" (2021): each time step is turned into an element of an
+    associative operation (see `_combine_filtering_elements`), and the
+    filtered distributions are the prefix sums of these elements. These are
+    computed by a scan in ceil(log2(seq_length)) steps, each of which
+    operates on all time steps at once, so that the computational graph has
+    logarithmic rather than linear depth in the sequence length.
+
+    Parameters
+    ----------
+    F
+    targets
+        Observations, shape (batch_size, seq_length, output_dim)
+    observed
+        Flag tensor indicating which observations are genuine (1.0) and
+        which are missing (0.0), shape (batch_size, seq_length)
+    emission_coeff
+        Tensor of shape (batch_size, seq_length, output_dim, latent_dim)
+    transition_coeff
+        Tensor of shape (batch_size, seq_length, latent_dim, latent_dim)
+    innovation_coeff
+        Tensor of shape (batch_size, seq_length, latent_dim)
+    noise_std
+        Tensor of shape (batch_size, seq_length, output_dim)
+    residuals
+        Tensor of shape (batch_size, seq_length, output_dim)
+    prior_mean
+        Tensor of shape (batch_size, latent_dim)
+    prior_cov
+        Tensor of shape (batch_size, latent_dim, latent_dim)
+    latent_dim
+        Dimension of the latent state
+    output_dim
+        Dimension of the output
+    seq_length
+        Sequence length
+
+    Returns
+    -------
+    Tensor
+        Log probabilities, shape (batch_size, seq_length)
+    Tensor
+        Mean of p(l_T | l_{T-1}), where T is seq_length, with shape
+        (batch_size, latent_dim)
+    Tensor
+        Covariance of p(l_T | l_{T-1}), where T is seq_length, with shape
+        (batch_size, latent_dim, latent_dim)
+    """
+    eye = F.eye(latent_dim)
+
+    # (batch_size, seq_length, output_dim, 1)
+    targets_minus_residuals = (targets - residuals).expand_dims(axis=-1)
+    noise_cov = make_nd_diag(F=F, x=noise_std * noise_std, d=output_dim)
+
+    # Covariance of the innovation, for each time step
+    # (batch_size, seq_length, latent_dim, latent_dim)
+    innovation_coeff = innovation_coeff.expand_dims(axis=-2)
+    innovation_cov = F.linalg_gemm2(
+        innovation_coeff, innovation_coeff, transpose_a=True
+    )
+
+    # Missing observations carry no information on the state
+    observed_emission_coeff = (
+        F.broadcast_mul(
+            emission_coeff, observed.expand_dims(axis=-1).expand_dims(axis=-1)
+        )
+        if observed is not None
+        else emission_coeff
+    )
+
+    def time_slice(x, begin, end):
+        return F.slice_axis(x, axis=1, begin=begin, end=end)
+
+    # The first element is the filtered distribution at time 0
+    first_mean, first_cov, _ = kalman_filter_step(
+        F,
+        target=time_slice(targets, 0, 1).squeeze(axis=1),
+        prior_mean=prior_mean,
+        prior_cov=prior_cov,
+        emission_coeff=time_slice(emission_coeff, 0, 1).squeeze(axis=1),
+        residual=time_slice(residuals, 0, 1).squeeze(axis=1),
+        noise_std=time_slice(noise_std, 0, 1).squeeze(axis=1),
+        latent_dim=latent_dim,
+        output_dim=output_dim,
+    )
+    if observed is not None:
+        first_observed = time_slice(observed, 0, 1).squeeze(axis=1)
+        first_mean = F.where(first_observed, x=first_mean, y=prior_mean)
+        first_cov = F.where(first_observed, x=first_cov, y=prior_cov)
+    first_mean = first_mean.expand_dims(axis=-1).expand_dims(axis=1)
+    first_cov = first_cov.expand_dims(axis=1)
+    elements = [
+        F.zeros_like(first_cov),
+        first_mean,
+        first_cov,
+        F.zeros_like(first_mean),
+        F.zeros_like(first_cov),
+    ]
+
+    if seq_length > 1:
+        # Elements of time steps t >= 1 condition on the state at t - 1
+        emission = time_slice(observed_emission_coeff, 1, None)
+        transition = time_slice(transition_coeff, 0, seq_length - 1)
+        prior_innovation_cov = time_slice(innovation_cov, 0, seq_length - 1)
+        noise = time_slice(noise_cov, 1, None)
+        target = time_slice(targets_minus_residuals, 1, None)
+
+        S_hh_x_A_tr = F.linalg_gemm2(
+            prior_innovation_cov, emission, transpose_b=True
+        )
+        L_output_cov = F.linalg_potrf(
+            F.linalg_gemm2(emission, S_hh_x_A_tr) + noise
+        )
+        kalman_gain = F.linalg_trsm(
+            L_output_cov,
+            F.linalg_trsm(
+                L_output_cov, S_hh_x_A_tr, rightside=True, transpose=True
+            ),
+            rightside=True,
+        )
+        ImKA = F.broadcast_sub(eye, F.linalg_gemm2(kalman_gain, emission))
+
+        # L^{-1} A C and L^{-1} (z - b)
+        whitened_emission = F.linalg_gemm2(
+            F.linalg_trsm(L_output_cov, emission), transition
+        )
+        whitened_target = F.linalg_trsm(L_output_cov, target)
+
+        elements = [
+            F.concat(x, y, dim=1)
+            for x, y in zip(
+                elements,
+                [
+                    F.linalg_gemm2(ImKA, transition),
+                    F.linalg_gemm2(kalman_gain, target),
+                    F.linalg_gemm2(
+                        ImKA,
+                        F.linalg_gemm2(
+                            prior_innovation_cov, ImKA, transpose_b=True
+                        ),
+                    )
+                    + F.linalg_gemm2(
+                        kalman_gain,
+                        F.linalg_gemm2(noise, kalman_gain, transpose_b=True),
+                    ),
+                    F.linalg_gemm2(
+                        whitened_emission, whitened_target, transpose_a=True
+                    ),
+                    F.linalg_gemm2(
+                        whitened_emission, whitened_emission, transpose_a=True
+                    ),
+                ],
+            )
+        ]
+
+    elements = _scan_filtering_elements(F, elements, seq_length, latent_dim)
+
+    # Filtered distributions p(l_t | z_0, ..., z_t), since A = 0 for the
+    # first element
+    _, filtered_mean, filtered_cov, _, _ = elements
+
+    # Distributions p(l_{t+1} | z_0, ..., z_t)
+    predicted_mean = F.linalg_gemm2(transition_coeff, filtered_mean)
+    predicted_cov = (
+        F.linalg_gemm2(
+            transition_coeff,
+            F.linalg_gemm2(filtered_cov, transition_coeff, transpose_b=True),
+        )
+        + innovation_cov
+    )
+
+    # Distributions p(l_t | z_0, ..., z_{t-1})
+    state_mean = prior_mean.expand_dims(axis=-1).expand_dims(axis=1)
+    state_cov = prior_cov.expand_dims(axis=1)
+    if seq_length > 1:
+        state_mean = F.concat(
+            state_mean, time_slice(predicted_mean, 0, seq_length - 1), dim=1
+        )
+        state_cov = F.concat(
+            state_cov, time_slice(predicted_cov, 0, seq_length - 1), dim=1
+        )
+
+    # log p(z_t | z_0, ..., z_{t-1}), for all t at once
+    delta = targets_minus_residuals - F.linalg_gemm2(
+        emission_coeff, state_mean
+    )
+    L_output_cov = F.linalg_potrf(
+        F.linalg_gemm2(
+            emission_coeff,
+            F.linalg_gemm2(state_cov, emission_coeff, transpose_b=True),
+        )
+        + noise_cov
+    )
+    whitened_delta = F.linalg_trsm(L_output_cov, delta)
+    log_p = (
+        -output_dim / 2 * math.log(2 * math.pi)
+        - F.linalg_sumlogdiag(L_output_cov)
+        - 0.5 * F.square(whitened_delta).sum(axis=(-2, -1))
+    )
+
+    final_mean = time_slice(predicted_mean, seq_length - 1, None)
+    final_cov = time_slice(predicted_cov, seq_length - 1, None)
+    return (
+        log_p,
+        final_mean.squeeze(axis=1).squeeze(axis=-1),
+        final_cov.squeeze(axis=1),
+    )
@@ -242,7 +242,12 @@ class LowrankMultivariateGaussian(Distribution):
 
         return self.Cov
 
-    def sample_rep(self, num_samples: int = None, dtype=np.float32) -> Tensor:
+    def sample_rep(
+        self,
+        num_samples: int = None,
+        dtype=np.float32,
+        factor_noise: Optional[Tensor] = None,
+    ) -> Tensor:
         r"""
         Draw samples from the multivariate Gaussian distribution:
 
@@ -257,11 +262,19 @@ class LowrankMultivariateGaussian(Distribution):
             number of samples to be drawn.
         dtype
             Data-type of the samples.
+        factor_noise
+            Standard normal samples :math:`v` of shape (..., rank) to use
+            instead of drawing them, e.g. to share them between distributions
+            over different subsets of dimensions of the same vector; only
+            supported if `num_samples` is None.
 
         Returns
         -------
             tensor with shape (num_samples, ..., dim)
         """
+        assert (
+            factor_noise is None or num_samples is None
+        ), "factor_noise is only supported if num_samples is None"
 
         def s(mu: Tensor, D: Tensor, W: Tensor) -> Tensor:
             F = getF(mu)
@@ -271,16 +284,19 @@ class LowrankMultivariateGaussian(Distribution):
             )
             cov_D = D.sqrt() * samples_D
 
-            # dummy only use to get the shape (..., rank, 1)
-            dummy_tensor = F.linalg_gemm2(
-                W, mu.expand_dims(axis=-1), transpose_a=True
-            ).squeeze(axis=-1)
-
-            samples_W = F.sample_normal(
-                mu=F.zeros_like(dummy_tensor),
-                sigma=F.ones_like(dummy_tensor),
-                dtype=dtype,
-            )
+            if factor_noise is not None:
+                samples_W = factor_noise
+            else:
+                # dummy only use to get the shape (..., rank, 1)
+                dummy_tensor = F.linalg_gemm2(
+                    W, mu.expand_dims(axis=-1), transpose_a=True
+                ).squeeze(axis=-1)
+
+                samples_W = F.sample_normal(
+                    mu=F.zeros_like(dummy_tensor),
+                    sigma=F.ones_like(dummy_tensor),
+                    dtype=dtype,
+                )
 
             cov_W = F.linalg_gemm2(W, samples_W.expand_dims(axis=-1)).squeeze(
                 axis=-1
@@ -0,0 +1,658 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+"""
+NumPy implementations of the mean, cdf and quantile function of the most
+common distributions.
+
+Once a network has produced the parameters of a distribution, evaluating
+these functions for all time series and quantile levels in NumPy avoids
+dispatching many small MXNet operators. Use :func:`to_numpy_distribution` to
+obtain the NumPy counterpart of a :class:`Distribution`.
+"""
+
+# Standard library imports
+import math
+from functools import singledispatch
+from typing import Callable, Optional, Tuple
+
+# Third-party imports
+import numpy as np
+
+# First-party imports
+from gluonts.support.util import erf, erfinv
+
+# Relative imports
+from .bijection import AffineTransformation
+from .distribution import Distribution
+from .gamma import Gamma
+from .gaussian import Gaussian
+from .laplace import Laplace
+from .neg_binomial import NegativeBinomial
+from .piecewise_linear import PiecewiseLinear
+from .student_t import StudentT
+from .transformed_distribution import TransformedDistribution
+
+_EPS = np.finfo(np.float64).eps
+_TINY = 1e-300
+_MAX_ITER = 1000
+# relative accuracy of the continued fractions
+_CF_TOL = 1e-14
+
+# coefficients of the Lanczos approximation with g=7
+_LANCZOS_G = 7.0
+_LANCZOS_COEFFICIENTS = [
+    0.99999999999980993,
+    676.5203681218851,
+    -1259.1392167224028,
+    771.32342877765313,
+    -176.61502916214059,
+    12.507343278686905,
+    -0.13857109526572012,
+    9.9843695780195716e-6,
+    1.5056327351493116e-7,
+]
+
+
+def gammaln(x: np.ndarray) -> np.ndarray:
+    """
+    Logarithm of the gamma function for positive arguments.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    # use the reflection formula for small arguments
+    reflect = x < 0.5
+    y = np.where(reflect, 1.0 - x, x) - 1.0
+
+    series = np.full_like(y, _LANCZOS_COEFFICIENTS[0])
+    for i, c in enumerate(_LANCZOS_COEFFICIENTS[1:], start=1):
+        series = series + c / (y + i)
+    t = y + _LANCZOS_G + 0.5
+    result = (
+        0.5 * math.log(2.0 * math.pi)
+        + (y + 0.5) * np.log(t)
+        - t
+        + np.log(series)
+    )
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        reflected = np.log(math.pi / np.sin(math.pi * x)) - result
+    return np.where(reflect, reflected, result)
+
+
+def _nonzero(x: np.ndarray) -> np.ndarray:
+    return np.where(np.abs(x) < _TINY, _TINY, x)
+
+
+def _betacf(a: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+    # continued fraction of the incomplete beta function, evaluated with the
+    # modified Lentz method
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c = np.ones_like(x)
+    d = 1.0 / _nonzero(1.0 - qab * x / qap)
+    h = d
+    for m in range(1, _MAX_ITER + 1):
+        m2 = 2.0 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 / _nonzero(1.0 + aa * d)
+        c = _nonzero(1.0 + aa / c)
+        h = h * d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 / _nonzero(1.0 + aa * d)
+        c = _nonzero(1.0 + aa / c)
+        delta = d * c
+        h = h * delta
+        if np.all(np.abs(delta - 1.0) < _CF_TOL):
+            break
+    return h
+
+
+def betainc(a: np.ndarray, b: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Regularized incomplete beta function :math:`I_x(a, b)`.
+    """
+    a, b, x = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (a, b, x))
+    )
+    x = np.clip(x, 0.0, 1.0)
+
+    # the continued fraction converges quickly for x < (a + 1) / (a + b + 2),
+    # otherwise we use I_x(a, b) = 1 - I_{1-x}(b, a)
+    swap = x > (a + 1.0) / (a + b + 2.0)
+    a, b, x = (
+        np.where(swap, b, a),
+        np.where(swap, a, b),
+        np.where(swap, 1.0 - x, x),
+    )
+
+    with np.errstate(divide="ignore"):
+        log_front = (
+            a * np.log(x)
+            + b * np.log1p(-x)
+            - gammaln(a)
+            - gammaln(b)
+            + gammaln(a + b)
+        )
+    result = np.exp(log_front) / a * _betacf(a, b, x)
+    return np.where(swap, 1.0 - result, result)
+
+
+def gammainc(a: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """
+    Regularized lower incomplete gamma function :math:`P(a, x)`.
+    """
+    a, x = np.broadcast_arrays(
+        *(np.asarray(v, dtype=np.float64) for v in (a, x))
+    )
+    x = np.maximum(x, 0.0)
+
+    # series expansion for x < a + 1, continued fraction otherwise; entries
+    # not handled by either method get harmless placeholder values
+    use_series = x < a + 1.0
+    x_series = np.where(use_series, x, 0.0)
+    x_cf = np.where(use_series, a + 1.0, x)
+
+    ap = a
+    delta = 1.0 / a
+    total = delta
+    for _ in range(_MAX_ITER):
+        ap = ap + 1.0
+        delta = delta * x_series / ap
+        total = total + delta
+        if np.all(np.abs(delta) < np.abs(total) * _EPS):
+            break
+    with np.errstate(divide="ignore"):
+        series = total * np.exp(a * np.log(x_series) - x_series - gammaln(a))
+
+    b = x_cf + 1.0 - a
+    c = np.full_like(x_cf, 1.0 / _TINY)
+    d = 1.0 / b
+    h = d
+    for i in range(1, _MAX_ITER + 1):
+        an = -i * (i - a)
+        b = b + 2.0
+        d = 1.0 / _nonzero(an * d + b)
+        c = _nonzero(b + an / c)
+        delta = d * c
+        h = h * delta
+        if np.all(np.abs(delta - 1.0) < _CF_TOL):
+            break
+    cf = 1.0 - np.exp(a * np.log(x_cf) - x_cf - gammaln(a)) * h
+
+    return np.where(use_series, series, cf)
+
+
+def normal_quantile(level: np.ndarray) -> np.ndarray:
+    """
+    Quantile function of the standard normal distribution.
+    """
+    return math.sqrt(2.0) * erfinv(np, 2.0 * level - 1.0)
+
+
+def _upper_bracket(
+    cdf: Callable[[np.ndarray], np.ndarray],
+    level: np.ndarray,
+    upper: np.ndarray,
+) -> np.ndarray:
+    # doubles `upper` until cdf(upper) >= level
+    for _ in range(64):
+        below = cdf(upper) < level
+        if not np.any(below):
+            break
+        upper = np.where(below, 2.0 * upper, upper)
+    return upper
+
+
+def _invert_cdf(
+    cdf_and_pdf: Callable[[np.ndarray], Tuple[np.ndarray, np.ndarray]],
+    level: np.ndarray,
+    x: np.ndarray,
+    lower: np.ndarray,
+    upper: np.ndarray,
+    tol: float = 1e-12,
+) -> np.ndarray:
+    """
+    Solves cdf(x) = level for x with Newton's method. Steps that leave the
+    bracket [lower, upper], which has to contain the solution, are replaced by
+    bisection steps.
+    """
+    for _ in range(200):
+        cdf, pdf = cdf_and_pdf(x)
+        below = cdf < level
+        lower = np.where(below, x, lower)
+        upper = np.where(below, upper, x)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = (cdf - level) / pdf
+        converged = np.isfinite(pdf) & (np.abs(step) <= tol * np.abs(x))
+        if np.all(converged):
+            break
+
+        x_newton = x - step
+        inside = (x_newton > lower) & (x_newton < upper)
+        x = np.where(
+            converged, x, np.where(inside, x_newton, 0.5 * (lower + upper)),
+        )
+    return x
+
+
+class NumPyDistribution:
+    """
+    Distribution whose parameters are NumPy arrays, and which supports
+    computing the mean, cdf and quantiles.
+    """
+
+    @property
+    def batch_shape(self) -> Tuple:
+        raise NotImplementedError()
+
+    @property
+    def mean(self) -> np.ndarray:
+        raise NotImplementedError()
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        r"""
+        Returns the value of the cumulative distribution function evaluated at
+        x, which has to broadcast against the batch shape.
+        """
+        raise NotImplementedError()
+
+    def quantile(self, level: np.ndarray) -> np.ndarray:
+        r"""
+        Calculates quantiles for the given levels.
+
+        Parameters
+        ----------
+        level
+            1d array of level values between 0 and 1.
+
+        Returns
+        -------
+        numpy.ndarray
+            Quantile values, of shape (num_levels, *batch_shape).
+        """
+        raise NotImplementedError()
+
+    def _expand_level(self, level: np.ndarray) -> np.ndarray:
+        level = np.asarray(level, dtype=np.float64)
+        return level.reshape(level.shape + (1,) * len(self.batch_shape))
+
+
+class NumPyGaussian(NumPyDistribution):
+    def __init__(self, mu: np.ndarray, sigma: np.ndarray) -> None:
+        self.mu = mu
+        self.sigma = sigma
+
+    @property
+    def batch_shape(self) -> Tuple:
+        return self.mu.shape
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.mu
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        u = (x - self.mu) / (self.sigma * math.sqrt(2.0))
+        return (erf(np, u) + 1.0) / 2.0
+
+    def quantile(self, level: np.ndarray) -> np.ndarray:
+        level = self._expand_level(level)
+        return self.mu + self.sigma * normal_quantile(level)
+
+
+class NumPyLaplace(NumPyDistribution):
+    def __init__(self, mu: np.ndarray, b: np.ndarray) -> None:
+        self.mu = mu
+        self.b = b
+
+    @property
+    def batch_shape(self) -> Tuple:
+        return self.mu.shape
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.mu
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        y = (x - self.mu) / self.b
+        return 0.5 + 0.5 * np.sign(y) * (1.0 - np.exp(-np.abs(y)))
+
+    def quantile(self, level: np.ndarray) -> np.ndarray:
+        level = self._expand_level(level)
+        with np.errstate(divide="ignore"):
+            u = np.where(
+                level > 0.5, -np.log(2.0 - 2.0 * level), np.log(2.0 * level)
+            )
+        return self.mu + self.b * u
+
+
+class NumPyStudentT(NumPyDistribution):
+    def __init__(
+        self, mu: np.ndarray, sigma: np.ndarray, nu: np.ndarray
+    ) -> None:
+        self.mu = mu
+        self.sigma = sigma
+        self.nu = nu
+
+    @property
+    def batch_shape(self) -> Tuple:
+        return self.mu.shape
+
+    @property
+    def mean(self) -> np.ndarray:
+        return np.where(self.nu > 1.0, self.mu, np.nan)
+
+    @staticmethod
+    def _standard_cdf(t: np.ndarray, nu: np.ndarray) -> np.ndarray:
+        tail = 0.5 * betainc(0.5 * nu, 0.5, nu / (nu + np.square(t)))
+        return np.where(t > 0, 1.0 - tail, tail)
+
+    @staticmethod
+    def _standard_pdf(t: np.ndarray, nu: np.ndarray) -> np.ndarray:
+        return np.exp(
+            gammaln(0.5 * (nu + 1.0))
+            - gammaln(0.5 * nu)
+            - 0.5 * np.log(math.pi * nu)
+            - 0.5 * (nu + 1.0) * np.log1p(np.square(t) / nu)
+        )
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        return self._standard_cdf((x - self.mu) / self.sigma, self.nu)
+
+    def quantile(self, level: np.ndarray) -> np.ndarray:
+        level = self._expand_level(level)
+        nu = np.broadcast_to(self.nu, np.broadcast(level, self.nu).shape)
+
+        # by symmetry, we only solve for levels in the upper half
+        p = np.maximum(level, 1.0 - level) + np.zeros_like(nu)
+
+        # Cornish-Fisher expansion as initial guess
+        z = normal_quantile(p)
+        t = (
+            z
+            + (z ** 3 + z) / (4.0 * nu)
+            + (5.0 * z ** 5 + 16.0 * z ** 3 + 3.0 * z) / (96.0 * nu ** 2)
+        )
+
+        def cdf(t):
+            return self._standard_cdf(t, nu)
+
+        upper = _upper_bracket(cdf, p, np.maximum(2.0 * t, 1.0))
+        t = _invert_cdf(
+            lambda t: (cdf(t), self._standard_pdf(t, nu)),
+            p,
+            x=np.clip(t, 0.0, upper),
+            lower=np.zeros_like(p),
+            upper=upper,
+        )
+        t = np.where(p >= 1.0, np.inf, t)
+        t = np.where(level < 0.5, -t, t)
+
+        return self.mu + self.sigma * t
+
+
+class NumPyGamma(NumPyDistribution):
+    def __init__(self, alpha: np.ndarray, beta: np.ndarray) -> None:
+        self.alpha = alpha
+        self.beta = beta
+
+    @property
+    def batch_shape(self) -> Tuple:
+        return self.alpha.shape
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.alpha / self.beta
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        return gammainc(self.alpha, self.beta * x)
+
+    def quantile(self, level: np.ndarray) -> np.ndarray:
+        level = self._expand_level(level)
+        shape = np.broadcast(level, self.alpha).shape
+        alpha = np.broadcast_to(self.alpha, shape)
+        level = np.broadcast_to(level, shape)
+
+        # Wilson-Hilferty approximation as initial guess for the distribution
+        # with unit rate, or P(a, y) ~ y^a / Gamma(a + 1) for small quantiles
+        z = normal_quantile(level)
+        w = 1.0 - 1.0 / (9.0 * alpha) + z / (3.0 * np.sqrt(alpha))
+        with np.errstate(divide="ignore"):
+            y_small = np.exp((np.log(level) + gammaln(alpha + 1.0)) / alpha)
+        y = np.where(w > 0.0, alpha * np.maximum(w, 0.0) ** 3, y_small)
+
+        def cdf(y):
+            return gammainc(alpha, y)
+
+        def pdf(y):
+            with np.errstate(divide="ignore"):
+                return np.exp((alpha - 1.0) * np.log(y) - y - gammaln(alpha))
+
+        upper = _upper_bracket(cdf, level, np.maximum(2.0 * y, 1.0))
+        y = _invert_cdf(
+            lambda y: (cdf(y), pdf(y)),
+            level,
+            x=np.clip(y, 0.0, upper),
+            lower=np.zeros_like(y),
+            upper=upper,
+        )
+        y = np.where(level >= 1.0, np.inf, np.where(level <= 0.0, 0.0, y))
+
+        return y / self.beta
+
+
+class NumPyNegativeBinomial(NumPyDistribution):
+    def __init__(self, mu: np.ndarray, alpha: np.ndarray) -> None:
+        self.mu = mu
+        self.alpha = alpha
+
+    @property
+    def batch_shape(self) -> Tuple:
+        return self.mu.shape
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.mu
+
+    @staticmethod
+    def _cdf(k: np.ndarray, mu: np.ndarray, alpha: np.ndarray) -> np.ndarray:
+        # P(X <= k) = I_{1 / (1 + alpha * mu)}(1 / alpha, k + 1)
+        k = np.floor(k)
+        result = betainc(
+            1.0 / alpha, np.maximum(k, 0.0) + 1.0, 1.0 / (1.0 + alpha * mu)
+        )
+        return np.where(k < 0, 0.0, result)
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        return self._cdf(x, self.mu, self.alpha)
+
+    def quantile(self, level: np.ndarray) -> np.ndarray:
+        level = self._expand_level(level)
+        shape = np.broadcast(level, self.mu).shape
+        mu = np.broadcast_to(self.mu, shape)
+        alpha = np.broadcast_to(self.alpha, shape)
+        level = np.broadcast_to(level, shape)
+
+        def cdf(k):
+            return self._cdf(k, mu, alpha)
+
+        # the quantile is the smallest integer k with cdf(k) >= level, which
+        # is found by bisection in (lower, upper]
+        stddev = np.sqrt(mu * (1.0 + mu * alpha))
+        lower = np.full(shape, -1.0)
+        upper = _upper_bracket(cdf, level, np.ceil(mu + 4.0 * stddev) + 1.0)
+        while np.any(upper - lower > 1.0):
+            mid = np.floor(0.5 * (lower + upper))
+            below = cdf(mid) < level
+            lower = np.where(below, mid, lower)
+            upper = np.where(below, upper, mid)
+
+        return upper
+
+
+class NumPyPiecewiseLinear(NumPyDistribution):
+    def __init__(
+        self, gamma: np.ndarray, slopes: np.ndarray, knot_spacings: np.ndarray
+    ) -> None:
+        self.gamma = gamma
+        # differences between the slopes of consecutive pieces
+        self.b = np.concatenate(
+            [slopes[..., :1], np.diff(slopes, axis=-1)], axis=-1
+        )
+        self.knot_positions = np.cumsum(knot_spacings, axis=-1) - knot_spacings
+
+    @property
+    def batch_shape(self) -> Tuple:
+        return self.gamma.shape
+
+    @property
+    def mean(self) -> np.ndarray:
+        # integral of the quantile function over [0, 1]
+        return self.gamma + np.sum(
+            self.b * np.square(1.0 - self.knot_positions) / 2.0, axis=-1
+        )
+
+    def cdf(self, x: np.ndarray) -> np.ndarray:
+        gamma, b, knot_positions = self.gamma, self.b, self.knot_positions
+
+        # quantiles at knots, of shape (..., num_pieces)
+        quantiles_at_knots = gamma[..., None] + np.sum(
+            b[..., None, :]
+            * np.maximum(
+                knot_positions[..., :, None] - knot_positions[..., None, :],
+                0.0,
+            ),
+            axis=-1,
+        )
+        mask = quantiles_at_knots < np.expand_dims(x, axis=-1)
+
+        slope_l0 = np.sum(b * mask, axis=-1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            a_tilde = (
+                x - gamma + np.sum(b * knot_positions * mask, axis=-1)
+            ) / slope_l0
+        a_tilde = np.where(slope_l0 == 0.0, 0.0, a_tilde)
+
+        return np.minimum(a_tilde, 1.0)
+
+    def quantile(self, level: np.ndarray) -> np.ndarray:
+        level = self._expand_level(level)
+        return self.gamma + np.sum(
+            self.b * np.maximum(level[..., None] - self.knot_positions, 0.0),
+            axis=-1,
+        )
+
+
+class NumPyAffineTransformed(NumPyDistribution):
+    """
+    Distribution of `scale * x + loc`, where `x` follows `base_distribution`.
+    """
+
+    def __init__(
+        self,
+        base_distribution: NumPyDistribution,
+        loc: np.ndarray,
+        scale: np.ndarray,
+    ) -> None:
+        self.base_distribution = base_distribution
+        self.loc = loc
+        self.scale = scale
+
+    @property
+    def batch_shape(self) -> Tuple:
+        return np.broadcast(
+            np.empty(self.base_distribution.batch_shape), self.loc, self.scale
+        ).shape
+
+    @property
+    def mean(self) -> np.ndarray:
+        return self.scale * self.base_distribution.mean + self.loc
+
+    def cdf(self, y: np.ndarray) -> np.ndarray:
+        f = self.base_distribution.cdf((y - self.loc) / self.scale)
+        return np.where(self.scale > 0, f, 1.0 - f)
+
+    def quantile(self, level: np.ndarray) -> np.ndarray:
+        level = np.asarray(level, dtype=np.float64)
+        q = self.base_distribution.quantile(level)
+        if np.any(self.scale < 0):
+            q = np.where(
+                self.scale > 0, q, self.base_distribution.quantile(1.0 - level)
+            )
+        return self.scale * q + self.loc
+
+
+def _numpy_args(distr: Distribution):
+    return [np.asarray(arg.asnumpy(), dtype=np.float64) for arg in distr.args]
+
+
+@singledispatch
+def to_numpy_distribution(distr: Distribution) -> Optional[NumPyDistribution]:
+    """
+    Returns the :class:`NumPyDistribution` equivalent to `distr`, or None if
+    there is no NumPy implementation for its type.
+
+    Support for further distribution types can be added by registering them
+    with ``to_numpy_distribution.register``.
+    """
+    return None
+
+
+@to_numpy_distribution.register(Gaussian)
+def _(distr: Gaussian) -> NumPyDistribution:
+    return NumPyGaussian(*_numpy_args(distr))
+
+
+@to_numpy_distribution.register(Laplace)
+def _(distr: Laplace) -> NumPyDistribution:
+    return NumPyLaplace(*_numpy_args(distr))
+
+
+@to_numpy_distribution.register(StudentT)
+def _(distr: StudentT) -> NumPyDistribution:
+    return NumPyStudentT(*_numpy_args(distr))
+
+
+@to_numpy_distribution.register(Gamma)
+def _(distr: Gamma) -> NumPyDistribution:
+    return NumPyGamma(*_numpy_args(distr))
+
+
+@to_numpy_distribution.register(NegativeBinomial)
+def _(distr: NegativeBinomial) -> NumPyDistribution:
+    return NumPyNegativeBinomial(*_numpy_args(distr))
+
+
+@to_numpy_distribution.register(PiecewiseLinear)
+def _(distr: PiecewiseLinear) -> NumPyDistribution:
+    return NumPyPiecewiseLinear(*_numpy_args(distr))
+
+
+@to_numpy_distribution.register(TransformedDistribution)
+def _(distr: TransformedDistribution) -> Optional[NumPyDistribution]:
+    if not all(isinstance(t, AffineTransformation) for t in distr.transforms):
+        return None
+
+    base_distribution = to_numpy_distribution(distr.base_distribution)
+    if base_distribution is None:
+        return None
+
+    # compose all affine transformations into a single one
+    loc, scale = np.zeros(()), np.ones(())
+    for t in distr.transforms:
+        if t.scale is not None:
+            t_scale = t.scale.asnumpy().astype(np.float64)
+            loc, scale = loc * t_scale, scale * t_scale
+        if t.loc is not None:
+            loc = loc + t.loc.asnumpy().astype(np.float64)
+
+    return NumPyAffineTransformed(base_distribution, loc, scale)
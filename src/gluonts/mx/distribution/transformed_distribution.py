@@ -129,9 +129,10 @@ class TransformedDistribution(Distribution):
             return s
 
     def sample_rep(
-        self, num_samples: Optional[int] = None, dtype=np.float
+        self, num_samples: Optional[int] = None, dtype=np.float, **kwargs
     ) -> Tensor:
-        s = self.base_distribution.sample_rep(dtype=dtype)
+        # additional arguments are passed to the base distribution
+        s = self.base_distribution.sample_rep(dtype=dtype, **kwargs)
         for t in self.transforms:
             s = t.f(s)
         return s
@@ -16,6 +16,10 @@ from gluonts.model.common import Tensor
 
 
 class Kernel:
+    # Whether the kernel only depends on the distance between its inputs, in
+    # which case its matrix on evenly spaced inputs is Toeplitz
+    stationary: bool = False
+
     # noinspection PyMethodOverriding,PyPep8Naming
     def kernel_matrix(self, x1: Tensor, x2: Tensor):
         # raise error in the base Kernel class, implement in the concrete subclasses
@@ -35,6 +35,8 @@ class PeriodicKernel(Kernel):
     :math:`\theta_2` is the frequency parameter.
     """
 
+    stationary = True
+
     # noinspection PyMethodOverriding,PyPep8Naming
     def __init__(
         self,
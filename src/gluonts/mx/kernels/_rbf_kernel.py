@@ -34,6 +34,8 @@ class RBFKernel(Kernel):
     :math:`\theta_1` is the length scale parameter.
     """
 
+    stationary = True
+
     # noinspection PyMethodOverriding,PyPep8Naming
     def __init__(
         self, amplitude: Tensor, length_scale: Tensor, F=None
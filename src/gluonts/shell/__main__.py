@@ -15,7 +15,7 @@
 import logging
 import traceback
 from pathlib import Path
-from typing import Optional, Type, Union, cast
+from typing import Optional, Tuple, Type, Union, cast
 
 # Third-party imports
 import click
@@ -139,6 +139,121 @@ def train_command(data_path: str, forecaster: Optional[str]) -> None:
         raise
 
 
+@cli.command(name="batch-predict")
+@click.option(
+    "--model-path",
+    type=click.Path(exists=True, file_okay=False),
+    required=True,
+    help="The folder containing the serialized predictor.",
+)
+@click.option(
+    "--data-path",
+    type=click.Path(exists=True),
+    required=True,
+    help="The folder or file containing the dataset in JSON Lines format.",
+)
+@click.option(
+    "--output-path",
+    type=click.Path(file_okay=False),
+    required=True,
+    help=(
+        "The folder the forecast shards are written to. If it contains "
+        "completed shards of a previous run, prediction resumes after them."
+    ),
+)
+@click.option(
+    "--freq",
+    type=str,
+    help="The frequency of the dataset; defaults to the predictor's.",
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(["jsonl", "npz"]),
+    default="jsonl",
+    show_default=True,
+    help="JSON Lines with one forecast per line, or one numpy archive per shard.",
+)
+@click.option(
+    "--shard-size",
+    type=click.IntRange(min=1),
+    default=1000,
+    show_default=True,
+    help="The number of time series per shard.",
+)
+@click.option(
+    "--num-workers",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="The number of worker processes used for prediction.",
+)
+@click.option(
+    "--num-samples",
+    type=click.IntRange(min=1),
+    default=100,
+    show_default=True,
+    help="The number of samples drawn for each forecast.",
+)
+@click.option(
+    "--output-type",
+    "output_types",
+    type=click.Choice(["mean", "quantiles", "samples"]),
+    multiple=True,
+    default=["mean", "quantiles"],
+    show_default=True,
+    help="The outputs to write for each forecast; can be repeated.",
+)
+@click.option(
+    "--quantile",
+    "quantiles",
+    multiple=True,
+    default=["0.1", "0.5", "0.9"],
+    show_default=True,
+    help="A quantile level to write; can be repeated.",
+)
+def batch_predict_command(
+    model_path: str,
+    data_path: str,
+    output_path: str,
+    freq: Optional[str],
+    output_format: str,
+    shard_size: int,
+    num_workers: int,
+    num_samples: int,
+    output_types: Tuple[str, ...],
+    quantiles: Tuple[str, ...],
+) -> None:
+    from gluonts.dataset.common import FileDataset
+    from gluonts.model.forecast import Config as ForecastConfig
+    from gluonts.model.predictor import Predictor
+    from gluonts.shell.batch_predict import run_batch_predict
+
+    logger.info("Run 'batch-predict' command")
+
+    predictor = Predictor.deserialize(Path(model_path))
+    dataset = FileDataset(Path(data_path), freq or predictor.freq)
+    stats = run_batch_predict(
+        predictor,
+        dataset,
+        Path(output_path),
+        ForecastConfig(
+            num_samples=num_samples,
+            output_types=set(output_types),
+            quantiles=list(quantiles),
+        ),
+        output_format=output_format,
+        shard_size=shard_size,
+        num_workers=num_workers,
+    )
+
+    num_items = sum(shard.num_items for shard in stats)
+    seconds = sum(shard.seconds for shard in stats)
+    logger.info(
+        f"Predicted {num_items} time series in {len(stats)} shards "
+        f"in {seconds:.2f}s"
+    )
+
+
 if __name__ == "__main__":
     import logging
     import os
@@ -0,0 +1,327 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+import json
+import logging
+import os
+import time
+from collections import deque
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+)
+
+# Third-party imports
+import numpy as np
+
+# First-party imports
+from gluonts.core.exception import GluonTSUserError
+from gluonts.dataset.common import DataEntry, Dataset
+from gluonts.model.forecast import Config as ForecastConfig
+from gluonts.model.forecast import (
+    Forecast,
+    OutputType,
+    Quantile,
+    SampleForecast,
+)
+from gluonts.model.predictor import ParallelizedPredictor, Predictor
+
+# Relative imports
+from .serve.util import jsonify_floats
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = ["jsonl", "npz"]
+
+SETTINGS_FILE = ".batch-predict.json"
+SUCCESS_FILE = "_SUCCESS"
+
+
+class ShardStats(NamedTuple):
+    shard: int
+    num_items: int
+    seconds: float
+
+    @property
+    def items_per_second(self) -> float:
+        return self.num_items / self.seconds if self.seconds > 0 else np.inf
+
+
+def shard_path(output_path: Path, shard: int, output_format: str) -> Path:
+    return output_path / f"part-{shard:05d}.{output_format}"
+
+
+def completed_shards(output_path: Path, output_format: str) -> int:
+    """
+    Number of shards written by a previous run, which are the consecutive
+    shards from the first one whose files exist; shards are only given their
+    final name once they are complete.
+    """
+    num_shards = 0
+    while shard_path(output_path, num_shards, output_format).exists():
+        num_shards += 1
+    return num_shards
+
+
+def predict_forecasts(
+    predictor: Predictor,
+    dataset: Iterable[DataEntry],
+    num_samples: int,
+    num_workers: int,
+    chunk_size: int = 100,
+) -> Iterator[Forecast]:
+    """
+    Streams the forecasts of `predictor` for `dataset`, in order, while
+    reading the dataset only once and `chunk_size` time series at a time.
+
+    With `num_workers` processes, the chunks are predicted in parallel by a
+    :class:`ParallelizedPredictor`; otherwise they are predicted in this
+    process, one after the other. Forecasts without an item id get the one
+    of their time series.
+    """
+    # the predictor reads ahead of the forecasts it has yielded
+    item_ids: Deque[Optional[str]] = deque()
+
+    def entries() -> Iterator[DataEntry]:
+        for entry in dataset:
+            item_ids.append(entry.get("item_id"))
+            yield entry
+
+    if num_workers > 0:
+        forecasts = ParallelizedPredictor(
+            predictor, num_workers=num_workers, chunk_size=chunk_size
+        ).predict(entries(), num_samples=num_samples)
+    else:
+        # data loaders may iterate over their dataset more than once
+        entry_it = entries()
+        forecasts = (
+            forecast
+            for chunk in iter(lambda: list(islice(entry_it, chunk_size)), [])
+            for forecast in predictor.predict(chunk, num_samples=num_samples)
+        )
+
+    for forecast in forecasts:
+        item_id = item_ids.popleft()
+        if forecast.item_id is None:
+            forecast.item_id = item_id
+        yield forecast
+
+
+def _json_record(forecast: Forecast, configuration: ForecastConfig) -> dict:
+    return {
+        "item_id": forecast.item_id,
+        "start": str(forecast.start_date),
+        **forecast.as_json_dict(configuration),
+    }
+
+
+def _npz_arrays(
+    forecasts: List[Forecast], configuration: ForecastConfig
+) -> Dict[str, np.ndarray]:
+    arrays = {
+        "item_id": np.array(
+            ["" if f.item_id is None else str(f.item_id) for f in forecasts]
+        ),
+        "start": np.array([str(f.start_date) for f in forecasts]),
+    }
+
+    if OutputType.mean in configuration.output_types:
+        arrays["mean"] = np.stack([f.mean for f in forecasts])
+
+    if OutputType.quantiles in configuration.output_types:
+        quantiles = list(map(Quantile.parse, configuration.quantiles))
+        levels = [quantile.value for quantile in quantiles]
+        arrays["quantile_levels"] = np.array(levels)
+        arrays["quantiles"] = np.stack(
+            [
+                np.stack([f.quantile(level) for level in levels])
+                for f in forecasts
+            ]
+        )
+
+    if OutputType.samples in configuration.output_types:
+        # like in the JSON output, forecasts which are not sample forecasts,
+        # e.g. quantile forecasts, have no samples
+        if all(isinstance(f, SampleForecast) for f in forecasts):
+            arrays["samples"] = np.stack([f.samples for f in forecasts])
+        else:
+            arrays["samples"] = np.zeros((len(forecasts), 0))
+
+    return arrays
+
+
+def write_shard(
+    forecasts: Iterator[Forecast],
+    path: Path,
+    output_format: str,
+    configuration: ForecastConfig,
+) -> int:
+    """
+    Writes the forecasts to `path` and returns their number.
+
+    JSON Lines are written one forecast at a time, while the arrays of a
+    binary shard are collected before being saved with :func:`numpy.savez`.
+    The shard is written to a hidden temporary file first, and only renamed
+    to `path` once it is complete and not empty.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    num_items = 0
+
+    if output_format == "jsonl":
+        with tmp_path.open("w") as fp:
+            for forecast in forecasts:
+                record = jsonify_floats(_json_record(forecast, configuration))
+                fp.write(json.dumps(record) + "\n")
+                num_items += 1
+    else:
+        shard = list(forecasts)
+        num_items = len(shard)
+        if shard:
+            with tmp_path.open("wb") as fp:
+                np.savez(fp, **_npz_arrays(shard, configuration))
+
+    if num_items > 0:
+        os.replace(tmp_path, path)
+    elif tmp_path.exists():
+        tmp_path.unlink()
+    return num_items
+
+
+def _check_settings(output_path: Path, settings: dict) -> None:
+    settings_path = output_path / SETTINGS_FILE
+
+    if settings_path.exists():
+        previous = json.loads(settings_path.read_text())
+        if previous != settings:
+            raise GluonTSUserError(
+                f"The output in {output_path} was written with settings "
+                f"{previous}, which differ from the current ones {settings}; "
+                "use a new output path to start over."
+            )
+    else:
+        settings_path.write_text(json.dumps(settings))
+
+
+def run_batch_predict(
+    predictor: Predictor,
+    dataset: Dataset,
+    output_path: Path,
+    configuration: ForecastConfig,
+    output_format: str = "jsonl",
+    shard_size: int = 1000,
+    num_workers: int = 0,
+) -> List[ShardStats]:
+    """
+    Predicts `dataset` and writes the forecasts in shards of `shard_size`
+    time series, named "part-00000.jsonl" and so on, to `output_path`.
+
+    Only one shard of forecasts is held in memory at a time. If
+    `output_path` already contains shards of a previous run with the same
+    settings, the corresponding time series are skipped and prediction
+    resumes with the first missing shard. A "_SUCCESS" file is written once
+    all shards are complete.
+
+    Parameters
+    ----------
+    predictor
+        The predictor to use, which is loaded only once.
+    dataset
+        The dataset to predict, which is iterated over once, in order.
+    output_path
+        Directory the shards are written to; it is created if needed.
+    configuration
+        Number of samples and outputs of the forecasts, as for the inference
+        server.
+    output_format
+        "jsonl" for one JSON object per forecast, or "npz" for one numpy
+        archive of stacked arrays per shard.
+    shard_size
+        Number of time series per shard.
+    num_workers
+        Number of worker processes used for prediction.
+
+    Returns
+    -------
+    List[ShardStats]
+        Number of time series and time taken for each shard written by this
+        run.
+    """
+    assert (
+        output_format in OUTPUT_FORMATS
+    ), f"output_format should be one of {OUTPUT_FORMATS}"
+    assert shard_size > 0, "shard_size should be positive"
+
+    forecast_settings = json.loads(configuration.json())
+    forecast_settings["output_types"].sort()
+
+    output_path.mkdir(parents=True, exist_ok=True)
+    _check_settings(
+        output_path,
+        {
+            "output_format": output_format,
+            "shard_size": shard_size,
+            "configuration": forecast_settings,
+        },
+    )
+
+    first_shard = completed_shards(output_path, output_format)
+    if first_shard > 0:
+        logger.info(
+            f"Resuming after {first_shard} completed shards "
+            f"in {output_path}"
+        )
+
+    forecasts = predict_forecasts(
+        predictor,
+        islice(dataset, first_shard * shard_size, None),
+        num_samples=configuration.num_samples,
+        num_workers=num_workers,
+    )
+
+    stats = []
+    shard = first_shard
+    start = time.time()
+    while True:
+        num_items = write_shard(
+            islice(forecasts, shard_size),
+            shard_path(output_path, shard, output_format),
+            output_format,
+            configuration,
+        )
+        if num_items == 0:
+            break
+
+        shard_stats = ShardStats(shard, num_items, time.time() - start)
+        logger.info(
+            f"Shard {shard}: {num_items} time series in "
+            f"{shard_stats.seconds:.2f}s, "
+            f"{shard_stats.items_per_second:.2f} time series/s"
+        )
+        stats.append(shard_stats)
+
+        if num_items < shard_size:
+            break
+        shard += 1
+        start = time.time()
+
+    (output_path / SUCCESS_FILE).touch()
+    return stats
@@ -18,7 +18,7 @@ import time
 import traceback
 import multiprocessing as mp
 from queue import Empty as QueueEmpty
-from typing import Callable, Iterable, List, Tuple
+from typing import Callable, Iterable, Iterator, List, Tuple
 
 from flask import Flask, Response, jsonify, request
 from pydantic import BaseModel
@@ -94,18 +94,36 @@ def get_base_app(execution_params):
     return app
 
 
+def json_forecasts(predictor, dataset, configuration) -> Iterator[dict]:
+    """
+    Yields the forecasts of `predictor` for `dataset` as JSON dictionaries.
+
+    If the forecast generator of the predictor keeps the forecasts of an
+    inference batch together, whole batches are encoded at once.
+    """
+    forecast_generator = getattr(predictor, "forecast_generator", None)
+
+    if hasattr(forecast_generator, "generate_batches"):
+        for forecast_batch in predictor.predict_batches(
+            dataset, num_samples=configuration.num_samples,
+        ):
+            yield from forecast_batch.as_json_dicts(configuration)
+    else:
+        for forecast in predictor.predict(
+            dataset, num_samples=configuration.num_samples,
+        ):
+            yield forecast.as_json_dict(configuration)
+
+
 def handle_predictions(predictor, instances, configuration):
     # create the forecasts
     forecasts = ThrougputIter(
-        predictor.predict(
-            ListDataset(instances, predictor.freq),
-            num_samples=configuration.num_samples,
+        json_forecasts(
+            predictor, ListDataset(instances, predictor.freq), configuration
         )
     )
 
-    predictions = [
-        forecast.as_json_dict(configuration) for forecast in forecasts
-    ]
+    predictions = list(forecasts)
 
     log_throughput(instances, forecasts.timings)
     return predictions
@@ -149,13 +167,8 @@ def make_predictions(predictor, dataset, configuration):
 
     predictions = []
 
-    forecast_iter = predictor.predict(
-        dataset, num_samples=configuration.num_samples,
-    )
-
-    for forecast in forecast_iter:
+    for prediction in json_forecasts(predictor, dataset, configuration):
         end = time.time()
-        prediction = forecast.as_json_dict(configuration)
 
         if DEBUG:
             prediction["debug"] = {"timing": end - start}
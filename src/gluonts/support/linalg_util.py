@@ -12,7 +12,7 @@
 # permissions and limitations under the License.
 
 # Standard library imports
-from typing import Optional
+from typing import Optional, Tuple
 
 # Third-party imports
 import mxnet as mx
@@ -234,3 +234,97 @@ def jitter_cholesky(
         f" Matrix is not positive definite after the maximum number of iterations = {max_iter_jitter} "
         f"with a maximum jitter = {F.max(jitter)}"
     )
+
+
+def toeplitz_cholesky(
+    column: np.ndarray,
+    max_iter_jitter: int = 10,
+    neg_tol: float = -1e-8,
+    diag_weight: float = 1e-6,
+    increase_jitter: int = 10,
+) -> np.ndarray:
+    """
+    This function computes the Cholesky factor of a batch of symmetric
+    Toeplitz matrices from their first columns using the Schur algorithm,
+    which takes :math:`O(n^2)` operations instead of the :math:`O(n^3)` of a
+    dense factorisation.  Matrices which are not numerically positive definite
+    are jittered in the same way as in `jitter_cholesky`.
+
+    Parameters
+    ----------
+    column
+        First columns of the Toeplitz matrices, of shape
+        (batch_size, num_data_points).
+    max_iter_jitter
+        Maximum number of iterations for jitter to iteratively make the matrix positive definite.
+    neg_tol
+        Parameter in the jitter methods to eliminate eliminate matrices with diagonal elements smaller than this
+        when checking if a matrix is positive definite.
+    diag_weight
+        Multiple of the diagonal entries to initialize the jitter.
+    increase_jitter
+        Each iteration multiply by jitter by this amount
+
+    Returns
+    -------
+    np.ndarray
+        The lower triangular Cholesky factors `L` of shape
+        (batch_size, num_data_points, num_data_points), computed in double
+        precision.
+    """
+    column = np.asarray(column, dtype=np.float64)
+    if np.any(column[:, 0] <= neg_tol):
+        raise mx.base.MXNetError(
+            " Matrix is not positive definite: negative diagonal elements"
+        )
+
+    batch_size, num_data_points = column.shape
+    L = np.zeros((batch_size, num_data_points, num_data_points))
+    jitter = np.zeros(batch_size)
+    pending = np.arange(batch_size)
+    num_iter = 0
+    while num_iter <= max_iter_jitter:
+        factor, failed = _schur_cholesky(
+            column[pending]
+            + np.outer(jitter[pending], np.eye(1, num_data_points))
+        )
+        L[pending[~failed]] = factor[~failed]
+        pending = pending[failed]
+        if len(pending) == 0:
+            return L
+        if num_iter == 0:
+            jitter[pending] = column[pending, 0] * diag_weight
+        else:
+            jitter[pending] *= increase_jitter
+        num_iter += 1
+    raise mx.base.MXNetError(
+        f" Matrix is not positive definite after the maximum number of iterations = {max_iter_jitter} "
+        f"with a maximum jitter = {jitter.max()}"
+    )
+
+
+def _schur_cholesky(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    batch_size, num_data_points = column.shape
+    L = np.zeros((batch_size, num_data_points, num_data_points))
+    failed = column[:, 0] <= 0
+    # The displacement T - Z T Z^T of a symmetric Toeplitz matrix T has rank
+    # two; the algorithm rotates its generators u and v hyperbolically so
+    # that at step k the generator u is the k-th column of L.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        u = column / np.sqrt(np.where(failed, 1.0, column[:, 0]))[:, None]
+        v = u.copy()
+        v[:, 0] = 0.0
+        L[:, :, 0] = u
+        for k in range(1, num_data_points):
+            u[:, k:] = u[:, k - 1 : -1].copy()
+            u[:, :k] = 0.0
+            rho = v[:, k] / u[:, k]
+            failed |= ~(np.abs(rho) < 1.0)
+            rho = np.where(failed, 0.0, rho)
+            scale = 1.0 / np.sqrt(1.0 - rho ** 2)[:, None]
+            u, v = (
+                (u - rho[:, None] * v) * scale,
+                (v - rho[:, None] * u) * scale,
+            )
+            L[:, :, k] = u
+    return L, failed
@@ -17,6 +17,7 @@ import os
 import signal
 import tempfile
 import time
+import warnings
 from pathlib import Path
 from typing import (
     Any,
@@ -225,6 +226,43 @@ def hybrid_block_to_symbol_block(
         return sb
 
 
+# noinspection PyProtectedMember
+def hybrid_block_to_shared_symbol_block(
+    hb: mx.gluon.HybridBlock, num_inputs: int
+) -> mx.gluon.SymbolBlock:
+    """
+    Builds a `SymbolBlock` with the graph of a Gluon `HybridBlock` which,
+    unlike :func:`hybrid_block_to_symbol_block`, shares the parameters of
+    the original block instead of copying them. Each such block has its own
+    cached graph, so several of them can be hybridized for different input
+    shapes at the cost of a single set of parameters.
+
+    Parameters
+    ----------
+    hb
+        The Gluon `HybridBlock` whose graph to use.
+    num_inputs
+        The number of (non-nested) inputs of the block.
+
+    Returns
+    -------
+    mx.gluon.SymbolBlock
+        A block computing the same outputs as `hb`, with the same parameters.
+    """
+    inputs = [mx.sym.var(f"data{i}") for i in range(num_inputs)]
+    outputs, out_format = _flatten(hb(*inputs), "output")
+
+    with warnings.catch_warnings():
+        # the types of the inputs are only known at the first forward pass
+        warnings.simplefilter("ignore", UserWarning)
+        sb = mx.gluon.SymbolBlock(
+            outputs=outputs, inputs=inputs, params=hb.collect_params()
+        )
+    sb._out_format = out_format
+
+    return sb
+
+
 # noinspection PyProtectedMember
 def export_symb_block(
     hb: mx.gluon.HybridBlock, model_dir: Path, model_name: str, epoch: int = 0
@@ -0,0 +1,175 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+import json
+import sys
+import time
+
+# Third-party imports
+import numpy as np
+from click.testing import CliRunner
+
+# First-party imports
+from gluonts.bench import (
+    BenchmarkConfig,
+    compare_results,
+    make_results,
+    run_benchmark,
+)
+from gluonts.bench import _runner
+from gluonts.bench.__main__ import cli
+
+
+def small_config(**kwargs) -> BenchmarkConfig:
+    return BenchmarkConfig(
+        datasets=["synthetic:constant"],
+        warmup=0,
+        repeats=1,
+        num_batches=2,
+        num_samples=10,
+        synthetic_num_series=5,
+        **kwargs,
+    )
+
+
+def test_run_benchmark():
+    config = small_config(
+        forecasters=[
+            {"name": "gluonts.model.seasonal_naive.SeasonalNaivePredictor"},
+            {
+                "name": "gluonts.model.simple_feedforward."
+                "SimpleFeedForwardEstimator",
+                "hyperparameters": {"num_hidden_dimensions": [4]},
+            },
+        ],
+        batch_sizes=[4, 8],
+    )
+    results = run_benchmark(config)
+
+    stages = [
+        (record["forecaster"].rsplit(".", 1)[-1], record["batch_size"])
+        + (record["stage"],)
+        for record in results
+    ]
+    assert stages == [
+        ("SeasonalNaivePredictor", 4, "prediction"),
+        ("SeasonalNaivePredictor", 4, "evaluation"),
+        ("SeasonalNaivePredictor", 8, "prediction"),
+        ("SeasonalNaivePredictor", 8, "evaluation"),
+    ] + [
+        ("SimpleFeedForwardEstimator", batch_size, stage)
+        for batch_size in [4, 8]
+        for stage in ["data_loading", "training", "prediction", "evaluation"]
+    ]
+
+    for record in results:
+        assert record["items"] > 0
+        assert record["items_per_second"] > 0
+        assert record["peak_rss_mb"] > 0
+        assert 0 <= record["rss_increase_mb"] <= record["peak_rss_mb"]
+        if record["stage"] == "prediction":
+            assert (
+                0
+                < record["latency_p50_seconds"]
+                <= record["latency_p99_seconds"]
+            )
+        else:
+            assert "latency_p50_seconds" not in record
+
+    data_loading = [r for r in results if r["stage"] == "data_loading"]
+    assert [r["items"] for r in data_loading] == [8, 16]
+
+
+def test_rss_monitor():
+    with _runner.RssMonitor(interval=0.001) as monitor:
+        data = np.ones(2 ** 25)
+        time.sleep(0.05)
+        del data
+    # about 256 MB were allocated during the stage
+    assert 200 < monitor.increase_mb < monitor.peak_mb
+
+
+def test_rss_without_psutil_and_proc(monkeypatch):
+    # e.g. on Windows, without psutil
+    monkeypatch.setitem(sys.modules, "psutil", None)
+    monkeypatch.setattr(_runner.Path, "exists", lambda self: False)
+    assert np.isnan(_runner.rss_mb())
+
+
+def test_compare_results():
+    config = small_config()
+    baseline = make_results(config, run_benchmark(config))
+    candidate = json.loads(json.dumps(baseline))
+
+    assert not any(
+        record["regression"] for record in compare_results(baseline, candidate)
+    )
+
+    for record in candidate["results"]:
+        record["items_per_second"] /= 2
+    comparison = compare_results(baseline, candidate, threshold=0.1)
+    assert [record["stage"] for record in comparison] == [
+        "prediction",
+        "evaluation",
+    ]
+    assert all(record["regression"] for record in comparison)
+    assert all(
+        abs(record["throughput_change"] + 0.5) < 1e-9 for record in comparison
+    )
+
+    for record in candidate["results"]:
+        record["items_per_second"] *= 2
+        record["rss_increase_mb"] += record["peak_rss_mb"] / 2
+    comparison = compare_results(baseline, candidate, threshold=0.1)
+    assert all(record["regression"] for record in comparison)
+    assert all(
+        abs(record["peak_rss_change"] - 0.5) < 1e-9 for record in comparison
+    )
+
+    # baselines which are zero or were not measured are not compared
+    for record in baseline["results"]:
+        record["items_per_second"] = 0.0
+        record["peak_rss_mb"] = float("nan")
+    comparison = compare_results(baseline, candidate, threshold=0.1)
+    assert not any(record["regression"] for record in comparison)
+    assert all(np.isnan(record["throughput_change"]) for record in comparison)
+
+
+def test_cli(tmp_path):
+    config_path = tmp_path / "config.json"
+    config_path.write_text(small_config().json())
+
+    runner = CliRunner()
+    for name in ["baseline.json", "candidate.json"]:
+        result = runner.invoke(
+            cli, ["run", str(config_path), "--output", str(tmp_path / name)]
+        )
+        assert result.exit_code == 0, result.output
+
+    results = json.loads((tmp_path / "baseline.json").read_text())
+    assert results["format_version"] == 1
+    assert results["config"]["datasets"] == ["synthetic:constant"]
+
+    result = runner.invoke(
+        cli,
+        [
+            "compare",
+            str(tmp_path / "baseline.json"),
+            str(tmp_path / "candidate.json"),
+            "--threshold",
+            "1000",
+        ],
+    )
+    assert result.exit_code == 0, result.output
@@ -34,7 +34,9 @@ from gluonts.mx.distribution import (
     Dirichlet,
     DirichletMultinomial,
     Categorical,
+    LowrankMultivariateGaussian,
 )
+from gluonts.mx.distribution.bijection import AffineTransformation
 from gluonts.core.serde import dump_json, load_json, dump_code, load_code
 
 from gluonts.testutil import empirical_cdf
@@ -233,3 +235,38 @@ def test_piecewise_linear_sampling(distr, params, serialize_fn):
     num_samples = 100_000
     samples = distr.sample(num_samples)
     assert samples.shape == (num_samples, 2)
+
+
+def test_lowrank_sampling_shared_factor_noise():
+    # D = 0 leaves mu + W v, so samples over two subsets of dimensions
+    # with the same factors v are the same as over all dimensions
+    mu = mx.nd.random.normal(shape=(3, 4))
+    W = mx.nd.random.normal(shape=(3, 4, 2))
+    factor_noise = mx.nd.random.normal(shape=(3, 2))
+
+    def sample(dims):
+        distr = TransformedDistribution(
+            LowrankMultivariateGaussian(
+                dim=len(dims),
+                rank=2,
+                mu=mu[:, dims],
+                D=mx.nd.zeros((3, len(dims))),
+                W=W[:, dims],
+            ),
+            [AffineTransformation(scale=mx.nd.ones((3, len(dims))) * 2.0)],
+        )
+        return distr.sample_rep(dtype=np.float32, factor_noise=factor_noise)
+
+    samples = sample([0, 1, 2, 3]).asnumpy()
+    expected = 2.0 * (
+        mu.asnumpy()
+        + np.einsum("bdr,br->bd", W.asnumpy(), factor_noise.asnumpy())
+    )
+    assert np.allclose(samples, expected, atol=1e-5)
+    assert np.allclose(
+        np.concatenate(
+            [sample([0, 1]).asnumpy(), sample([2, 3]).asnumpy()], axis=1
+        ),
+        samples,
+        atol=1e-5,
+    )
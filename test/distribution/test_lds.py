@@ -50,7 +50,8 @@ current_path = os.path.dirname(os.path.abspath(__file__))
         ),
     ],
 )
-def test_lds_likelihood(data_filename):
+@pytest.mark.parametrize("filtering", ["sequential", "parallel"])
+def test_lds_likelihood(data_filename, filtering):
     """
     Test to check that likelihood is correctly computed for different
     innovation state space models (ISSM).
@@ -70,6 +71,7 @@ def test_lds_likelihood(data_filename):
         data["latent_dim"],
         data["output_dim"],
         data["seq_length"],
+        filtering=filtering,
     )
 
     targets = mx.nd.array(data["targets"])
@@ -125,3 +127,55 @@ def test_lds_likelihood(data_filename):
     ll, _, _ = lds.log_prob(sample)
 
     assert_shape_and_finite(ll, shape=lds.batch_shape)
+
+
+@pytest.mark.parametrize("seq_length", [1, 2, 7, 16])
+@pytest.mark.parametrize("hybridize", [False, True])
+def test_parallel_kalman_filter(seq_length, hybridize):
+    batch_size, latent_dim, output_dim = 3, 4, 2
+
+    def uniform(*shape, low=-1.0, high=1.0):
+        return mx.nd.random.uniform(low, high, shape=shape)
+
+    coefficients = [
+        uniform(batch_size, seq_length, output_dim, latent_dim),
+        uniform(batch_size, seq_length, latent_dim, latent_dim) * 0.5
+        + mx.nd.eye(latent_dim),
+        uniform(batch_size, seq_length, latent_dim, low=0.1),
+        uniform(batch_size, seq_length, output_dim, low=0.1),
+        uniform(batch_size, seq_length, output_dim),
+        uniform(batch_size, latent_dim),
+        mx.nd.eye(latent_dim).broadcast_to(
+            (batch_size, latent_dim, latent_dim)
+        ),
+    ]
+    targets = uniform(batch_size, seq_length, output_dim, low=-3, high=3)
+    observed = uniform(batch_size, seq_length, low=0.0) > 0.3
+
+    class LogProb(mx.gluon.HybridBlock):
+        def __init__(self, filtering):
+            super().__init__()
+            self.filtering = filtering
+
+        def hybrid_forward(self, F, targets, observed, *coefficients):
+            lds = LDS(
+                *coefficients,
+                latent_dim=latent_dim,
+                output_dim=output_dim,
+                seq_length=seq_length,
+                filtering=self.filtering,
+            )
+            return lds.log_prob(targets, observed=observed)
+
+    results = []
+    for filtering in ["sequential", "parallel"]:
+        block = LogProb(filtering)
+        if hybridize:
+            block.hybridize()
+        results.append(block(targets, observed, *coefficients))
+
+    for expected, result in zip(*results):
+        assert expected.shape == result.shape
+        assert np.allclose(
+            expected.asnumpy(), result.asnumpy(), rtol=1e-3, atol=1e-3
+        )
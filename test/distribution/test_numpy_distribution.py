@@ -0,0 +1,159 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+import math
+
+import mxnet as mx
+import numpy as np
+import pytest
+
+from gluonts.mx.distribution import (
+    Gamma,
+    Gaussian,
+    Laplace,
+    NegativeBinomial,
+    PiecewiseLinear,
+    StudentT,
+    TransformedDistribution,
+    Uniform,
+)
+from gluonts.mx.distribution.bijection import AffineTransformation
+from gluonts.mx.distribution.numpy_distribution import (
+    betainc,
+    gammainc,
+    gammaln,
+    to_numpy_distribution,
+)
+
+LEVELS = np.array([0.001, 0.05, 0.3, 0.5, 0.7, 0.95, 0.999])
+SHAPE = (4, 6)
+
+
+def uniform(low, high):
+    return mx.nd.random.uniform(low, high, shape=SHAPE, dtype="float64")
+
+
+def test_special_functions():
+    x = np.linspace(0.01, 60.0, 200)
+    assert np.allclose(
+        gammaln(x), [math.lgamma(v) for v in x], rtol=1e-12, atol=1e-12
+    )
+
+    # I_x(1, b) = 1 - (1 - x)^b and P(1, x) = 1 - exp(-x)
+    u = np.linspace(0.0, 1.0, 50)
+    assert np.allclose(betainc(1.0, 3.5, u), 1.0 - (1.0 - u) ** 3.5)
+    assert np.allclose(gammainc(1.0, 10 * u), 1.0 - np.exp(-10 * u))
+
+    # symmetry of the incomplete beta function
+    assert np.allclose(betainc(2.5, 7.0, u), 1.0 - betainc(7.0, 2.5, 1 - u))
+
+
+@pytest.mark.parametrize(
+    "distr",
+    [
+        Gaussian(mu=uniform(-5, 5), sigma=uniform(0.1, 3)),
+        Laplace(mu=uniform(-5, 5), b=uniform(0.1, 3)),
+        TransformedDistribution(
+            Gaussian(mu=uniform(-5, 5), sigma=uniform(0.1, 3)),
+            [
+                AffineTransformation(
+                    loc=uniform(-5, 5), scale=uniform(-2, 2).sign()
+                ),
+                AffineTransformation(scale=uniform(0.5, 3)),
+            ],
+        ),
+    ],
+)
+def test_numpy_distribution_matches_mxnet(distr):
+    np_distr = to_numpy_distribution(distr)
+
+    assert np_distr.batch_shape == SHAPE
+
+    quantiles = np_distr.quantile(LEVELS)
+    assert quantiles.shape == (len(LEVELS),) + SHAPE
+    assert np.allclose(
+        quantiles,
+        distr.quantile(mx.nd.array(LEVELS, dtype="float64")).asnumpy(),
+        rtol=1e-5,
+        atol=1e-5,
+    )
+
+    for level, quantile in zip(LEVELS, quantiles):
+        expected = distr.cdf(mx.nd.array(quantile, dtype="float64"))
+        assert np.allclose(np_distr.cdf(quantile), expected.asnumpy())
+        assert np.allclose(np_distr.cdf(quantile), level, atol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "distr, scipy_distr",
+    [
+        (
+            StudentT(
+                mu=uniform(-5, 5), sigma=uniform(0.1, 3), nu=uniform(2, 30)
+            ),
+            lambda d: ("t", (d.nu, d.mu, d.sigma)),
+        ),
+        (
+            Gamma(alpha=uniform(0.05, 50), beta=uniform(0.1, 3)),
+            lambda d: ("gamma", (d.alpha, 0.0, 1.0 / d.beta)),
+        ),
+        (
+            NegativeBinomial(mu=uniform(0.1, 500), alpha=uniform(0.01, 2)),
+            lambda d: (
+                "nbinom",
+                (1.0 / d.alpha, 1.0 / (1.0 + d.alpha * d.mu)),
+            ),
+        ),
+    ],
+)
+def test_numpy_distribution_matches_scipy(distr, scipy_distr):
+    stats = pytest.importorskip("scipy.stats")
+
+    np_distr = to_numpy_distribution(distr)
+    name, args = scipy_distr(np_distr)
+    expected = getattr(stats, name)(*args)
+
+    quantiles = np_distr.quantile(LEVELS)
+    assert np.allclose(
+        quantiles, expected.ppf(LEVELS[:, None, None]), rtol=1e-6
+    )
+    assert np.allclose(np_distr.cdf(quantiles), expected.cdf(quantiles))
+    assert np.allclose(np_distr.mean, distr.mean.asnumpy())
+
+
+def test_numpy_piecewise_linear():
+    distr = PiecewiseLinear(
+        gamma=mx.nd.random.uniform(-5, 5, shape=SHAPE),
+        slopes=mx.nd.random.uniform(0.1, 2, shape=SHAPE + (3,)),
+        knot_spacings=mx.nd.softmax(mx.nd.random.normal(shape=SHAPE + (3,))),
+    )
+    np_distr = to_numpy_distribution(distr)
+
+    levels = np.broadcast_to(LEVELS.reshape(-1, 1, 1), LEVELS.shape + SHAPE)
+    quantiles = np_distr.quantile(LEVELS)
+    expected = distr.quantile_internal(mx.nd.array(levels), axis=0)
+    assert np.allclose(quantiles, expected.asnumpy(), atol=1e-5)
+
+    for level, quantile in zip(LEVELS, quantiles):
+        assert np.allclose(np_distr.cdf(quantile), level)
+
+    # the mean is the integral of the quantile function
+    grid = np.linspace(0.0, 1.0, 100001)
+    assert np.allclose(
+        np_distr.mean, np.trapz(np_distr.quantile(grid), grid, axis=0)
+    )
+
+
+def test_numpy_distribution_unsupported():
+    distr = Uniform(low=mx.nd.zeros(SHAPE), high=mx.nd.ones(SHAPE))
+    assert to_numpy_distribution(distr) is None
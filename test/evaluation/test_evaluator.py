@@ -11,6 +11,12 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+# Standard library imports
+import math
+import multiprocessing
+import os
+from itertools import chain
+
 # Third-party imports
 import numpy as np
 import pandas as pd
@@ -18,10 +24,19 @@ import pytest
 
 # First-party imports
 from gluonts.evaluation import (
+    EvaluationContext,
     Evaluator,
     MultivariateEvaluator,
+    TargetSeries,
+    load_item_metrics,
+)
+from gluonts.evaluation._parallel import _shared_memory_dir
+from gluonts.evaluation._streaming import RunningSum
+from gluonts.model.forecast import (
+    QuantileForecast,
+    SampleForecast,
+    SampleForecastBatch,
 )
-from gluonts.model.forecast import QuantileForecast, SampleForecast
 
 QUANTILES = [str(q / 10.0) for q in range(1, 10)]
 
@@ -643,3 +658,546 @@ def test_evaluation_with_QuantileForecast():
     agg_metric, _ = ev(iter([ts]), iter(fcst))
 
     assert np.isfinite(agg_metric["wQuantileLoss[0.5]"])
+
+
+def test_vectorised_metrics_match_per_series_metrics():
+    rng = np.random.RandomState(0)
+    freq, prediction_length = "H", 24
+    quantiles = ("0.1", "0.5", "0.9", "0.99")
+
+    targets, forecasts = [], []
+    for batch in range(4):
+        num_series = [1, 5, 3, 7][batch]
+        start_dates, item_ids = [], []
+        for i in range(num_series):
+            length = rng.randint(prediction_length + 1, 300)
+            start = pd.Timestamp("2020-01-01") + rng.randint(
+                50
+            ) * pd.Timedelta("1H")
+            values = 10 * rng.rand(length) ** 2
+            values[rng.rand(length) < 0.05] = np.nan
+            if i == 1:
+                values[-prediction_length:] = np.nan
+            if i == 2:
+                values[-prediction_length:] = 0.0
+            targets.append(
+                pd.Series(
+                    values,
+                    index=pd.date_range(start, periods=length, freq=freq),
+                )
+            )
+            start_dates.append(targets[-1].index[-prediction_length])
+            item_ids.append(f"item_{batch}_{i}")
+        samples = 10 * rng.rand(num_series, 50, prediction_length) ** 2
+        forecast_batch = SampleForecastBatch(
+            samples, start_dates, freq, item_ids=item_ids
+        )
+        forecasts.extend(forecast_batch if batch % 2 else [forecast_batch])
+
+    evaluator = Evaluator(
+        quantiles=quantiles, calculate_owa=True, num_workers=0, chunk_size=6
+    )
+    agg_metrics, item_metrics = evaluator(iter(targets), iter(forecasts))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rows = [
+            evaluator.get_metrics_per_ts(ts, forecast)
+            for ts, forecast in zip(
+                targets,
+                chain.from_iterable(
+                    f if isinstance(f, SampleForecastBatch) else [f]
+                    for f in forecasts
+                ),
+            )
+        ]
+    expected_agg, expected_items = evaluator.get_aggregate_metrics(
+        pd.DataFrame(rows, dtype=np.float64)
+    )
+
+    assert list(item_metrics.columns) == list(expected_items.columns)
+    assert (
+        item_metrics["item_id"].tolist() == expected_items["item_id"].tolist()
+    )
+    for column in expected_items.columns[1:]:
+        np.testing.assert_array_equal(
+            item_metrics[column].values, expected_items[column].values
+        )
+    assert agg_metrics.keys() == expected_agg.keys()
+    for key, value in expected_agg.items():
+        np.testing.assert_array_equal(agg_metrics[key], value)
+
+
+def test_overridden_get_metrics_per_ts():
+    class CustomEvaluator(Evaluator):
+        def get_metrics_per_ts(self, time_series, forecast):
+            metrics = super().get_metrics_per_ts(time_series, forecast)
+            metrics["MSE"] = 2.0
+            metrics["custom"] = 1.0
+            return metrics
+
+    rng = np.random.RandomState(8)
+    index = pd.date_range("2020-01-01", periods=20, freq="D")
+    targets = [pd.Series(rng.rand(20), index=index) for _ in range(6)]
+    forecasts = [
+        SampleForecastBatch(rng.rand(4, 10, 5), [index[-5]] * 4, "D"),
+        SampleForecastBatch(rng.rand(2, 10, 5), [index[-5]] * 2, "D"),
+    ]
+
+    expected_agg, expected_items = Evaluator(num_workers=0)(targets, forecasts)
+    for num_workers in [0, 2]:
+        agg_metrics, item_metrics = CustomEvaluator(
+            num_workers=num_workers, chunk_size=3
+        )(targets, forecasts)
+        assert (item_metrics["MSE"] == 2.0).all()
+        assert (item_metrics["custom"] == 1.0).all()
+        assert agg_metrics["MSE"] == 2.0
+        assert np.isclose(agg_metrics["ND"], expected_agg["ND"])
+        np.testing.assert_allclose(
+            item_metrics["abs_error"], expected_items["abs_error"]
+        )
+
+
+def test_overridden_get_aggregate_metrics():
+    class CustomEvaluator(Evaluator):
+        def get_aggregate_metrics(self, metric_per_ts):
+            totals, metric_per_ts = super().get_aggregate_metrics(
+                metric_per_ts
+            )
+            totals["max_abs_error"] = metric_per_ts["abs_error"].max()
+            return totals, metric_per_ts
+
+    rng = np.random.RandomState(9)
+    index = pd.date_range("2020-01-01", periods=20, freq="D")
+    targets = [pd.Series(rng.rand(20), index=index) for _ in range(6)]
+    forecasts = [
+        SampleForecast(samples=rng.rand(10, 5), start_date=index[-5], freq="D")
+        for _ in range(6)
+    ]
+
+    expected_agg, expected_items = Evaluator(num_workers=0)(targets, forecasts)
+    for num_workers in [0, 2]:
+        agg_metrics, item_metrics = CustomEvaluator(
+            num_workers=num_workers, chunk_size=4
+        )(targets, forecasts)
+        pd.testing.assert_frame_equal(item_metrics, expected_items)
+        assert (
+            agg_metrics.pop("max_abs_error")
+            == expected_items["abs_error"].max()
+        )
+        assert agg_metrics.keys() == expected_agg.keys()
+        for key, value in expected_agg.items():
+            np.testing.assert_array_equal(agg_metrics[key], value)
+
+    with pytest.raises(AssertionError):
+        CustomEvaluator(num_workers=0, item_metrics="discard")(
+            targets, forecasts
+        )
+
+
+def test_running_sum():
+    rng = np.random.RandomState(0)
+    values = rng.randn(10000) * 10.0 ** rng.randint(-3, 6, size=10000)
+    values[::100] = np.nan
+
+    running_sum = RunningSum()
+    for part in np.array_split(values, 70):
+        running_sum.add(part)
+
+    # the compensated sum of the blocks is close to the exact sum
+    series = pd.Series(values)
+    exact = math.fsum(series.dropna())
+    assert running_sum.count == series.count()
+    assert np.isclose(running_sum.sum(), exact, rtol=1e-14, atol=0)
+    assert np.isclose(
+        running_sum.mean(), exact / series.count(), rtol=1e-14, atol=0
+    )
+    assert RunningSum().sum() == 0.0 and np.isnan(RunningSum().mean())
+
+    # the state does not grow with the number of blocks
+    assert len(vars(running_sum)) == 4
+
+    running_sum.add(np.array([np.inf]))
+    assert running_sum.sum() == np.inf
+    running_sum.add(np.array([-np.inf]))
+    assert np.isnan(running_sum.sum())
+
+
+@pytest.mark.parametrize("item_metrics", ["discard", "sample", "spill"])
+def test_streaming_item_metrics(item_metrics, tmpdir):
+    rng = np.random.RandomState(1)
+    index = pd.date_range("2020-01-01", periods=50, freq="D")
+    targets = [pd.Series(rng.rand(50), index=index) for _ in range(100)]
+    targets[3][-5:] = np.nan
+    forecasts = [
+        SampleForecast(
+            samples=rng.rand(20, 10), start_date=index[-10], freq="D"
+        )
+        for _ in targets
+    ]
+
+    expected_agg, expected_items = Evaluator(num_workers=0)(targets, forecasts)
+    agg_metrics, item_metrics_frame = Evaluator(
+        num_workers=0,
+        chunk_size=16,
+        item_metrics=item_metrics,
+        item_metrics_path=str(tmpdir / "metrics"),
+        item_metrics_sample_size=10,
+    )(targets, forecasts)
+
+    assert agg_metrics.keys() == expected_agg.keys()
+    for key, value in expected_agg.items():
+        np.testing.assert_allclose(agg_metrics[key], value, rtol=1e-12)
+
+    if item_metrics == "discard":
+        assert item_metrics_frame.empty
+        assert list(item_metrics_frame.columns) == list(expected_items.columns)
+    elif item_metrics == "sample":
+        assert len(item_metrics_frame) == 10
+        # sampled rows are rows of the full table, in their original order
+        positions = expected_items.reset_index().merge(item_metrics_frame)
+        assert len(positions) == 10
+        assert np.all(np.diff(positions["index"]) > 0)
+    else:
+        assert item_metrics_frame.empty
+        pd.testing.assert_frame_equal(
+            load_item_metrics(str(tmpdir / "metrics")), expected_items
+        )
+
+
+def test_parallel_evaluation():
+    rng = np.random.RandomState(2)
+    index = pd.date_range("2020-01-01", periods=60, freq="D")
+    targets = [pd.Series(rng.rand(60), index=index) for _ in range(50)]
+    forecasts = [
+        SampleForecast(
+            samples=rng.rand(20, 10),
+            start_date=index[-10],
+            freq="D",
+            item_id=str(i),
+        )
+        for i in range(40)
+    ] + [
+        QuantileForecast(
+            forecast_arrays=np.sort(rng.rand(3, 10), axis=0),
+            start_date=index[-10],
+            freq="D",
+            forecast_keys=["0.1", "0.5", "0.9"],
+            item_id=str(i),
+        )
+        for i in range(40, 50)
+    ]
+
+    expected_agg, expected_items = Evaluator(num_workers=0)(targets, forecasts)
+
+    evaluator = Evaluator(num_workers=2, chunk_size=4)
+    for _ in range(2):
+        agg_metrics, item_metrics = evaluator(iter(targets), iter(forecasts))
+        pd.testing.assert_frame_equal(item_metrics, expected_items)
+        for key, value in expected_agg.items():
+            np.testing.assert_array_equal(agg_metrics[key], value)
+        # the workers are shut down after every call
+        assert evaluator._pool is None
+        assert not multiprocessing.active_children()
+
+    with evaluator:
+        evaluator(targets, forecasts)
+        pool = evaluator._pool
+        # the pool is reused in the with block, unless the configuration
+        # changes
+        evaluator(targets, forecasts)
+        assert evaluator._pool is pool
+        evaluator.alpha = 0.1
+        evaluator(targets, forecasts)
+        assert evaluator._pool is not pool
+    assert evaluator._pool is None
+    assert not multiprocessing.active_children()
+
+    # shared arrays are cleaned up
+    assert not [
+        name
+        for name in os.listdir(_shared_memory_dir())
+        if name.startswith("gluonts-evaluation-")
+    ]
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_evaluation_context(num_workers, tmpdir):
+    rng = np.random.RandomState(3)
+    prediction_length = 12
+    targets = []
+    for i in range(30):
+        length = rng.randint(prediction_length, 100)
+        values = rng.rand(length)
+        values[rng.rand(length) < 0.05] = np.nan
+        targets.append(
+            pd.Series(
+                values,
+                index=pd.date_range(
+                    "2020-01-01", periods=length, freq="M" if i % 3 else "D"
+                ),
+            )
+        )
+
+    def forecasts():
+        return [
+            SampleForecast(
+                samples=rng.rand(20, prediction_length),
+                start_date=ts.index[-prediction_length],
+                freq=ts.index.freqstr,
+                item_id=str(i),
+            )
+            for i, ts in enumerate(targets)
+        ]
+
+    evaluator = Evaluator(
+        calculate_owa=True, num_workers=num_workers, chunk_size=7
+    )
+    try:
+        context = evaluator.create_context(targets, prediction_length)
+        assert len(context) == len(targets)
+        context.save(str(tmpdir / "context.npz"))
+        loaded = EvaluationContext.load(str(tmpdir / "context.npz"))
+        assert loaded.prediction_length == prediction_length
+        assert loaded.arrays.keys() == context.arrays.keys()
+
+        # every predictor is evaluated with the same context
+        for _ in range(2):
+            predictor_forecasts = forecasts()
+            expected_agg, expected_items = evaluator(
+                targets, predictor_forecasts
+            )
+            agg_metrics, item_metrics = evaluator(loaded, predictor_forecasts)
+            pd.testing.assert_frame_equal(item_metrics, expected_items)
+            for key, value in expected_agg.items():
+                np.testing.assert_array_equal(agg_metrics[key], value)
+    finally:
+        evaluator.close()
+
+    with pytest.raises(AssertionError):
+        Evaluator(seasonality=2, num_workers=0)(context, forecasts())
+    with pytest.raises(AssertionError):
+        Evaluator(num_workers=0)(context, forecasts()[1:])
+    no_owa = Evaluator(num_workers=0).create_context(
+        targets, prediction_length
+    )
+    with pytest.raises(AssertionError):
+        Evaluator(calculate_owa=True, num_workers=0)(no_owa, forecasts())
+
+
+def test_vectorised_multivariate_evaluation():
+    rng = np.random.RandomState(4)
+    prediction_length, target_dim = 8, 5
+    eval_dims = [0, 2, 3]
+    targets, forecasts = [], []
+    for i in range(9):
+        length = rng.randint(prediction_length + 2, 50)
+        index = pd.date_range("2020-01-01", periods=length, freq="H")
+        values = rng.rand(length, target_dim)
+        values[rng.rand(length, target_dim) < 0.05] = np.nan
+        targets.append(pd.DataFrame(values, index=index))
+        forecasts.append(
+            SampleForecast(
+                samples=rng.rand(30, prediction_length, target_dim),
+                start_date=index[-prediction_length],
+                freq="H",
+                item_id=str(i),
+            )
+        )
+
+    target_agg_funcs = {"sum": np.sum, "max": np.max}
+    evaluator = MultivariateEvaluator(
+        quantiles=QUANTILES,
+        eval_dims=eval_dims,
+        target_agg_funcs=target_agg_funcs,
+    )
+    evaluator.chunk_size = 10
+    agg_metrics, item_metrics = evaluator(targets, forecasts)
+
+    # compare to evaluating every dimension and aggregate separately
+    univariate = Evaluator(quantiles=QUANTILES, num_workers=0)
+    expected_agg, expected_items = {}, []
+    for dim in eval_dims:
+        dim_agg, dim_items = univariate(
+            [ts[dim] for ts in targets], [f.copy_dim(dim) for f in forecasts]
+        )
+        expected_items.append(dim_items)
+        for metric, value in dim_agg.items():
+            expected_agg[f"{dim}_{metric}"] = value
+    expected_items = pd.concat(expected_items)
+    expected_agg.update(univariate.get_aggregate_metrics(expected_items)[0])
+    for name, agg_fun in target_agg_funcs.items():
+        m_agg, _ = univariate(
+            [ts.agg(agg_fun, axis=1) for ts in targets],
+            [f.copy_aggregate(agg_fun) for f in forecasts],
+        )
+        for metric, value in m_agg.items():
+            expected_agg[f"m_{name}_{metric}"] = value
+
+    pd.testing.assert_frame_equal(item_metrics, expected_items)
+    assert list(agg_metrics) == list(expected_agg)
+    for key, value in expected_agg.items():
+        np.testing.assert_array_equal(agg_metrics[key], value)
+
+
+def naive_crps(target, samples):
+    # O(num_samples^2) definition of the CRPS of every time point
+    return np.mean(np.abs(samples - target), axis=0) - 0.5 * np.mean(
+        np.abs(samples[:, None] - samples[None]), axis=(0, 1)
+    )
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_crps(num_workers):
+    rng = np.random.RandomState(5)
+    index = pd.date_range("2020-01-01", periods=30, freq="D")
+    targets = [pd.Series(rng.rand(30), index=index) for _ in range(12)]
+    targets[0][-3:] = np.nan
+    samples = rng.rand(10, 40, 5)
+    forecasts = [
+        SampleForecastBatch(samples[:6], [index[-5]] * 6, "D"),
+        *SampleForecastBatch(samples[6:], [index[-5]] * 4, "D"),
+        QuantileForecast(
+            forecast_arrays=np.sort(rng.rand(3, 5), axis=0),
+            start_date=index[-5],
+            freq="D",
+            forecast_keys=["0.1", "0.5", "0.9"],
+        ),
+        QuantileForecast(
+            forecast_arrays=np.sort(rng.rand(3, 5), axis=0),
+            start_date=index[-5],
+            freq="D",
+            forecast_keys=["0.1", "0.5", "0.9"],
+        ),
+    ]
+
+    evaluator = Evaluator(
+        calculate_crps=True, num_workers=num_workers, chunk_size=5
+    )
+    try:
+        agg_metrics, item_metrics = evaluator(targets, forecasts)
+    finally:
+        evaluator.close()
+
+    expected = [
+        np.nansum(naive_crps(ts.values[-5:], samples[i]))
+        for i, ts in enumerate(targets[:10])
+    ]
+    assert np.allclose(item_metrics["CRPS"].values[:10], expected)
+    assert np.isnan(item_metrics["CRPS"].values[10:]).all()
+    assert np.isclose(
+        agg_metrics["wCRPS"],
+        np.sum(expected) / item_metrics["abs_target_sum"].sum(),
+    )
+
+    # the per time series metrics agree
+    assert np.isclose(
+        evaluator.get_metrics_per_ts(targets[6], forecasts[1])["CRPS"],
+        expected[6],
+    )
+    assert "CRPS" not in Evaluator(num_workers=0)(targets, forecasts)[0]
+
+
+def test_energy_score():
+    rng = np.random.RandomState(6)
+    index = pd.date_range("2020-01-01", periods=20, freq="H")
+    targets = [pd.DataFrame(rng.rand(20, 3), index=index) for _ in range(4)]
+    targets[0].iloc[-2, 1] = np.nan
+    forecasts = [
+        SampleForecast(
+            samples=rng.rand(50, 6, 3),
+            start_date=index[-6],
+            freq="H",
+            item_id=str(i),
+        )
+        for i in range(4)
+    ]
+
+    def naive_energy_score(target, samples):
+        observed = np.isfinite(target).all(axis=1)
+        target, samples = target[observed], samples[:, observed]
+        distance = np.linalg.norm(samples - target, axis=2).mean(axis=0)
+        spread = (
+            np.linalg.norm(samples[:, None] - samples[None], axis=3).sum(
+                axis=(0, 1)
+            )
+            / len(samples) ** 2
+        )
+        return np.mean(distance - 0.5 * spread)
+
+    expected = [
+        naive_energy_score(ts.values[-6:], f.samples)
+        for ts, f in zip(targets, forecasts)
+    ]
+
+    evaluator = MultivariateEvaluator(
+        calculate_energy_score=True,
+        calculate_crps=True,
+        energy_score_num_pairs=50 * 49 // 2,
+    )
+    agg_metrics, item_metrics = evaluator(targets, forecasts)
+    assert np.isclose(agg_metrics["energy_score"], np.mean(expected))
+    assert np.allclose(item_metrics["energy_score"].values[:4], expected)
+    assert "0_wCRPS" in agg_metrics and "wCRPS" in agg_metrics
+
+    # the energy score of a one-dimensional target is its mean CRPS
+    samples = rng.rand(50, 6)
+    target = rng.rand(6)
+    assert np.isclose(
+        evaluator.energy_score(target[:, None], samples[:, :, None]),
+        np.mean(naive_crps(target, samples)),
+    )
+
+    # subsampled pairs give a deterministic estimate
+    subsampled = MultivariateEvaluator(
+        calculate_energy_score=True, energy_score_num_pairs=200
+    )
+    estimate = subsampled(targets, forecasts)[0]["energy_score"]
+    assert estimate == subsampled(targets, forecasts)[0]["energy_score"]
+    assert np.isclose(estimate, np.mean(expected), rtol=0.05)
+
+
+@pytest.mark.parametrize("freq", ["H", "2D", "W", "2W", "M", "B", "MS"])
+def test_target_series(freq):
+    rng = np.random.RandomState(7)
+    prediction_length = 4
+    targets, forecasts = [], []
+    for i in range(6):
+        length = rng.randint(prediction_length + 1, 40)
+        start = pd.Timestamp("2020-01-01") + rng.randint(10) * pd.Timedelta(
+            "1D"
+        )
+        targets.append(TargetSeries(rng.rand(length), start, freq))
+        forecasts.append(
+            SampleForecast(
+                samples=rng.rand(20, prediction_length),
+                start_date=targets[-1].timestamp(length - prediction_length),
+                freq=freq,
+            )
+        )
+
+    evaluator = Evaluator(num_workers=0, calculate_owa=True)
+    agg_metrics, item_metrics = evaluator(targets, forecasts)
+    # the targets are aligned without creating their data frames
+    assert all(ts._frame is None for ts in targets)
+
+    frames = [
+        pd.DataFrame(
+            index=pd.date_range(ts.start, freq=freq, periods=len(ts)),
+            data=np.asarray(ts),
+        )
+        for ts in targets
+    ]
+    expected_agg, expected_items = evaluator(frames, forecasts)
+    pd.testing.assert_frame_equal(item_metrics, expected_items)
+    for key, value in expected_agg.items():
+        np.testing.assert_array_equal(agg_metrics[key], value)
+
+    # the data frame is available on demand
+    pd.testing.assert_frame_equal(targets[0].to_pandas(), frames[0])
+    assert not hasattr(targets[0], "values")
+    index = frames[0].index
+    for position in [-3, 0, 2, len(index) - 1, len(index) + 5]:
+        date = targets[0].timestamp(position)
+        assert targets[0].position(date) == position
+        assert targets[0].position(date + pd.Timedelta("1min")) is None
+    assert targets[0].position(index[2]) == 2
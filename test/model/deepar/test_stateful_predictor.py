@@ -0,0 +1,160 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Third-party imports
+import mxnet as mx
+import numpy as np
+import pandas as pd
+import pytest
+
+# First-party imports
+from gluonts.dataset.common import ListDataset
+from gluonts.dataset.loader import InferenceDataLoader
+from gluonts.model.deepar import (
+    DeepAREstimator,
+    LRUCache,
+    StatefulDeepARPredictor,
+)
+from gluonts.trainer import Trainer
+
+freq = "1H"
+prediction_length = 4
+
+
+def make_dataset(length, num_series=5, revised=()):
+    return ListDataset(
+        [
+            {
+                "item_id": str(i),
+                "start": "2020-01-01",
+                "target": np.sin(np.arange(length) / 3.0 + i) * 10.0
+                + 20.0
+                + (i in revised),
+            }
+            for i in range(num_series)
+        ],
+        freq=freq,
+    )
+
+
+@pytest.fixture(scope="module")
+def predictor():
+    return DeepAREstimator(
+        freq=freq,
+        prediction_length=prediction_length,
+        context_length=8,
+        num_cells=8,
+        trainer=Trainer(epochs=1, num_batches_per_epoch=2),
+    ).train(make_dataset(60))
+
+
+def test_advance_encoder(predictor):
+    network = predictor.prediction_net
+    batch = next(
+        iter(
+            InferenceDataLoader(
+                make_dataset(60),
+                transform=predictor.input_transform,
+                batch_size=5,
+                ctx=mx.cpu(),
+            )
+        )
+    )
+    inputs = [
+        batch[name]
+        for name in [
+            "feat_static_cat",
+            "feat_static_real",
+            "past_time_feat",
+            "past_target",
+            "past_observed_values",
+        ]
+    ]
+    _, state, scale, static_feat = network.unroll_encoder(
+        mx.nd, *inputs, None, None
+    )
+
+    # advancing a zero state over the whole context window with the same
+    # scale is the same as unrolling the encoder
+    advanced_state = network.advance_encoder(
+        mx.nd,
+        past_time_feat=batch["past_time_feat"],
+        past_target=batch["past_target"],
+        begin_state=[mx.nd.zeros_like(s) for s in state],
+        scale=scale,
+        static_feat=static_feat,
+        num_steps=network.context_length,
+    )
+    for s, advanced_s in zip(state, advanced_state):
+        assert np.allclose(s.asnumpy(), advanced_s.asnumpy(), atol=1e-6)
+
+
+def test_stateful_predictor(predictor):
+    stateful_predictor = StatefulDeepARPredictor.from_predictor(
+        predictor, max_incremental_steps=5
+    )
+
+    forecasts = list(stateful_predictor.predict(make_dataset(50)))
+    assert sorted(stateful_predictor.cache) == list("01234")
+    assert all(
+        state.num_incremental_steps == 0
+        for state in stateful_predictor.cache.values()
+    )
+
+    # three new observations, the history of series 1 is revised
+    forecasts = list(stateful_predictor.predict(make_dataset(53, revised=[1])))
+    steps = {
+        item_id: state.num_incremental_steps
+        for item_id, state in stateful_predictor.cache.items()
+    }
+    assert steps == {"0": 3, "1": 0, "2": 3, "3": 3, "4": 3}
+
+    for forecast in forecasts:
+        assert forecast.start_date == pd.Timestamp("2020-01-03 05:00")
+        assert forecast.samples.shape == (100, prediction_length)
+        assert np.all(np.isfinite(forecast.samples))
+
+    # the same history again only runs the decoder
+    list(stateful_predictor.predict(make_dataset(53), num_samples=150))
+    assert stateful_predictor.cache["0"].num_incremental_steps == 3
+
+    # states are computed from scratch after max_incremental_steps steps
+    list(stateful_predictor.predict(make_dataset(56)))
+    assert stateful_predictor.cache["0"].num_incremental_steps == 0
+
+
+def test_stateful_predictor_buckets_and_output_transform(predictor):
+    stateful_predictor = StatefulDeepARPredictor.from_predictor(
+        predictor, batch_buckets=[8]
+    )
+    stateful_predictor.output_transform = lambda batch, samples: (
+        samples + 1000.0
+    )
+
+    for _ in range(2):
+        forecasts = list(
+            stateful_predictor.predict(make_dataset(50), num_samples=10)
+        )
+        assert [forecast.item_id for forecast in forecasts] == list("01234")
+        for forecast in forecasts:
+            assert forecast.samples.shape == (10, prediction_length)
+            assert np.all(forecast.samples > 500.0)
+
+
+def test_lru_cache():
+    cache = LRUCache(max_size=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    assert cache["a"] == 1
+    cache["c"] = 3
+    assert sorted(cache) == ["a", "c"]
@@ -116,6 +116,17 @@ common_estimator_hps = dict(
                 cardinality=[3, 10, 42], num_feat_dynamic_real=3
             ),
         ),
+        # Parallel Kalman filtering
+        (
+            partial(
+                DeepStateEstimator,
+                **common_estimator_hps,
+                cardinality=[1],
+                use_feat_static_cat=False,
+                filtering="parallel",
+            ),
+            make_dummy_datasets_with_features(),
+        ),
     ],
 )
 def test_deepstate_smoke(estimator, datasets):
@@ -127,3 +127,34 @@ def test_deepvar(
     )
 
     assert agg_metrics["ND"] < 1.5
+
+
+@pytest.mark.parametrize("hybridize", [True, False])
+def test_deepvar_chunked_sampling(hybridize):
+    estimator = DeepVAREstimator(
+        num_cells=4,
+        num_layers=1,
+        pick_incomplete=True,
+        target_dim=target_dim,
+        prediction_length=metadata.prediction_length,
+        freq=metadata.freq,
+        distr_output=LowrankMultivariateGaussianOutput(dim=target_dim, rank=2),
+        num_parallel_samples=30,
+        sampling_memory_budget=1_000_000,
+        trainer=Trainer(
+            epochs=1,
+            batch_size=8,
+            num_batches_per_epoch=1,
+            hybridize=hybridize,
+        ),
+    )
+    sample_chunk_size = estimator.sample_chunk_size()
+    assert sample_chunk_size is not None and sample_chunk_size < 30
+
+    predictor = estimator.train(training_data=dataset.train)
+    for forecast in predictor.predict(dataset.test):
+        assert forecast.samples.shape == (
+            30,
+            metadata.prediction_length,
+            target_dim,
+        )
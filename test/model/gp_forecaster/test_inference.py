@@ -16,7 +16,11 @@ import numpy as np
 
 # First-party imports
 from gluonts.mx.kernels import RBFKernel
-from gluonts.model.gp_forecaster.gaussian_process import GaussianProcess
+from gluonts.model.gp_forecaster.gaussian_process import (
+    CholeskyCache,
+    GaussianProcess,
+    is_regular_grid,
+)
 
 # Relative imports
 from .data import (
@@ -96,3 +100,61 @@ def test_inference(gp_params, mean_exact, std_exact, x_full, y_train) -> None:
     # the predictive covariance matrix.
     assert relative_error(mean, mean_exact) <= tol
     assert relative_error(std, std_exact) <= tol
+
+
+@pytest.mark.parametrize("use_toeplitz", [True, False])
+@pytest.mark.parametrize("regular_grid", [True, False])
+def test_structured_inference(use_toeplitz, regular_grid) -> None:
+    gp_params = load_gp_params().astype(np.float64)
+    # the first and third series share their hyper-parameters
+    gp_params[2] = gp_params[0]
+    y_train = load_ytrain().astype(np.float64)
+    context_length = y_train.shape[1]
+    if regular_grid:
+        x_full = nd.arange(context_length + 24, dtype=np.float64)
+        x_full = nd.tile(x_full.reshape(1, -1, 1), reps=(10, 1, 1)) / 4
+    else:
+        # day of week and hour of day, which are not evenly spaced
+        x_full = load_xfull().astype(np.float64)
+    x_train = x_full[:, :context_length, :]
+    x_test = x_full[:, context_length : context_length + 24, :]
+    assert is_regular_grid(x_train.asnumpy()) == regular_grid
+
+    def inference(**kwargs):
+        gp = GaussianProcess(
+            sigma=gp_params[:, 2, :].expand_dims(axis=2),
+            kernel=RBFKernel(
+                gp_params[:, 0, :].expand_dims(axis=2),
+                gp_params[:, 1, :].expand_dims(axis=2),
+            ),
+            context_length=context_length,
+            prediction_length=24,
+            num_samples=10,
+            **kwargs,
+        )
+        return gp.exact_inference(x_train, y_train, x_test)
+
+    _, mean_exact, std_exact = inference()
+
+    cache = CholeskyCache(max_size=32)
+    for _ in range(2):
+        _, mean, std = inference(
+            cholesky_cache=cache, use_toeplitz=use_toeplitz
+        )
+        assert np.allclose(mean.asnumpy(), mean_exact.asnumpy(), rtol=1e-4)
+        assert np.allclose(std.asnumpy(), std_exact.asnumpy(), rtol=1e-4)
+
+    num_series = gp_params.shape[0]
+    assert len(cache) == num_series - 1
+    assert cache.misses == num_series - 1
+    assert cache.hits == num_series
+    # each cached factor owns its memory, rather than viewing a whole batch
+    for factor in cache.factors.values():
+        assert factor.base is None
+        assert factor.shape == (context_length, context_length)
+
+
+def test_is_regular_grid() -> None:
+    grid = np.arange(10.0)[None, :, None] * np.array([1.0, -0.5])
+    assert is_regular_grid(grid)
+    assert not is_regular_grid(grid ** 2)
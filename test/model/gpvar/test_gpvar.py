@@ -15,6 +15,7 @@
 import pytest
 from flaky import flaky
 import mxnet as mx
+import numpy as np
 
 # First-party imports
 from gluonts.dataset.artificial import constant_dataset
@@ -133,3 +134,45 @@ def test_smoke(
         ),
     )
     assert agg_metrics["ND"] < 2.5
+
+
+@pytest.mark.parametrize("sampling_memory_budget", [5_000_000, 200_000])
+def test_chunked_sampling(sampling_memory_budget):
+    def make_estimator(**kwargs):
+        return GPVAREstimator(
+            distr_output=LowrankGPOutput(rank=2),
+            num_cells=4,
+            num_layers=1,
+            pick_incomplete=True,
+            prediction_length=metadata.prediction_length,
+            target_dim=target_dim,
+            freq=metadata.freq,
+            num_parallel_samples=400,
+            trainer=Trainer(
+                epochs=1, batch_size=4, num_batches_per_epoch=2, hybridize=True
+            ),
+            **kwargs,
+        )
+
+    train_output = make_estimator().train_model(dataset.train)
+
+    estimator = make_estimator(sampling_memory_budget=sampling_memory_budget)
+    sample_chunk_size, target_dim_chunk_size = estimator.sampling_chunk_sizes()
+    assert target_dim_chunk_size is not None and target_dim_chunk_size > 0
+    assert (sample_chunk_size is not None) == (
+        sampling_memory_budget < 1_000_000
+    )
+
+    predictor = estimator.create_predictor(
+        train_output.transformation, train_output.trained_net
+    )
+    forecasts = list(predictor.predict(dataset.test))
+    expected_forecasts = list(train_output.predictor.predict(dataset.test))
+
+    for forecast, expected in zip(forecasts, expected_forecasts):
+        assert forecast.samples.shape == expected.samples.shape
+        assert np.allclose(
+            forecast.samples.mean(axis=0),
+            expected.samples.mean(axis=0),
+            atol=0.3 * expected.samples.std(axis=0).max(),
+        )
@@ -0,0 +1,112 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Third-party imports
+import mxnet as mx
+import numpy as np
+import pytest
+
+# First-party imports
+from gluonts.dataset.common import ListDataset
+from gluonts.model.n_beats import NBEATSEnsembleEstimator
+from gluonts.model.n_beats._network import NBEATSNetwork
+from gluonts.mx.trainer import Trainer
+
+
+@pytest.mark.parametrize(
+    "architecture",
+    [
+        dict(num_stacks=2),
+        dict(
+            num_stacks=2,
+            num_blocks=[2],
+            widths=[16],
+            sharing=[True],
+            stack_types=["T", "S"],
+        ),
+    ],
+)
+def test_stacked_ensemble_prediction(architecture):
+    dataset = ListDataset(
+        [
+            {
+                "start": "2020-01-01",
+                "target": np.sin(np.arange(30 + i) / 2.0) + i,
+                "item_id": str(i),
+            }
+            for i in range(7)
+        ],
+        freq="D",
+    )
+    predictor = NBEATSEnsembleEstimator(
+        freq="D",
+        prediction_length=3,
+        meta_context_length=[6, 9],
+        meta_loss_function=["MAPE", "sMAPE"],
+        meta_bagging_size=1,
+        trainer=Trainer(epochs=1, num_batches_per_epoch=1, batch_size=4),
+        **architecture,
+    ).train(dataset)
+
+    # the models predict separately
+    outputs = np.stack(
+        [
+            np.stack([f.samples for f in member.predict(dataset)])
+            for member in predictor.predictors
+        ]
+    )
+
+    for method, aggregate in [
+        ("median", lambda x: np.median(x, axis=0)),
+        ("mean", lambda x: np.mean(x, axis=0)),
+        ("none", lambda x: np.swapaxes(x, 0, 1)),
+    ]:
+        predictor.set_aggregation_method(method)
+        forecasts = list(predictor.predict(dataset))
+        assert [f.item_id for f in forecasts] == [str(i) for i in range(7)]
+        assert np.allclose(
+            np.stack([f.samples for f in forecasts]),
+            aggregate(outputs),
+            atol=1e-4,
+        )
+
+
+@pytest.mark.parametrize("stack_types", [["G", "G"], ["T", "S"]])
+def test_stacked_network(stack_types):
+    networks = []
+    for _ in range(3):
+        network = NBEATSNetwork(
+            prediction_length=3,
+            context_length=6,
+            num_stacks=2,
+            widths=[8, 8],
+            num_blocks=[2, 1],
+            num_block_layers=[2, 2],
+            expansion_coefficient_lengths=[4, 4],
+            sharing=[False, False],
+            stack_types=stack_types,
+        )
+        network.initialize(mx.init.Xavier())
+        networks.append(network)
+
+    past_target = mx.nd.random.normal(shape=(5, 6))
+    expected = np.stack(
+        [network(past_target, past_target).asnumpy() for network in networks]
+    )
+
+    stacked = NBEATSNetwork.stack(networks, mx.cpu())
+    stacked_past_target = mx.nd.stack(*[past_target] * len(networks))
+    output = stacked(stacked_past_target, stacked_past_target).asnumpy()
+
+    assert output.shape == (3, 5, 3)
+    assert np.allclose(output, expected, atol=1e-5)
@@ -0,0 +1,84 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Third-party imports
+import numpy as np
+import pytest
+
+# First-party imports
+from gluonts.model.naive_2 import naive_2
+from gluonts.model.naive_2._predictor import (
+    autocorrelation,
+    multiplicative_seasonality,
+    seasonality_test,
+)
+
+
+def seasonal_series(
+    num_series: int, length: int, season_length: int, seed: int = 0
+) -> np.ndarray:
+    rng = np.random.RandomState(seed)
+    season = np.sin(2 * np.pi * np.arange(length) / season_length)
+    return (
+        10.0
+        + 3.0 * rng.uniform(size=(num_series, 1)) * season
+        + rng.uniform(size=(num_series, length))
+    )
+
+
+@pytest.mark.parametrize("season_length", [7, 12])
+@pytest.mark.parametrize("length", [30, 100, 301])
+def test_statsmodels_compliance(season_length: int, length: int) -> None:
+    sm = pytest.importorskip("statsmodels.api")
+
+    for x in seasonal_series(5, length, season_length):
+        np.testing.assert_allclose(
+            autocorrelation(x, nlags=season_length),
+            sm.tsa.stattools.acf(x, nlags=season_length, fft=False),
+        )
+        np.testing.assert_allclose(
+            multiplicative_seasonality(x, season_length),
+            sm.tsa.seasonal_decompose(
+                x, period=season_length, model="multiplicative"
+            ).seasonal,
+        )
+
+
+def test_autocorrelation_fft() -> None:
+    x = seasonal_series(3, 500, 24)
+    np.testing.assert_allclose(
+        autocorrelation(x, nlags=24, fft=True),
+        autocorrelation(x, nlags=24),
+        atol=1e-10,
+    )
+
+
+@pytest.mark.parametrize("season_length", [1, 12])
+def test_naive_2_batch(season_length: int) -> None:
+    x = seasonal_series(10, 120, 12)
+    # make some of the series non-seasonal
+    x[::2] = np.random.uniform(1.0, 2.0, size=x[::2].shape)
+
+    forecasts = naive_2(x, prediction_length=30, season_length=season_length)
+    assert forecasts.shape == (10, 30)
+
+    is_seasonal = seasonality_test(x, 12)
+    assert is_seasonal.shape == (10,)
+    assert np.all(is_seasonal[1::2])
+
+    for ts, forecast, ts_is_seasonal in zip(x, forecasts, is_seasonal):
+        np.testing.assert_allclose(
+            forecast,
+            naive_2(ts, prediction_length=30, season_length=season_length),
+        )
+        assert seasonality_test(ts, 12) == ts_is_seasonal
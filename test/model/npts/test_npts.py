@@ -23,6 +23,7 @@ import pytest
 from gluonts.core.exception import GluonTSDataError
 from gluonts.dataset.common import Dataset, ListDataset, DataEntry
 from gluonts.model.npts import KernelType, NPTSPredictor
+from gluonts.model.npts._model import NPTS
 from gluonts.model.npts._weighted_sampler import WeightedSampler
 
 
@@ -661,3 +662,113 @@ def test_weighted_sampler(frac_zero_weights: float) -> None:
         assert all(
             probs_ix[zeros_ix] == 0.0
         ), "Indices with sampling weight zero are sampled!"
+
+
+@pytest.mark.parametrize("kernel_type", [KernelType.exponential, "uniform"])
+@pytest.mark.parametrize("exp_kernel_weights", [1.0, [1.0, 0.5]])
+def test_compute_weight_matrix(
+    kernel_type: KernelType, exp_kernel_weights
+) -> None:
+    """
+    The vectorised sampling weights must match the weights obtained by
+    evaluating the kernel separately for every pair of time points.
+    """
+    predictor = NPTSPredictor(
+        freq="H",
+        prediction_length=12,
+        kernel_type=kernel_type,
+        exp_kernel_weights=exp_kernel_weights,
+    )
+    train_ts = get_test_data(history_length=100, freq="H")
+    train_features, pred_features = predictor._get_features(
+        train_ts.index, predictor.prediction_length
+    )
+    target_isnan = np.zeros(len(train_ts), dtype=bool)
+    target_isnan[[3, 17, 42]] = True
+
+    weight_matrix = NPTS.compute_weight_matrix(
+        train_features=train_features,
+        pred_features=pred_features,
+        target_isnan=target_isnan,
+        kernel=predictor.kernel,
+        do_exp=predictor._is_exp_kernel(),
+    )
+
+    features = np.hstack([train_features, pred_features])
+    for pred_t, weights in enumerate(weight_matrix):
+        expected = np.array(
+            [
+                predictor.kernel(features[:, t], pred_features[:, pred_t])
+                for t in range(len(train_ts) + pred_t)
+            ]
+        )
+        if predictor._is_exp_kernel():
+            expected = np.exp(expected - expected.max())
+        expected[: len(train_ts)][target_isnan] = 0.0
+
+        np.testing.assert_allclose(weights[: len(expected)], expected)
+        assert np.all(weights[len(expected) :] == 0.0)
+
+
+def test_weighted_sampler_rows() -> None:
+    """
+    Each row of the weights must be sampled independently according to its
+    own distribution.
+    """
+    weights = np.random.random((2, 3, 50))
+    weights[0, 1, 20:] = 0.0
+    weights[1, 2] = 0.0
+
+    num_samples = 100_000
+    samples_ix = WeightedSampler.sample_rows(weights, num_samples)
+    assert samples_ix.shape == (2, num_samples, 3)
+
+    for i in range(2):
+        for row in range(3):
+            counts_ix, _ = np.histogram(
+                samples_ix[i, :, row], bins=range(weights.shape[-1] + 1)
+            )
+            true_prob_ix = (
+                weights[i, row] / weights[i, row].sum()
+                if weights[i, row].sum() > 0
+                else np.ones(weights.shape[-1]) / weights.shape[-1]
+            )
+            np.testing.assert_almost_equal(
+                counts_ix / num_samples, true_prob_ix, 2
+            )
+
+    assert np.all(samples_ix[0, :, 1] < 20)
+
+
+@pytest.mark.parametrize("batch_size", [1, 3, 8])
+def test_npts_batch_prediction(batch_size: int) -> None:
+    """
+    Batched prediction must produce forecasts in input order, including for
+    consecutive time series of different lengths.
+    """
+    freq = "D"
+    lengths = [30, 30, 30, 30, 45, 45, 30, 10]
+    dataset = ListDataset(
+        [
+            {
+                "start": "2011-01-01",
+                "target": np.full(length, float(i)),
+                "feat_dynamic_real": [np.arange(length + 7, dtype=float)],
+            }
+            for i, length in enumerate(lengths)
+        ],
+        freq=freq,
+    )
+    predictor = NPTSPredictor(
+        freq=freq, prediction_length=7, batch_size=batch_size
+    )
+
+    forecasts = list(predictor.predict(dataset, num_samples=50))
+
+    assert len(forecasts) == len(lengths)
+    for i, (forecast, length) in enumerate(zip(forecasts, lengths)):
+        assert forecast.samples.shape == (50, 7)
+        assert np.all(forecast.samples == float(i))
+        assert forecast.start_date == pd.Timestamp(
+            "2011-01-01", freq=freq
+        ) + length * pd.Timedelta(days=1)
@@ -17,6 +17,7 @@ from itertools import chain
 import pytest
 
 # First-party imports
+from gluonts.dataset.common import ListDataset
 from gluonts.model.rotbaum import TreeEstimator
 
 
@@ -38,3 +39,25 @@ def test_repr(repr_test, hyperparameters):
 
 def test_serialize(serialize_test, hyperparameters):
     serialize_test(TreeEstimator, hyperparameters)
+
+
+def test_train_in_processes():
+    dataset = ListDataset(
+        [
+            {"start": "2020-01-01", "target": np.sin(np.arange(50) + i)}
+            for i in range(5)
+        ],
+        freq="H",
+    )
+    estimator = TreeEstimator(
+        freq="H",
+        prediction_length=2,
+        context_length=4,
+        max_n_datapts=500,
+        max_workers=2,
+        use_processes=True,
+    )
+    predictor = estimator.train(dataset)
+    assert all(model.cell_values for model in predictor.model_list)
+    for forecast in predictor.predict(dataset):
+        assert forecast.quantile(0.5).shape == (2,)
@@ -0,0 +1,87 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Third-party imports
+import numpy as np
+import pytest
+
+# First-party imports
+from gluonts.model.rotbaum._preprocess import (
+    PreprocessOnlyLagFeatures,
+    sliding_windows,
+)
+
+
+def test_sliding_windows():
+    x = np.arange(6.0)
+    windows = sliding_windows(x, 4)
+    assert windows.shape == (3, 4)
+    assert np.array_equal(windows[2], [2.0, 3.0, 4.0, 5.0])
+    assert not windows.flags.writeable
+    assert sliding_windows(x, 7).shape == (0, 7)
+
+
+@pytest.mark.parametrize("stratify_targets", [False, True])
+def test_preprocess_matches_make_features(stratify_targets):
+    time_series = {
+        "start": "2020-01-01",
+        "target": np.random.RandomState(0).normal(size=30),
+        "feat_static_cat": [1.0, 2.0],
+        "feat_dynamic_real": [[0.5, 1.5]],
+    }
+    context_length, prediction_length = 5, 3
+    preprocess = PreprocessOnlyLagFeatures(
+        context_length,
+        forecast_horizon=prediction_length,
+        stratify_targets=stratify_targets,
+        n_ignore_last=2,
+        max_n_datapts=100,
+        use_feat_static_cat=True,
+        use_feat_dynamic_real=True,
+    )
+    preprocess.preprocess_from_list([time_series, time_series])
+
+    num_windows = 30 - 2 - context_length - prediction_length + 1
+    feature_data = preprocess.feature_data
+    target_data = preprocess.target_data
+    assert feature_data.dtype == target_data.dtype == np.float32
+
+    expected_features = np.array(
+        [
+            preprocess.make_features(time_series, starting_index)
+            for starting_index in range(num_windows)
+        ]
+    )
+    expected_targets = np.array(
+        [
+            time_series["target"][
+                starting_index
+                + context_length : starting_index
+                + context_length
+                + prediction_length
+            ]
+            for starting_index in range(num_windows)
+        ]
+    )
+    if stratify_targets:
+        expected_features = np.concatenate(
+            [
+                np.repeat(expected_features, prediction_length, axis=0),
+                np.tile(np.arange(prediction_length), num_windows)[:, None],
+            ],
+            axis=1,
+        )
+        expected_targets = expected_targets.reshape(-1, 1)
+
+    assert np.allclose(feature_data, np.tile(expected_features, (2, 1)))
+    assert np.allclose(target_data, np.tile(expected_targets, (2, 1)))
@@ -0,0 +1,78 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+# Third-party imports
+import numpy as np
+import pytest
+
+# First-party imports
+from gluonts.dataset.common import ListDataset
+from gluonts.model.rotbaum import TreeEstimator
+from gluonts.model.rotbaum._model import QRX
+
+
+def closest_cell(qrx, pred):
+    # the closest cell value, ties going to the larger one
+    return min(qrx.cell_values, key=lambda value: (abs(value - pred), -value))
+
+
+@pytest.fixture()
+def qrx():
+    rng = np.random.RandomState(0)
+    x_train = rng.uniform(size=(500, 3))
+    y_train = x_train.sum(axis=1) + rng.normal(scale=0.1, size=500)
+    model = QRX(clump_size=20)
+    model.fit(list(x_train), list(y_train))
+    return model
+
+
+@pytest.mark.parametrize("quantile", [0.1, 0.5, 0.9])
+def test_batched_predict(qrx, quantile):
+    x_test = np.random.RandomState(1).uniform(-0.5, 1.5, size=(200, 3))
+    preds = qrx.model.predict(x_test)
+
+    expected = [
+        np.percentile(
+            qrx.cell_values_dict[closest_cell(qrx, pred)], quantile * 100,
+        )
+        for pred in preds
+    ]
+    assert np.allclose(qrx.predict(list(x_test), quantile), expected)
+
+    dists = qrx.estimate_dist(list(x_test))
+    assert all(
+        dist is qrx.cell_values_dict[closest_cell(qrx, p)]
+        for dist, p in zip(dists, preds)
+    )
+
+
+def test_forecast_quantiles():
+    dataset = ListDataset(
+        [
+            {"start": "2020-01-01", "target": np.sin(np.arange(100) + i)}
+            for i in range(20)
+        ],
+        freq="H",
+    )
+    predictor = TreeEstimator(
+        freq="H", prediction_length=3, context_length=5, max_n_datapts=2000,
+    ).train(dataset)
+
+    for forecast in predictor.predict(dataset):
+        assert forecast.cells is not None
+        features = forecast.featurized_data
+        for q in [0.1, 0.5, 0.9]:
+            expected = [
+                model.predict(features, q)[0] for model in forecast.models
+            ]
+            assert np.allclose(forecast.quantile(q), expected)
@@ -17,18 +17,29 @@ import math
 import pytest
 from pathlib import Path
 
+# Third-party imports
+import numpy as np
+import pandas as pd
+
 # First-party imports
 import gluonts
 from gluonts.core.component import equals
 from gluonts.core.serde import load_code, dump_code
 from gluonts.dataset.artificial import constant_dataset
+from gluonts.dataset.common import ListDataset
 from gluonts.dataset.stat import (  # noqa
     DatasetStatistics,
     ScaleHistogram,
     calculate_dataset_statistics,
 )
 from gluonts.evaluation import Evaluator
-from gluonts.evaluation.backtest import BacktestInformation, backtest_metrics
+from gluonts.evaluation.backtest import (
+    BacktestInformation,
+    backtest_metrics,
+    make_evaluation_predictions,
+    rolling_backtest,
+)
+from gluonts.model.seasonal_naive import SeasonalNaivePredictor
 from gluonts.model.trivial.mean import MeanEstimator
 
 root = logging.getLogger()
@@ -95,3 +106,56 @@ def test_benchmark(caplog):
     assert equals(estimator, log_info.estimator)
 
     print(log_info)
+
+
+def test_rolling_backtest():
+    rng = np.random.RandomState(0)
+    freq, prediction_length, num_windows = "D", 3, 4
+    dataset = ListDataset(
+        [
+            {"start": "2020-01-01", "target": rng.rand(length)}
+            for length in [30, 25, 8]
+        ],
+        freq=freq,
+    )
+    predictor = SeasonalNaivePredictor(
+        freq=freq, prediction_length=prediction_length, season_length=2
+    )
+    evaluator = Evaluator(quantiles=[0.5], num_workers=0)
+
+    result = rolling_backtest(
+        dataset, predictor, evaluator, num_windows=num_windows, distance=2
+    )
+
+    # the last time series has no history for the first window
+    assert result.item_metrics["window"].tolist() == [0, 1, 2, 3] * 2 + [
+        1,
+        2,
+        3,
+    ]
+    assert len(result.window_metrics) == num_windows
+
+    # every window agrees with evaluating the correspondingly truncated data
+    for window, window_metrics in enumerate(result.window_metrics):
+        cut = 2 * (num_windows - 1 - window)
+        truncated = ListDataset(
+            [
+                {"start": entry["start"], "target": entry["target"][:-cut]}
+                if cut
+                else entry
+                for entry in dataset
+                if len(entry["target"]) - cut > prediction_length
+            ],
+            freq=freq,
+        )
+        forecast_it, ts_it = make_evaluation_predictions(
+            truncated, predictor, num_samples=1
+        )
+        expected, _ = evaluator(ts_it, forecast_it)
+        assert window_metrics.keys() == expected.keys()
+        for key, value in expected.items():
+            assert np.isclose(window_metrics[key], value, equal_nan=True), key
+
+    expected, _ = evaluator.get_aggregate_metrics(result.item_metrics)
+    for key, value in expected.items():
+        assert np.isclose(result.agg_metrics[key], value, equal_nan=True)
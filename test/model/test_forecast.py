@@ -19,12 +19,18 @@ import mxnet as mx
 
 # First-party imports
 from gluonts.model.forecast import (
+    Config,
+    OutputType,
     QuantileForecast,
+    QuantileForecastBatch,
     SampleForecast,
+    SampleForecastBatch,
     DistributionForecast,
+    DistributionForecastBatch,
+    sample_quantiles,
 )
 
-from gluonts.mx.distribution import Uniform
+from gluonts.mx.distribution import StudentT, Uniform
 
 QUANTILES = np.arange(1, 100) / 100
 SAMPLES = np.arange(101).reshape(101, 1) / 100
@@ -129,3 +135,138 @@ def test_DistributionForecast():
 def test_forecast_multivariate(forecast, exp_index):
     assert forecast.prediction_length == len(exp_index)
     assert np.all(forecast.index == exp_index)
+
+
+def test_sample_forecast_batch():
+    samples = np.random.normal(size=(4, 50, 7))
+    start_dates = [START_DATE] * 2 + [pd.Timestamp(2018, 1, 1, 12)] * 2
+    batch = SampleForecastBatch(
+        samples=samples,
+        start_dates=start_dates,
+        freq=FREQ,
+        item_ids=["a", "b", "c", "d"],
+    )
+
+    assert len(batch) == 4
+    assert batch.prediction_length == 7
+    assert batch.mean.shape == (4, 7)
+    assert batch.index[0] is batch.index[1]
+
+    config = Config(
+        quantiles=["0.1", "0.5"],
+        output_types={OutputType.mean, OutputType.quantiles},
+    )
+    json_dicts = batch.as_json_dicts(config)
+
+    for i, forecast in enumerate(batch):
+        expected = SampleForecast(
+            samples=samples[i],
+            start_date=start_dates[i],
+            freq=FREQ,
+            item_id=batch.item_ids[i],
+        )
+        assert isinstance(forecast, SampleForecast)
+        assert forecast.item_id == expected.item_id
+        assert np.shares_memory(forecast.samples, samples)
+        assert np.allclose(batch.mean[i], expected.mean)
+        assert np.all(forecast.index == expected.index)
+        assert np.all(batch.index[i] == expected.index)
+        for q in [0.1, 0.5, 0.9]:
+            assert np.allclose(forecast.quantile(q), expected.quantile(q))
+            assert np.allclose(batch.quantile(q)[i], expected.quantile(q))
+        assert json_dicts[i] == expected.as_json_dict(config)
+
+
+def test_quantile_forecast_batch():
+    keys = ["0.1", "0.5", "mean"]
+    forecast_arrays = np.random.normal(size=(3, len(keys), 5))
+    batch = QuantileForecastBatch(
+        forecast_arrays=forecast_arrays,
+        start_dates=[START_DATE] * 3,
+        freq=FREQ,
+        forecast_keys=keys,
+    )
+
+    config = Config(quantiles=["0.1", "0.5"])
+    json_dicts = batch.as_json_dicts(config)
+
+    for i, forecast in enumerate(batch):
+        assert isinstance(forecast, QuantileForecast)
+        assert np.allclose(batch.mean[i], forecast.mean)
+        for q in ["0.1", "0.5"]:
+            assert np.allclose(batch.quantile(q)[i], forecast.quantile(q))
+        assert np.all(np.isnan(batch.quantile("0.9")))
+        assert json_dicts[i] == forecast.as_json_dict(config)
+
+
+@pytest.mark.parametrize("axis", [0, 1])
+@pytest.mark.parametrize("num_samples", [1, 10, 501])
+def test_sample_quantiles(axis, num_samples):
+    samples = np.random.normal(size=(num_samples, 4, 3))
+    samples = np.moveaxis(samples, 0, axis)
+    qs = [0.9, 0.1, 0.5, 0.5, 0.0, 1.0]
+
+    result = sample_quantiles(samples, qs, axis=axis)
+
+    sorted_samples = np.sort(samples, axis=axis)
+    for i, q in enumerate(qs):
+        idx = int(np.round((num_samples - 1) * q))
+        assert np.array_equal(
+            np.take(result, i, axis=axis),
+            np.take(sorted_samples, idx, axis=axis),
+        )
+
+
+def test_forecast_quantiles():
+    samples = np.random.normal(size=(3, 100, 5))
+    batch = SampleForecastBatch(
+        samples=samples, start_dates=[START_DATE] * 3, freq=FREQ
+    )
+    qs = ["0.1", 0.5, "p90"]
+
+    batch_quantiles = batch.quantiles(qs)
+    assert batch_quantiles.shape == (3, len(qs), 5)
+
+    for forecast, expected in zip(batch, batch_quantiles):
+        assert np.array_equal(forecast.quantiles(qs), expected)
+        for q, value in zip(qs, expected):
+            assert np.array_equal(forecast.quantile(q), value)
+
+    for forecast in FORECASTS.values():
+        assert np.allclose(
+            forecast.quantiles([0.1, 0.9]),
+            [forecast.quantile(0.1), forecast.quantile(0.9)],
+        )
+
+
+@pytest.mark.parametrize(
+    "distribution",
+    [
+        StudentT(
+            mu=mx.nd.random.normal(shape=(3, 5)),
+            sigma=mx.nd.random.uniform(0.5, 2.0, shape=(3, 5)),
+            nu=mx.nd.random.uniform(2.5, 10.0, shape=(3, 5)),
+        ),
+        # no NumPy implementation
+        Uniform(low=mx.nd.zeros(shape=(3, 5)), high=mx.nd.ones(shape=(3, 5))),
+    ],
+)
+def test_distribution_forecast_batch(distribution):
+    batch = DistributionForecastBatch(
+        distribution, start_dates=[START_DATE] * 3, freq=FREQ
+    )
+    qs = [0.1, 0.5, 0.9]
+
+    assert len(batch) == 3
+    assert batch.prediction_length == 5
+    assert batch.quantiles(qs).shape == (3, len(qs), 5)
+
+    for i, forecast in enumerate(batch):
+        assert isinstance(forecast, DistributionForecast)
+        assert np.allclose(forecast.mean, batch.mean[i])
+        assert np.allclose(forecast.quantiles(qs), batch.quantiles(qs)[i])
+        assert np.allclose(forecast.quantile(0.9), batch.quantile(0.9)[i])
+        assert np.allclose(forecast.cdf(forecast.quantile(0.9)), 0.9)
+
+    samples = batch.to_sample_forecast_batch(num_samples=20)
+    assert samples.samples.shape == (3, 20, 5)
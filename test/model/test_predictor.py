@@ -11,15 +11,32 @@
 # express or implied. See the License for the specific language governing
 # permissions and limitations under the License.
 
+# Standard library imports
+import multiprocessing as mp
+import tempfile
+import time
+from pathlib import Path
+
 # Third-party imports
 import numpy as np
+import pytest
 
 # First-party imports
 from gluonts.dataset.common import ListDataset
 from gluonts.evaluation.backtest import backtest_metrics
-from gluonts.model.predictor import ParallelizedPredictor, Localizer
+from gluonts.core.exception import GluonTSDataError
+from gluonts.model.predictor import (
+    Localizer,
+    ParallelizedPredictor,
+    Predictor,
+    ProcessPoolPredictor,
+    RepresentableBlockPredictor,
+)
+from gluonts.model.simple_feedforward import SimpleFeedForwardEstimator
+from gluonts.model.trivial.constant import ConstantValuePredictor
 from gluonts.model.trivial.identity import IdentityPredictor
 from gluonts.model.trivial.mean import MeanEstimator
+from gluonts.trainer import Trainer
 
 
 def test_parallelized_predictor():
@@ -49,6 +66,98 @@ def test_parallelized_predictor():
         assert np.all(p.index == pp.index)
 
 
+class UnreliablePredictor(IdentityPredictor):
+    """
+    Identity predictor which hangs on targets starting with -1, fails on
+    targets starting with -2 and raises a data error on targets starting
+    with -3.
+    """
+
+    def predict_item(self, item):
+        if item["target"][0] == -1:
+            time.sleep(60)
+        elif item["target"][0] == -2:
+            raise ValueError("failed")
+        elif item["target"][0] == -3:
+            raise GluonTSDataError("bad data")
+        return super().predict_item(item)
+
+
+def test_process_pool_predictor():
+    first_values = [0, 1, -1, 2, -2, 3, 4, -1, 5]
+    dataset = ListDataset(
+        data_iter=[
+            {"start": "2012-01-01", "target": [float(v)] + [float(i)] * 19}
+            for i, v in enumerate(first_values)
+        ],
+        freq="1H",
+    )
+
+    predictor = ProcessPoolPredictor(
+        base_predictor=UnreliablePredictor(
+            freq="1H", prediction_length=10, num_samples=5
+        ),
+        num_workers=3,
+        timeout=2.0,
+        fallback_predictor=ConstantValuePredictor(
+            value=-100.0, freq="1H", prediction_length=10, num_samples=5
+        ),
+    )
+
+    forecasts = list(predictor.predict(dataset))
+
+    assert len(forecasts) == len(first_values)
+    for i, (v, forecast) in enumerate(zip(first_values, forecasts)):
+        assert forecast.info["fit_time"] >= 0.0
+        if v < 0:
+            assert forecast.info["fallback"]
+            assert np.all(forecast.samples == -100.0)
+        else:
+            assert "fallback" not in forecast.info
+            assert np.all(forecast.samples == float(i))
+
+
+def test_process_pool_predictor_timeout_without_process_kill(monkeypatch):
+    # Process.kill does not exist before Python 3.7
+    monkeypatch.delattr(mp.process.BaseProcess, "kill", raising=False)
+    dataset = ListDataset(
+        data_iter=[
+            {"start": "2012-01-01", "target": [float(v)] * 20}
+            for v in [1, -1, 2]
+        ],
+        freq="1H",
+    )
+    predictor = ProcessPoolPredictor(
+        base_predictor=UnreliablePredictor(
+            freq="1H", prediction_length=10, num_samples=5
+        ),
+        num_workers=2,
+        timeout=1.0,
+    )
+
+    forecasts = list(predictor.predict(dataset))
+    assert [bool(f.info.get("fallback")) for f in forecasts] == [
+        False,
+        True,
+        False,
+    ]
+
+
+def test_process_pool_predictor_data_error():
+    dataset = ListDataset(
+        data_iter=[{"start": "2012-01-01", "target": [-3.0] * 20}], freq="1H",
+    )
+    predictor = ProcessPoolPredictor(
+        base_predictor=UnreliablePredictor(
+            freq="1H", prediction_length=10, num_samples=5
+        ),
+        num_workers=2,
+    )
+
+    with pytest.raises(GluonTSDataError):
+        list(predictor.predict(dataset))
+
+
 def test_localizer():
     dataset = ListDataset(
         data_iter=[
@@ -68,3 +177,66 @@ def test_localizer():
     agg_metrics, _ = backtest_metrics(
         test_dataset=dataset, predictor=local_pred
     )
+
+
+def test_parallel_localizer():
+    dataset = ListDataset(
+        data_iter=[
+            {"start": "2012-01-01", "target": np.zeros(20) + i}
+            for i in range(7)
+        ],
+        freq="1H",
+    )
+
+    estimator = MeanEstimator(prediction_length=10, freq="1H", num_samples=5)
+    forecasts = list(
+        Localizer(estimator=estimator, num_workers=3).predict(dataset)
+    )
+
+    assert len(forecasts) == 7
+    for i, forecast in enumerate(forecasts):
+        assert np.allclose(forecast.mean, i)
+        assert "fallback" not in forecast.info
+
+
+def test_batch_buckets():
+    dataset = ListDataset(
+        data_iter=[
+            {"start": "2012-01-01", "target": np.arange(30.0) + i}
+            for i in range(11)
+        ],
+        freq="1H",
+    )
+
+    predictor = SimpleFeedForwardEstimator(
+        freq="1H",
+        prediction_length=5,
+        sampling=False,
+        trainer=Trainer(epochs=1, num_batches_per_epoch=1, batch_size=8),
+    ).train(dataset)
+
+    bucketed_predictor = RepresentableBlockPredictor(
+        prediction_net=predictor.prediction_net,
+        batch_size=predictor.batch_size,
+        prediction_length=predictor.prediction_length,
+        freq=predictor.freq,
+        ctx=predictor.ctx,
+        input_transform=predictor.input_transform,
+        forecast_generator=predictor.forecast_generator,
+        batch_buckets=[1, 4],
+    )
+    bucketed_predictor.warm_up(dataset)
+    assert sorted(bucketed_predictor._bucket_nets) == [1, 4, 8]
+
+    # 11 series are predicted in batches of 8 and 3, padded to 4
+    forecasts = list(predictor.predict(dataset))
+    bucketed_forecasts = list(bucketed_predictor.predict(dataset))
+
+    assert len(bucketed_forecasts) == len(forecasts)
+    for forecast, bucketed_forecast in zip(forecasts, bucketed_forecasts):
+        assert np.allclose(forecast.mean, bucketed_forecast.mean, atol=1e-5)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bucketed_predictor.serialize(Path(temp_dir))
+        deserialized = Predictor.deserialize(Path(temp_dir))
+    assert deserialized.batch_buckets == [1, 4]
@@ -0,0 +1,218 @@
+# Copyright 2018 Amazon.com, Inc. or its affiliates. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License").
+# You may not use this file except in compliance with the License.
+# A copy of the License is located at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# or in the "license" file accompanying this file. This file is distributed
+# on an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either
+# express or implied. See the License for the specific language governing
+# permissions and limitations under the License.
+
+
+# Standard library imports
+import json
+
+# Third-party imports
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+# First-party imports
+from gluonts.core.exception import GluonTSUserError
+from gluonts.dataset.common import ListDataset
+from gluonts.model.forecast import Config as ForecastConfig
+from gluonts.model.forecast import OutputType, QuantileForecast
+from gluonts.model.seasonal_naive import SeasonalNaivePredictor
+from gluonts.shell.__main__ import cli
+from gluonts.shell.batch_predict import (
+    OUTPUT_FORMATS,
+    run_batch_predict,
+    shard_path,
+    write_shard,
+)
+
+freq = "H"
+prediction_length = 3
+num_series = 10
+
+predictor = SeasonalNaivePredictor(
+    freq=freq, prediction_length=prediction_length, season_length=2
+)
+dataset = ListDataset(
+    [
+        {
+            "start": "2020-01-01",
+            "target": np.arange(5 + i, dtype=float),
+            "item_id": str(i),
+        }
+        for i in range(num_series)
+    ],
+    freq=freq,
+)
+configuration = ForecastConfig(
+    num_samples=1, output_types={"mean", "quantiles"}, quantiles=["0.5"]
+)
+
+
+def read_jsonl(path):
+    records = []
+    for shard in sorted(path.glob("part-*.jsonl")):
+        with shard.open() as fp:
+            records.extend(map(json.loads, fp))
+    return records
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+def test_batch_predict_jsonl(tmp_path, num_workers):
+    stats = run_batch_predict(
+        predictor,
+        dataset,
+        tmp_path,
+        configuration,
+        shard_size=4,
+        num_workers=num_workers,
+    )
+
+    assert [shard.num_items for shard in stats] == [4, 4, 2]
+    assert (tmp_path / "_SUCCESS").exists()
+
+    records = read_jsonl(tmp_path)
+    assert [record["item_id"] for record in records] == [
+        str(i) for i in range(num_series)
+    ]
+    for record, forecast in zip(records, predictor.predict(dataset)):
+        assert record["start"] == str(forecast.start_date)
+        assert record["mean"] == forecast.mean.tolist()
+        assert record["quantiles"]["0.5"] == forecast.quantile(0.5).tolist()
+
+
+def test_batch_predict_npz(tmp_path):
+    run_batch_predict(
+        predictor,
+        dataset,
+        tmp_path,
+        configuration,
+        output_format="npz",
+        shard_size=4,
+    )
+
+    shards = [np.load(path) for path in sorted(tmp_path.glob("part-*.npz"))]
+    assert [len(shard["item_id"]) for shard in shards] == [4, 4, 2]
+
+    forecasts = list(predictor.predict(dataset))
+    mean = np.concatenate([shard["mean"] for shard in shards])
+    quantiles = np.concatenate([shard["quantiles"] for shard in shards])
+    assert quantiles.shape == (num_series, 1, prediction_length)
+    assert np.array_equal(mean, [forecast.mean for forecast in forecasts])
+    assert np.array_equal(
+        quantiles[:, 0], [forecast.quantile(0.5) for forecast in forecasts]
+    )
+
+
+@pytest.mark.parametrize("output_format", OUTPUT_FORMATS)
+def test_batch_predict_quantile_forecast_samples(tmp_path, output_format):
+    forecasts = [
+        QuantileForecast(
+            forecast_arrays=np.ones((1, prediction_length)),
+            start_date=pd.Timestamp("2020-01-01", freq=freq),
+            freq=freq,
+            forecast_keys=["0.5"],
+            item_id=str(i),
+        )
+        for i in range(2)
+    ]
+    path = tmp_path / f"part-00000.{output_format}"
+    samples_configuration = ForecastConfig(
+        output_types={"quantiles", "samples"}, quantiles=["0.5"]
+    )
+    assert write_shard(
+        iter(forecasts), path, output_format, samples_configuration
+    ) == len(forecasts)
+
+    # quantile forecasts have no samples
+    if output_format == "jsonl":
+        assert [record["samples"] for record in read_jsonl(tmp_path)] == [
+            [],
+            [],
+        ]
+    else:
+        shard = np.load(path)
+        assert shard["samples"].shape == (2, 0)
+        assert shard["quantiles"].shape == (2, 1, prediction_length)
+
+
+def test_batch_predict_resume(tmp_path):
+    run_batch_predict(
+        predictor, dataset, tmp_path, configuration, shard_size=4
+    )
+    expected = read_jsonl(tmp_path)
+
+    # an interrupted run leaves the completed shards and maybe a partial one
+    shard_path(tmp_path, 2, "jsonl").rename(tmp_path / ".part-00002.jsonl.tmp")
+    (tmp_path / "_SUCCESS").unlink()
+
+    stats = run_batch_predict(
+        predictor, dataset, tmp_path, configuration, shard_size=4
+    )
+    assert [(shard.shard, shard.num_items) for shard in stats] == [(2, 2)]
+    assert read_jsonl(tmp_path) == expected
+
+    with pytest.raises(GluonTSUserError):
+        run_batch_predict(
+            predictor, dataset, tmp_path, configuration, shard_size=5
+        )
+
+
+def test_batch_predict_command(tmp_path):
+    model_path = tmp_path / "model"
+    model_path.mkdir()
+    predictor.serialize(model_path)
+
+    data_path = tmp_path / "data"
+    data_path.mkdir()
+    with (data_path / "data.json").open("w") as fp:
+        for entry in dataset.list_data:
+            print(
+                json.dumps({**entry, "target": entry["target"].tolist()}),
+                file=fp,
+            )
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "batch-predict",
+            "--model-path",
+            str(model_path),
+            "--data-path",
+            str(data_path),
+            "--output-path",
+            str(tmp_path / "output"),
+            "--shard-size",
+            "3",
+            "--output-type",
+            "mean",
+        ],
+    )
+    assert result.exit_code == 0, result.output
+
+    records = read_jsonl(tmp_path / "output")
+    assert len(records) == num_series
+    assert all(
+        set(record) == {"item_id", "start", "mean"} for record in records
+    )
+
+
+def test_batch_predict_command_choices():
+    # the choices are spelled out, so that the shell does not import the
+    # models to parse its arguments
+    params = {
+        param.name: param for param in cli.commands["batch-predict"].params
+    }
+    assert list(params["output_format"].type.choices) == OUTPUT_FORMATS
+    assert set(params["output_types"].type.choices) == {
+        output_type.value for output_type in OutputType
+    }
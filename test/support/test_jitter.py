@@ -19,7 +19,11 @@ import sys
 from gluonts.mx.context import check_gpu_support
 from gluonts.mx.kernels import RBFKernel
 from gluonts.model.gp_forecaster.gaussian_process import GaussianProcess
-from gluonts.support.linalg_util import jitter_cholesky, jitter_cholesky_eig
+from gluonts.support.linalg_util import (
+    jitter_cholesky,
+    jitter_cholesky_eig,
+    toeplitz_cholesky,
+)
 
 # Third-party imports
 import mxnet.ndarray as nd
@@ -120,3 +124,23 @@ def test_jitter_synthetic_gp(jitter_method, float_type, ctx) -> None:
     assert (
         np.sum(np.isnan(samples.asnumpy())) == 0
     ), "NaNs in predictive samples!"
+
+
+@pytest.mark.parametrize("length_scale", [2.0, 20.0])
+def test_toeplitz_cholesky(length_scale) -> None:
+    lags = np.arange(200)
+    column = np.stack(
+        [
+            np.exp(-(lags ** 2) / (2 * length_scale ** 2)) + 0.1 * (lags == 0),
+            np.exp(-(lags ** 2) / (2 * length_scale ** 2)),
+        ]
+    )
+    matrix = column[:, np.abs(lags[:, None] - lags[None, :])]
+
+    L = toeplitz_cholesky(column)
+
+    assert np.allclose(L[0], np.linalg.cholesky(matrix[0]))
+    # the noiseless matrix is numerically singular and has to be jittered
+    assert np.all(np.isfinite(L[1]))
+    assert np.allclose(L @ L.transpose(0, 2, 1), matrix, atol=1e-4)
+    assert np.allclose(np.triu(L[1], 1), 0.0)